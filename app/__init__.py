@@ -1,20 +1,58 @@
 from flask import Flask
 from flask_cors import CORS
 from config import Config
+from app.core.access_log import init_access_log
+from app.core.admin import create_admin_blueprint
+from app.core.compression import init_compression
+from app.core.health import create_health_blueprint
+from app.core.lifecycle import worker_resources
+from app.core.limits import init_limits
+from app.core.profiling import init_profiling
+from app.core.registry import ModuleRegistry
+from app.core.settings import runtime_settings
 from app.core.websocket import websocket_manager
 
+def init_extensions(app: Flask):
+    """Set up extensions shared by the gateway app and lazily loaded module apps"""
+    CORS(app)
+    # Registered before compression so its after_request hook sees the final response
+    init_access_log(app)
+    # Its after_request hook runs before the access log's, so accounted bytes are logged
+    init_limits(app)
+    init_profiling(app)
+    init_compression(app)
+
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
     # Initialize CORS
-    CORS(app)
+    init_extensions(app)
     
     # Initialize WebSocket
     websocket_manager.init_app(app)
     
-    # Register blueprints
-    from app.modules.xendit import create_xendit_blueprint
-    app.register_blueprint(create_xendit_blueprint(), url_prefix='/api/xendit')
+    # Register integration modules (blueprints are imported on first use when lazy)
+    registry = ModuleRegistry()
+    registry.discover(config_class.MODULES)
+    registry.init_app(
+        app,
+        enabled=config_class.ENABLED_MODULES,
+        lazy=config_class.LAZY_MODULES,
+        setup=init_extensions
+    )
+    
+    # Operational endpoints
+    app.register_blueprint(create_admin_blueprint(), url_prefix='/admin')
+    
+    # Per-worker lifecycle: load modules and warm upstream connections before reporting ready
+    app.register_blueprint(create_health_blueprint(), url_prefix='/healthz')
+    worker_resources.add_prepare_hook(registry.load_all)
+    # SIGHUP re-reads SETTINGS_FILE (gunicorn workers install it in post_worker_init)
+    runtime_settings.install_signal_handler()
+    if config_class.WARMUP_ON_START:
+        worker_resources.start_warmup()
+    elif not config_class.WARMUP_ENABLED:
+        worker_resources.mark_ready()
     
     return app
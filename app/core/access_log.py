@@ -0,0 +1,249 @@
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from flask import Flask, Response, g, has_request_context, request
+from app.core.lifecycle import worker_resources
+from app.core.metrics import metrics
+from app.core.settings import runtime_settings
+from config import Config
+
+REDACTED = '[REDACTED]'
+# Header, query and body keys whose values are never logged (compared lowercased, '-' as '_')
+SENSITIVE_KEYS = frozenset({
+    'authorization', 'proxy_authorization', 'cookie', 'set_cookie', 'x_callback_token', 'x_admin_token',
+    'api_key', 'apikey', 'password', 'secret', 'token', 'access_token', 'token_id',
+    'card_number', 'account_number', 'cvv', 'cvn', 'card_cvn', 'expiry_month', 'expiry_year',
+})
+# Card numbers (PANs) anywhere in a string; all but the last four digits are masked
+PAN_PATTERN = re.compile(r'\b(?:\d[ -]?){12,18}\d\b')
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,128}$')
+TRACEPARENT_PATTERN = re.compile(r'^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-[0-9a-f]{2}$')
+
+def _mask_pan(match: re.Match) -> str:
+    digits = re.sub(r'\D', '', match.group())
+    return '*' * (len(digits) - 4) + digits[-4:]
+
+def redact(value: Any) -> Any:
+    """Copy of value with secrets and card numbers removed"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower().replace('-', '_') in SENSITIVE_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return PAN_PATTERN.sub(_mask_pan, value)
+    return value
+
+def redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.query:
+        return PAN_PATTERN.sub(_mask_pan, url)
+    query = '&'.join(f'{key}={value}' for key, value in redact(dict(parse_qsl(parts.query))).items())
+    return urlunsplit(parts._replace(query=query, path=PAN_PATTERN.sub(_mask_pan, parts.path)))
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request/trace IDs and record fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key in ('request_id', 'trace_id'):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        entry.update(getattr(record, 'fields', None) or {})
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+class BoundedQueueHandler(QueueHandler):
+    """Hands records to the writer thread; drops and counts them when the queue is full instead of blocking"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Request context only exists on the calling thread, not in the writer
+        if has_request_context() and not getattr(record, 'request_id', None):
+            record.request_id = g.get('request_id')
+            record.trace_id = g.get('trace_id')
+        return super().prepare(record)
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc('logging.dropped')
+
+class AccessLog:
+    """Per-worker JSON lines writer: callers enqueue, a background thread does the I/O.
+
+    Records are sampled per route (first matching glob in sample_rates,
+    else default_rate). Requests slower than slow_ms and server errors are
+    always written.
+    """
+
+    def __init__(self, path: Optional[str] = None, queue_size: int = 10000, default_rate: float = 1.0,
+                 sample_rates: Optional[Dict[str, float]] = None, slow_ms: float = 1000.0,
+                 log_headers: bool = False, capture_app_logs: bool = False):
+        self.default_rate = default_rate
+        self.sample_rates = sample_rates or {}
+        self.slow_ms = slow_ms
+        self.log_headers = log_headers
+        self.target = logging.FileHandler(path) if path else logging.StreamHandler(sys.stdout)
+        self.target.setFormatter(JsonFormatter())
+        self.handler = BoundedQueueHandler(queue.Queue(queue_size))
+        self.listener = QueueListener(self.handler.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+        self.closed = False
+        self.root_handler = None
+        if capture_app_logs:
+            self._capture_app_logs()
+
+    def _capture_app_logs(self):
+        """Send application logs through the same queue, replacing a previous worker's handler"""
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, BoundedQueueHandler):
+                root.removeHandler(handler)
+        self.root_handler = BoundedQueueHandler(self.handler.queue)
+        root.addHandler(self.root_handler)
+
+    def sample_rate(self, route: str) -> float:
+        for pattern, rate in self.sample_rates.items():
+            if fnmatch(route, pattern):
+                return rate
+        return self.default_rate
+
+    def sampled(self, route: str) -> bool:
+        rate = self.sample_rate(route)
+        return rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+    def write(self, event: str, fields: Dict[str, Any], request_id: Optional[str] = None,
+              trace_id: Optional[str] = None):
+        record = logging.makeLogRecord({
+            'name': 'gateway.access', 'levelno': logging.INFO, 'levelname': 'INFO',
+            'msg': event, 'fields': fields, 'request_id': request_id, 'trace_id': trace_id,
+        })
+        self.handler.handle(record)
+
+    def close(self):
+        """Flush queued records and stop the writer thread"""
+        if self.root_handler is not None:
+            logging.getLogger().removeHandler(self.root_handler)
+        if not self.closed:
+            self.closed = True
+            self.listener.stop()
+            self.target.close()
+
+runtime_settings.define('access_log.sample_rate', Config.ACCESS_LOG_SAMPLE_RATE, float, 0, 1,
+                        description='Share of requests logged when no per-route rate matches')
+runtime_settings.define('access_log.slow_ms', Config.ACCESS_LOG_SLOW_MS, float, 0,
+                        description='Requests at least this slow are always logged')
+
+def create_access_log() -> AccessLog:
+    return AccessLog(
+        path=Config.ACCESS_LOG_FILE,
+        queue_size=Config.ACCESS_LOG_QUEUE_SIZE,
+        default_rate=runtime_settings.get('access_log.sample_rate'),
+        sample_rates=Config.ACCESS_LOG_SAMPLE_RATES,
+        slow_ms=runtime_settings.get('access_log.slow_ms'),
+        log_headers=Config.ACCESS_LOG_HEADERS,
+        capture_app_logs=Config.LOG_JSON
+    )
+
+# One writer thread per worker process, started after fork
+worker_resources.register('access_log', create_access_log, close=lambda log: log.close())
+access_log = worker_resources.proxy('access_log')
+
+def _apply_settings(changed: Dict[str, Any]):
+    log = worker_resources.peek('access_log')
+    if log is None:
+        return
+    if 'access_log.sample_rate' in changed:
+        log.default_rate = changed['access_log.sample_rate']
+    if 'access_log.slow_ms' in changed:
+        log.slow_ms = changed['access_log.slow_ms']
+
+runtime_settings.subscribe(_apply_settings)
+
+def _begin_request():
+    request_id = request.headers.get('X-Request-ID', '')
+    g.request_id = request_id if REQUEST_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+    traceparent = TRACEPARENT_PATTERN.match(request.headers.get('traceparent', ''))
+    g.trace_id = traceparent.group(1) if traceparent else uuid.uuid4().hex
+    g.access_log_started = time.perf_counter()
+    g.access_log_sampled = access_log.sampled(request.url_rule.rule if request.url_rule else request.path)
+
+def _log_request(response: Response) -> Response:
+    if 'request_id' not in g:
+        return response
+    response.headers['X-Request-ID'] = g.request_id
+    response.headers['X-Trace-ID'] = g.trace_id
+    duration_ms = (time.perf_counter() - g.access_log_started) * 1000
+    slow = duration_ms >= access_log.slow_ms
+    if not (g.access_log_sampled or slow or response.status_code >= 500):
+        return response
+
+    fields = {
+        'type': 'request',
+        'method': request.method,
+        'path': redact(request.path),
+        'route': request.url_rule.rule if request.url_rule else None,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 2),
+        'bytes': response.calculate_content_length(),
+        'remote_addr': request.remote_addr,
+        'user_agent': request.user_agent.string or None,
+    }
+    if request.args:
+        fields['query'] = redact(request.args.to_dict())
+    if access_log.log_headers:
+        fields['headers'] = redact(dict(request.headers))
+    if g.get('buffered_bytes'):
+        fields['buffered_bytes'] = g.buffered_bytes
+    if slow:
+        fields['slow'] = True
+    access_log.write('request', fields, g.request_id, g.trace_id)
+    return response
+
+def log_upstream(service: str, method: str, url: str, status: Optional[int], duration_ms: float,
+                 error: Optional[str] = None):
+    """Access log record for an upstream call; follows the sampling decision of the current request"""
+    if not Config.ACCESS_LOG_ENABLED:
+        return
+    in_request = has_request_context() and 'request_id' in g
+    sampled = g.access_log_sampled if in_request else access_log.sampled(f'upstream:{service}')
+    slow = duration_ms >= access_log.slow_ms
+    if not (sampled or slow or error or (status or 0) >= 500):
+        return
+
+    fields = {
+        'type': 'upstream',
+        'service': service,
+        'method': method,
+        'url': redact_url(url),
+        'status': status,
+        'duration_ms': round(duration_ms, 2),
+    }
+    if error:
+        fields['error'] = error
+    if slow:
+        fields['slow'] = True
+    access_log.write('upstream', fields, g.request_id if in_request else None, g.trace_id if in_request else None)
+
+def init_access_log(app: Flask):
+    if app.config.get('ACCESS_LOG_ENABLED', True):
+        app.before_request(_begin_request)
+        app.after_request(_log_request)
@@ -0,0 +1,161 @@
+from functools import wraps
+import hmac
+import os
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.core.faults import fault_injector
+from app.core.metrics import metrics
+from app.core.profiling import cpu_profiler, memory_profiler, profile_status, route_timings
+from app.core.settings import runtime_settings
+from app.core.shadow import shadow_report
+from app.core.validation import RequestValidationException
+from app.core.websocket import websocket_manager
+
+def admin_required(f):
+    """Require the X-Admin-Token header to match ADMIN_TOKEN; admin routes are hidden when unset"""
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        token = current_app.config.get('ADMIN_TOKEN')
+        if not token:
+            return jsonify({'error': 'Not found'}), 404
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token):
+            return jsonify({'error': 'Unauthorized'}), 401
+        return f(*args, **kwargs)
+    return wrapped
+
+def create_admin_blueprint() -> Blueprint:
+    """Operational endpoints for metrics and runtime controls"""
+    blueprint = Blueprint('admin', __name__)
+
+    @blueprint.route('/metrics', methods=['GET'])
+    @admin_required
+    def get_metrics():
+        return jsonify(metrics.snapshot(prefix=request.args.get('prefix', ''))), 200
+
+    # Profiling acts on the worker process that serves the admin request (see 'pid')
+    @blueprint.route('/profile', methods=['GET'])
+    @admin_required
+    def get_profile_status():
+        return jsonify(profile_status()), 200
+
+    @blueprint.route('/profile/cpu', methods=['GET'])
+    @admin_required
+    def profile_cpu():
+        cpu_profiler.max_seconds = current_app.config.get('PROFILE_MAX_SECONDS', 60)
+        stacks = cpu_profiler.profile(
+            request.args.get('seconds', 10, type=float),
+            request.args.get('interval_ms', 5, type=float) / 1000
+        )
+        if stacks is None:
+            return jsonify({'error': 'A CPU profile is already running'}), 409
+        return Response(stacks, mimetype='text/plain'), 200
+
+    @blueprint.route('/profile/memory/start', methods=['POST'])
+    @admin_required
+    def start_memory_profile():
+        memory_profiler.start(request.args.get('frames', 1, type=int))
+        return jsonify(profile_status()), 200
+
+    @blueprint.route('/profile/memory/snapshot', methods=['POST'])
+    @admin_required
+    def snapshot_memory_profile():
+        if not memory_profiler.tracing:
+            return jsonify({'error': 'tracemalloc is not running'}), 400
+        return jsonify(memory_profiler.snapshot(
+            limit=request.args.get('limit', 25, type=int),
+            key_type='traceback' if request.args.get('group') == 'traceback' else 'lineno'
+        )), 200
+
+    @blueprint.route('/profile/memory/stop', methods=['POST'])
+    @admin_required
+    def stop_memory_profile():
+        memory_profiler.stop()
+        return jsonify(profile_status()), 200
+
+    @blueprint.route('/profile/timings', methods=['GET'])
+    @admin_required
+    def get_route_timings():
+        return jsonify(route_timings.report()), 200
+
+    @blueprint.route('/profile/timings', methods=['POST'])
+    @admin_required
+    def set_route_timings():
+        route_timings.enabled = request.args.get('enabled', 'true').lower() == 'true'
+        if request.args.get('reset', 'false').lower() == 'true':
+            metrics.reset_prefix(route_timings.prefix + '.')
+        return jsonify(profile_status()), 200
+
+    # Runtime settings: a change is written to SETTINGS_FILE, which every worker watches
+    @blueprint.route('/settings', methods=['GET'])
+    @admin_required
+    def get_settings():
+        return jsonify({'pid': os.getpid(), **runtime_settings.describe()}), 200
+
+    @blueprint.route('/settings', methods=['POST'])
+    @admin_required
+    def update_settings():
+        try:
+            changed = runtime_settings.update_file(request.get_json(silent=True) or {})
+        except RequestValidationException as e:
+            return jsonify({'error': str(e), 'details': e.errors}), 400
+        return jsonify({
+            'changed': changed,
+            # Without a settings file the change only reaches the worker serving this request
+            'scope': 'all_workers' if runtime_settings.path else 'this_worker',
+            'version': runtime_settings.version,
+        }), 200
+
+    @blueprint.route('/settings/reload', methods=['POST'])
+    @admin_required
+    def reload_settings():
+        runtime_settings.request_reload()
+        reloaded = runtime_settings.reload()
+        status = 400 if runtime_settings.last_error else 200
+        return jsonify({'reloaded': reloaded, **runtime_settings.describe()}), status
+
+    # Fault injection rules are stored as the 'faults.rules' runtime setting
+    @blueprint.route('/faults', methods=['GET', 'POST', 'DELETE'])
+    @admin_required
+    def faults():
+        if not fault_injector.enabled:
+            return jsonify({'error': 'Fault injection is disabled (FAULT_INJECTION_ENABLED)'}), 404
+        if request.method != 'GET':
+            body = request.get_json(silent=True) if request.method == 'POST' else []
+            rules = body.get('rules') if isinstance(body, dict) else body
+            try:
+                runtime_settings.update_file({'faults.rules': rules if rules is not None else []})
+            except RequestValidationException as e:
+                return jsonify({'error': str(e), 'details': e.errors}), 400
+        return jsonify({
+            'pid': os.getpid(),
+            'scope': 'all_workers' if runtime_settings.path else 'this_worker',
+            **fault_injector.describe(),
+        }), 200
+
+    # WebSocket connections and room subscriptions held by this worker
+    @blueprint.route('/websocket', methods=['GET'])
+    @admin_required
+    def get_websocket_stats():
+        return jsonify({
+            'pid': os.getpid(),
+            **websocket_manager.rooms.stats(top=request.args.get('top', 10, type=int)),
+            'auth': websocket_manager.auth.stats(),
+        }), 200
+
+    @blueprint.route('/websocket/token', methods=['POST'])
+    @admin_required
+    def issue_websocket_token():
+        """Sign claims (sub, account, customer_id, payments, jobs, scopes) into a connection token"""
+        claims = request.get_json(silent=True)
+        if not isinstance(claims, dict) or not claims.get('sub'):
+            return jsonify({'error': "Claims must be a JSON object with 'sub'"}), 400
+        if not websocket_manager.auth.configured:
+            return jsonify({'error': 'WS_AUTH_SECRET is not configured'}), 503
+        return jsonify({'token': websocket_manager.auth.issue(claims), 'expires_in': websocket_manager.auth.max_age}), 200
+
+    # Shadow traffic comparisons recorded by this worker's clients
+    @blueprint.route('/shadow', methods=['GET'])
+    @admin_required
+    def get_shadow():
+        return jsonify({'pid': os.getpid(), 'mirrors': shadow_report()}), 200
+
+    return blueprint
@@ -0,0 +1,174 @@
+from fnmatch import fnmatch
+from typing import Any, Callable, Dict, List, Optional
+import copy
+import threading
+import time
+import logging
+from app.core.cache import LRUCache
+from app.core.exceptions import NotFoundException
+from app.core.metrics import metrics
+from app.core.resilience import CircuitBreaker
+from app.core.third_party import ThirdPartyAPI
+
+logger = logging.getLogger(__name__)
+
+class ClientPool:
+    """API clients keyed by account, each with its own connection pool, rate budget and circuit breaker.
+
+    Accounts are chosen explicitly (e.g. from a header), by the account that
+    created a resource, by routing rules on the request path, or spread by
+    weight across accounts that have budget left and a closed circuit. Calls
+    on an existing resource whose owner is unknown go to the default account,
+    since another account would not find it.
+    reload() swaps the account set at runtime: unchanged clients are kept,
+    removed or changed ones are closed after a grace period.
+    """
+
+    def __init__(self, factory: Callable[[str, Dict[str, Any]], ThirdPartyAPI],
+                 accounts: Optional[Dict[str, Dict[str, Any]]] = None, default: Optional[str] = None,
+                 rules: Optional[List[Dict[str, Any]]] = None, owner_cache_size: int = 10000,
+                 drain_seconds: float = 60.0):
+        self.factory = factory
+        self.drain_seconds = drain_seconds
+        self._lock = threading.RLock()
+        self._clients: Dict[str, ThirdPartyAPI] = {}
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        self._current_weights: Dict[str, float] = {}
+        self._owners = LRUCache(owner_cache_size)
+        self._last_stats: Dict[str, tuple] = {}
+        self.default: Optional[str] = None
+        self.rules: List[Dict[str, Any]] = []
+        self.reload(accounts or {}, default, rules)
+
+    @property
+    def accounts(self) -> List[str]:
+        return list(self._clients)
+
+    def reload(self, accounts: Dict[str, Dict[str, Any]], default: Optional[str] = None,
+               rules: Optional[List[Dict[str, Any]]] = None):
+        """Replace the account set; only new or changed accounts get a new client"""
+        retired = []
+        with self._lock:
+            clients = {}
+            for name, settings in accounts.items():
+                current = self._clients.get(name)
+                if current is not None and self._settings.get(name) == settings:
+                    clients[name] = current
+                    continue
+                clients[name] = self.factory(name, settings)
+                if current is not None:
+                    retired.append(current)
+            retired.extend(client for name, client in self._clients.items() if name not in accounts)
+
+            self._clients = clients
+            self._settings = copy.deepcopy(accounts)
+            self._current_weights = {name: self._current_weights.get(name, 0.0) for name in clients}
+            self.default = default if default in clients else next(iter(clients), None)
+            self.rules = [rule for rule in (rules or []) if rule.get('account') in clients]
+
+        for client in retired:
+            self._retire(client)
+        logger.info(f"Client pool loaded accounts: {', '.join(self._clients) or 'none'}")
+
+    def _retire(self, client: ThirdPartyAPI):
+        # Let in-flight calls on the old client finish before closing its connection pool
+        timer = threading.Timer(self.drain_seconds, client.close)
+        timer.daemon = True
+        timer.start()
+
+    def get(self, name: Optional[str] = None) -> ThirdPartyAPI:
+        name = name or self.default
+        client = self._clients.get(name) if name else None
+        if client is None:
+            raise NotFoundException(f"Unknown account '{name}'")
+        return client
+
+    def select(self, account: Optional[str] = None, resource_id: Optional[str] = None,
+               path: str = '', method: str = 'GET') -> str:
+        """Pick the account for a call: explicit, resource owner, routing rule, then the default account
+        for calls on a resource and a weighted spread for the rest"""
+        if account:
+            self.get(account)
+            return account
+        if resource_id:
+            owner = self.owner_of(resource_id)
+            if owner in self._clients:
+                return owner
+        for rule in self.rules:
+            if fnmatch(path, rule.get('path', '*')) and method in rule.get('methods', [method]):
+                return rule['account']
+        if resource_id:
+            return self.default
+        return self._spread() or self.default
+
+    def _spread(self) -> Optional[str]:
+        """Smooth weighted round robin over accounts with budget left and a closed circuit"""
+        with self._lock:
+            best, total = None, 0.0
+            for name, client in self._clients.items():
+                if not self._has_capacity(client):
+                    continue
+                weight = self._settings[name].get('weight', 1)
+                self._current_weights[name] += weight
+                total += weight
+                if best is None or self._current_weights[name] > self._current_weights[best]:
+                    best = name
+            if best is not None:
+                self._current_weights[best] -= total
+            return best
+
+    @staticmethod
+    def _has_capacity(client: ThirdPartyAPI) -> bool:
+        limiter = getattr(client, 'rate_limiter', None)
+        breaker = getattr(client, 'circuit_breaker', None)
+        return ((limiter is None or limiter.available >= 1)
+                and (breaker is None or breaker.state != CircuitBreaker.OPEN))
+
+    def remember(self, resource_id: str, account: str):
+        """Record which account owns a resource so later reads use the same credentials"""
+        self._owners.set(resource_id, account)
+
+    def owner_of(self, resource_id: str) -> Optional[str]:
+        return self._owners.get(resource_id)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-account throughput (since the previous call), latency, remaining budget and circuit state"""
+        result = {}
+        now = time.monotonic()
+        for name, client in list(self._clients.items()):
+            snapshot = metrics.snapshot(client.metrics_prefix + '.')
+            counters = snapshot['counters']
+            requests = counters.get(f'{client.metrics_prefix}.requests', 0)
+            last_time, last_requests = self._last_stats.get(name, (None, 0))
+            self._last_stats[name] = (now, requests)
+            result[name] = {
+                'requests': requests,
+                'requests_per_second': round((requests - last_requests) / (now - last_time), 2) if last_time and now > last_time else None,
+                'errors': counters.get(f'{client.metrics_prefix}.errors', 0),
+                'rejected': {key.rsplit('.', 1)[-1]: value for key, value in counters.items() if '.rejected.' in key},
+                'latency_ms': snapshot['histograms'].get(f'{client.metrics_prefix}.latency_ms'),
+                'rate_tokens': round(client.rate_limiter.available, 2) if client.rate_limiter else None,
+                'circuit': client.circuit_breaker.state if client.circuit_breaker else None,
+            }
+        return result
+
+    def reconfigure(self, updates: Dict[str, Any]):
+        """Apply changed service-wide settings to every client, except where an account sets its own"""
+        with self._lock:
+            clients = [(client, self._settings.get(name, {})) for name, client in self._clients.items()]
+        for client, settings in clients:
+            client.reconfigure({key: value for key, value in updates.items() if key not in settings})
+
+    def warmup(self):
+        for name, client in list(self._clients.items()):
+            try:
+                client.warmup()
+            except Exception as e:
+                logger.warning(f"Warmup of account '{name}' failed: {str(e)}")
+
+    def close(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients = {}
+        for client in clients:
+            client.close()
@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import re
+
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+# :id, {id}, {{payment-method-id}}
+_PARAM = re.compile(r'^(?::(?P<colon>[\w-]+)|\{\{?(?P<brace>[\w-]+)\}?\})$')
+_VERSION = re.compile(r'^v\d+$')
+_WORD = re.compile(r'^[a-z_]+$')
+_TEMPLATE = re.compile(r'\{\{[^}]*\}\}')
+
+@dataclass
+class EndpointSpec:
+    """One upstream endpoint read from a Postman collection; requests with the same method and path shape merge"""
+    name: str
+    method: str
+    path: str
+    params: Tuple[str, ...]
+    title: str
+    # Top-level body fields seen in the collection's examples, with their Python types
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def schema_class(self) -> str:
+        return ''.join(part.capitalize() for part in self.name.split('_')) + 'Request'
+
+def _param_name(value: str) -> str:
+    return value.replace('-', '_')
+
+def _normalize_path(segments: List[str]) -> Tuple[str, Tuple[str, ...], List[str], Optional[str]]:
+    """(path with {param} placeholders, params, static words, API version).
+
+    Example IDs hard-coded in the collection (anything that isn't a lowercase
+    word, e.g. qr_61cb3576-...) become an {id} parameter, and key=value
+    segments (reference={reference}) keep the key and parameterize the value.
+    """
+    parts, params, words, version = [], [], [], None
+    for segment in segments:
+        if not segment:
+            continue
+        match = _PARAM.match(segment)
+        if match:
+            param = _param_name(match.group('colon') or match.group('brace'))
+        elif _VERSION.match(segment):
+            version = segment
+            parts.append(segment)
+            continue
+        elif '=' in segment:
+            key = segment.split('=', 1)[0]
+            param = _param_name(key)
+            parts.append(f'{key}={{{param}}}')
+            params.append(param)
+            words.append(None)
+            continue
+        elif _WORD.match(segment):
+            parts.append(segment)
+            words.append(segment)
+            continue
+        else:
+            param = 'id'
+        parts.append(f'{{{param}}}')
+        params.append(param)
+        words.append(None)
+    return '/' + '/'.join(parts), tuple(params), words, version
+
+def _endpoint_name(method: str, words: List[Optional[str]]) -> str:
+    """get_/list_/create_/update_/delete_ plus the path's static words; POSTs to a non-plural
+    sub-resource are actions named after it (/payment_methods/{id}/expire -> expire_payment_methods)"""
+    static = [word for word in words if word]
+    last = words[-1] if words else None
+    if method == 'POST' and last and len(static) > 1 and not last.endswith('s'):
+        return '_'.join([last] + static[:-1])
+    if method == 'GET':
+        verb = 'list' if last and last.endswith('s') else 'get'
+    else:
+        verb = {'POST': 'create', 'PUT': 'update', 'PATCH': 'update', 'DELETE': 'delete'}[method]
+    return '_'.join([verb] + static)
+
+def _python_type(values: List[Any]) -> str:
+    kinds = {type(value) for value in values if value is not None}
+    if kinds == {str}:
+        return 'str'
+    if kinds == {bool}:
+        return 'bool'
+    if kinds and kinds <= {int, float}:
+        return 'Union[int, float]'
+    if kinds == {list}:
+        return 'List[Any]'
+    if kinds == {dict}:
+        return 'Dict[str, Any]'
+    return 'Any'
+
+def _example_body(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    body = request.get('body') or {}
+    if body.get('mode') != 'raw' or not body.get('raw', '').strip():
+        return None
+    try:
+        # Postman variables: quoted ones stay strings, bare ones become null (type unknown)
+        example = json.loads(_TEMPLATE.sub('null', body['raw']))
+    except ValueError:
+        return None
+    return example if isinstance(example, dict) else None
+
+def _requests(items: List[Dict[str, Any]], folder: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Dict[str, Any]]]:
+    for item in items:
+        if 'item' in item:
+            yield from _requests(item['item'], folder + (item.get('name', ''),))
+        elif 'request' in item:
+            yield folder + (item.get('name', ''),), item['request']
+
+def read_collection(path: str, hosts: Tuple[str, ...]) -> List[EndpointSpec]:
+    """Endpoints of a Postman v2.1 collection whose host is one of hosts ('api.xendit.co', '{{url}}').
+
+    Sample notifications and other requests to placeholder hosts are skipped.
+    """
+    with open(path) as f:
+        collection = json.load(f)
+
+    specs: Dict[Tuple[str, str], EndpointSpec] = {}
+    examples: Dict[Tuple[str, str], Dict[str, List[Any]]] = {}
+    versions: Dict[Tuple[str, str], Optional[str]] = {}
+    for names, request in _requests(collection.get('item', [])):
+        url = request.get('url')
+        method = (request.get('method') or '').upper()
+        if not isinstance(url, dict) or method not in HTTP_METHODS:
+            continue
+        if '.'.join(url.get('host') or []) not in hosts:
+            continue
+        path, params, words, version = _normalize_path(url.get('path') or [])
+        key = (method, re.sub(r'\{[^}]*\}', '{}', path))
+        if key not in specs:
+            specs[key] = EndpointSpec(_endpoint_name(method, words), method, path, params, names[-1].strip())
+            examples[key] = {}
+            versions[key] = version
+        body = _example_body(request) if method in ('POST', 'PUT', 'PATCH') else None
+        for field_name, value in (body or {}).items():
+            examples[key].setdefault(field_name, []).append(value)
+
+    # /payouts and /v2/payouts both read as create_payouts; suffix the API version on clashes
+    by_name: Dict[str, List[Tuple[str, str]]] = {}
+    for key, spec in specs.items():
+        by_name.setdefault(spec.name, []).append(key)
+    for name, keys in by_name.items():
+        if len(keys) > 1:
+            for key in keys:
+                specs[key].name = f"{name}_{versions[key] or 'v1'}"
+
+    for key, spec in specs.items():
+        spec.fields = {name: _python_type(values) for name, values in sorted(examples[key].items())}
+    return sorted(specs.values(), key=lambda spec: spec.name)
+
+def render_endpoints(specs: List[EndpointSpec], source: str, command: str, schema_prefix: str) -> str:
+    """Python module with the ENDPOINTS dispatch table"""
+    lines = [
+        f'"""Endpoint table generated from {source}.',
+        '',
+        f'Do not edit by hand; regenerate with `{command}`.',
+        '"""',
+        'from app.core.dispatch import Endpoint',
+        '',
+        'ENDPOINTS = {',
+    ]
+    for spec in specs:
+        args = [repr(spec.method), repr(spec.path)]
+        if spec.params:
+            args.append(f'params={spec.params!r}')
+        if spec.fields:
+            args.append(f"schema={schema_prefix + spec.name!r}")
+        # Lookups by ID are latency-critical and idempotent, like the hand-written get_* methods
+        if spec.method == 'GET' and spec.path.endswith('}'):
+            args.append('hedge=True')
+        lines.append(f'    # {spec.title}')
+        lines.append(f"    {spec.name!r}: Endpoint({', '.join(args)}),")
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+def render_schemas(specs: List[EndpointSpec], source: str, command: str, schema_prefix: str) -> str:
+    """Python module with a request model skeleton per endpoint that has example bodies.
+
+    Every field is optional and unknown fields are forwarded (extra='allow'),
+    so the skeletons check types without rejecting requests the examples don't cover.
+    """
+    lines = [
+        f'"""Request schema skeletons generated from {source}.',
+        '',
+        f'Do not edit by hand; regenerate with `{command}`.',
+        '"""',
+        'from typing import Any, Dict, List, Optional, Union',
+        'from pydantic import BaseModel',
+        'from app.core.validation import request_schemas',
+    ]
+    with_fields = [spec for spec in specs if spec.fields]
+    for spec in with_fields:
+        lines += ['', f'class {spec.schema_class}(BaseModel):']
+        lines += [f'    {name}: Optional[{annotation}] = None' for name, annotation in spec.fields.items()]
+    lines.append('')
+    for spec in with_fields:
+        lines.append(f"request_schemas.register({schema_prefix + spec.name!r}, {spec.schema_class}, extra='allow')")
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,53 @@
+from typing import Optional
+import gzip
+import hashlib
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=current_app.config.get('BROTLI_QUALITY', 4))
+    return gzip.compress(body, compresslevel=current_app.config.get('GZIP_LEVEL', 6))
+
+def _negotiate_encoding(response: Response, size: int) -> Optional[str]:
+    if size < current_app.config.get('COMPRESSION_MIN_SIZE', 1024) or 'Content-Encoding' in response.headers:
+        return None
+    if not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+        return None
+    offers = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offers)
+
+def compress_and_tag(response: Response) -> Response:
+    """Add a strong ETag (answering If-None-Match with 304) and compress per Accept-Encoding"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or request.method not in ('GET', 'HEAD')):
+        return response
+
+    config = current_app.config
+    body = response.get_data()
+    encoding = None
+    if config.get('COMPRESSION_ENABLED', True):
+        encoding = _negotiate_encoding(response, len(body))
+        response.vary.add('Accept-Encoding')
+
+    if config.get('ETAG_ENABLED', True) and 'ETag' not in response.headers:
+        # Each content coding is a distinct representation, so it gets its own strong ETag
+        etag = hashlib.sha1(body).hexdigest()
+        response.set_etag(f'{etag}-{encoding}' if encoding else etag)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding:
+        response.set_data(_compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def init_compression(app: Flask):
+    app.after_request(compress_and_tag)
@@ -1,15 +1,25 @@
+from functools import lru_cache
 from typing import Any, Dict
-from flask import jsonify
+from flask import Response, jsonify
+import json
 from app.core.dto import ResponseDTO
 from app.core.exceptions import ApplicationException
 
+@lru_cache(maxsize=256)
+def _error_body(message: str) -> bytes:
+    # Error envelopes never carry data, so the whole body is reused per message
+    return b'{"status":"error","message":%s,"data":{}}' % json.dumps(message).encode()
+
 class BaseController:
     def __init__(self):
         pass
 
     def _create_response(self, response: ResponseDTO) -> tuple[Dict[str, Any], int]:
+        outcome = 'success' if response.status < 400 else 'error'
+        if outcome == 'error' and not response.data:
+            return Response(_error_body(response.message), mimetype='application/json'), response.status
         return jsonify({
-            'status': 'success' if response.status < 400 else 'error',
+            'status': outcome,
             'message': response.message,
             'data': response.data
         }), response.status
@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+from flask import Blueprint, Response, jsonify, request
+from app.core.exceptions import ThirdPartyAPIException
+from app.core.validation import request_schemas
+
+BODY_METHODS = frozenset({'POST', 'PUT', 'PATCH'})
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """One upstream endpoint of a generated table; path has {param} placeholders"""
+    method: str
+    path: str
+    params: Tuple[str, ...] = ()
+    # request_schemas name validating the body, if the contract has an example body
+    schema: Optional[str] = None
+    hedge: bool = False
+
+    @property
+    def rule(self) -> str:
+        """Flask URL rule mirroring the upstream path"""
+        rule = self.path
+        for param in self.params:
+            rule = rule.replace(f'{{{param}}}', f'<{param}>')
+        return rule
+
+def register_endpoint_routes(bp: Blueprint, endpoints: Dict[str, Endpoint], client: Callable[[], Any],
+                             exclude: Collection[str] = ()):
+    """Serve every table entry through one view: validate the body, call client().call(name, ...) and
+    pass the upstream JSON through undecoded. Names in exclude are served by hand-written routes."""
+
+    def dispatch(_endpoint: str, **path_params):
+        endpoint = endpoints[_endpoint]
+        data = None
+        if endpoint.method in BODY_METHODS:
+            data = request.get_json(silent=True)
+            if endpoint.schema:
+                data = request_schemas.validate(endpoint.schema, data)
+        try:
+            body = client().call(
+                _endpoint, path_params, data=data, params=request.args.to_dict(flat=False) or None, raw=True
+            )
+        except ThirdPartyAPIException as e:
+            return jsonify({'error': str(e)}), 400
+        return Response(body, status=201 if _endpoint.startswith('create_') else 200, mimetype='application/json')
+
+    for name, endpoint in endpoints.items():
+        if name not in exclude:
+            bp.add_url_rule(
+                endpoint.rule, endpoint=f'contract_{name}', view_func=dispatch,
+                methods=[endpoint.method], defaults={'_endpoint': name}
+            )
@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from typing import Dict, Any
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RequestDTO:
     data: Dict[str, Any]
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ResponseDTO:
     status: int
     data: Dict[str, Any]
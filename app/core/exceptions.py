@@ -19,3 +19,19 @@ class ThirdPartyAPIException(ApplicationException):
     def __init__(self, message: str, status_code: int = 500, raw_error: Exception = None):
         super().__init__(message, status_code)
         self.raw_error = raw_error
+
+class RateLimitExceededException(ThirdPartyAPIException):
+    def __init__(self, message: str = "Upstream rate limit exceeded"):
+        super().__init__(message, status_code=429)
+
+class CircuitOpenException(ThirdPartyAPIException):
+    def __init__(self, message: str = "Upstream temporarily unavailable"):
+        super().__init__(message, status_code=503)
+
+class ResponseTooLargeException(ThirdPartyAPIException):
+    def __init__(self, message: str = "Upstream response too large"):
+        super().__init__(message, status_code=502)
+
+class JobLeaseLostException(ApplicationException):
+    def __init__(self, message: str = "Job lease was taken over by another worker"):
+        super().__init__(message, status_code=409)
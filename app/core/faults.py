@@ -0,0 +1,209 @@
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlsplit
+import json
+import math
+import random
+import time
+import requests
+import logging
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from app.core.metrics import metrics
+from app.core.settings import runtime_settings
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# z-score of the 99th percentile, for lognormal latency given as median and p99
+Z_99 = 2.3263
+
+class LatencyFault(BaseModel):
+    """Added latency: fixed (ms), uniform (min_ms..max_ms), normal (mean_ms, stddev_ms) or lognormal (median_ms, p99_ms)"""
+    model_config = ConfigDict(extra='forbid')
+
+    distribution: Literal['fixed', 'uniform', 'normal', 'lognormal'] = 'fixed'
+    ms: float = Field(0, ge=0)
+    min_ms: float = Field(0, ge=0)
+    max_ms: float = Field(0, ge=0)
+    mean_ms: float = Field(0, ge=0)
+    stddev_ms: float = Field(0, ge=0)
+    median_ms: float = Field(0, ge=0)
+    p99_ms: float = Field(0, ge=0)
+
+    @model_validator(mode='after')
+    def check_bounds(self):
+        if self.distribution == 'uniform' and self.max_ms < self.min_ms:
+            raise ValueError('max_ms must be >= min_ms')
+        if self.distribution == 'lognormal' and (self.median_ms <= 0 or self.p99_ms < self.median_ms):
+            raise ValueError('lognormal needs median_ms > 0 and p99_ms >= median_ms')
+        return self
+
+    def sample_ms(self) -> float:
+        if self.distribution == 'uniform':
+            return random.uniform(self.min_ms, self.max_ms)
+        if self.distribution == 'normal':
+            return max(0.0, random.gauss(self.mean_ms, self.stddev_ms))
+        if self.distribution == 'lognormal':
+            sigma = math.log(self.p99_ms / self.median_ms) / Z_99
+            return random.lognormvariate(math.log(self.median_ms), sigma)
+        return self.ms
+
+class FaultRule(BaseModel):
+    """Faults for calls matching service/method/path globs, applied to `probability` of them.
+
+    Latency is added first; then the call either fails with a connection
+    reset, gets a synthetic `status` response without reaching upstream, or
+    goes upstream with its body delivered at `body_bytes_per_second`.
+    """
+    model_config = ConfigDict(extra='forbid')
+
+    service: str = '*'
+    method: str = '*'
+    path: str = '*'
+    probability: float = Field(1.0, ge=0, le=1)
+    latency: Optional[LatencyFault] = None
+    status: Optional[int] = Field(None, ge=400, le=599)
+    reset: bool = False
+    body_bytes_per_second: Optional[float] = Field(None, gt=0)
+
+    def matches(self, service: str, method: str, path: str) -> bool:
+        return (
+            fnmatch(service, self.service) and (self.method == '*' or self.method.upper() == method)
+            and fnmatch(path, self.path)
+        )
+
+RULES_ADAPTER = TypeAdapter(List[FaultRule])
+
+def parse_rules(value: Any) -> List[Dict[str, Any]]:
+    """Validate fault rules (a list, or its JSON) into plain dicts; pydantic errors are ValueErrors"""
+    if isinstance(value, str):
+        value = json.loads(value or '[]')
+    return [rule.model_dump(exclude_defaults=True) for rule in RULES_ADAPTER.validate_python(value)]
+
+class FaultInjector:
+    """Active fault rules for this process; the first matching rule applies"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.rules: Tuple[FaultRule, ...] = ()
+
+    def set_rules(self, rules: List[Dict[str, Any]]):
+        self.rules = tuple(RULES_ADAPTER.validate_python(rules))
+        if self.rules:
+            logger.warning(f"Fault injection active with {len(self.rules)} rule(s)")
+
+    def match(self, service: str, method: str, url: str) -> Optional[FaultRule]:
+        if not self.rules:
+            return None
+        path = urlsplit(url).path
+        for rule in self.rules:
+            if rule.matches(service, method, path):
+                return rule if random.random() < rule.probability else None
+        return None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'rules': [rule.model_dump(exclude_defaults=True) for rule in self.rules],
+            'injected': metrics.snapshot('faults.')['counters'],
+        }
+
+class ThrottledBody:
+    """File-like wrapper that delivers an upstream body at a fixed byte rate"""
+
+    def __init__(self, raw, bytes_per_second: float):
+        self._raw = raw
+        self._bytes_per_second = bytes_per_second
+
+    def read(self, amt: Optional[int] = None, *args, **kwargs) -> bytes:
+        return self._throttle(self._raw.read(amt, *args, **kwargs))
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None):
+        if hasattr(self._raw, 'stream'):
+            chunks = self._raw.stream(amt, decode_content=decode_content)
+        else:
+            chunks = iter(lambda: self._raw.read(amt), b'')
+        for chunk in chunks:
+            yield self._throttle(chunk)
+
+    def _throttle(self, data: bytes) -> bytes:
+        if data:
+            time.sleep(len(data) / self._bytes_per_second)
+        return data
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
+
+class FaultInjectingAdapter(BaseAdapter):
+    """Wraps a transport adapter and applies the fault injector's rules to the calls it sends"""
+
+    def __init__(self, adapter: BaseAdapter, service: str, injector: Optional['FaultInjector'] = None):
+        super().__init__()
+        self.adapter = adapter
+        self.service = service
+        self.injector = injector or fault_injector
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        rule = self.injector.match(self.service, request.method, request.url)
+        if rule is None:
+            return self.adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        prefix = f"faults.{self.service}"
+        if rule.latency:
+            delay = rule.latency.sample_ms() / 1000
+            read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+            metrics.inc(f"{prefix}.latency")
+            # Added latency beyond the read timeout surfaces as the timeout it would cause
+            if read_timeout is not None and delay > read_timeout:
+                time.sleep(read_timeout)
+                raise requests.exceptions.ReadTimeout(f"Injected latency of {delay:.3f}s", request=request)
+            time.sleep(delay)
+        if rule.reset:
+            metrics.inc(f"{prefix}.reset")
+            raise requests.exceptions.ConnectionError(
+                ConnectionResetError(104, 'Connection reset by peer (injected)'), request=request
+            )
+        if rule.status:
+            metrics.inc(f"{prefix}.status.{rule.status}")
+            return self._synthetic_response(request, rule.status)
+
+        response = self.adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        if rule.body_bytes_per_second:
+            metrics.inc(f"{prefix}.slow_body")
+            if response._content is False:
+                response.raw = ThrottledBody(response.raw, rule.body_bytes_per_second)
+            else:
+                # Already read by the adapter (HTTP/2): charge the whole body up front
+                time.sleep(len(response._content) / rule.body_bytes_per_second)
+        return response
+
+    @staticmethod
+    def _synthetic_response(request, status: int) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+        response._content = json.dumps({'error_code': 'INJECTED_FAULT', 'message': f'Injected {status}'}).encode()
+        response.encoding = 'utf-8'
+        response.reason = 'Injected Fault'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+# Create a singleton instance
+fault_injector = FaultInjector(enabled=Config.FAULT_INJECTION_ENABLED)
+
+# Rules are a runtime setting, so a change made through one worker reaches all of them via SETTINGS_FILE
+runtime_settings.define('faults.rules', parse_rules(Config.FAULT_INJECTION_RULES), parse_rules,
+                        description='Fault injection rules (FAULT_INJECTION_ENABLED must be set)')
+fault_injector.set_rules(runtime_settings.get('faults.rules'))
+
+def _apply_settings(changed: Dict[str, Any]):
+    if 'faults.rules' in changed:
+        fault_injector.set_rules(changed['faults.rules'])
+
+runtime_settings.subscribe(_apply_settings)
@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from app.core.lifecycle import worker_resources
+
+def create_health_blueprint() -> Blueprint:
+    """Liveness and readiness probes for the worker"""
+    blueprint = Blueprint('health', __name__)
+
+    @blueprint.route('/live', methods=['GET'])
+    def live():
+        return jsonify({'status': 'ok'}), 200
+
+    @blueprint.route('/ready', methods=['GET'])
+    def ready():
+        if worker_resources.ready.is_set():
+            return jsonify({'status': 'ready'}), 200
+        return jsonify({'status': 'warming_up'}), 503
+
+    return blueprint
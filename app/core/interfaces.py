@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 class UseCase(ABC):
     @abstractmethod
@@ -22,3 +22,21 @@ class Repository(ABC):
     @abstractmethod
     def delete(self, id: str) -> bool:
         pass
+
+class PaymentProvider(ABC):
+    """Payment operations a provider integration exposes to the payment router"""
+
+    # Prefix of the payment IDs the provider issues, so reads can be routed by ID alone
+    payment_id_prefix: Optional[str] = None
+
+    @abstractmethod
+    def create_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def get_payment(self, payment_id: str) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def list_payments(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        pass
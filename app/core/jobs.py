@@ -0,0 +1,451 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from app.core.exceptions import JobLeaseLostException
+from app.core.metrics import metrics
+from app.core.resilience import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+FINISHED = (SUCCEEDED, FAILED)
+
+# The job running on this thread, for handlers that renew their own lease
+_current = threading.local()
+
+COLUMNS = ('id', 'type', 'status', 'payload', 'result', 'error', 'attempts', 'max_attempts',
+           'created_at', 'updated_at', 'run_after')
+
+class JobStore:
+    """Durable job queue in a local SQLite file (WAL), shared by every process on the host.
+
+    Workers claim jobs with a lease and renew it while the job runs. A job
+    whose lease expires (its worker died) is handed out again only if its type
+    is resumable and attempts remain; otherwise it fails, since the outcome of
+    the interrupted attempt is unknown.
+    """
+
+    def __init__(self, path: str = 'jobs.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL, '
+            'payload TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, '
+            'max_attempts INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, '
+            'run_after REAL NOT NULL, locked_by TEXT, locked_until REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (type, status, run_after)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at)')
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        job = dict(zip(COLUMNS, row))
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def enqueue(self, job_type: str, payload: Dict[str, Any], max_attempts: int = 3,
+                job_id: Optional[str] = None) -> Dict[str, Any]:
+        return self.enqueue_many(job_type, [payload], max_attempts, [job_id] if job_id else None)[0]
+
+    def enqueue_many(self, job_type: str, payloads: List[Dict[str, Any]], max_attempts: int = 3,
+                     job_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Insert jobs in one transaction; a caller-supplied ID that already exists is not enqueued twice"""
+        now = time.time()
+        ids = job_ids or [uuid.uuid4().hex for _ in payloads]
+        rows = [
+            (job_id, job_type, QUEUED, json.dumps(payload, default=str), max_attempts, now, now, now)
+            for job_id, payload in zip(ids, payloads)
+        ]
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO jobs (id, type, status, payload, max_attempts, created_at, updated_at, '
+                    'run_after) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        metrics.inc(f'jobs.{job_type}.enqueued', len(rows))
+        return [self.get(job_id) for job_id in ids]
+
+    def claim(self, job_types: Iterable[str], worker_id: str, lease_seconds: float = 300.0,
+              resumable: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job of the given types, including expired leases of resumable types"""
+        job_types = list(job_types)
+        resumable = [job_type for job_type in resumable if job_type in job_types]
+        placeholders = ', '.join('?' for _ in job_types)
+        resumable_placeholders = ', '.join('?' for _ in resumable)
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute(
+                    f"SELECT id FROM jobs WHERE type IN ({placeholders}) AND run_after <= ? AND "
+                    f"(status = ? OR (status = ? AND locked_until < ? AND attempts < max_attempts AND "
+                    f"type IN ({resumable_placeholders}))) ORDER BY run_after LIMIT 1",
+                    [*job_types, now, QUEUED, RUNNING, now, *resumable]
+                ).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return None
+                self._conn.execute(
+                    'UPDATE jobs SET status = ?, attempts = attempts + 1, locked_by = ?, locked_until = ?, '
+                    'updated_at = ? WHERE id = ?',
+                    (RUNNING, worker_id, now + lease_seconds, now, row[0])
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return self.get(row[0])
+
+    def renew(self, job_id: str, worker_id: str, lease_seconds: float = 300.0) -> bool:
+        """Extend a running job's lease; False if the worker no longer holds it"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET locked_until = ? WHERE id = ? AND status = ? AND locked_by = ?',
+                (now + lease_seconds, job_id, RUNNING, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def abandon_expired(self, job_types: Iterable[str], resumable: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Fail jobs whose lease expired and that can't be claimed again (not resumable or out of attempts)"""
+        job_types = list(job_types)
+        resumable = list(resumable)
+        now = time.time()
+        where = (
+            f"type IN ({', '.join('?' for _ in job_types)}) AND status = ? AND locked_until < ? AND "
+            f"(attempts >= max_attempts OR type NOT IN ({', '.join('?' for _ in resumable)}))"
+        )
+        args = [*job_types, RUNNING, now, *resumable]
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                ids = [row[0] for row in self._conn.execute(f'SELECT id FROM jobs WHERE {where}', args)]
+                if ids:
+                    self._conn.execute(
+                        f"UPDATE jobs SET status = ?, error = ?, updated_at = ?, locked_by = NULL, locked_until = NULL "
+                        f"WHERE id IN ({', '.join('?' for _ in ids)})",
+                        (FAILED, 'Lease expired; outcome of the last attempt is unknown', now, *ids)
+                    )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return [self.get(job_id) for job_id in ids]
+
+    def complete(self, job_id: str, worker_id: str, result: Any = None) -> bool:
+        """Record success; False if the worker no longer holds the job (another worker took it over)"""
+        return self._finish(job_id, worker_id, SUCCEEDED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: Optional[float] = None) -> bool:
+        """Record a failed attempt; requeue after retry_delay while attempts remain.
+        False if the worker no longer holds the job."""
+        now = time.time()
+        with self._lock:
+            if retry_delay is not None:
+                cursor = self._conn.execute(
+                    'UPDATE jobs SET status = ?, error = ?, run_after = ?, updated_at = ?, locked_by = NULL, '
+                    'locked_until = NULL WHERE id = ? AND status = ? AND locked_by = ? AND attempts < max_attempts',
+                    (QUEUED, error, now + retry_delay, now, job_id, RUNNING, worker_id)
+                )
+                if cursor.rowcount:
+                    return True
+        return self._finish(job_id, worker_id, FAILED, error=error)
+
+    def _finish(self, job_id: str, worker_id: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        # Only the lease holder may finish a job, so a worker that lost it can't overwrite the new holder's outcome
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, locked_by = NULL, '
+                'locked_until = NULL WHERE id = ? AND status = ? AND locked_by = ?',
+                (status, result, error, time.time(), job_id, RUNNING, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: Optional[str] = None, job_type: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        filters = {key: value for key, value in (('status', status), ('type', job_type)) if value}
+        where = f"WHERE {' AND '.join(f'{key} = ?' for key in filters)}" if filters else ''
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs {where} ORDER BY created_at DESC LIMIT ?",
+                [*filters.values(), limit]
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def finished_since(self, since: float, limit: int = 500) -> List[Dict[str, Any]]:
+        """Jobs that reached a final status after `since` (updated_at), oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE updated_at > ? AND status IN (?, ?) "
+                f"ORDER BY updated_at LIMIT ?",
+                (since, *FINISHED, limit)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._conn.execute('SELECT type, status, COUNT(*) FROM jobs GROUP BY type, status').fetchall()
+        result: Dict[str, Dict[str, int]] = {}
+        for job_type, status, count in rows:
+            result.setdefault(job_type, {})[status] = count
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def renew_lease():
+    """Renew the running job's lease from inside its handler (e.g. after each chunk of a long job).
+
+    Raises JobLeaseLostException once another worker has taken the job over,
+    so the handler stops instead of running it twice. Does nothing outside a job.
+    """
+    lease = getattr(_current, 'lease', None)
+    if lease is None:
+        return
+    store, job_id, worker_id, lease_seconds = lease
+    if not store.renew(job_id, worker_id, lease_seconds):
+        raise JobLeaseLostException(f"Lease on job {job_id} was taken over by another worker")
+
+class JobType:
+    """Handler and limits for one kind of job"""
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any], concurrency: int = 1,
+                 rate_limit: Optional[float] = None, max_attempts: int = 3, retry_delay: float = 5.0,
+                 retryable: Callable[[Exception], bool] = lambda e: True, resumable: bool = False):
+        self.handler = handler
+        self.concurrency = concurrency
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Failures for which another attempt is safe (e.g. the call never reached upstream)
+        self.retryable = retryable
+        # Whether a job whose worker died mid-attempt may run again (the attempt's outcome is unknown)
+        self.resumable = resumable
+
+class JobWorkerPool:
+    """Runs jobs from a JobStore: `concurrency` threads per job type, each type with its own rate limit.
+
+    Runs inside a web worker or standalone (`flask <module> jobs-worker`).
+    A heartbeat thread renews the leases of running jobs and fails expired
+    ones that can't be resumed. Completed and permanently failed jobs are
+    passed to on_finished.
+    """
+
+    def __init__(self, store: JobStore, job_types: Dict[str, JobType],
+                 on_finished: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 poll_interval: float = 0.5, lease_seconds: float = 300.0):
+        self.store = store
+        self.job_types = job_types
+        self.on_finished = on_finished
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._wakeup = {job_type: threading.Event() for job_type in job_types}
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._running_lock = threading.Lock()
+
+    @property
+    def resumable(self) -> List[str]:
+        return [job_type for job_type, spec in self.job_types.items() if spec.resumable]
+
+    def start(self):
+        for job_type, spec in self.job_types.items():
+            for index in range(spec.concurrency):
+                thread = threading.Thread(
+                    target=self._run, args=(job_type, spec), name=f'job-{job_type}-{index}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name='job-leases', daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Job workers started: {', '.join(f'{t}={s.concurrency}' for t, s in self.job_types.items())}")
+
+    def notify(self, job_type: str):
+        """Wake idle workers of job_type after an in-process enqueue instead of waiting for the next poll"""
+        event = self._wakeup.get(job_type)
+        if event is not None:
+            event.set()
+
+    def set_rate_limit(self, job_type: str, rate_limit: Optional[float]):
+        """Change a job type's jobs/second at runtime (0 or None removes the limit)"""
+        spec = self.job_types[job_type]
+        if not rate_limit:
+            spec.rate_limiter = None
+        elif spec.rate_limiter:
+            spec.rate_limiter.configure(rate_limit)
+        else:
+            spec.rate_limiter = TokenBucket(rate_limit)
+
+    def stop(self, timeout: float = 30.0):
+        """Stop claiming new jobs and wait for running ones to finish"""
+        self._stop.set()
+        for event in self._wakeup.values():
+            event.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self._threads = []
+
+    def _run(self, job_type: str, spec: JobType):
+        wakeup = self._wakeup[job_type]
+        while not self._stop.is_set():
+            if spec.rate_limiter and not spec.rate_limiter.acquire(timeout=self.poll_interval):
+                continue
+            try:
+                job = self.store.claim([job_type], self.worker_id, self.lease_seconds, self.resumable)
+            except sqlite3.Error as e:
+                logger.warning(f"Claiming {job_type} job failed: {str(e)}")
+                job = None
+            if job is None:
+                if spec.rate_limiter:
+                    # Nothing ran, so give the token back
+                    spec.rate_limiter.refund()
+                wakeup.wait(self.poll_interval)
+                wakeup.clear()
+                continue
+            with self._running_lock:
+                self._running[job['id']] = job
+            try:
+                self._execute(job, spec)
+            finally:
+                with self._running_lock:
+                    self._running.pop(job['id'], None)
+
+    def _heartbeat(self):
+        """Renew running jobs' leases a few times per lease and fail abandoned ones"""
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._running_lock:
+                running = list(self._running.values())
+            try:
+                for job in running:
+                    if not self.store.renew(job['id'], self.worker_id, self.lease_seconds):
+                        logger.warning(f"Lease on job {job['id']} ({job['type']}) was lost while it ran")
+                for job in self.store.abandon_expired(self.job_types, self.resumable):
+                    metrics.inc(f"jobs.{job['type']}.abandoned")
+                    logger.warning(f"Job {job['id']} ({job['type']}) abandoned: {job['error']}")
+                    self._finished(job)
+            except sqlite3.Error as e:
+                logger.warning(f"Renewing job leases failed: {str(e)}")
+
+    def _execute(self, job: Dict[str, Any], spec: JobType):
+        started = time.perf_counter()
+        prefix = f"jobs.{job['type']}"
+        _current.lease = (self.store, job['id'], self.worker_id, self.lease_seconds)
+        try:
+            result = spec.handler(job['payload'])
+        except JobLeaseLostException as e:
+            # The new holder owns the job's status now
+            metrics.inc(f'{prefix}.lease_lost')
+            logger.warning(f"Job {job['id']} ({job['type']}) stopped: {str(e)}")
+            return
+        except Exception as e:
+            metrics.inc(f'{prefix}.errors')
+            retry = spec.retryable(e) and job['attempts'] < job['max_attempts']
+            delay = spec.retry_delay * (2 ** (job['attempts'] - 1)) if retry else None
+            logger.warning(f"Job {job['id']} ({job['type']}) attempt {job['attempts']} failed: {str(e)}")
+            recorded = self.store.fail(job['id'], self.worker_id, str(e), retry_delay=delay)
+            if delay is not None and recorded:
+                return
+        else:
+            recorded = self.store.complete(job['id'], self.worker_id, result)
+            if recorded:
+                metrics.inc(f'{prefix}.succeeded')
+        finally:
+            _current.lease = None
+            metrics.observe(f'{prefix}.duration_ms', (time.perf_counter() - started) * 1000)
+
+        if not recorded:
+            # Reclaimed or abandoned after the lease expired; its current holder reports the outcome
+            metrics.inc(f'{prefix}.lease_lost')
+            logger.warning(f"Job {job['id']} ({job['type']}) finished after losing its lease; outcome discarded")
+            return
+        self._finished(self.store.get(job['id']))
+
+    def _finished(self, job: Dict[str, Any]):
+        if self.on_finished:
+            try:
+                self.on_finished(job)
+            except Exception as e:
+                logger.warning(f"Job completion callback failed for {job['id']}: {str(e)}")
+
+class JobCompletionWatcher:
+    """Polls the store for finished jobs, for processes that don't run the workers themselves"""
+
+    def __init__(self, store: JobStore, on_finished: Callable[[Dict[str, Any]], None], poll_interval: float = 1.0):
+        self.store = store
+        self.on_finished = on_finished
+        self.poll_interval = poll_interval
+        self._since = time.time()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='job-completions', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                for job in self.store.finished_since(self._since):
+                    self._since = max(self._since, job['updated_at'])
+                    self.on_finished(job)
+            except Exception as e:
+                logger.warning(f"Polling job completions failed: {str(e)}")
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.poll_interval * 2)
+
+class JobRuntime:
+    """A process's view of the job system: the store, plus either the workers or a completion watcher"""
+
+    def __init__(self, store: JobStore, pool: JobWorkerPool, in_process: bool = True,
+                 completion_poll_interval: float = 1.0):
+        self.store = store
+        self.pool = pool
+        self.watcher = None
+        if in_process:
+            pool.start()
+        elif pool.on_finished:
+            self.watcher = JobCompletionWatcher(store, pool.on_finished, completion_poll_interval)
+            self.watcher.start()
+
+    def enqueue(self, job_type: str, payloads: List[Dict[str, Any]],
+                job_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        spec = self.pool.job_types[job_type]
+        jobs = self.store.enqueue_many(job_type, payloads, spec.max_attempts, job_ids)
+        self.pool.notify(job_type)
+        return jobs
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        self.pool.stop()
+        self.store.close()
@@ -0,0 +1,116 @@
+from typing import Any, Callable, Dict, List, Optional
+import atexit
+import os
+import threading
+import logging
+from werkzeug.local import LocalProxy
+
+logger = logging.getLogger(__name__)
+
+class WorkerResource:
+    def __init__(self, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None,
+                 close: Optional[Callable[[Any], None]] = None):
+        self.factory = factory
+        self.warmup = warmup
+        self.close = close
+
+class WorkerResources:
+    """Per-process registry of long-lived API clients and use cases.
+
+    Instances are created once per worker process. A fork (e.g. gunicorn
+    --preload) discards instances inherited from the parent so sockets and
+    locks are never shared across processes.
+    """
+
+    def __init__(self):
+        self._resources: Dict[str, WorkerResource] = {}
+        self._instances: Dict[str, Any] = {}
+        self._prepare: List[Callable[[], None]] = []
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._warmup_thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+
+    def register(self, name: str, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None,
+                 close: Optional[Callable[[Any], None]] = None):
+        """Register a resource factory with optional warmup and close hooks"""
+        self._resources[name] = WorkerResource(factory, warmup, close)
+
+    def add_prepare_hook(self, hook: Callable[[], None]):
+        """Run a hook at the start of warmup, before resources are warmed (e.g. loading modules)"""
+        self._prepare.append(hook)
+
+    def get(self, name: str) -> Any:
+        """Return the instance for this worker process, creating it on first use"""
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._resources[name].factory()
+                    self._instances[name] = instance
+        return instance
+
+    def peek(self, name: str) -> Optional[Any]:
+        """This worker's instance if it has been created, without creating it"""
+        if self._pid != os.getpid():
+            return None
+        return self._instances.get(name)
+
+    def proxy(self, name: str) -> LocalProxy:
+        """Module-level handle that resolves to this worker's instance on access"""
+        return LocalProxy(lambda: self.get(name))
+
+    def warmup(self):
+        """Create and warm every registered resource, then mark the worker ready"""
+        for hook in self._prepare:
+            hook()
+        for name, resource in list(self._resources.items()):
+            try:
+                instance = self.get(name)
+                if resource.warmup:
+                    resource.warmup(instance)
+            except Exception as e:
+                # A failed warmup only costs the first request its cold start
+                logger.warning(f"Warmup of '{name}' failed: {str(e)}")
+        self.ready.set()
+        logger.info(f"Worker {os.getpid()} ready")
+
+    def start_warmup(self):
+        """Warm up in a background thread; readiness reports 503 until it finishes"""
+        self._warmup_thread = threading.Thread(target=self.warmup, name='worker-warmup', daemon=True)
+        self._warmup_thread.start()
+
+    def mark_ready(self):
+        self.ready.set()
+
+    def shutdown(self):
+        """Close instances in reverse creation order, draining their connection pools"""
+        self.ready.clear()
+        with self._lock:
+            instances = list(self._instances.items())
+            self._instances.clear()
+        for name, instance in reversed(instances):
+            close = self._resources[name].close
+            if close:
+                try:
+                    close(instance)
+                except Exception as e:
+                    logger.warning(f"Error closing '{name}': {str(e)}")
+
+    def reset_after_fork(self):
+        """Drop instances inherited from the parent process without closing their sockets"""
+        self._lock = threading.RLock()
+        self._instances = {}
+        self._pid = os.getpid()
+        self._warmup_thread = None
+        self.ready = threading.Event()
+
+# Create a singleton instance
+worker_resources = WorkerResources()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=worker_resources.reset_after_fork)
+atexit.register(worker_resources.shutdown)
@@ -0,0 +1,86 @@
+from fnmatch import fnmatch
+from typing import Any, Callable, Iterable, Iterator, Optional
+from flask import Flask, Request, Response, current_app, g, has_request_context, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+from app.core.metrics import metrics
+
+def body_limit(rule: Optional[str]) -> Optional[int]:
+    """Inbound body limit for a route: the first matching glob in BODY_LIMITS, else MAX_CONTENT_LENGTH"""
+    config = current_app.config
+    if rule:
+        for pattern, limit in (config.get('BODY_LIMITS') or {}).items():
+            if fnmatch(rule, pattern):
+                return limit
+    return config.get('MAX_CONTENT_LENGTH')
+
+class LimitedRequest(Request):
+    """Request whose body limit depends on the matched route.
+
+    Werkzeug enforces it while the body is read (a declared Content-Length
+    over the limit is rejected before reading; a chunked body is cut off at
+    the limit), so an oversized body is never buffered.
+    """
+
+    @property
+    def max_content_length(self) -> Optional[int]:  # type: ignore[override]
+        if not current_app:
+            return None
+        return body_limit(self.url_rule.rule if self.url_rule else None)
+
+def account(kind: str, size: int):
+    """Add bytes buffered for the current request (request body, upstream bodies, response body)"""
+    if size and has_request_context():
+        buffered = g.get('buffered_bytes')
+        if buffered is None:
+            buffered = g.buffered_bytes = {}
+        buffered[kind] = buffered.get(kind, 0) + size
+
+def stream_json_array(items: Iterable[Any], dumps: Callable[[Any], str], batch: int = 100) -> Iterator[bytes]:
+    """Encode a list as a JSON array in batches, so the whole document is never held as one string"""
+    yield b'['
+    separator, encoded = b'', []
+    for item in items:
+        encoded.append(dumps(item))
+        if len(encoded) >= batch:
+            yield separator + ','.join(encoded).encode()
+            separator, encoded = b',', []
+    if encoded:
+        yield separator + ','.join(encoded).encode()
+    yield b']'
+
+def list_response(items: list, serialize: Callable[[Any], Any] = lambda item: item.dict()):
+    """JSON array response; lists longer than LIST_STREAM_THRESHOLD are serialized while they are sent"""
+    threshold = current_app.config.get('LIST_STREAM_THRESHOLD', 0)
+    if not threshold or len(items) <= threshold:
+        return jsonify([serialize(item) for item in items]), 200
+    metrics.inc('limits.streamed_lists')
+    # Bound now: the body is generated after the app context is gone
+    dumps = current_app.json.dumps
+    return Response(
+        stream_json_array((serialize(item) for item in items), dumps), status=200, mimetype='application/json'
+    )
+
+def _account_request():
+    if request.content_length:
+        account('request', request.content_length)
+
+def _record_request(response: Response) -> Response:
+    if not response.is_streamed and not response.direct_passthrough:
+        account('response', response.calculate_content_length() or 0)
+    buffered = g.get('buffered_bytes')
+    if buffered:
+        route = f"limits.routes.{request.endpoint or 'unmatched'}"
+        for kind, size in buffered.items():
+            metrics.observe(f"{route}.{kind}_bytes", size)
+        metrics.observe(f"{route}.buffered_bytes", sum(buffered.values()))
+    return response
+
+def _too_large(e: RequestEntityTooLarge):
+    metrics.inc('limits.rejected.request_too_large')
+    return jsonify({'error': f"Request body exceeds {request.max_content_length} bytes"}), 413
+
+def init_limits(app: Flask):
+    app.request_class = LimitedRequest
+    app.register_error_handler(RequestEntityTooLarge, _too_large)
+    app.before_request(_account_request)
+    app.after_request(_record_request)
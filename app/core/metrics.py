@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import math
+import threading
+
+class Histogram:
+    """Bounded reservoir of recent observations with count/sum totals"""
+
+    def __init__(self, size: int = 1024):
+        self._values: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, p: float) -> Optional[float]:
+        values = sorted(self._values)
+        if not values:
+            return None
+        # Nearest-rank percentile
+        return values[max(0, math.ceil(p / 100.0 * len(values)) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+class MetricsRegistry:
+    """In-process counters and latency histograms, keyed by dotted metric names"""
+
+    def __init__(self, histogram_size: int = 1024):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self.histogram_size = histogram_size
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.histogram_size)
+            histogram.observe(value)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Optional[Histogram]:
+        return self._histograms.get(name)
+
+    def snapshot(self, prefix: str = '') -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': {k: v for k, v in self._counters.items() if k.startswith(prefix)},
+                'histograms': {k: h.snapshot() for k, h in self._histograms.items() if k.startswith(prefix)},
+            }
+
+    def reset_prefix(self, prefix: str):
+        with self._lock:
+            for name in [name for name in self._counters if name.startswith(prefix)]:
+                del self._counters[name]
+            for name in [name for name in self._histograms if name.startswith(prefix)]:
+                del self._histograms[name]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+# Create a singleton instance
+metrics = MetricsRegistry()
@@ -0,0 +1,197 @@
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from flask import Flask, Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from app.core.metrics import metrics
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+def sample_stacks(seconds: float, interval: float = 0.005, ignore: Optional[set] = None) -> Counter:
+    """Wall-clock sampling of every thread's stack; returns counts keyed by 'thread;outer;...;inner'"""
+    ignore = set(ignore or ()) | {threading.get_ident()}
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id in ignore:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, str(thread_id)))
+            stacks[';'.join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+def collapsed(stacks: Counter) -> str:
+    """Collapsed stack format read by flamegraph.pl, speedscope and similar tools"""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+class CPUProfiler:
+    """Runs one sampling profile at a time in the calling (admin request) thread"""
+
+    def __init__(self, max_seconds: float = 60.0):
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float = 0.005) -> Optional[str]:
+        """Collapsed stacks for `seconds`, or None if another profile is already running"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            seconds = min(max(seconds, 0.1), self.max_seconds)
+            return collapsed(sample_stacks(seconds, max(interval, 0.001)))
+        finally:
+            self._lock.release()
+
+class MemoryProfiler:
+    """tracemalloc on demand: start, snapshot (diffed against the previous one) and stop"""
+
+    def __init__(self):
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(min(max(frames, 1), 25))
+            self._previous = None
+
+    def stop(self):
+        with self._lock:
+            tracemalloc.stop()
+            self._previous = None
+
+    def snapshot(self, limit: int = 25, key_type: str = 'lineno') -> Dict[str, Any]:
+        """Top allocations now, and the biggest changes since the previous snapshot"""
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            previous, self._previous = self._previous, snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        result = {
+            'traced_bytes': current,
+            'peak_bytes': peak,
+            'top': [self._stat(stat) for stat in snapshot.statistics(key_type)[:limit]],
+        }
+        if previous is not None:
+            result['diff'] = [self._stat(stat) for stat in snapshot.compare_to(previous, key_type)[:limit]]
+        return result
+
+    @staticmethod
+    def _stat(stat) -> Dict[str, Any]:
+        entry = {'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+        if hasattr(stat, 'size_diff'):
+            entry.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+        return entry
+
+class _Phase:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        phases = g.get('profile_phases')
+        if phases is not None:
+            phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+_NO_PHASE = nullcontext()
+
+class RouteTimings:
+    """Per-route time split into phases (parse, validation, upstream, serialize, websocket).
+
+    Disabled by default; when off, phase() is a flag check returning a
+    shared no-op context manager.
+    """
+
+    def __init__(self, prefix: str = 'profile.routes'):
+        self.prefix = prefix
+        self.enabled = False
+
+    def phase(self, name: str):
+        if not self.enabled or not has_request_context():
+            return _NO_PHASE
+        return _Phase(name)
+
+    def begin(self):
+        if not self.enabled:
+            return
+        g.profile_started = time.perf_counter()
+        g.profile_phases = {}
+        if request.is_json:
+            # Parse up front so the time is attributed; Flask caches the result for the view
+            with _Phase('parse'):
+                request.get_json(silent=True)
+
+    def finish(self, response: Response) -> Response:
+        started = g.get('profile_started')
+        if started is None:
+            return response
+        total = time.perf_counter() - started
+        phases = g.profile_phases
+        route = f"{self.prefix}.{request.endpoint or 'unmatched'}"
+        metrics.observe(f"{route}.total_ms", total * 1000)
+        for name, seconds in phases.items():
+            metrics.observe(f"{route}.{name}_ms", seconds * 1000)
+        metrics.observe(f"{route}.other_ms", max(total - sum(phases.values()), 0.0) * 1000)
+        return response
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Histogram snapshots grouped by route endpoint"""
+        routes: Dict[str, Dict[str, Any]] = {}
+        for name, histogram in metrics.snapshot(self.prefix + '.')['histograms'].items():
+            route, phase = name[len(self.prefix) + 1:].rsplit('.', 1)
+            routes.setdefault(route, {})[phase] = histogram
+        return routes
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Attributes jsonify() time to the 'serialize' phase"""
+
+    def response(self, *args, **kwargs) -> Response:
+        with route_timings.phase('serialize'):
+            return super().response(*args, **kwargs)
+
+# Create singleton instances
+route_timings = RouteTimings()
+cpu_profiler = CPUProfiler()
+memory_profiler = MemoryProfiler()
+
+def phase(name: str):
+    """Time a block as part of the current request's route breakdown (no-op unless enabled)"""
+    if not route_timings.enabled:
+        return _NO_PHASE
+    return route_timings.phase(name)
+
+def init_profiling(app: Flask):
+    app.json = TimedJSONProvider(app)
+    app.before_request(route_timings.begin)
+    app.after_request(route_timings.finish)
+
+def profile_status() -> Dict[str, Any]:
+    return {
+        'pid': os.getpid(),
+        'route_timings': route_timings.enabled,
+        'tracemalloc': memory_profiler.tracing,
+    }
@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Optional, Tuple
+import random
+import threading
+import time
+import logging
+from app.core.cache import LRUCache
+from app.core.exceptions import (
+    ApplicationException, CircuitOpenException, RateLimitExceededException
+)
+from app.core.metrics import Histogram, metrics
+from app.core.resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+class ProviderStats:
+    """Live latency (EWMA and p95 over recent calls) and EWMA error rate of one provider"""
+
+    def __init__(self, alpha: float = 0.2, window: int = 256):
+        self.alpha = alpha
+        self.latency = Histogram(window)
+        self.ewma_latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, ok: bool):
+        with self._lock:
+            self.latency.observe(latency_ms)
+            if self.ewma_latency_ms is None:
+                self.ewma_latency_ms = latency_ms
+            else:
+                self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+            self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+    def score(self, error_penalty: float) -> float:
+        """Expected cost of a call; lower is better. Providers without samples score 0 so they get tried"""
+        if self.ewma_latency_ms is None:
+            return 0.0
+        latency = (self.ewma_latency_ms + (self.latency.percentile(95) or self.ewma_latency_ms)) / 2
+        return latency * (1 + error_penalty * self.error_rate)
+
+class ProviderRouter:
+    """Routes an operation to one of several providers ranked by live latency and error rate.
+
+    Each provider has a circuit breaker fed by routed calls. A call fails
+    over to the next provider when a circuit is open or the provider
+    rejected the call without sending it (rate limit). Upstream 5xx errors
+    fail over only for idempotent operations, so a create is never
+    sent twice. Calls with failover=False (lists, whose data differs per
+    provider) go to the pinned or default provider only.
+
+    Resources are read from the provider that created them, known from an
+    earlier create or from the ID prefix the provider issues. A resource
+    with an unknown owner is looked up on each provider in turn until one
+    does not answer 404.
+    """
+
+    def __init__(self, providers: Dict[str, Any], name: str = 'payments', ewma_alpha: float = 0.2,
+                 error_penalty: float = 10.0, explore_ratio: float = 0.05,
+                 breaker_failure_threshold: int = 5, breaker_reset_timeout: float = 30.0,
+                 owner_cache_size: int = 10000, id_prefixes: Optional[Dict[str, Optional[str]]] = None):
+        if not providers:
+            raise ValueError("At least one provider is required")
+        self.providers = providers
+        self.name = name
+        # Lists and other calls that must not fail over go here unless pinned
+        self.default = next(iter(providers))
+        self.id_prefixes = {provider: prefix for provider, prefix in (id_prefixes or {}).items() if prefix}
+        self.error_penalty = error_penalty
+        self.explore_ratio = explore_ratio
+        self.stats_by_provider = {provider: ProviderStats(ewma_alpha) for provider in providers}
+        self.breakers = {
+            provider: CircuitBreaker(breaker_failure_threshold, breaker_reset_timeout) for provider in providers
+        }
+        self._owners = LRUCache(owner_cache_size)
+
+    def ranked(self) -> List[str]:
+        """Providers ordered by score, those with an open circuit last"""
+        order = sorted(self.providers, key=lambda provider: (
+            self.breakers[provider].state == CircuitBreaker.OPEN,
+            self.stats_by_provider[provider].score(self.error_penalty)
+        ))
+        # Occasionally lead with another provider so its statistics stay current
+        if len(order) > 1 and self.explore_ratio and random.random() < self.explore_ratio:
+            explore = random.randrange(1, len(order))
+            order.insert(0, order.pop(explore))
+        return order
+
+    def owner_of(self, resource_id: str) -> Optional[str]:
+        owner = self._owners.get(resource_id)
+        if owner is None:
+            owner = next((name for name, prefix in self.id_prefixes.items() if resource_id.startswith(prefix)), None)
+        return owner
+
+    def call(self, operation: str, *args, provider: Optional[str] = None, resource_id: Optional[str] = None,
+             idempotent: bool = False, failover: bool = True, **kwargs) -> Tuple[str, Any]:
+        """Run operation on the best available provider; returns (provider name, result)"""
+        if provider is not None and provider not in self.providers:
+            raise ApplicationException(f"Unknown {self.name} provider '{provider}'")
+        owner = self.owner_of(resource_id) if resource_id else None
+        # An unowned resource is searched for on every provider, best first
+        lookup = resource_id is not None and not (provider or owner)
+        if provider or owner:
+            candidates = [provider or owner]
+        elif failover or lookup:
+            candidates = self.ranked()
+        else:
+            candidates = [self.default]
+
+        last_error: Optional[ApplicationException] = None
+        not_found: Optional[ApplicationException] = None
+        for index, name in enumerate(candidates):
+            if index and last_error is not None:
+                metrics.inc(f'{self.name}.providers.{name}.failovers')
+                logger.warning(f"Failing over {self.name}.{operation} to '{name}': {str(last_error)}")
+            if not self.breakers[name].allow():
+                last_error = CircuitOpenException(f"Circuit open for {self.name} provider '{name}'")
+                continue
+
+            metrics.inc(f'{self.name}.providers.{name}.requests')
+            started = time.perf_counter()
+            try:
+                result = getattr(self.providers[name], operation)(*args, **kwargs)
+            except (CircuitOpenException, RateLimitExceededException) as e:
+                # Rejected before reaching the provider: safe to retry elsewhere
+                self.breakers[name].release()
+                last_error = e
+                continue
+            except ApplicationException as e:
+                upstream_failure = e.status_code >= 500
+                self._record(name, started, ok=not upstream_failure)
+                if lookup and e.status_code == 404:
+                    not_found = e
+                    continue
+                if not upstream_failure or not (idempotent or lookup):
+                    raise
+                last_error = e
+                continue
+
+            self._record(name, started, ok=True)
+            if isinstance(result, dict) and result.get('id'):
+                self._owners.set(result['id'], name)
+            return name, result
+
+        # A provider that couldn't be asked may still own the resource, so unavailability wins over 404
+        raise last_error or not_found or CircuitOpenException(f"No {self.name} provider available")
+
+    def _record(self, name: str, started: float, ok: bool):
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.stats_by_provider[name].record(latency_ms, ok)
+        metrics.observe(f'{self.name}.providers.{name}.latency_ms', latency_ms)
+        if ok:
+            self.breakers[name].record_success()
+        else:
+            metrics.inc(f'{self.name}.providers.{name}.errors')
+            self.breakers[name].record_failure()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                'ewma_latency_ms': round(stats.ewma_latency_ms, 2) if stats.ewma_latency_ms is not None else None,
+                'p95_latency_ms': stats.latency.percentile(95),
+                'error_rate': round(stats.error_rate, 4),
+                'score': round(stats.score(self.error_penalty), 2),
+                'circuit': self.breakers[name].state,
+            }
+            for name, stats in self.stats_by_provider.items()
+        }
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import logging
+import click
+from flask import Flask
+from werkzeug.utils import import_string
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'thirdparty_api_gateway.modules'
+
+@dataclass
+class ModuleSpec:
+    """Declaration of an integration module; nothing is imported until it is loaded"""
+    name: str
+    factory: str
+    url_prefix: str
+    websocket: Optional[str] = None
+    cli: Optional[str] = None
+
+    @classmethod
+    def from_manifest(cls, name: str, entry: Dict[str, Any]) -> "ModuleSpec":
+        return cls(
+            name=name,
+            factory=entry['factory'],
+            url_prefix=entry.get('url_prefix', f'/api/{name}').rstrip('/'),
+            websocket=entry.get('websocket'),
+            cli=entry.get('cli')
+        )
+
+class LazyModuleGroup(click.Group):
+    """CLI group that imports a module's commands only when they are listed or invoked"""
+
+    def __init__(self, name: str, import_path: str, **kwargs):
+        super().__init__(name, help=f"Commands for the {name} module.", **kwargs)
+        self.import_path = import_path
+        self._group: Optional[click.Group] = None
+
+    def _load(self) -> click.Group:
+        if self._group is None:
+            self._group = import_string(self.import_path)
+        return self._group
+
+    def list_commands(self, ctx):
+        return self._load().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._load().get_command(ctx, name)
+
+class LazyModuleDispatcher:
+    """WSGI middleware that builds a module's app on the first request under its prefix"""
+
+    def __init__(self, app: Flask, registry: "ModuleRegistry"):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.registry = registry
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        for spec in self.registry.lazy_specs:
+            if path == spec.url_prefix or path.startswith(spec.url_prefix + '/'):
+                return self.registry.load(spec.name)(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+class ModuleRegistry:
+    """Discovers integration modules from the config manifest and entry points"""
+
+    def __init__(self):
+        self._specs: Dict[str, ModuleSpec] = {}
+        self._apps: Dict[str, Flask] = {}
+        self._lock = threading.Lock()
+        self._app: Optional[Flask] = None
+        self._setup: Optional[Callable[[Flask], None]] = None
+        self.lazy_specs: List[ModuleSpec] = []
+
+    @property
+    def specs(self) -> Dict[str, ModuleSpec]:
+        return dict(self._specs)
+
+    def register(self, spec: ModuleSpec):
+        self._specs[spec.name] = spec
+
+    def discover(self, manifest: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Collect module specs from the manifest, then from installed entry points"""
+        for name, entry in (manifest or {}).items():
+            self.register(ModuleSpec.from_manifest(name, entry))
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name not in self._specs:
+                self.register(ModuleSpec.from_manifest(entry_point.name, {'factory': entry_point.value}))
+
+    def init_app(self, app: Flask, enabled: Optional[List[str]] = None, lazy: bool = True,
+                 setup: Optional[Callable[[Flask], None]] = None):
+        """Register enabled modules on the app, deferring blueprint imports when lazy"""
+        self._app = app
+        self._setup = setup
+        self.lazy_specs = []
+        app.extensions['module_registry'] = self
+
+        for name, spec in self._specs.items():
+            if enabled is not None and name not in enabled:
+                logger.info(f"Module '{name}' disabled by configuration")
+                continue
+            if spec.websocket:
+                import_string(spec.websocket)()
+            if spec.cli:
+                app.cli.add_command(LazyModuleGroup(name, spec.cli))
+            if lazy:
+                self.lazy_specs.append(spec)
+            else:
+                app.register_blueprint(import_string(spec.factory)(), url_prefix=spec.url_prefix)
+
+        if self.lazy_specs:
+            app.wsgi_app = LazyModuleDispatcher(app, self)
+
+    def load(self, name: str) -> Flask:
+        """Import a lazy module and build the app serving its routes (once per process)"""
+        module_app = self._apps.get(name)
+        if module_app is not None:
+            return module_app
+
+        with self._lock:
+            if name not in self._apps:
+                spec = self._specs[name]
+                module_app = Flask(self._app.import_name)
+                module_app.config.update(self._app.config)
+                if self._setup:
+                    self._setup(module_app)
+                module_app.register_blueprint(import_string(spec.factory)(), url_prefix=spec.url_prefix)
+                self._apps[name] = module_app
+                logger.info(f"Module '{name}' loaded on first use")
+        return self._apps[name]
+
+    def load_all(self):
+        """Eagerly load every lazy module, e.g. during worker warmup"""
+        for spec in self.lazy_specs:
+            self.load(spec.name)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._apps
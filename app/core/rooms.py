@@ -0,0 +1,163 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import heapq
+import sys
+import threading
+import time
+import logging
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of RoomRegistry.join
+JOINED, ALREADY_JOINED, LIMIT_REACHED, NOT_CONNECTED = 'joined', 'already_joined', 'limit_reached', 'not_connected'
+
+class RoomRegistry:
+    """Which connection is in which room, indexed both ways.
+
+    Connections and rooms are keyed by namespace. Each connection may hold at
+    most max_rooms subscriptions and the registry at most max_connections
+    connections, so memory is bounded by their product. Rooms are dropped
+    as soon as their last member leaves; rooms with no join or emit for
+    idle_seconds are collected with their memberships. has_subscribers()
+    is a dict lookup, so callers can skip building and emitting events
+    nobody would receive.
+    """
+
+    def __init__(self, max_connections: int = 100000, max_rooms: int = 100, idle_seconds: float = 0,
+                 leave: Optional[Callable[[str, str, str], None]] = None):
+        self.max_connections = max_connections
+        self.max_rooms = max_rooms
+        self.idle_seconds = idle_seconds
+        # Called as leave(sid, room, namespace) when collection removes a membership
+        self.leave_callback = leave
+        self._connections: Dict[Tuple[str, str], Set[str]] = {}
+        self._rooms: Dict[Tuple[str, str], Set[str]] = {}
+        self._active: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def connect(self, sid: str, namespace: str = '/') -> bool:
+        """Register a connection; False when the registry is full"""
+        with self._lock:
+            key = (namespace, sid)
+            if key in self._connections:
+                return True
+            if len(self._connections) >= self.max_connections:
+                metrics.inc('websocket.rejected.connection_limit')
+                return False
+            self._connections[key] = set()
+        return True
+
+    def disconnect(self, sid: str, namespace: str = '/') -> int:
+        """Forget a connection and its memberships; returns how many rooms it was in"""
+        with self._lock:
+            rooms = self._connections.pop((namespace, sid), None) or set()
+            for room in rooms:
+                self._remove_member((namespace, room), sid)
+        return len(rooms)
+
+    def join(self, sid: str, room: str, namespace: str = '/') -> str:
+        with self._lock:
+            rooms = self._connections.get((namespace, sid))
+            if rooms is None:
+                return NOT_CONNECTED
+            if room in rooms:
+                return ALREADY_JOINED
+            if len(rooms) >= self.max_rooms:
+                metrics.inc('websocket.rejected.room_limit')
+                return LIMIT_REACHED
+            # Interned so every membership of a room shares one string
+            room = sys.intern(room)
+            rooms.add(room)
+            key = (namespace, room)
+            self._rooms.setdefault(key, set()).add(sid)
+            self._active[key] = time.monotonic()
+        return JOINED
+
+    def leave(self, sid: str, room: str, namespace: str = '/') -> bool:
+        with self._lock:
+            rooms = self._connections.get((namespace, sid))
+            if rooms is None or room not in rooms:
+                return False
+            rooms.discard(room)
+            self._remove_member((namespace, room), sid)
+        return True
+
+    def _remove_member(self, key: Tuple[str, str], sid: str):
+        members = self._rooms.get(key)
+        if members is None:
+            return
+        members.discard(sid)
+        if not members:
+            del self._rooms[key]
+            self._active.pop(key, None)
+
+    def has_subscribers(self, room: str, namespace: str = '/') -> bool:
+        return (namespace, room) in self._rooms
+
+    def subscriber_count(self, room: str, namespace: str = '/') -> int:
+        return len(self._rooms.get((namespace, room), ()))
+
+    def rooms_of(self, sid: str, namespace: str = '/') -> Set[str]:
+        return set(self._connections.get((namespace, sid), ()))
+
+    def touch(self, room: str, namespace: str = '/'):
+        """Mark a room active (an event was sent to it), postponing its collection"""
+        key = (namespace, room)
+        if key in self._active:
+            self._active[key] = time.monotonic()
+
+    def collect(self, now: Optional[float] = None) -> int:
+        """Drop rooms idle for idle_seconds with their memberships; returns how many rooms were dropped"""
+        if not self.idle_seconds:
+            return 0
+        deadline = (now if now is not None else time.monotonic()) - self.idle_seconds
+        removed: List[Tuple[str, str, str]] = []
+        with self._lock:
+            idle = [key for key, active in self._active.items() if active < deadline]
+            for key in idle:
+                namespace, room = key
+                for sid in self._rooms.pop(key, ()):
+                    self._connections.get((namespace, sid), set()).discard(room)
+                    removed.append((sid, room, namespace))
+                del self._active[key]
+        if idle:
+            metrics.inc('websocket.rooms.collected', len(idle))
+            logger.info(f"Collected {len(idle)} idle WebSocket room(s), {len(removed)} subscription(s)")
+        if self.leave_callback:
+            for sid, room, namespace in removed:
+                try:
+                    self.leave_callback(sid, room, namespace)
+                except Exception as e:
+                    logger.debug(f"Leaving idle room {room} for {sid} failed: {str(e)}")
+        return len(idle)
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            namespaces: Dict[str, Dict[str, int]] = {}
+            for namespace, _ in self._connections:
+                namespaces.setdefault(namespace, {'connections': 0, 'rooms': 0})['connections'] += 1
+            for namespace, _ in self._rooms:
+                namespaces.setdefault(namespace, {'connections': 0, 'rooms': 0})['rooms'] += 1
+            largest = heapq.nlargest(top, self._rooms.items(), key=lambda item: len(item[1]))
+            subscriptions = sum(len(rooms) for rooms in self._connections.values())
+            connections = len(self._connections)
+        return {
+            'connections': connections,
+            'rooms': sum(n['rooms'] for n in namespaces.values()),
+            'subscriptions': subscriptions,
+            'namespaces': namespaces,
+            'largest_rooms': [
+                {'namespace': namespace, 'room': room, 'subscribers': len(members)}
+                for (namespace, room), members in largest
+            ],
+            'limits': {
+                'max_connections': self.max_connections,
+                'max_rooms_per_connection': self.max_rooms,
+                'idle_seconds': self.idle_seconds,
+            },
+            'rejected': {
+                'connection_limit': metrics.counter('websocket.rejected.connection_limit'),
+                'room_limit': metrics.counter('websocket.rejected.room_limit'),
+            },
+            'collected_rooms': metrics.counter('websocket.rooms.collected'),
+        }
@@ -0,0 +1,233 @@
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+import json
+import os
+import signal
+import threading
+import logging
+from app.core.exceptions import ValidationException
+from app.core.lifecycle import worker_resources
+from app.core.validation import RequestValidationException
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class Tunable:
+    __slots__ = ('name', 'default', 'type', 'minimum', 'maximum', 'description')
+
+    def __init__(self, name: str, default: Any, type: Callable[[Any], Any] = float, minimum: Optional[float] = None,
+                 maximum: Optional[float] = None, description: str = ''):
+        self.name = name
+        self.default = default
+        self.type = type
+        self.minimum = minimum
+        self.maximum = maximum
+        self.description = description
+
+    def parse(self, value: Any) -> Any:
+        if self.type is bool and isinstance(value, str):
+            value = value.lower() == 'true'
+        elif self.type is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError('must be an integer')
+        value = self.type(value)
+        if self.minimum is not None and value < self.minimum:
+            raise ValueError(f'must be >= {self.minimum}')
+        if self.maximum is not None and value > self.maximum:
+            raise ValueError(f'must be <= {self.maximum}')
+        return value
+
+def flatten(document: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """{"xendit": {"timeout": 10}} -> {"xendit.timeout": 10}"""
+    flat = {}
+    for key, value in document.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{name}.'))
+        else:
+            flat[name] = value
+    return flat
+
+class RuntimeSettings:
+    """Tunables that can change while workers keep serving.
+
+    Modules define their tunables (defaults come from Config) and subscribe
+    to changes. A set of new values is validated as a whole and swapped in
+    as one immutable mapping; subscribers then resize or reconfigure live
+    objects. With a settings file, every worker watches it (and re-reads
+    it on SIGHUP), so a change written by one worker reaches all of them.
+    """
+
+    def __init__(self):
+        self._tunables: Dict[str, Tunable] = {}
+        self._values: Mapping[str, Any] = MappingProxyType({})
+        self._overrides: Dict[str, Any] = {}
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+        self.version = 0
+        self.path: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._wakeup = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._watcher_pid: Optional[int] = None
+
+    def define(self, name: str, default: Any, type: Callable[[Any], Any] = float, minimum: Optional[float] = None,
+               maximum: Optional[float] = None, description: str = ''):
+        """Declare a tunable; a value already loaded from the settings file takes effect immediately"""
+        tunable = Tunable(name, default, type, minimum, maximum, description)
+        with self._lock:
+            self._tunables[name] = tunable
+            value = default
+            if name in self._overrides:
+                try:
+                    value = tunable.parse(self._overrides[name])
+                except (TypeError, ValueError) as e:
+                    self.last_error = f"{name}: {str(e)}"
+                    logger.error(f"Ignoring invalid setting {name}={self._overrides[name]!r}: {str(e)}")
+            self._values = MappingProxyType({**self._values, name: value})
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback(changed) with the names and new values of tunables after each change"""
+        self._subscribers.append(callback)
+
+    def get(self, name: str) -> Any:
+        return self._values[name]
+
+    def section(self, prefix: str) -> Dict[str, Any]:
+        """Current values under 'prefix.', keyed without the prefix"""
+        start = len(prefix) + 1
+        return {name[start:]: value for name, value in self._values.items() if name.startswith(prefix + '.')}
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'file': self.path,
+            'last_error': self.last_error,
+            'values': dict(self._values),
+            'overrides': dict(self._overrides),
+            # In the file but not defined in this process (typo, or a module that isn't loaded)
+            'unknown': sorted(name for name in self._overrides if name not in self._tunables),
+            'tunables': {
+                name: {'default': t.default, 'minimum': t.minimum, 'maximum': t.maximum, 'description': t.description}
+                for name, t in sorted(self._tunables.items())
+            },
+        }
+
+    def validate(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse every value, reporting all problems at once; nothing is applied"""
+        parsed, errors = {}, []
+        for name, value in updates.items():
+            tunable = self._tunables.get(name)
+            if tunable is None:
+                errors.append({'loc': [name], 'msg': 'unknown setting', 'type': 'unknown'})
+                continue
+            try:
+                parsed[name] = tunable.parse(value)
+            except (TypeError, ValueError) as e:
+                errors.append({'loc': [name], 'msg': str(e), 'type': 'value_error'})
+        if errors:
+            raise RequestValidationException('settings', errors)
+        return parsed
+
+    def apply(self, overrides: Dict[str, Any], replace: bool = False) -> Dict[str, Any]:
+        """Validate and swap in new values; replace=True resets tunables missing from overrides to defaults"""
+        overrides = flatten(overrides)
+        with self._lock:
+            # Settings for modules not loaded in this process yet are kept until they are defined
+            known = {name: value for name, value in overrides.items() if name in self._tunables}
+            parsed = self.validate(known)
+            base = {name: t.default for name, t in self._tunables.items()} if replace else dict(self._values)
+            values = {**base, **parsed}
+            changed = {name: value for name, value in values.items() if self._values.get(name) != value}
+            self._overrides = overrides if replace else {**self._overrides, **overrides}
+            self._values = MappingProxyType(values)
+            self.version += 1
+            self.last_error = None
+
+        if changed:
+            logger.info(f"Runtime settings changed: {changed}")
+            for callback in self._subscribers:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logger.error(f"Applying runtime settings in {getattr(callback, '__qualname__', callback)} failed: {str(e)}")
+        return changed
+
+    def load_file(self, path: str) -> Dict[str, Any]:
+        """Replace the overrides with the contents of a JSON settings file"""
+        # Recorded first so a broken file is reported once, not on every poll
+        self._mtime = os.stat(path).st_mtime
+        with open(path) as f:
+            document = json.load(f)
+        if not isinstance(document, dict):
+            raise ValueError('settings file must contain a JSON object')
+        return self.apply(document, replace=True)
+
+    def update_file(self, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate updates, merge them into the settings file for every worker, and apply them here"""
+        updates = flatten(updates)
+        self.validate(updates)
+        with self._lock:
+            overrides = {**self._overrides, **updates}
+            if self.path:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(overrides, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            changed = self.apply(overrides, replace=bool(self.path))
+            if self.path:
+                self._mtime = os.stat(self.path).st_mtime
+        return changed
+
+    def reload(self) -> bool:
+        """Re-read the settings file if it changed (or was requested); invalid files leave current values in place"""
+        if not self.path:
+            return False
+        try:
+            if os.stat(self.path).st_mtime == self._mtime:
+                return False
+            self.load_file(self.path)
+            return True
+        except (OSError, ValueError, ValidationException) as e:
+            self.last_error = str(e)
+            logger.error(f"Failed to reload runtime settings from {self.path}: {str(e)}")
+            return False
+
+    def watch(self, path: Optional[str], interval: float = 5.0) -> 'RuntimeSettings':
+        """Load the settings file and poll it for changes in this process"""
+        self.path = path
+        if not path:
+            return self
+        if os.path.exists(path):
+            self.reload()
+        if self._watcher is not None and self._watcher_pid == os.getpid():
+            return self
+        self._watcher_pid = os.getpid()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name='settings-watcher', daemon=True)
+        self._watcher.start()
+        return self
+
+    def _watch(self, interval: float):
+        while True:
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            self.reload()
+
+    def request_reload(self, *args):
+        """SIGHUP handler: wake the watcher to re-read the file now"""
+        self._mtime = None
+        self._wakeup.set()
+
+    def install_signal_handler(self):
+        """Re-read the settings file on SIGHUP; must run in the main thread of the worker process"""
+        if threading.current_thread() is not threading.main_thread() or not hasattr(signal, 'SIGHUP'):
+            return
+        signal.signal(signal.SIGHUP, self.request_reload)
+
+# Create a singleton instance
+runtime_settings = RuntimeSettings()
+
+# Each worker loads and watches the settings file after fork
+worker_resources.register(
+    'runtime_settings', lambda: runtime_settings.watch(Config.SETTINGS_FILE, Config.SETTINGS_RELOAD_INTERVAL)
+)
@@ -0,0 +1,166 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, FrozenSet, List, Optional
+import json
+import random
+import threading
+import time
+import weakref
+import requests
+import logging
+from requests.adapters import HTTPAdapter
+from app.core.access_log import redact_url
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Only requests without side effects are mirrored (PUT/DELETE are idempotent but still write)
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+# Primary credentials never leave for the shadow target; it gets its own (ShadowMirror headers=)
+CREDENTIAL_HEADERS = frozenset({'authorization', 'proxy-authorization', 'cookie', 'x-api-key', 'x-callback-token'})
+
+def diff_json(primary: Any, shadow: Any, ignore: FrozenSet[str] = frozenset(), limit: int = 20) -> List[str]:
+    """Paths ('$.items[2].status') where two decoded JSON documents differ, up to limit"""
+    diffs: List[str] = []
+
+    def walk(a: Any, b: Any, path: str):
+        if len(diffs) >= limit:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in sorted(a.keys() | b.keys()):
+                if key in ignore:
+                    continue
+                if key not in a or key not in b:
+                    diffs.append(f"{path}.{key}")
+                else:
+                    walk(a[key], b[key], f"{path}.{key}")
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(a) != len(b):
+                diffs.append(f"{path}.length")
+            for index, (x, y) in enumerate(zip(a, b)):
+                walk(x, y, f"{path}[{index}]")
+        elif a != b:
+            diffs.append(path)
+
+    walk(primary, shadow, '$')
+    return diffs[:limit]
+
+class ShadowMirror:
+    """Copies a sample of read-only upstream calls to a secondary base URL and compares the answers.
+
+    Mirroring is fire-and-forget: the primary call only pays for a random
+    draw and a non-blocking submit. Mirrored calls run on their own session
+    and a small thread pool; when max_pending calls are already queued or
+    running, new ones are dropped. Status and body mismatches (paths only,
+    never values) and the latency delta to the primary call are recorded
+    under `<prefix>.shadow.*`. Credential headers of the primary call are
+    stripped; `headers` holds the credentials configured for the shadow target.
+    """
+
+    def __init__(self, base_url: str, sample_rate: float = 0.01, max_workers: int = 2, max_pending: int = 100,
+                 timeout: float = 10.0, ignore_fields: FrozenSet[str] = frozenset(), prefix: str = 'upstream',
+                 history: int = 50, headers: Optional[Dict[str, str]] = None):
+        self.base_url = base_url.rstrip('/')
+        self.headers = dict(headers or {})
+        self.sample_rate = sample_rate
+        self.timeout = timeout
+        self.ignore_fields = ignore_fields
+        self.prefix = f"{prefix}.shadow"
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shadow')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.mismatches: Deque[Dict[str, Any]] = deque(maxlen=history)
+        mirrors.add(self)
+
+    def mirror(self, method: str, endpoint: str, headers: Dict[str, str], params: Optional[Dict[str, Any]],
+               status: int, body: bytes, duration_ms: float):
+        """Queue a copy of a finished primary call; never blocks"""
+        if method.upper() not in SAFE_METHODS or random.random() >= self.sample_rate:
+            return
+        if not self._slots.acquire(blocking=False):
+            metrics.inc(f"{self.prefix}.dropped")
+            return
+        headers = {
+            **{name: value for name, value in headers.items() if name.lower() not in CREDENTIAL_HEADERS},
+            **self.headers
+        }
+        try:
+            self._executor.submit(self._run, method, endpoint, headers, params, status, body, duration_ms)
+        except RuntimeError:
+            # Pool already shut down
+            self._slots.release()
+
+    def _run(self, method: str, endpoint: str, headers: Dict[str, str], params: Optional[Dict[str, Any]],
+             status: int, body: bytes, duration_ms: float):
+        try:
+            self._compare(method, endpoint, headers, params, status, body, duration_ms)
+        except Exception as e:
+            logger.debug(f"Shadow comparison for {method} {endpoint} failed: {str(e)}")
+        finally:
+            self._slots.release()
+
+    def _compare(self, method: str, endpoint: str, headers: Dict[str, str], params: Optional[Dict[str, Any]],
+                 status: int, body: bytes, duration_ms: float):
+        metrics.inc(f"{self.prefix}.sent")
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}/{endpoint.lstrip('/')}", headers=headers, params=params, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            metrics.inc(f"{self.prefix}.errors")
+            self._record(method, endpoint, status, None, None, [], type(e).__name__)
+            return
+        shadow_ms = (time.perf_counter() - started) * 1000
+        metrics.observe(f"{self.prefix}.latency_ms", shadow_ms)
+        metrics.observe(f"{self.prefix}.latency_delta_ms", shadow_ms - duration_ms)
+
+        diffs = []
+        if response.status_code != status:
+            metrics.inc(f"{self.prefix}.status_mismatch")
+        elif response.content != body:
+            try:
+                diffs = diff_json(json.loads(body), response.json(), self.ignore_fields)
+            except ValueError:
+                diffs = ['$']
+        if response.status_code != status or diffs:
+            metrics.inc(f"{self.prefix}.mismatch")
+            self._record(method, endpoint, status, response.status_code, shadow_ms - duration_ms, diffs)
+        else:
+            metrics.inc(f"{self.prefix}.match")
+
+    def _record(self, method: str, endpoint: str, status: int, shadow_status: Optional[int],
+                latency_delta_ms: Optional[float], diffs: List[str], error: Optional[str] = None):
+        entry = {
+            'at': time.time(),
+            'method': method.upper(),
+            'endpoint': redact_url(endpoint),
+            'status': status,
+            'shadow_status': shadow_status,
+            'latency_delta_ms': round(latency_delta_ms, 2) if latency_delta_ms is not None else None,
+            'diffs': diffs,
+        }
+        if error:
+            entry['error'] = error
+        self.mismatches.append(entry)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'base_url': self.base_url,
+            'sample_rate': self.sample_rate,
+            'metrics': metrics.snapshot(self.prefix + '.'),
+            'recent_mismatches': list(self.mismatches),
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+# Live mirrors in this process, for the admin report
+mirrors: 'weakref.WeakSet[ShadowMirror]' = weakref.WeakSet()
+
+def shadow_report() -> Dict[str, Any]:
+    return {mirror.prefix: mirror.report() for mirror in list(mirrors)}
@@ -0,0 +1,153 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Set
+import itertools
+import json
+import queue
+import threading
+import logging
+from flask import Response
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ServerSentEvent:
+    id: int
+    event: str
+    data: Dict[str, Any]
+    channel: Optional[str] = None
+    payload: bytes = field(default=b'', repr=False)
+
+    def __post_init__(self):
+        # Encode once at publish time so fan-out to N subscribers is a plain write
+        if not self.payload:
+            body = json.dumps(self.data, separators=(',', ':'), default=str)
+            self.payload = f"id: {self.id}\nevent: {self.event}\ndata: {body}\n\n".encode()
+
+class Subscription:
+    """A single SSE consumer with its own bounded delivery queue"""
+
+    def __init__(self, stream: "EventStream", channels: Optional[Set[str]],
+                 predicate: Optional[Callable[[ServerSentEvent], bool]], maxsize: int):
+        self.stream = stream
+        self.channels = channels
+        self.predicate = predicate
+        self.queue = stream.create_queue(maxsize)
+        self.closed = False
+
+    def matches(self, event: ServerSentEvent) -> bool:
+        if self.channels is not None and event.channel not in self.channels:
+            return False
+        return self.predicate is None or self.predicate(event)
+
+    def deliver(self, event: Optional[ServerSentEvent]) -> bool:
+        """Queue an event without blocking the publisher; False if the consumer is too slow"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        self.closed = True
+        self.stream.unsubscribe(self)
+        self.deliver(None)
+
+class EventStream:
+    """In-memory event source with a bounded replay ring for Server-Sent Events"""
+
+    def __init__(self, replay_size: int = 1000, subscriber_queue_size: int = 100,
+                 keepalive: float = 15.0, retry_ms: int = 3000,
+                 queue_factory: Optional[Callable[[int], Any]] = None):
+        self._lock = threading.Lock()
+        self._replay: Deque[ServerSentEvent] = deque(maxlen=replay_size)
+        self._ids = itertools.count(1)
+        self._subscribers: Set[Subscription] = set()
+        self._queue_factory = queue_factory
+        self.subscriber_queue_size = subscriber_queue_size
+        self.keepalive = keepalive
+        self.retry_ms = retry_ms
+
+    def create_queue(self, maxsize: int):
+        """Create a delivery queue suited to the running server (green or threaded)"""
+        if self._queue_factory:
+            return self._queue_factory(maxsize)
+        return queue.Queue(maxsize)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any], channel: Optional[str] = None) -> ServerSentEvent:
+        """Record an event in the replay ring and fan it out to matching subscribers"""
+        with self._lock:
+            sse = ServerSentEvent(id=next(self._ids), event=event, data=data, channel=channel)
+            self._replay.append(sse)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            if subscription.matches(sse) and not subscription.deliver(sse):
+                # Slow consumer: drop it, the client reconnects with Last-Event-ID
+                logger.warning(f"Dropping slow SSE subscriber on channel(s) {subscription.channels}")
+                self.unsubscribe(subscription)
+                subscription.closed = True
+        return sse
+
+    def subscribe(self, channels: Optional[Iterable[str]] = None, last_event_id: Optional[str] = None,
+                  predicate: Optional[Callable[[ServerSentEvent], bool]] = None) -> Subscription:
+        """Register a subscriber, queueing any replayable events after last_event_id"""
+        subscription = Subscription(
+            self, set(channels) if channels is not None else None, predicate, self.subscriber_queue_size
+        )
+        resume_from = self._parse_event_id(last_event_id)
+
+        with self._lock:
+            if resume_from is not None:
+                backlog = [e for e in self._replay if e.id > resume_from and subscription.matches(e)]
+                # A backlog larger than the queue cannot be replayed; keep the newest events
+                for sse in backlog[-self.subscriber_queue_size:]:
+                    subscription.deliver(sse)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def iter_events(self, subscription: Subscription) -> Iterator[bytes]:
+        """Yield encoded SSE frames for a subscription until it is closed"""
+        try:
+            yield f"retry: {self.retry_ms}\n\n".encode()
+            while not subscription.closed:
+                try:
+                    sse = subscription.queue.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+                    continue
+                if sse is None:
+                    break
+                yield sse.payload
+        finally:
+            self.unsubscribe(subscription)
+
+    def response(self, channels: Optional[Iterable[str]] = None, last_event_id: Optional[str] = None,
+                 predicate: Optional[Callable[[ServerSentEvent], bool]] = None) -> Response:
+        """Build a streaming text/event-stream response for the given filter"""
+        subscription = self.subscribe(channels, last_event_id, predicate)
+        return Response(
+            self.iter_events(subscription),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
+            }
+        )
+
+    @staticmethod
+    def _parse_event_id(last_event_id: Optional[str]) -> Optional[int]:
+        if last_event_id is None:
+            return None
+        try:
+            return int(last_event_id)
+        except (TypeError, ValueError):
+            return None
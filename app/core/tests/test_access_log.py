@@ -0,0 +1,72 @@
+import json
+import logging
+import queue
+import pytest
+from flask import Flask, jsonify
+from app.core.access_log import AccessLog, BoundedQueueHandler, init_access_log, redact, redact_url
+from app.core.metrics import metrics
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_redacts_secrets_and_card_numbers():
+    assert redact({'Authorization': 'Basic abc', 'card': {'card_number': '4000000000001091', 'cvn': '123'},
+                   'note': 'paid with 4000 0000 0000 1091'}) == {
+        'Authorization': '[REDACTED]',
+        'card': {'card_number': '[REDACTED]', 'cvn': '[REDACTED]'},
+        'note': 'paid with ************1091',
+    }
+    assert redact_url('https://api.example.com/v1/tokens?api_key=s3cret&limit=10') == \
+        'https://api.example.com/v1/tokens?api_key=[REDACTED]&limit=10'
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = BoundedQueueHandler(queue.Queue(1))
+    before = metrics.counter('logging.dropped')
+    for _ in range(3):
+        handler.handle(logging.makeLogRecord({'msg': 'event'}))
+    assert metrics.counter('logging.dropped') == before + 2
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    path = tmp_path / 'access.log'
+    log = AccessLog(str(path), sample_rates={'/skipped*': 0}, slow_ms=60000, log_headers=True)
+    monkeypatch.setattr('app.core.access_log.access_log', log)
+    yield path, log
+    log.close()
+
+@pytest.fixture
+def client(log_path):
+    app = Flask(__name__)
+    init_access_log(app)
+    app.add_url_rule('/payments/<payment_id>', 'payment', lambda payment_id: jsonify({'id': payment_id}))
+    app.add_url_rule('/skipped', 'skipped', lambda: jsonify({}))
+    app.add_url_rule('/fails', 'fails', lambda: (jsonify({}), 502))
+    return app.test_client()
+
+def test_logs_request_with_ids_and_redacted_headers(client, log_path):
+    path, log = log_path
+    response = client.get('/payments/pr-1?card_number=4000000000001091', headers={
+        'Authorization': 'Basic secret', 'X-Request-ID': 'req-1', 'traceparent': f'00-{TRACE_ID}-00f067aa0ba902b7-01'
+    })
+    log.close()
+
+    assert response.headers['X-Request-ID'] == 'req-1'
+    assert response.headers['X-Trace-ID'] == TRACE_ID
+    [entry] = _lines(path)
+    assert entry['request_id'] == 'req-1' and entry['trace_id'] == TRACE_ID
+    assert entry['route'] == '/payments/<payment_id>' and entry['status'] == 200
+    assert entry['query'] == {'card_number': '[REDACTED]'}
+    assert entry['headers']['Authorization'] == '[REDACTED]'
+
+def test_sampling_keeps_errors_and_slow_requests(client, log_path):
+    path, log = log_path
+    client.get('/skipped')
+    client.get('/fails')
+    log.slow_ms = 0
+    client.get('/skipped')
+    log.close()
+
+    entries = _lines(path)
+    assert [(entry['route'], entry.get('slow', False)) for entry in entries] == [('/fails', False), ('/skipped', True)]
@@ -0,0 +1,44 @@
+from unittest.mock import Mock
+import pytest
+from app.core.client_pool import ClientPool
+from app.core.exceptions import NotFoundException
+from app.core.resilience import CircuitBreaker
+
+def _factory(name, settings):
+    client = Mock(metrics_prefix=f'test.pool.{name}', rate_limiter=None, circuit_breaker=None)
+    client.settings = settings
+    return client
+
+def test_reload_keeps_unchanged_clients_and_retires_others():
+    pool = ClientPool(_factory, {'a': {'api_key': '1'}, 'b': {'api_key': '2'}}, drain_seconds=0)
+    a, b = pool.get('a'), pool.get('b')
+
+    pool.reload({'a': {'api_key': '1'}, 'c': {'api_key': '3'}})
+
+    assert pool.get('a') is a
+    assert pool.accounts == ['a', 'c']
+    with pytest.raises(NotFoundException):
+        pool.get('b')
+
+def test_weighted_spread_skips_open_circuits():
+    pool = ClientPool(_factory, {'a': {'weight': 2}, 'b': {}, 'c': {}})
+    picks = [pool.select() for _ in range(8)]
+    assert picks.count('a') == 4 and picks.count('b') == 2
+
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    pool.get('a').circuit_breaker = breaker
+    assert 'a' not in {pool.select() for _ in range(4)}
+
+def test_selection_order_header_owner_rule():
+    pool = ClientPool(_factory, {'a': {}, 'b': {}}, default='a',
+                      rules=[{'path': '/api/xendit/qr-codes*', 'account': 'b'}])
+    pool.remember('pr-1', 'b')
+
+    assert pool.select(account='a', resource_id='pr-1') == 'a'
+    assert pool.select(resource_id='pr-1') == 'b'
+    assert pool.select(path='/api/xendit/qr-codes', method='POST') == 'b'
+    # An unknown owner is never spread across accounts
+    assert {pool.select(resource_id='pr-unknown') for _ in range(4)} == {'a'}
+    with pytest.raises(NotFoundException):
+        pool.select(account='missing')
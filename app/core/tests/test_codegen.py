@@ -0,0 +1,85 @@
+import json
+from unittest.mock import Mock
+from flask import Blueprint, Flask
+from app.core.codegen import read_collection, render_endpoints, render_schemas
+from app.core.dispatch import Endpoint, register_endpoint_routes
+from app.core.exceptions import ThirdPartyAPIException
+
+def _request(name, method, host, path, body=None):
+    request = {'method': method, 'url': {'host': host.split('.'), 'path': path}}
+    if body is not None:
+        request['body'] = {'mode': 'raw', 'raw': body}
+    return {'name': name, 'request': request}
+
+COLLECTION = {'item': [
+    {'name': 'Payments', 'item': [
+        _request('Create', 'POST', 'api.example.com', ['v2', 'payments'],
+                 '{"reference_id": "order-{{$timestamp}}", "amount": {{amount}}, "items": []}'),
+        _request('Create again', 'POST', 'api.example.com', ['v2', 'payments'], '{"amount": 100.5, "metadata": {}}'),
+        _request('Legacy create', 'POST', 'api.example.com', ['payments'], '{"amount": 1}'),
+        _request('Get', 'GET', 'api.example.com', ['v2', 'payments', ':id']),
+        _request('Get example', 'GET', 'api.example.com', ['v2', 'payments', 'pay_61cb3576-3a25']),
+        _request('Expire', 'POST', 'api.example.com', ['v2', 'payments', '{{payment-id}}', 'expire']),
+        _request('By reference', 'GET', 'api.example.com', ['transfers', 'reference={reference}']),
+    ]},
+    _request('Balance', 'GET', '{{url}}', ['balance']),
+    _request('Sample notification', 'POST', 'your endpoint here', None),
+]}
+
+def _specs(tmp_path):
+    path = tmp_path / 'collection.json'
+    path.write_text(json.dumps(COLLECTION))
+    return {spec.name: spec for spec in read_collection(str(path), hosts=('api.example.com', '{{url}}'))}
+
+def test_collection_is_merged_into_named_endpoints(tmp_path):
+    specs = _specs(tmp_path)
+
+    assert sorted(specs) == [
+        'create_payments_v1', 'create_payments_v2', 'expire_payments', 'get_balance', 'get_payments', 'get_transfers'
+    ]
+    assert specs['get_payments'].path == '/v2/payments/{id}'
+    assert (specs['expire_payments'].path, specs['expire_payments'].params) == ('/v2/payments/{payment_id}/expire', ('payment_id',))
+    assert specs['get_transfers'].path == '/transfers/reference={reference}'
+    assert specs['create_payments_v2'].fields == {
+        'amount': 'Union[int, float]', 'items': 'List[Any]', 'metadata': 'Dict[str, Any]', 'reference_id': 'str'
+    }
+
+def test_rendered_modules_are_importable(tmp_path):
+    specs = list(_specs(tmp_path).values())
+    namespace = {}
+    exec(render_endpoints(specs, 'collection.json', 'make generate', 'codegentest.'), namespace)
+    endpoints = namespace['ENDPOINTS']
+
+    assert endpoints['get_payments'] == Endpoint('GET', '/v2/payments/{id}', params=('id',), hedge=True)
+    assert endpoints['create_payments_v2'].schema == 'codegentest.create_payments_v2'
+    assert endpoints['get_payments'].rule == '/v2/payments/<id>'
+
+    exec(render_schemas(specs, 'collection.json', 'make generate', 'codegentest.'), namespace)
+    assert namespace['request_schemas'].validate('codegentest.create_payments_v2', {'amount': 5, 'extra': 'x'}) == {
+        'amount': 5, 'extra': 'x'
+    }
+
+def test_routes_dispatch_through_the_table():
+    endpoints = {
+        'get_payments': Endpoint('GET', '/v2/payments/{id}', params=('id',), hedge=True),
+        'create_payments': Endpoint('POST', '/v2/payments'),
+        'create_refunds': Endpoint('POST', '/refunds'),
+    }
+    client = Mock()
+    client.call.return_value = b'{"id": "p1"}'
+    bp = Blueprint('dispatchtest', __name__)
+    register_endpoint_routes(bp, endpoints, lambda: client, exclude={'create_refunds'})
+    app = Flask(__name__)
+    app.register_blueprint(bp, url_prefix='/api/test')
+    http = app.test_client()
+
+    response = http.get('/api/test/v2/payments/p1?expand=a&expand=b')
+    assert response.status_code == 200 and response.get_json() == {'id': 'p1'}
+    client.call.assert_called_with('get_payments', {'id': 'p1'}, data=None, params={'expand': ['a', 'b']}, raw=True)
+
+    assert http.post('/api/test/v2/payments', json={'amount': 1}).status_code == 201
+    client.call.assert_called_with('create_payments', {}, data={'amount': 1}, params=None, raw=True)
+    assert http.post('/api/test/refunds', json={}).status_code == 404
+
+    client.call.side_effect = ThirdPartyAPIException('Not found', status_code=404)
+    assert http.get('/api/test/v2/payments/p2').status_code == 400
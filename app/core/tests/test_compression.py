@@ -0,0 +1,61 @@
+import gzip
+import pytest
+from flask import Flask, Response, jsonify
+from app import init_extensions
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config.update(COMPRESSION_MIN_SIZE=100)
+    init_extensions(app)
+
+    @app.route('/payments/<payment_id>')
+    def get_payment(payment_id):
+        return jsonify({'id': payment_id, 'metadata': {'note': 'x' * 500}})
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/stream')
+    def stream():
+        return Response(iter([b'data: 1\n\n']), mimetype='text/event-stream')
+
+    return app.test_client()
+
+def test_gzip_negotiated_above_threshold(client):
+    response = client.get('/payments/pr-1', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data).startswith(b'{')
+
+def test_brotli_preferred_when_available(client):
+    brotli = pytest.importorskip('brotli')
+    response = client.get('/payments/pr-1', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data).startswith(b'{')
+
+def test_small_and_streamed_responses_are_not_compressed(client):
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    stream = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in stream.headers
+    assert 'ETag' not in stream.headers
+
+def test_unchanged_body_returns_304(client):
+    first = client.get('/payments/pr-1', headers={'Accept-Encoding': 'gzip'})
+    etag = first.headers['ETag']
+
+    second = client.get('/payments/pr-1', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    other = client.get('/payments/pr-2', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+    assert second.status_code == 304
+    assert second.data == b''
+    assert other.status_code == 200
+
+def test_identity_and_gzip_have_distinct_etags(client):
+    identity = client.get('/payments/pr-1').headers['ETag']
+    gzipped = client.get('/payments/pr-1', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    assert identity != gzipped
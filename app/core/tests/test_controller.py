@@ -0,0 +1,34 @@
+from dataclasses import FrozenInstanceError
+import json
+import pytest
+from flask import Flask
+from app.core.controller import BaseController
+from app.core.dto import ResponseDTO
+from app.core.exceptions import NotFoundException
+
+@pytest.fixture
+def controller():
+    with Flask(__name__).app_context():
+        yield BaseController()
+
+def test_dtos_are_slotted_and_immutable():
+    response = ResponseDTO.success({'id': 'pr-1'})
+    assert not hasattr(response, '__dict__')
+    with pytest.raises(FrozenInstanceError):
+        response.status = 500
+
+def test_error_bodies_are_reused(controller):
+    def missing():
+        raise NotFoundException()
+
+    first, status = controller.handle_request(missing)
+    second, _ = controller.handle_request(missing)
+
+    assert status == 404
+    assert json.loads(first.get_data()) == {'status': 'error', 'message': 'Resource not found', 'data': {}}
+    assert first.response[0] is second.response[0]
+
+def test_dict_data_still_uses_jsonify(controller):
+    response, status = controller.handle_request(lambda: ResponseDTO.success({'id': 'pr-1'}))
+    assert status == 200
+    assert response.get_json() == {'status': 'success', 'message': 'Success', 'data': {'id': 'pr-1'}}
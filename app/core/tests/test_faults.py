@@ -0,0 +1,94 @@
+from unittest.mock import Mock, patch
+import io
+import time
+import pytest
+import requests
+from flask import Flask
+from app.core.admin import create_admin_blueprint
+from app.core.exceptions import ThirdPartyAPIException
+from app.core.faults import FaultInjectingAdapter, FaultInjector, fault_injector, parse_rules
+from app.core.third_party import ThirdPartyAPI
+
+class ExampleAPI(ThirdPartyAPI):
+    def get_headers(self):
+        return {}
+
+def _send(adapter, method='GET', url='https://api.example.com/payment_requests/pr-1', timeout=5):
+    request = requests.Request(method, url).prepare()
+    return adapter.send(request, stream=True, timeout=timeout)
+
+def _upstream(body=b'{"id": "pr-1"}'):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return Mock(send=Mock(return_value=response))
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        parse_rules([{'status': 200}])
+    with pytest.raises(ValueError):
+        parse_rules([{'latency': {'distribution': 'uniform', 'min_ms': 10, 'max_ms': 5}}])
+    assert parse_rules('[{"path": "/v2/*", "reset": true}]') == [{'path': '/v2/*', 'reset': True}]
+
+def test_rules_match_service_method_and_path():
+    injector = FaultInjector(enabled=True)
+    injector.set_rules([{'service': 'xendit.*', 'method': 'POST', 'path': '/payment_requests*', 'status': 503}])
+    upstream = _upstream()
+    adapter = FaultInjectingAdapter(upstream, 'xendit.default', injector)
+
+    assert _send(adapter).status_code == 200
+    injected = _send(adapter, 'POST')
+    assert injected.status_code == 503 and injected.json()['error_code'] == 'INJECTED_FAULT'
+    assert upstream.send.call_count == 1
+    assert _send(FaultInjectingAdapter(_upstream(), 'other', injector), 'POST').status_code == 200
+
+def test_resets_timeouts_and_slow_bodies():
+    injector = FaultInjector(enabled=True)
+    adapter = FaultInjectingAdapter(_upstream(b'x' * 1000), 'xendit.default', injector)
+
+    injector.set_rules([{'reset': True}])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _send(adapter)
+
+    injector.set_rules([{'latency': {'ms': 200}}])
+    started = time.perf_counter()
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        _send(adapter, timeout=(1, 0.05))
+    assert time.perf_counter() - started < 0.15
+
+    injector.set_rules([{'body_bytes_per_second': 10000}])
+    response = _send(adapter)
+    started = time.perf_counter()
+    assert len(response.content) == 1000
+    assert time.perf_counter() - started >= 0.09
+
+def test_injected_errors_reach_the_client_and_breaker():
+    with patch.object(fault_injector, 'enabled', True):
+        api = ExampleAPI('https://api.example.com', config={'breaker_failure_threshold': 2})
+    fault_injector.set_rules([{'status': 503}])
+    try:
+        for _ in range(2):
+            with pytest.raises(ThirdPartyAPIException) as error:
+                api._make_request('GET', '/payment_requests/pr-1')
+            assert error.value.status_code == 503
+        assert not api.circuit_breaker.allow()
+    finally:
+        fault_injector.set_rules([])
+
+def test_admin_endpoint_updates_rules():
+    app = Flask(__name__)
+    app.config['ADMIN_TOKEN'] = 'secret'
+    app.register_blueprint(create_admin_blueprint(), url_prefix='/admin')
+    client = app.test_client()
+    headers = {'X-Admin-Token': 'secret'}
+
+    assert client.get('/admin/faults', headers=headers).status_code == 404
+    with patch.object(fault_injector, 'enabled', True):
+        rejected = client.post('/admin/faults', json=[{'probability': 2}], headers=headers)
+        applied = client.post('/admin/faults', json={'rules': [{'path': '/v2/*', 'status': 502}]}, headers=headers)
+        assert fault_injector.rules[0].status == 502
+        cleared = client.delete('/admin/faults', headers=headers)
+
+    assert rejected.status_code == 400
+    assert applied.status_code == 200 and applied.json['rules'] == [{'path': '/v2/*', 'status': 502}]
+    assert cleared.json['rules'] == [] and fault_injector.rules == ()
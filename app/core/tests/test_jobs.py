@@ -0,0 +1,189 @@
+import threading
+import time
+import pytest
+from app.core.exceptions import ThirdPartyAPIException
+from app.core.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobRuntime, JobStore, JobType, JobWorkerPool, renew_lease
+from app.core.metrics import metrics
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    yield store
+    store.close()
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_claim_leases_oldest_job_and_reclaims_expired_lease(store):
+    first = store.enqueue('expire', {'n': 1}, max_attempts=2)
+    store.enqueue('expire', {'n': 2})
+
+    job = store.claim(['expire'], 'worker-a', lease_seconds=-1, resumable=['expire'])
+    assert job['id'] == first['id'] and job['status'] == RUNNING and job['attempts'] == 1
+
+    # The lease already expired, so another worker picks the same job up again while attempts remain
+    again = store.claim(['expire'], 'worker-b', lease_seconds=-1, resumable=['expire'])
+    assert again['id'] == first['id'] and again['attempts'] == 2
+    assert store.claim(['expire'], 'worker-c', resumable=['expire'])['id'] != first['id']
+    assert store.claim(['refund'], 'worker-b') is None
+
+    assert [job['id'] for job in store.abandon_expired(['expire'], resumable=['expire'])] == [first['id']]
+    assert store.get(first['id'])['status'] == FAILED
+
+def test_expired_lease_of_non_resumable_job_is_abandoned(store):
+    job = store.enqueue('refund', {'payment_id': 'p-1'})
+    store.claim(['refund'], 'worker-a', lease_seconds=-1)
+
+    assert store.claim(['refund'], 'worker-b') is None
+    abandoned = store.abandon_expired(['refund'])
+    assert abandoned[0]['id'] == job['id'] and abandoned[0]['status'] == FAILED
+    assert 'unknown' in abandoned[0]['error']
+
+def test_renew_extends_only_the_holders_lease(store):
+    store.enqueue('expire', {})
+    job = store.claim(['expire'], 'worker-a', lease_seconds=-1, resumable=['expire'])
+
+    assert not store.renew(job['id'], 'worker-b')
+    assert store.renew(job['id'], 'worker-a', lease_seconds=60)
+    assert store.claim(['expire'], 'worker-b', resumable=['expire']) is None
+
+def test_fail_requeues_until_attempts_run_out(store):
+    store.enqueue('refund', {}, max_attempts=2)
+    job = store.claim(['refund'], 'w')
+    store.fail(job['id'], 'w', 'boom', retry_delay=0)
+    assert store.get(job['id'])['status'] == QUEUED
+
+    job = store.claim(['refund'], 'w')
+    store.fail(job['id'], 'w', 'boom again', retry_delay=0)
+    failed = store.get(job['id'])
+    assert failed['status'] == FAILED and failed['error'] == 'boom again'
+
+def test_worker_that_lost_its_lease_cannot_finish_the_job(store):
+    store.enqueue('expire', {})
+    job = store.claim(['expire'], 'worker-a', lease_seconds=-1, resumable=['expire'])
+    store.claim(['expire'], 'worker-b', resumable=['expire'])
+
+    assert not store.complete(job['id'], 'worker-a', 'stale')
+    assert not store.fail(job['id'], 'worker-a', 'stale', retry_delay=0)
+    assert store.get(job['id'])['status'] == RUNNING
+    assert store.complete(job['id'], 'worker-b', 'done')
+    assert store.get(job['id'])['result'] == 'done'
+
+def test_enqueue_with_same_ids_is_idempotent(store):
+    store.enqueue_many('expire', [{'id': 'pm-1'}], job_ids=['job-1'])
+    store.enqueue_many('expire', [{'id': 'pm-2'}], job_ids=['job-1'])
+    assert store.counts() == {'expire': {QUEUED: 1}}
+    assert store.get('job-1')['payload'] == {'id': 'pm-1'}
+
+def test_pool_runs_jobs_and_reports_completions(store):
+    finished = []
+    pool = JobWorkerPool(store, {'echo': JobType(lambda payload: {'echo': payload['n']}, concurrency=2)},
+                         on_finished=finished.append, poll_interval=0.05)
+    runtime = JobRuntime(store, pool)
+    try:
+        jobs = runtime.enqueue('echo', [{'n': n} for n in range(5)])
+        assert _wait_for(lambda: len(finished) == 5)
+    finally:
+        pool.stop()
+    assert {job['status'] for job in finished} == {SUCCEEDED}
+    assert store.get(jobs[3]['id'])['result'] == {'echo': 3}
+
+def test_pool_does_not_retry_non_retryable_errors(store):
+    finished = []
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        raise ThirdPartyAPIException('declined', status_code=400)
+
+    spec = JobType(handler, max_attempts=3, retry_delay=0, retryable=lambda e: e.status_code >= 500)
+    pool = JobWorkerPool(store, {'refund': spec}, on_finished=finished.append, poll_interval=0.05)
+    pool.start()
+    try:
+        job = store.enqueue('refund', {'payment_id': 'p-1'}, max_attempts=3)
+        pool.notify('refund')
+        assert _wait_for(lambda: finished)
+    finally:
+        pool.stop()
+    assert len(calls) == 1
+    assert finished[0]['id'] == job['id'] and finished[0]['status'] == FAILED
+
+def test_pool_applies_rate_limit_per_job_type(store):
+    metrics.reset()
+    done = threading.Event()
+    count = []
+
+    def handler(payload):
+        count.append(payload)
+        if len(count) == 15:
+            done.set()
+
+    # A burst of 10, then 10 jobs/second: the last five take at least ~0.5s
+    pool = JobWorkerPool(store, {'slow': JobType(handler, concurrency=3, rate_limit=10)}, poll_interval=0.05)
+    store.enqueue_many('slow', [{} for _ in range(15)])
+    started = time.monotonic()
+    pool.start()
+    try:
+        assert done.wait(5)
+    finally:
+        pool.stop()
+    assert time.monotonic() - started >= 0.4
+    assert _wait_for(lambda: metrics.snapshot('jobs.slow.')['counters'].get('jobs.slow.succeeded') == 15)
+
+def test_pool_renews_leases_of_running_jobs(store):
+    release = threading.Event()
+    pool = JobWorkerPool(store, {'slow': JobType(lambda payload: release.wait(5))}, poll_interval=0.05,
+                         lease_seconds=0.3)
+    job = store.enqueue('slow', {})
+    pool.start()
+    try:
+        assert _wait_for(lambda: store.get(job['id'])['status'] == RUNNING)
+        time.sleep(0.6)
+        # Still leased, so no other worker may take it over
+        assert store.claim(['slow'], 'other', resumable=['slow']) is None
+        release.set()
+        assert _wait_for(lambda: store.get(job['id'])['status'] == SUCCEEDED)
+    finally:
+        release.set()
+        pool.stop()
+    assert store.get(job['id'])['attempts'] == 1
+
+def test_handler_stops_when_its_lease_was_taken_over(store):
+    metrics.reset_prefix('jobs.import.')
+    def handler(payload):
+        renew_lease()
+        # Another worker takes the job over after an expired lease
+        store._conn.execute("UPDATE jobs SET locked_by = 'other'")
+        renew_lease()
+        return 'ran twice'
+
+    pool = JobWorkerPool(store, {'import': JobType(handler)}, poll_interval=0.05)
+    job = store.enqueue('import', {})
+    pool.start()
+    try:
+        assert _wait_for(lambda: metrics.snapshot('jobs.import.')['counters'].get('jobs.import.lease_lost') == 1)
+    finally:
+        pool.stop()
+    assert store.get(job['id'])['status'] == RUNNING
+
+def test_pool_discards_outcome_after_takeover(store):
+    metrics.reset_prefix('jobs.takeover.')
+    finished = []
+
+    def handler(payload):
+        store._conn.execute("UPDATE jobs SET locked_by = 'other'")
+        return 'stale'
+
+    pool = JobWorkerPool(store, {'takeover': JobType(handler)}, on_finished=finished.append, poll_interval=0.05)
+    job = store.enqueue('takeover', {})
+    pool.start()
+    try:
+        assert _wait_for(lambda: metrics.snapshot('jobs.takeover.')['counters'].get('jobs.takeover.lease_lost') == 1)
+    finally:
+        pool.stop()
+    assert finished == [] and store.get(job['id'])['status'] == RUNNING
@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+from flask import Flask
+from app.core.health import create_health_blueprint
+from app.core.lifecycle import WorkerResources, worker_resources
+
+def test_resource_is_created_once_per_process():
+    resources = WorkerResources()
+    factory = Mock(side_effect=lambda: object())
+    resources.register('client', factory)
+
+    first = resources.get('client')
+
+    assert resources.get('client') is first
+    assert factory.call_count == 1
+
+def test_fork_discards_inherited_instances():
+    resources = WorkerResources()
+    resources.register('client', lambda: object())
+    inherited = resources.get('client')
+    resources.mark_ready()
+
+    resources.reset_after_fork()
+
+    assert resources.get('client') is not inherited
+    assert not resources.ready.is_set()
+
+def test_proxy_resolves_lazily():
+    resources = WorkerResources()
+    client = Mock()
+    resources.register('client', lambda: client)
+    proxy = resources.proxy('client')
+
+    proxy.ping()
+
+    client.ping.assert_called_once()
+
+def test_warmup_marks_ready_even_if_a_resource_fails():
+    resources = WorkerResources()
+    healthy, prepare = Mock(), Mock()
+    resources.add_prepare_hook(prepare)
+    resources.register('healthy', lambda: healthy, warmup=lambda c: c.warmup())
+    resources.register('broken', lambda: Mock(), warmup=Mock(side_effect=OSError("DNS failure")))
+
+    resources.warmup()
+
+    prepare.assert_called_once()
+    healthy.warmup.assert_called_once()
+    assert resources.ready.is_set()
+
+def test_shutdown_closes_in_reverse_order():
+    resources = WorkerResources()
+    closed = []
+    resources.register('api', lambda: 'api', close=closed.append)
+    resources.register('use_case', lambda: 'use_case', close=closed.append)
+    resources.get('api')
+    resources.get('use_case')
+
+    resources.shutdown()
+
+    assert closed == ['use_case', 'api']
+
+def test_readiness_probe_waits_for_warmup():
+    app = Flask(__name__)
+    app.register_blueprint(create_health_blueprint(), url_prefix='/healthz')
+    client = app.test_client()
+    worker_resources.ready.clear()
+
+    assert client.get('/healthz/live').status_code == 200
+    assert client.get('/healthz/ready').status_code == 503
+    worker_resources.mark_ready()
+    assert client.get('/healthz/ready').status_code == 200
@@ -0,0 +1,97 @@
+from unittest.mock import Mock
+import io
+import json
+import pytest
+import requests
+from flask import Flask, request
+from app.core.exceptions import ResponseTooLargeException
+from app.core.limits import init_limits, list_response
+from app.core.metrics import metrics
+from app.core.third_party import ThirdPartyAPI
+
+class ExampleAPI(ThirdPartyAPI):
+    def get_headers(self):
+        return {}
+
+class Item:
+    def __init__(self, n):
+        self.n = n
+
+    def dict(self):
+        return {'n': self.n}
+
+def _streamed_response(body: bytes, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    return response
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(MAX_CONTENT_LENGTH=16, BODY_LIMITS={'/uploads/*': 1024}, LIST_STREAM_THRESHOLD=3)
+    init_limits(app)
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return {'size': len(request.get_data())}
+
+    @app.route('/uploads/<name>', methods=['POST'])
+    def upload(name):
+        return {'size': len(request.get_data())}
+
+    @app.route('/items/<int:count>')
+    def items(count):
+        upstream = ExampleAPI('https://api.example.com')
+        upstream.session.request = Mock(return_value=_streamed_response(b'{"ok": true}'))
+        upstream._make_request('GET', '/items')
+        return list_response([Item(n) for n in range(count)])
+
+    return app
+
+def test_body_limit_is_chosen_per_route(app):
+    client = app.test_client()
+
+    rejected = client.post('/echo', data=b'x' * 100)
+    accepted = client.post('/uploads/file', data=b'x' * 100)
+
+    assert rejected.status_code == 413 and rejected.json['error'] == 'Request body exceeds 16 bytes'
+    assert accepted.status_code == 200 and accepted.json == {'size': 100}
+
+def test_upstream_body_is_cut_off_at_max_response_bytes():
+    api = ExampleAPI('https://api.example.com', config={'max_response_bytes': 64})
+    api.session.request = Mock(return_value=_streamed_response(b'[' + b'1,' * 100 + b'1]'))
+    with pytest.raises(ResponseTooLargeException):
+        api._make_request('GET', '/items')
+
+    # A declared Content-Length is rejected before anything is read
+    response = _streamed_response(b'', {'Content-Length': '1000'})
+    response.raw = Mock()
+    api.session.request = Mock(return_value=response)
+    with pytest.raises(ResponseTooLargeException):
+        api._make_request('GET', '/items')
+    response.raw.read.assert_not_called()
+    response.raw.close.assert_called_once()
+
+    api.session.request = Mock(return_value=_streamed_response(b'{"id": "1"}'))
+    assert api._make_request('GET', '/items/1') == {'id': '1'}
+    assert api.session.request.call_args.kwargs['stream'] is True
+
+def test_long_lists_are_streamed_with_the_same_body(app):
+    client = app.test_client()
+
+    short = client.get('/items/3')
+    long = client.get('/items/250')
+
+    assert 'Content-Length' in short.headers and short.json == [{'n': 0}, {'n': 1}, {'n': 2}]
+    assert 'Content-Length' not in long.headers
+    assert json.loads(long.get_data()) == [{'n': n} for n in range(250)]
+
+def test_buffered_bytes_are_recorded_per_route(app):
+    metrics.reset_prefix('limits.routes.items')
+    app.test_client().get('/items/2')
+
+    histograms = metrics.snapshot('limits.routes.items')['histograms']
+    assert histograms['limits.routes.items.upstream_bytes']['mean'] == len(b'{"ok": true}')
+    assert 'limits.routes.items.response_bytes' in histograms
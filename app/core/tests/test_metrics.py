@@ -0,0 +1,39 @@
+from flask import Flask
+from app.core.admin import create_admin_blueprint
+from app.core.metrics import MetricsRegistry, metrics
+
+def test_histogram_percentiles():
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.observe('latency_ms', value)
+
+    snapshot = registry.snapshot()['histograms']['latency_ms']
+
+    assert snapshot['count'] == 100
+    assert snapshot['p50'] == 50
+    assert snapshot['p99'] == 99
+
+def test_snapshot_filters_by_prefix():
+    registry = MetricsRegistry()
+    registry.inc('upstream.xendit.errors')
+    registry.inc('upstream.other.errors', 2)
+
+    assert registry.snapshot('upstream.xendit')['counters'] == {'upstream.xendit.errors': 1}
+
+def _admin_client(token):
+    app = Flask(__name__)
+    app.config['ADMIN_TOKEN'] = token
+    app.register_blueprint(create_admin_blueprint(), url_prefix='/admin')
+    return app.test_client()
+
+def test_admin_metrics_requires_token():
+    client = _admin_client('secret')
+    metrics.inc('test.admin.requests')
+
+    assert client.get('/admin/metrics').status_code == 401
+    response = client.get('/admin/metrics?prefix=test.admin', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['counters']['test.admin.requests'] >= 1
+
+def test_admin_endpoints_hidden_without_token():
+    assert _admin_client(None).get('/admin/metrics').status_code == 404
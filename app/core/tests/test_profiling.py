@@ -0,0 +1,84 @@
+import threading
+import time
+import pytest
+from flask import Flask, jsonify
+from app.core.admin import create_admin_blueprint
+from app.core.metrics import metrics
+from app.core.profiling import (
+    MemoryProfiler, init_profiling, phase, route_timings, sample_stacks
+)
+
+def _busy_wait(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sampled_stacks_include_busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_busy_wait, args=(stop,), name='busy')
+    thread.start()
+    try:
+        stacks = sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    busy = [stack for stack in stacks if stack.startswith('busy;')]
+    assert busy and all('test_profiling.py:_busy_wait' in stack for stack in busy)
+
+def test_memory_snapshot_diffs_against_previous():
+    profiler = MemoryProfiler()
+    profiler.start()
+    try:
+        profiler.snapshot()
+        retained = [bytearray(1024) for _ in range(1000)]
+        result = profiler.snapshot(limit=5)
+    finally:
+        profiler.stop()
+
+    assert result['diff'][0]['size_diff_bytes'] >= 1024 * 1000
+    assert 'test_profiling.py' in result['diff'][0]['location']
+    assert len(retained) == 1000
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['ADMIN_TOKEN'] = 'secret'
+    init_profiling(app)
+    app.register_blueprint(create_admin_blueprint(), url_prefix='/admin')
+
+    @app.route('/charges', methods=['POST'])
+    def create_charge():
+        with phase('upstream'):
+            time.sleep(0.02)
+        return jsonify({'id': 'ch-1'}), 201
+
+    yield app
+    route_timings.enabled = False
+    metrics.reset_prefix(route_timings.prefix + '.')
+
+def test_route_timings_split_request_into_phases(app):
+    client = app.test_client()
+    headers = {'X-Admin-Token': 'secret'}
+    client.post('/charges', json={'amount': 1})
+    assert client.get('/admin/profile/timings', headers=headers).json == {}
+
+    client.post('/admin/profile/timings?enabled=true', headers=headers)
+    client.post('/charges', json={'amount': 1})
+    report = client.get('/admin/profile/timings', headers=headers).json['create_charge']
+
+    assert set(report) == {'total_ms', 'parse_ms', 'upstream_ms', 'serialize_ms', 'other_ms'}
+    assert report['upstream_ms']['p50'] >= 20
+
+def test_cpu_profile_endpoint_returns_collapsed_stacks(app):
+    stop = threading.Event()
+    thread = threading.Thread(target=_busy_wait, args=(stop,))
+    thread.start()
+    try:
+        response = app.test_client().get('/admin/profile/cpu?seconds=0.1', headers={'X-Admin-Token': 'secret'})
+    finally:
+        stop.set()
+        thread.join()
+
+    assert response.status_code == 200 and response.mimetype == 'text/plain'
+    stack, count = response.get_data(as_text=True).splitlines()[0].rsplit(' ', 1)
+    assert ';' in stack and int(count) > 0
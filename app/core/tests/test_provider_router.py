@@ -0,0 +1,78 @@
+from unittest.mock import Mock
+import pytest
+from app.core.exceptions import CircuitOpenException, NotFoundException, ThirdPartyAPIException
+from app.core.provider_router import ProviderRouter
+from app.core.resilience import CircuitBreaker
+
+def _router(**providers):
+    return ProviderRouter(providers, name='test', explore_ratio=0, breaker_failure_threshold=2)
+
+def test_prefers_provider_with_lower_latency():
+    router = _router(slow=Mock(), fast=Mock())
+    router.stats_by_provider['slow'].record(400, ok=True)
+    router.stats_by_provider['fast'].record(40, ok=True)
+
+    assert router.ranked() == ['fast', 'slow']
+
+def test_error_rate_outweighs_latency():
+    router = _router(flaky=Mock(), steady=Mock())
+    router.stats_by_provider['steady'].record(100, ok=True)
+    for _ in range(3):
+        router.stats_by_provider['flaky'].record(40, ok=False)
+
+    assert router.ranked()[0] == 'steady'
+
+def test_idempotent_calls_fail_over_until_circuit_opens():
+    primary = Mock(get_payment=Mock(side_effect=ThirdPartyAPIException("down", status_code=503)))
+    backup = Mock(get_payment=Mock(return_value={'id': 'pr-1'}))
+    router = _router(primary=primary, backup=backup)
+    router.stats_by_provider['backup'].record(500, ok=True)
+
+    for _ in range(3):
+        assert router.call('get_payment', 'pr-1', idempotent=True) == ('backup', {'id': 'pr-1'})
+
+    assert primary.get_payment.call_count == 2
+    assert router.breakers['primary'].state == CircuitBreaker.OPEN
+
+def test_creates_fail_over_only_when_not_sent():
+    primary = Mock(create_payment=Mock(side_effect=ThirdPartyAPIException("down", status_code=502)))
+    backup = Mock(create_payment=Mock(return_value={'id': 'fp-1'}))
+    router = _router(primary=primary, backup=backup)
+    router.stats_by_provider['backup'].record(500, ok=True)
+
+    with pytest.raises(ThirdPartyAPIException):
+        router.call('create_payment', {})
+
+    primary.create_payment.side_effect = CircuitOpenException()
+    assert router.call('create_payment', {}) == ('backup', {'id': 'fp-1'})
+
+def test_reads_go_to_the_creating_provider():
+    a = Mock(create_payment=Mock(return_value={'id': 'pr-1'}), get_payment=Mock(side_effect=NotFoundException()))
+    b = Mock(get_payment=Mock(return_value={'id': 'pr-1'}))
+    router = _router(a=a, b=b)
+    router.stats_by_provider['a'].record(1, ok=True)
+    router.stats_by_provider['b'].record(1000, ok=True)
+
+    router.call('create_payment', {})
+    router.stats_by_provider['a'].record(10000, ok=True)
+
+    with pytest.raises(NotFoundException):
+        router.call('get_payment', 'pr-1', resource_id='pr-1', idempotent=True)
+    b.get_payment.assert_not_called()
+
+def test_unowned_reads_route_by_prefix_or_search_past_404s():
+    a = Mock(get_payment=Mock(side_effect=NotFoundException()),
+             list_payments=Mock(side_effect=ThirdPartyAPIException("down", status_code=503)))
+    b = Mock(get_payment=Mock(return_value={'id': 'fp-1'}))
+    router = ProviderRouter({'a': a, 'b': b}, name='test', explore_ratio=0, id_prefixes={'b': 'fp-'})
+
+    assert router.call('get_payment', 'fp-1', resource_id='fp-1') == ('b', {'id': 'fp-1'})
+    a.get_payment.assert_not_called()
+
+    assert router.call('get_payment', 'x-1', resource_id='x-1') == ('b', {'id': 'fp-1'})
+    assert a.get_payment.call_count == 1
+
+    # Lists differ per provider, so they stay on the default provider
+    with pytest.raises(ThirdPartyAPIException):
+        router.call('list_payments', {}, failover=False)
+    b.list_payments.assert_not_called()
@@ -0,0 +1,66 @@
+import sys
+import click
+import pytest
+from flask import Flask
+from app.core.registry import LazyModuleGroup, ModuleRegistry
+
+MODULE_SOURCE = '''
+from flask import Blueprint
+import click
+
+bp = Blueprint('{name}', __name__)
+cli = click.Group('{name}', commands=[click.Command('hello', callback=lambda: None)])
+
+@bp.route('/ping')
+def ping():
+    return {{'module': '{name}'}}
+
+def create_blueprint():
+    return bp
+'''
+
+@pytest.fixture
+def module_path(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def make(name: str) -> str:
+        (tmp_path / f"{name}.py").write_text(MODULE_SOURCE.format(name=name))
+        sys.modules.pop(name, None)
+        return name
+    return make
+
+def make_manifest(*names):
+    return {name: {'factory': f'{name}:create_blueprint', 'url_prefix': f'/api/{name}'} for name in names}
+
+def test_lazy_module_is_imported_on_first_request(module_path):
+    name = module_path('lazy_mod_a')
+    app = Flask(__name__)
+    registry = ModuleRegistry()
+    registry.discover(make_manifest(name))
+    registry.init_app(app, lazy=True)
+
+    assert name not in sys.modules
+    response = app.test_client().get(f'/api/{name}/ping')
+
+    assert response.json == {'module': name}
+    assert registry.is_loaded(name)
+    assert app.test_client().get('/api/other').status_code == 404
+
+def test_eager_and_disabled_modules(module_path):
+    enabled, disabled = module_path('eager_mod_b'), module_path('disabled_mod_c')
+    app = Flask(__name__)
+    registry = ModuleRegistry()
+    registry.discover(make_manifest(enabled, disabled))
+    registry.init_app(app, enabled=[enabled], lazy=False)
+
+    assert enabled in sys.modules
+    assert disabled not in sys.modules
+    assert app.test_client().get(f'/api/{enabled}/ping').status_code == 200
+    assert app.test_client().get(f'/api/{disabled}/ping').status_code == 404
+
+def test_lazy_cli_group_defers_import(module_path):
+    name = module_path('cli_mod_d')
+    group = LazyModuleGroup(name, f'{name}:cli')
+
+    assert name not in sys.modules
+    assert group.list_commands(click.Context(group)) == ['hello']
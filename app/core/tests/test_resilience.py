@@ -0,0 +1,113 @@
+from unittest.mock import Mock, patch
+import threading
+import time
+import pytest
+import requests
+from app.core.exceptions import CircuitOpenException, RateLimitExceededException
+from app.core.metrics import metrics
+from app.core.resilience import CircuitBreaker, RatioBudget, TokenBucket
+from app.core.third_party import ThirdPartyAPI
+
+class ExampleAPI(ThirdPartyAPI):
+    def get_headers(self):
+        return {}
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{}'
+    return response
+
+def test_token_bucket_refills_over_time():
+    with patch('app.core.resilience.time.monotonic', return_value=0.0):
+        bucket = TokenBucket(rate=2, burst=2)
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+    with patch('app.core.resilience.time.monotonic', return_value=0.5):
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+def test_circuit_breaker_opens_and_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    with patch('app.core.resilience.time.monotonic', return_value=0.0):
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+    with patch('app.core.resilience.time.monotonic', return_value=11.0):
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_client_breaker_ignores_client_errors():
+    api = ExampleAPI('https://api.example.com', config={'breaker_failure_threshold': 1})
+    api.session.request = Mock(return_value=_response(404))
+    with pytest.raises(Exception):
+        api._make_request('GET', '/missing')
+    assert api.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    api.session.request = Mock(return_value=_response(503))
+    with pytest.raises(Exception):
+        api._make_request('GET', '/down')
+    with pytest.raises(CircuitOpenException):
+        api._make_request('GET', '/down')
+    assert api.session.request.call_count == 1
+
+def test_client_rate_limit_rejects_without_calling_upstream():
+    api = ExampleAPI('https://api.example.com', config={'rate_limit': 1, 'rate_burst': 1})
+    api.session.request = Mock(return_value=_response(200))
+
+    api._make_request('GET', '/a')
+    with pytest.raises(RateLimitExceededException):
+        api._make_request('GET', '/b')
+    assert api.session.request.call_count == 1
+
+def test_ratio_budget_caps_extra_attempts():
+    budget = RatioBudget(ratio=0.5, burst=1)
+    budget.deposit()
+    assert not budget.try_spend()
+    for _ in range(5):
+        budget.deposit()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+
+def _hedging_api(prefix, **config):
+    api = ExampleAPI('https://api.example.com', config={
+        'hedge': True, 'hedge_min_samples': 1, 'hedge_min_delay_ms': 10, 'metrics_prefix': prefix, **config
+    })
+    metrics.observe(f'{prefix}.hedge.attempt_latency_ms', 10)
+    return api
+
+def test_hedge_wins_over_slow_first_attempt():
+    api = _hedging_api('test.hedge.win', hedge_max_ratio=1.0)
+    release = threading.Event()
+    calls = []
+
+    def request(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            release.wait(5)
+        return _response(200)
+
+    api.session.request = Mock(side_effect=request)
+    assert api._make_request('GET', '/payments/1', hedge=True) == {}
+    assert len(calls) == 2
+    assert metrics.counter('test.hedge.win.hedge.won') == 1
+
+    release.set()
+    api.close()
+
+def test_hedging_is_capped_and_skips_non_idempotent_calls():
+    api = _hedging_api('test.hedge.cap', hedge_max_ratio=0.5, hedge_percentile=1)
+    api.session.request = Mock(side_effect=lambda *args, **kwargs: time.sleep(0.05) or _response(200))
+
+    for _ in range(4):
+        api._make_request('GET', '/payments/1', hedge=True)
+    api._make_request('POST', '/payments', hedge=True)
+    api._make_request('GET', '/payments', hedge=False)
+
+    assert metrics.counter('test.hedge.cap.hedge.fired') == 2
+    assert metrics.counter('test.hedge.cap.hedge.throttled') == 2
+    assert api.session.request.call_count == 8
+    api.close()
@@ -0,0 +1,82 @@
+from unittest.mock import Mock, patch
+from flask import Flask
+from app.core.metrics import metrics
+from app.core.rooms import ALREADY_JOINED, JOINED, LIMIT_REACHED, RoomRegistry
+from app.core.websocket import WebSocketManager
+from app.core.ws_auth import WebSocketAuth
+from app.modules.xendit.websocket import authorize_payment, handle_payment_subscribe, handle_payment_unsubscribe
+
+def test_memberships_are_indexed_both_ways_and_empty_rooms_dropped():
+    registry = RoomRegistry(max_rooms=2)
+    registry.connect('a', '/x')
+    registry.connect('b', '/x')
+
+    assert registry.join('a', 'pay_1', '/x') == JOINED
+    assert registry.join('a', 'pay_1', '/x') == ALREADY_JOINED
+    assert registry.join('a', 'pay_2', '/x') == JOINED
+    assert registry.join('a', 'pay_3', '/x') == LIMIT_REACHED
+    assert registry.join('b', 'pay_1', '/x') == JOINED
+
+    assert registry.subscriber_count('pay_1', '/x') == 2
+    assert not registry.has_subscribers('pay_1', '/')
+    assert registry.disconnect('a', '/x') == 2
+    assert not registry.has_subscribers('pay_2', '/x')
+    assert registry.leave('b', 'pay_1', '/x')
+    assert registry.stats()['rooms'] == 0 and registry.stats()['connections'] == 1
+
+def test_connection_limit():
+    registry = RoomRegistry(max_connections=1)
+    assert registry.connect('a') and registry.connect('a')
+    assert not registry.connect('b')
+
+def test_idle_rooms_are_collected_with_their_memberships():
+    leave = Mock()
+    registry = RoomRegistry(idle_seconds=60, leave=leave)
+    registry.connect('a')
+    with patch('app.core.rooms.time.monotonic', return_value=0.0):
+        registry.join('a', 'stale')
+        registry.join('a', 'busy')
+    with patch('app.core.rooms.time.monotonic', return_value=50.0):
+        registry.touch('busy')
+
+    assert registry.collect(now=100.0) == 1
+    assert registry.rooms_of('a') == {'busy'}
+    leave.assert_called_once_with('a', 'stale', '/')
+
+def test_subscriptions_over_socketio_respect_the_cap():
+    metrics.reset_prefix('websocket.')
+    manager = WebSocketManager()
+    manager.rooms = RoomRegistry(max_rooms=1, leave=manager._leave_collected)
+    manager.auth = WebSocketAuth('secret')
+    manager.auth.register_authorizer('xendit.payment', authorize_payment)
+    manager.register_handler('subscribe_xendit_payment', handle_payment_subscribe, namespace='/xendit')
+    manager.register_handler('unsubscribe_xendit_payment', handle_payment_unsubscribe, namespace='/xendit')
+    app = Flask(__name__)
+    manager.init_app(app)
+
+    with patch('app.core.websocket.websocket_manager', manager):
+        token = manager.auth.issue({'sub': 'merchant', 'payments': ['p1', 'p2']})
+        client = manager._socketio.test_client(app, namespace='/xendit', auth={'token': token})
+        client.emit('subscribe_xendit_payment', {'payment_id': 'p1'}, namespace='/xendit')
+        client.emit('subscribe_xendit_payment', {'payment_id': 'p2'}, namespace='/xendit')
+        replies = [event['args'][0] for event in client.get_received('/xendit')]
+        assert [reply['status'] for reply in replies] == ['success', 'error']
+        assert manager.has_subscribers('xendit_payment_p1', '/xendit')
+        assert not manager.has_subscribers('xendit_payment_p2', '/xendit')
+
+        manager.emit('payment_update', {'payment_id': 'p1'}, room='xendit_payment_p1', namespace='/xendit')
+        assert client.get_received('/xendit')[0]['name'] == 'payment_update'
+
+        client.disconnect(namespace='/xendit')
+    assert manager.rooms.stats()['connections'] == 0
+    assert not manager.has_subscribers('xendit_payment_p1', '/xendit')
+    assert metrics.counter('websocket.emits.skipped') == 2
+
+def test_emits_are_not_skipped_through_a_message_queue():
+    metrics.reset_prefix('websocket.')
+    manager = WebSocketManager()
+    manager.message_queue = 'redis://redis:6379/0'
+
+    # The room may have members on another instance
+    assert manager.has_subscribers('xendit_payment_p1', '/xendit')
+    assert metrics.counter('websocket.emits.skipped') == 0
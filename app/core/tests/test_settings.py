@@ -0,0 +1,105 @@
+from unittest.mock import Mock, patch
+import json
+import os
+import time
+import pytest
+from flask import Flask
+from app.core.admin import create_admin_blueprint
+from app.core.client_pool import ClientPool
+from app.core.settings import RuntimeSettings
+from app.core.third_party import ThirdPartyAPI
+from app.core.validation import RequestValidationException
+
+class ExampleAPI(ThirdPartyAPI):
+    def get_headers(self):
+        return {}
+
+@pytest.fixture
+def settings():
+    settings = RuntimeSettings()
+    settings.define('svc.timeout', 30.0, float, 0.1, 300)
+    settings.define('svc.pool_maxsize', 10, int, 1)
+    return settings
+
+def test_invalid_update_is_rejected_as_a_whole(settings):
+    with pytest.raises(RequestValidationException) as error:
+        settings.apply({'svc.timeout': 5, 'svc.pool_maxsize': 0, 'svc.unknown': 1})
+
+    assert {tuple(e['loc']) for e in error.value.errors} == {('svc.pool_maxsize',)}
+    assert settings.get('svc.timeout') == 30.0
+
+def test_apply_notifies_subscribers_with_changed_values_only(settings):
+    seen = []
+    settings.subscribe(seen.append)
+
+    settings.apply({'svc': {'timeout': '5', 'pool_maxsize': 10}})
+
+    assert seen == [{'svc.timeout': 5.0}]
+    assert settings.section('svc') == {'timeout': 5.0, 'pool_maxsize': 10}
+
+def test_settings_file_is_reloaded_and_bad_files_are_ignored(settings, tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'svc.timeout': 10, 'other.module.setting': 1}))
+    settings.watch(str(path), interval=60)
+    assert settings.get('svc.timeout') == 10.0
+    assert settings.describe()['unknown'] == ['other.module.setting']
+
+    path.write_text(json.dumps({'svc.pool_maxsize': 'many'}))
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert not settings.reload()
+    assert settings.get('svc.timeout') == 10.0 and 'svc.pool_maxsize' in settings.last_error
+
+    # Keys missing from the file fall back to their defaults
+    path.write_text(json.dumps({'svc.pool_maxsize': 20}))
+    os.utime(path, (time.time() + 10, time.time() + 10))
+    assert settings.reload()
+    assert settings.section('svc') == {'timeout': 30.0, 'pool_maxsize': 20}
+
+def test_tunables_defined_later_pick_up_loaded_values(settings):
+    settings.apply({'lazy.module.ttl': 5})
+    settings.define('lazy.module.ttl', 60.0, float, 0)
+    assert settings.get('lazy.module.ttl') == 5.0
+
+def test_reconfigure_adjusts_limits_in_place_and_swaps_session():
+    api = ExampleAPI('https://api.example.com', config={'rate_limit': 10, 'pool_maxsize': 2, 'drain_seconds': 0})
+    limiter, session = api.rate_limiter, api.session
+
+    with patch.object(session, 'close') as close:
+        api.reconfigure({'rate_limit': 50, 'pool_maxsize': 20, 'timeout': 5})
+        time.sleep(0.05)
+
+    assert api.rate_limiter is limiter and limiter.rate == 50
+    assert api.timeout == 5
+    assert api.session is not session
+    assert api.session.get_adapter('https://api.example.com')._pool_maxsize == 20
+    close.assert_called_once()
+
+def test_client_pool_reconfigure_keeps_account_overrides():
+    clients = {}
+
+    def factory(name, settings):
+        clients[name] = Mock(metrics_prefix=f'test.settings.{name}')
+        return clients[name]
+
+    pool = ClientPool(factory, {'main': {}, 'sub': {'timeout': 3}})
+    pool.reconfigure({'timeout': 10, 'rate_limit': 5})
+
+    clients['main'].reconfigure.assert_called_once_with({'timeout': 10, 'rate_limit': 5})
+    clients['sub'].reconfigure.assert_called_once_with({'rate_limit': 5})
+
+def test_admin_settings_update_writes_file(settings, tmp_path):
+    settings.watch(str(tmp_path / 'settings.json'), interval=60)
+    app = Flask(__name__)
+    app.config['ADMIN_TOKEN'] = 'secret'
+    app.register_blueprint(create_admin_blueprint(), url_prefix='/admin')
+    client = app.test_client()
+    headers = {'X-Admin-Token': 'secret'}
+
+    with patch('app.core.admin.runtime_settings', settings):
+        rejected = client.post('/admin/settings', json={'svc.timeout': -1}, headers=headers)
+        accepted = client.post('/admin/settings', json={'svc.timeout': 12}, headers=headers)
+
+    assert rejected.status_code == 400 and rejected.json['details'][0]['loc'] == ['svc.timeout']
+    assert accepted.status_code == 200 and accepted.json['scope'] == 'all_workers'
+    assert json.loads((tmp_path / 'settings.json').read_text()) == {'svc.timeout': 12}
+    assert settings.get('svc.timeout') == 12.0
@@ -0,0 +1,106 @@
+from unittest.mock import Mock
+import threading
+import time
+import requests
+from app.core.metrics import metrics
+from app.core.shadow import diff_json
+from app.core.third_party import ThirdPartyAPI
+from app.modules.xendit.api import XenditAPI
+
+class ExampleAPI(ThirdPartyAPI):
+    def get_headers(self):
+        return {'Authorization': 'Basic key'}
+
+def _response(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    return response
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_diff_json_reports_paths_and_skips_ignored_fields():
+    primary = {'id': 'p1', 'status': 'PAID', 'updated': 'a', 'items': [{'amount': 1}, {'amount': 2}]}
+    shadow = {'id': 'p1', 'status': 'PENDING', 'updated': 'b', 'items': [{'amount': 1}, {'amount': 3}], 'new': 1}
+
+    assert diff_json(primary, shadow, frozenset({'updated'})) == ['$.items[1].amount', '$.new', '$.status']
+
+def test_mirrored_call_does_not_delay_primary_and_records_diff():
+    metrics.reset_prefix('upstream.shadowtest.')
+    api = ExampleAPI('https://api.example.com', config={
+        'shadow_base_url': 'https://shadow.example.com', 'shadow_sample_rate': 1.0, 'metrics_prefix': 'upstream.shadowtest'
+    })
+    api.session.request = Mock(return_value=_response(200, b'{"id": "p1", "status": "PAID"}'))
+    release = threading.Event()
+    api.shadow.session.request = Mock(
+        side_effect=lambda *args, **kwargs: release.wait() and _response(200, b'{"id": "p1", "status": "PENDING"}')
+    )
+
+    started = time.perf_counter()
+    assert api._make_request('GET', '/payments/p1', params={'expand': 'all'}) == {'id': 'p1', 'status': 'PAID'}
+    assert time.perf_counter() - started < 0.5
+    # Writes are never mirrored
+    api._make_request('POST', '/payments')
+
+    release.set()
+    _wait_for(lambda: api.shadow.mismatches)
+    mismatch = api.shadow.mismatches[0]
+    assert mismatch['endpoint'] == '/payments/p1' and mismatch['diffs'] == ['$.status']
+    assert api.shadow.session.request.call_count == 1
+    args, kwargs = api.shadow.session.request.call_args
+    assert args == ('GET', 'https://shadow.example.com/payments/p1')
+    assert kwargs['params'] == {'expand': 'all'}
+    assert metrics.counter('upstream.shadowtest.shadow.mismatch') == 1
+    assert metrics.histogram('upstream.shadowtest.shadow.latency_delta_ms').count == 1
+    api.close()
+
+def test_mirrors_are_dropped_when_the_pool_is_full():
+    metrics.reset_prefix('upstream.shadowfull.')
+    api = ExampleAPI('https://api.example.com', config={
+        'shadow_base_url': 'https://shadow.example.com', 'shadow_sample_rate': 1.0, 'shadow_max_workers': 1,
+        'shadow_max_pending': 2, 'metrics_prefix': 'upstream.shadowfull'
+    })
+    api.session.request = Mock(return_value=_response(200, b'{}'))
+    release = threading.Event()
+    api.shadow.session.request = Mock(side_effect=lambda *args, **kwargs: release.wait() and _response(200, b'{}'))
+
+    for _ in range(5):
+        api._make_request('GET', '/payments')
+    release.set()
+    _wait_for(lambda: metrics.counter('upstream.shadowfull.shadow.match') == 2)
+
+    assert metrics.counter('upstream.shadowfull.shadow.dropped') == 3
+    assert metrics.counter('upstream.shadowfull.shadow.match') == 2
+    api.close()
+
+def test_primary_credentials_are_not_mirrored():
+    api = ExampleAPI('https://api.example.com', config={
+        'shadow_base_url': 'https://shadow.example.com', 'shadow_sample_rate': 1.0, 'metrics_prefix': 'upstream.shadowauth'
+    })
+    api.session.request = Mock(return_value=_response(200, b'{}'))
+    api.shadow.session.request = Mock(return_value=_response(200, b'{}'))
+
+    api._make_request('GET', '/payments/p1', headers={'Cookie': 'session=1', 'X-Trace': 't'})
+    _wait_for(lambda: api.shadow.session.request.called)
+
+    headers = api.shadow.session.request.call_args.kwargs['headers']
+    assert {name.lower() for name in headers} & {'authorization', 'cookie'} == set()
+    assert headers['X-Trace'] == 't'
+    api.close()
+
+def test_shadow_target_gets_its_own_key():
+    api = XenditAPI(api_key='live_key', base_url='https://api.xendit.co', config={
+        'shadow_base_url': 'https://shadow.example.com', 'shadow_sample_rate': 1.0, 'shadow_api_key': 'shadow_key'
+    })
+    api.session.request = Mock(return_value=_response(200, b'{}'))
+    api.shadow.session.request = Mock(return_value=_response(200, b'{}'))
+
+    api.get_payment('p1')
+    _wait_for(lambda: api.shadow.session.request.called)
+
+    assert api.shadow.session.request.call_args.kwargs['headers']['Authorization'] == 'Basic shadow_key'
+    assert 'live_key' not in str(api.shadow.session.request.call_args)
+    api.close()
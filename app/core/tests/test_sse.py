@@ -0,0 +1,62 @@
+from app.core.sse import EventStream
+
+def test_publish_delivers_to_matching_channel():
+    stream = EventStream(replay_size=10)
+    subscription = stream.subscribe(channels=['pay-1'])
+
+    stream.publish('payment_update', {'status': 'PENDING'}, channel='pay-2')
+    event = stream.publish('payment_update', {'status': 'SUCCEEDED'}, channel='pay-1')
+
+    assert subscription.queue.get_nowait() is event
+    assert subscription.queue.empty()
+
+def test_resume_from_last_event_id():
+    stream = EventStream(replay_size=10)
+    first = stream.publish('payment_update', {'status': 'PENDING'}, channel='pay-1')
+    second = stream.publish('payment_update', {'status': 'SUCCEEDED'}, channel='pay-1')
+
+    subscription = stream.subscribe(channels=['pay-1'], last_event_id=str(first.id))
+
+    assert subscription.queue.get_nowait() is second
+    assert subscription.queue.empty()
+
+def test_replay_ring_is_bounded():
+    stream = EventStream(replay_size=2)
+    for status in ['PENDING', 'AUTHORIZED', 'SUCCEEDED']:
+        stream.publish('payment_update', {'status': status}, channel='pay-1')
+
+    subscription = stream.subscribe(last_event_id='0')
+
+    replayed = [subscription.queue.get_nowait().data['status'] for _ in range(2)]
+    assert replayed == ['AUTHORIZED', 'SUCCEEDED']
+
+def test_predicate_filters_events():
+    stream = EventStream()
+    subscription = stream.subscribe(predicate=lambda event: event.data['status'] == 'SUCCEEDED')
+
+    stream.publish('payment_update', {'status': 'PENDING'}, channel='pay-1')
+    stream.publish('payment_update', {'status': 'SUCCEEDED'}, channel='pay-1')
+
+    assert subscription.queue.get_nowait().data['status'] == 'SUCCEEDED'
+    assert subscription.queue.empty()
+
+def test_slow_subscriber_is_dropped():
+    stream = EventStream(subscriber_queue_size=1)
+    subscription = stream.subscribe()
+
+    stream.publish('payment_update', {'status': 'PENDING'})
+    stream.publish('payment_update', {'status': 'SUCCEEDED'})
+
+    assert subscription.closed
+    assert stream.subscriber_count == 0
+
+def test_iter_events_encodes_frames():
+    stream = EventStream()
+    subscription = stream.subscribe(channels=['pay-1'])
+    event = stream.publish('payment_update', {'status': 'PENDING'}, channel='pay-1')
+    frames = stream.iter_events(subscription)
+
+    assert next(frames).startswith(b'retry:')
+    assert next(frames) == f'id: {event.id}\nevent: payment_update\ndata: {{"status":"PENDING"}}\n\n'.encode()
+    subscription.close()
+    assert list(frames) == []
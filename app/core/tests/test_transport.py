@@ -0,0 +1,162 @@
+import socket
+from unittest.mock import Mock, patch
+import pytest
+from app.core.metrics import MetricsRegistry
+from app.core.transport import DNSCache, GatewayHTTPAdapter, create_ssl_context
+
+def _addrinfo(*addresses):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, 443)) for address in addresses]
+
+def test_dns_cache_hits_until_ttl_expires():
+    registry = MetricsRegistry()
+    cache = DNSCache(ttl=60, metrics=registry, prefix='t')
+    with patch('app.core.transport.socket.getaddrinfo', return_value=_addrinfo('10.0.0.1')) as lookup:
+        assert cache.resolve('api.example.com', 443) == '10.0.0.1'
+        assert cache.resolve('api.example.com', 443) == '10.0.0.1'
+        with patch('app.core.transport.time.monotonic', return_value=10 ** 9):
+            cache.resolve('api.example.com', 443)
+
+    assert lookup.call_count == 2
+    assert registry.counter('t.dns.hits') == 1
+    assert registry.counter('t.dns.misses') == 2
+
+def test_dns_cache_rotates_addresses_and_skips_ip_literals():
+    cache = DNSCache(ttl=60, metrics=MetricsRegistry())
+    with patch('app.core.transport.socket.getaddrinfo', return_value=_addrinfo('10.0.0.1', '10.0.0.2')) as lookup:
+        resolved = [cache.resolve('api.example.com', 443) for _ in range(3)]
+        assert cache.resolve('127.0.0.1', 443) == '127.0.0.1'
+
+    assert resolved == ['10.0.0.1', '10.0.0.2', '10.0.0.1']
+    assert lookup.call_count == 1
+
+def test_adapter_shares_ssl_context_across_pools():
+    context = create_ssl_context(metrics=MetricsRegistry())
+    adapter = GatewayHTTPAdapter(dns_cache=DNSCache(metrics=MetricsRegistry()), ssl_context=context)
+
+    pool = adapter.poolmanager.connection_from_url('https://api.example.com')
+
+    assert pool.conn_kw['ssl_context'] is context
+    assert pool.ConnectionCls.__name__ == 'ResolvingConnection'
+
+def _http2_session(handler, fallback=None):
+    import functools
+    import httpx
+    import requests
+    from app.core.transport import HTTP2Adapter
+
+    adapter = HTTP2Adapter(fallback or GatewayHTTPAdapter(), metrics=MetricsRegistry(), prefix='t')
+    mock_client = functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler))
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session, adapter, patch('app.core.transport.httpx.AsyncClient', mock_client)
+
+def test_http2_adapter_returns_requests_responses():
+    pytest.importorskip('h2')
+    import httpx
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={'id': 'pr-1'}, extensions={'http_version': b'HTTP/2'})
+
+    session, adapter, client_patch = _http2_session(handler)
+    with client_patch:
+        response = session.get('https://api.example.com/v1/payments', headers={'Authorization': 'Basic abc'})
+    adapter.close()
+
+    assert response.json() == {'id': 'pr-1'}
+    assert seen[0].headers['authorization'] == 'Basic abc'
+    assert adapter.metrics.counter('t.requests.http2') == 1
+
+def test_http2_adapter_pins_hosts_that_negotiate_http1():
+    pytest.importorskip('h2')
+    import httpx
+    import requests
+    fallback = Mock(wraps=GatewayHTTPAdapter())
+    fallback.send.return_value = requests.Response()
+
+    session, adapter, client_patch = _http2_session(lambda request: httpx.Response(200, json={}), fallback)
+    with client_patch:
+        session.get('https://api.example.com/a')
+        session.get('https://api.example.com/b')
+    adapter.close()
+
+    assert fallback.send.call_count == 1
+    assert adapter.metrics.counter('t.http2.fallbacks') == 1
+
+def test_http2_adapter_retries_idempotent_requests_after_goaway():
+    pytest.importorskip('h2')
+    import httpx
+    import requests
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) % 2:
+            raise httpx.RemoteProtocolError('ConnectionTerminated', request=request)
+        return httpx.Response(200, json={}, extensions={'http_version': b'HTTP/2'})
+
+    session, adapter, client_patch = _http2_session(handler)
+    with client_patch:
+        assert session.get('https://api.example.com/a').status_code == 200
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.post('https://api.example.com/b', json={})
+    adapter.close()
+
+    assert calls == ['GET', 'GET', 'POST']
+
+def test_http2_adapter_stops_reading_past_max_response_bytes():
+    pytest.importorskip('h2')
+    import httpx
+    from app.core.exceptions import ResponseTooLargeException
+    sent = []
+
+    async def body():
+        for _ in range(100):
+            sent.append(1)
+            yield b'x' * 1024
+
+    def handler(request):
+        if request.url.path == '/declared':
+            return httpx.Response(200, content=b'x' * 4096, extensions={'http_version': b'HTTP/2'})
+        return httpx.Response(200, content=body(), extensions={'http_version': b'HTTP/2'})
+
+    session, adapter, client_patch = _http2_session(handler)
+    adapter.max_response_bytes = 2048
+    with client_patch:
+        with pytest.raises(ResponseTooLargeException):
+            session.get('https://api.example.com/declared')
+        with pytest.raises(ResponseTooLargeException):
+            session.get('https://api.example.com/chunked')
+    adapter.close()
+
+    # The body is abandoned once it passes the limit, not read in full first
+    assert len(sent) == 3
+
+def test_http2_falls_back_when_dependency_missing():
+    from app.core.third_party import ThirdPartyAPI
+
+    class ExampleAPI(ThirdPartyAPI):
+        def get_headers(self):
+            return {}
+
+    with patch('app.core.third_party.http2_available', return_value=False):
+        api = ExampleAPI('https://api.example.com', config={'http2': True})
+
+    assert isinstance(api.session.get_adapter('https://api.example.com'), GatewayHTTPAdapter)
+
+def test_http2_response_cap_follows_runtime_changes():
+    pytest.importorskip('h2')
+    from app.core.third_party import ThirdPartyAPI
+
+    class ExampleAPI(ThirdPartyAPI):
+        def get_headers(self):
+            return {}
+
+    api = ExampleAPI('https://api.example.com', config={'http2': True, 'max_response_bytes': 1024})
+    adapter = api.session.get_adapter('https://api.example.com')
+    assert adapter.max_response_bytes == 1024
+
+    api.reconfigure({'max_response_bytes': 4096})
+    assert adapter.max_response_bytes == 4096
+    api.close()
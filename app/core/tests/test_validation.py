@@ -0,0 +1,40 @@
+import pytest
+from app.core.validation import RequestValidationException, SchemaRegistry
+from app.modules.xendit.schemas import PaymentMethodRequest, PaymentRequest, QRCodeRequest
+
+PAYMENT = {'reference_id': 'ref-1', 'amount': '10000', 'currency': 'IDR', 'payment_method_id': 'pm-1',
+           'description': None, 'unknown': 'dropped'}
+
+@pytest.fixture
+def registry():
+    registry = SchemaRegistry()
+    registry.register('payment', PaymentRequest)
+    registry.register('payment_method', PaymentMethodRequest)
+    registry.register('qr_code', QRCodeRequest, extra='allow')
+    return registry
+
+def test_matches_model_round_trip(registry):
+    assert registry.validate('payment', PAYMENT) == PaymentRequest(**PAYMENT).model_dump(exclude_none=True)
+
+def test_enums_are_plain_values(registry):
+    payload = registry.validate('payment_method', {
+        'type': 'CARD', 'reusability': 'SINGLE_USE', 'customer_id': 'cust-1', 'reference_id': 'ref-1'
+    })
+    assert payload['type'] == 'CARD' and type(payload['type']) is str
+
+def test_extra_fields_are_forwarded_when_allowed(registry):
+    payload = registry.validate('qr_code', {'reference_id': 'ref-1', 'type': 'DYNAMIC', 'currency': 'IDR', 'is_closed': True})
+    assert payload['is_closed'] is True
+
+def test_errors_name_the_invalid_fields(registry):
+    with pytest.raises(RequestValidationException) as excinfo:
+        registry.validate('payment', {'reference_id': 'ref-1', 'amount': 'lots'})
+
+    assert excinfo.value.status_code == 400
+    assert {tuple(error['loc']) for error in excinfo.value.errors} == {('amount',), ('currency',), ('payment_method_id',)}
+
+def test_rejects_non_object_bodies_and_duplicate_names(registry):
+    with pytest.raises(RequestValidationException):
+        registry.validate('payment', [PAYMENT])
+    with pytest.raises(ValueError):
+        registry.register('payment', PaymentRequest)
@@ -0,0 +1,92 @@
+from unittest.mock import Mock, patch
+import pytest
+from flask import Flask
+from app.core.metrics import metrics
+from app.core.websocket import WebSocketManager
+from app.core.ws_auth import WebSocketAuth, token_from
+from app.modules.xendit.websocket import authorize_payment_stream, handle_payment_subscribe
+
+def test_tokens_round_trip_and_reject_tampering_and_expiry():
+    auth = WebSocketAuth('secret', max_age=60)
+    token = auth.issue({'sub': 'merchant', 'payments': ['p1']})
+
+    assert auth.verify(token) == {'sub': 'merchant', 'payments': ['p1']}
+    assert auth.verify(token[:-2] + 'xx') is None
+    assert WebSocketAuth('other').verify(token) is None
+    assert auth.verify(None) is None
+    with patch('itsdangerous.timed.time.time', return_value=10 ** 10):
+        assert auth.verify(token) is None
+    assert token_from({'token': 'a'}, 'b') == 'a' and token_from(None, 'b') == 'b'
+
+def test_required_auth_refuses_every_connection_without_a_secret():
+    manager = WebSocketManager()
+    manager.auth = WebSocketAuth(None, required=True)
+    manager.register_handler('subscribe_xendit_payment', handle_payment_subscribe, namespace='/xendit')
+    app = Flask(__name__)
+    manager.init_app(app)
+
+    assert manager.auth.verify(WebSocketAuth('you-will-never-guess').issue({'sub': 'a'})) is None
+    with pytest.raises(ValueError):
+        manager.auth.issue({'sub': 'a'})
+    with pytest.raises(ConnectionRefusedError):
+        manager._socketio.test_client(app, namespace='/xendit', query_string='token=anything')
+
+def test_decisions_are_cached_per_claim_set():
+    metrics.reset_prefix('websocket.')
+    auth = WebSocketAuth('secret')
+    authorizer = Mock(side_effect=lambda claims, payment_id: payment_id == 'p1')
+    auth.register_authorizer('payment', authorizer)
+    claims = {'sub': 'merchant'}
+
+    for _ in range(3):
+        assert auth.authorize(claims, 'payment', 'p1')
+        assert not auth.authorize(dict(claims), 'payment', 'p2')
+    assert authorizer.call_count == 2
+    assert auth.stats()['cache']['hit_rate'] == round(4 / 6, 4)
+    assert not auth.authorize(claims, 'unknown', 'p1')
+
+def test_failed_lookups_are_denied_but_not_cached():
+    auth = WebSocketAuth('secret')
+    authorizer = Mock(side_effect=[RuntimeError('upstream down'), True])
+    auth.register_authorizer('payment', authorizer)
+
+    assert not auth.authorize({'sub': 'a'}, 'payment', 'p1')
+    assert auth.authorize({'sub': 'a'}, 'payment', 'p1')
+
+def test_socketio_connections_need_a_token_and_an_authorized_resource():
+    manager = WebSocketManager()
+    manager.auth = WebSocketAuth('secret', required=True)
+    manager.auth.register_authorizer('xendit.payment', lambda claims, payment_id: payment_id in claims['payments'])
+    manager.register_handler('subscribe_xendit_payment', handle_payment_subscribe, namespace='/xendit')
+    app = Flask(__name__)
+    manager.init_app(app)
+
+    with patch('app.core.websocket.websocket_manager', manager):
+        with pytest.raises(ConnectionRefusedError):
+            manager._socketio.test_client(app, namespace='/xendit')
+
+        token = manager.auth.issue({'sub': 'merchant', 'payments': ['p1']})
+        client = manager._socketio.test_client(app, namespace='/xendit', query_string=f'token={token}')
+        client.emit('subscribe_xendit_payment', {'payment_id': 'p1'}, namespace='/xendit')
+        client.emit('subscribe_xendit_payment', {'payment_id': 'p2'}, namespace='/xendit')
+        replies = [event['args'][0] for event in client.get_received('/xendit')]
+        assert [reply['status'] for reply in replies] == ['success', 'error']
+        assert replies[1]['message'] == 'forbidden'
+        assert not manager.has_subscribers('xendit_payment_p2', '/xendit')
+
+def test_sse_streams_need_an_authorized_token_and_the_firehose_a_scope():
+    auth = WebSocketAuth('secret', required=True)
+    auth.register_authorizer('xendit.payment', lambda claims, payment_id: payment_id in claims.get('payments', ()))
+    token = auth.issue({'sub': 'merchant', 'payments': ['p1']})
+    firehose = auth.issue({'sub': 'ops', 'scopes': ['payments']})
+    app = Flask(__name__)
+
+    with patch('app.core.websocket.websocket_manager.auth', auth):
+        with app.test_request_context('/'):
+            assert authorize_payment_stream(['p1'])[1] == 401
+        with app.test_request_context('/', headers={'Authorization': f'Bearer {token}'}):
+            assert authorize_payment_stream(['p1']) is None
+            assert authorize_payment_stream(['p1', 'p2'])[1] == 403
+            assert authorize_payment_stream([])[1] == 403
+        with app.test_request_context(f'/?token={firehose}'):
+            assert authorize_payment_stream([]) is None
@@ -1,35 +1,322 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlsplit
+import socket
+import threading
+import time
 import requests
-from app.core.exceptions import ThirdPartyAPIException
+import logging
+from app.core.access_log import log_upstream
+from app.core.exceptions import (
+    CircuitOpenException, RateLimitExceededException, ResponseTooLargeException, ThirdPartyAPIException
+)
+from app.core.faults import FaultInjectingAdapter, fault_injector
+from app.core.limits import account
+from app.core.metrics import metrics
+from app.core.profiling import phase
+from app.core.resilience import CircuitBreaker, RatioBudget, TokenBucket
+from app.core.shadow import ShadowMirror
+from app.core.transport import (
+    IDEMPOTENT_METHODS, DNSCache, GatewayHTTPAdapter, HTTP2Adapter, create_ssl_context, http2_available
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+READ_CHUNK_SIZE = 64 * 1024
+# Settings baked into the session's adapters; changing one means building a new session
+SESSION_SETTINGS = frozenset({
+    'pool_connections', 'pool_maxsize', 'max_retries', 'dns_cache_ttl', 'tls_session_resumption',
+    'http2', 'http2_max_connections', 'http2_max_streams',
+})
 
 class ThirdPartyAPI(ABC):
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
+    service_name = 'third_party'
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.session = requests.Session()
-    
+        self.config = config or {}
+        self.timeout = self.config.get('timeout', DEFAULT_TIMEOUT)
+        self.metrics_prefix = self.config.get('metrics_prefix') or f"upstream.{self.service_name}"
+        self.session = self._create_session()
+        # Optional per-client request budget and circuit breaker
+        self.rate_limiter = TokenBucket(self.config['rate_limit'], self.config.get('rate_burst')) if self.config.get('rate_limit') else None
+        self.circuit_breaker = CircuitBreaker(
+            self.config['breaker_failure_threshold'], self.config.get('breaker_reset_timeout', 30.0)
+        ) if self.config.get('breaker_failure_threshold') else None
+        # Opt-in hedging of idempotent lookups, capped at hedge_max_ratio of hedgeable calls
+        self.hedge_budget = RatioBudget(self.config.get('hedge_max_ratio', 0.1)) if self.config.get('hedge') else None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        # Opt-in mirroring of a sample of read-only calls to a secondary upstream
+        self.shadow = self._create_shadow() if self.config.get('shadow_base_url') else None
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled session sized from the service configuration"""
+        session = requests.Session()
+        dns_cache_ttl = self.config.get('dns_cache_ttl', 0)
+        adapter = GatewayHTTPAdapter(
+            dns_cache=DNSCache(dns_cache_ttl, prefix=self.metrics_prefix) if dns_cache_ttl else None,
+            ssl_context=create_ssl_context(prefix=self.metrics_prefix) if self.config.get('tls_session_resumption') else None,
+            pool_connections=self.config.get('pool_connections', 10),
+            pool_maxsize=self.config.get('pool_maxsize', 10),
+            max_retries=self.config.get('max_retries', 0)
+        )
+        # Kept so max_response_bytes can be changed in place
+        self._http2_adapter: Optional[HTTP2Adapter] = None
+        https_adapter = self._create_http2_adapter(adapter) if self.config.get('http2') else adapter
+        if fault_injector.enabled:
+            service = self.metrics_prefix.split('.', 1)[-1]
+            adapter, https_adapter = FaultInjectingAdapter(adapter, service), FaultInjectingAdapter(https_adapter, service)
+        session.mount('https://', https_adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _create_http2_adapter(self, fallback: GatewayHTTPAdapter):
+        """Multiplex HTTPS calls over HTTP/2, falling back to the HTTP/1.1 pool if unavailable"""
+        if not http2_available():
+            logger.warning(f"HTTP/2 enabled for {self.service_name} but 'httpx[http2]' is not installed; using HTTP/1.1")
+            return fallback
+        self._http2_adapter = HTTP2Adapter(
+            fallback,
+            max_connections=self.config.get('http2_max_connections', 2),
+            max_streams=self.config.get('http2_max_streams', 100),
+            max_response_bytes=self.config.get('max_response_bytes'),
+            prefix=self.metrics_prefix
+        )
+        return self._http2_adapter
+
+    def _create_shadow(self) -> ShadowMirror:
+        return ShadowMirror(
+            self.config['shadow_base_url'],
+            sample_rate=self.config.get('shadow_sample_rate', 0.01),
+            max_workers=self.config.get('shadow_max_workers', 2),
+            max_pending=self.config.get('shadow_max_pending', 100),
+            timeout=self.config.get('shadow_timeout', self.timeout),
+            ignore_fields=frozenset(self.config.get('shadow_ignore_fields') or ()),
+            prefix=self.metrics_prefix,
+            headers=self.get_shadow_headers()
+        )
+
+    def get_shadow_headers(self) -> Dict[str, str]:
+        """Credentials for the shadow target; the primary ones are never mirrored"""
+        return {}
+
     @abstractmethod
     def get_headers(self) -> Dict[str, str]:
         """Return headers required for the API calls"""
         pass
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request to the API with error handling"""
+    def _make_request(self, method: str, endpoint: str, hedge: bool = False, raw: bool = False,
+                      **kwargs) -> Union[Dict[str, Any], bytes]:
+        """Make HTTP request to the API with error handling; hedge=True marks latency-critical lookups.
+
+        raw=True returns the undecoded JSON body, for responses that are passed through as is.
+        """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         headers = self.get_headers()
-        
+
         if 'headers' in kwargs:
             headers.update(kwargs['headers'])
             del kwargs['headers']
-            
+        kwargs.setdefault('timeout', self.timeout)
+
+        if self.rate_limiter and not self.rate_limiter.acquire(timeout=self.config.get('rate_limit_wait', 0.0)):
+            metrics.inc(f"{self.metrics_prefix}.rejected.rate_limited")
+            raise RateLimitExceededException(f"Rate limit exceeded for {self.metrics_prefix}")
+        if self.circuit_breaker and not self.circuit_breaker.allow():
+            metrics.inc(f"{self.metrics_prefix}.rejected.circuit_open")
+            raise CircuitOpenException(f"Circuit open for {self.metrics_prefix}")
+
+        metrics.inc(f"{self.metrics_prefix}.requests")
+        started = time.perf_counter()
+        status, error = None, None
         try:
-            response = self.session.request(method, url, headers=headers, **kwargs)
+            with phase('upstream'):
+                if hedge and self.hedge_budget and method.upper() in IDEMPOTENT_METHODS:
+                    response = self._send_hedged(method, url, headers=headers, **kwargs)
+                else:
+                    response = self._fetch(method, url, headers=headers, **kwargs)
+            status = response.status_code
+            account('upstream', len(response.content))
+            duration_ms = (time.perf_counter() - started) * 1000
+            metrics.observe(f"{self.metrics_prefix}.latency_ms", duration_ms)
+            if self.shadow:
+                self.shadow.mirror(method, endpoint, headers, kwargs.get('params'), status, response.content, duration_ms)
             response.raise_for_status()
-            return response.json()
+            self._record_outcome(True)
+            return response.content if raw else response.json()
         except requests.exceptions.RequestException as e:
+            error = type(e).__name__
+            metrics.inc(f"{self.metrics_prefix}.errors")
+            # Client errors (4xx) say nothing about upstream health
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            self._record_outcome(status is not None and status < 500)
             raise ThirdPartyAPIException(
                 f"Error calling {url}: {str(e)}",
                 status_code=getattr(e.response, 'status_code', 500) if hasattr(e, 'response') else 500,
                 raw_error=e
             )
+        except ResponseTooLargeException:
+            error = 'ResponseTooLarge'
+            # Upstream answered; the body is only too big for us
+            self._record_outcome(True)
+            metrics.inc(f"{self.metrics_prefix}.rejected.response_too_large")
+            raise
+        finally:
+            log_upstream(self.metrics_prefix, method, url, status, (time.perf_counter() - started) * 1000, error)
+
+    def _fetch(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request and read the body in chunks, giving up once it exceeds max_response_bytes"""
+        response = self.session.request(method, url, stream=True, **kwargs)
+        # Adapters that buffer the whole response (HTTP/2) have already read it, bounded by max_response_bytes
+        if response._content is not False:
+            self._check_size(url, len(response._content))
+            return response
+        try:
+            self._check_size(url, int(response.headers.get('Content-Length') or 0))
+            chunks, size = [], 0
+            for chunk in response.iter_content(READ_CHUNK_SIZE):
+                size += len(chunk)
+                self._check_size(url, size)
+                chunks.append(chunk)
+        finally:
+            # Returns the connection to the pool, or drops it if the body was cut short
+            response.close()
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        return response
+
+    def _check_size(self, url: str, size: int):
+        limit = self.config.get('max_response_bytes')
+        if limit and size > limit:
+            raise ResponseTooLargeException(f"Response from {url} exceeds {limit} bytes")
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging: a percentile of recent single-attempt latency"""
+        histogram = metrics.histogram(f"{self.metrics_prefix}.hedge.attempt_latency_ms")
+        if histogram is None or histogram.count < self.config.get('hedge_min_samples', 50):
+            return None
+        delay_ms = histogram.percentile(self.config.get('hedge_percentile', 95))
+        return max(delay_ms, self.config.get('hedge_min_delay_ms', 20)) / 1000
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.config.get('hedge_max_workers', 2 * self.config.get('pool_maxsize', 10)),
+                    thread_name_prefix=f"{self.service_name}-hedge"
+                )
+            return self._hedge_executor
+
+    def _send_hedged(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a second attempt if the first has not answered within the hedge delay; first answer wins"""
+        executor = self._get_hedge_executor()
+        delay = self._hedge_delay()
+        self.hedge_budget.deposit()
+
+        started = time.perf_counter()
+        primary = executor.submit(self._fetch, method, url, **kwargs)
+        primary.add_done_callback(lambda _: metrics.observe(
+            f"{self.metrics_prefix}.hedge.attempt_latency_ms", (time.perf_counter() - started) * 1000
+        ))
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+
+        # The hedge is an extra upstream call: it needs hedge budget and a rate limit token
+        if not self.hedge_budget.try_spend() or (self.rate_limiter and not self.rate_limiter.try_acquire()):
+            metrics.inc(f"{self.metrics_prefix}.hedge.throttled")
+            return primary.result()
+
+        metrics.inc(f"{self.metrics_prefix}.hedge.fired")
+        hedged = executor.submit(self._fetch, method, url, **kwargs)
+        done, _ = wait([primary, hedged], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else hedged
+        if winner.exception() is not None:
+            # A failed attempt only loses if the other one succeeds
+            other = hedged if winner is primary else primary
+            if other.exception() is None:
+                winner = other
+
+        if winner is hedged:
+            metrics.inc(f"{self.metrics_prefix}.hedge.won")
+            if not primary.done():
+                won_at = time.perf_counter()
+                primary.add_done_callback(lambda _: metrics.observe(
+                    f"{self.metrics_prefix}.hedge.saved_ms", (time.perf_counter() - won_at) * 1000
+                ))
+        return winner.result()
+
+    def _record_outcome(self, healthy: bool):
+        if self.circuit_breaker:
+            self.circuit_breaker.record_success() if healthy else self.circuit_breaker.record_failure()
+
+    def warmup(self, connections: Optional[int] = None):
+        """Pre-resolve DNS and open pooled (TLS) connections to the base URL"""
+        connections = connections or self.config.get('warmup_connections', 1)
+        parts = urlsplit(self.base_url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+
+        def open_connection(_):
+            # Any HTTP status is fine; the point is the handshake and a pooled keep-alive socket
+            self.session.head(self.base_url, timeout=self.timeout).close()
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(open_connection, range(connections)))
+        logger.info(f"Warmed up {connections} connection(s) to {parts.hostname}")
+
+    def reconfigure(self, updates: Dict[str, Any]):
+        """Apply changed settings to the live client without interrupting calls in flight.
+
+        Limits are adjusted in place. Pool changes swap in a new session; calls
+        already running finish on the old one, which is closed after a drain period.
+        """
+        if not updates:
+            return
+        config = {**self.config, **updates}
+        self.config = config
+        self.timeout = config.get('timeout', DEFAULT_TIMEOUT)
+
+        if 'rate_limit' in updates or 'rate_burst' in updates:
+            if not config.get('rate_limit'):
+                self.rate_limiter = None
+            elif self.rate_limiter:
+                self.rate_limiter.configure(config['rate_limit'], config.get('rate_burst'))
+            else:
+                self.rate_limiter = TokenBucket(config['rate_limit'], config.get('rate_burst'))
+        if 'breaker_failure_threshold' in updates or 'breaker_reset_timeout' in updates:
+            if not config.get('breaker_failure_threshold'):
+                self.circuit_breaker = None
+            elif self.circuit_breaker:
+                self.circuit_breaker.failure_threshold = config['breaker_failure_threshold']
+                self.circuit_breaker.reset_timeout = config.get('breaker_reset_timeout', 30.0)
+            else:
+                self.circuit_breaker = CircuitBreaker(
+                    config['breaker_failure_threshold'], config.get('breaker_reset_timeout', 30.0)
+                )
+        if 'hedge_max_ratio' in updates and self.hedge_budget:
+            self.hedge_budget.ratio = config['hedge_max_ratio']
+        if 'max_response_bytes' in updates and self._http2_adapter:
+            self._http2_adapter.max_response_bytes = config['max_response_bytes']
+        if 'shadow_sample_rate' in updates and self.shadow:
+            self.shadow.sample_rate = config['shadow_sample_rate']
+
+        if SESSION_SETTINGS & updates.keys():
+            retired, self.session = self.session, self._create_session()
+            timer = threading.Timer(config.get('drain_seconds', 2 * self.timeout), retired.close)
+            timer.daemon = True
+            timer.start()
+        logger.info(f"Reconfigured {self.metrics_prefix}: {', '.join(sorted(updates))}")
+
+    def close(self):
+        """Close pooled connections"""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self.shadow:
+            self.shadow.close()
+        self.session.close()
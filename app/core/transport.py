@@ -0,0 +1,344 @@
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import ipaddress
+import socket
+import ssl
+import threading
+import time
+import weakref
+import logging
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, extract_zipped_paths, get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from app.core.exceptions import ResponseTooLargeException
+from app.core.metrics import MetricsRegistry, metrics as default_metrics
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 support is optional (pip install 'httpx[http2]')
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+class DNSCache:
+    """In-process DNS cache with a fixed TTL, rotating across resolved addresses"""
+
+    def __init__(self, ttl: float = 60.0, metrics: Optional[MetricsRegistry] = None, prefix: str = 'transport'):
+        self.ttl = ttl
+        self.metrics = metrics or default_metrics
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str], int]] = {}
+
+    def resolve(self, host: str, port: int) -> str:
+        """Return an IP address for host, using a cached lookup while it is fresh"""
+        if self._is_ip(host):
+            return host
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                expires, addresses, index = entry
+                self._entries[key] = (expires, addresses, index + 1)
+                self.metrics.inc(f'{self.prefix}.dns.hits')
+                return addresses[index % len(addresses)]
+
+        self.metrics.inc(f'{self.prefix}.dns.misses')
+        started = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        self.metrics.observe(f'{self.prefix}.dns.lookup_ms', (time.perf_counter() - started) * 1000)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses, 1)
+        return addresses[0]
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    @staticmethod
+    def _is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host.strip('[]'))
+            return True
+        except ValueError:
+            return False
+
+class ResumableSSLSocket(ssl.SSLSocket):
+    """SSLSocket that hands its session back to the context before closing"""
+
+    def _real_close(self):
+        remember = getattr(self.context, 'remember_session', None)
+        if remember and self.server_hostname and not self.server_side:
+            remember(self.server_hostname, self)
+        super()._real_close()
+
+class ResumingSSLContext(ssl.SSLContext):
+    """SSLContext that offers the last session per hostname so handshakes can resume"""
+
+    sslsocket_class = ResumableSSLSocket
+
+    def __new__(cls, metrics: Optional[MetricsRegistry] = None, prefix: str = 'transport'):
+        context = super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+        context.metrics = metrics or default_metrics
+        context.prefix = prefix
+        context._sessions = {}
+        context._last_sockets = {}
+        context._session_lock = threading.Lock()
+        return context
+
+    def remember_session(self, hostname: str, sock: ssl.SSLSocket):
+        """Keep a socket's session if it carries a ticket (TLS 1.3 tickets arrive after the handshake)"""
+        try:
+            session = sock.session
+        except (OSError, ValueError):
+            return
+        if session is not None and session.has_ticket:
+            with self._session_lock:
+                self._sessions[hostname] = session
+
+    def _session_for(self, hostname: str) -> Optional[ssl.SSLSession]:
+        # Prefer the latest session of a still-open socket, which may have received newer tickets
+        last = self._last_sockets.get(hostname)
+        sock = last() if last else None
+        if sock is not None:
+            self.remember_session(hostname, sock)
+        return self._sessions.get(hostname)
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        if session is None and server_hostname and not server_side:
+            session = self._session_for(server_hostname)
+        try:
+            ssl_sock = super().wrap_socket(
+                sock, server_side=server_side, do_handshake_on_connect=do_handshake_on_connect,
+                suppress_ragged_eofs=suppress_ragged_eofs, server_hostname=server_hostname, session=session
+            )
+        except ssl.SSLError:
+            if session is None:
+                raise
+            # A rejected session must not poison later handshakes
+            with self._session_lock:
+                self._sessions.pop(server_hostname, None)
+            raise
+
+        if server_hostname and not server_side:
+            reused = ssl_sock.session_reused
+            self.metrics.inc(f"{self.prefix}.tls.handshakes.{'resumed' if reused else 'full'}")
+            self._last_sockets[server_hostname] = weakref.ref(ssl_sock)
+            self.remember_session(server_hostname, ssl_sock)
+        return ssl_sock
+
+def _resolving(connection_cls, dns_cache: DNSCache):
+    """Connection subclass that connects to a cached address while keeping the hostname for TLS"""
+
+    class ResolvingConnection(connection_cls):
+        def _new_conn(self):
+            hostname = self._dns_host
+            self._dns_host = dns_cache.resolve(hostname.rstrip('.'), self.port)
+            try:
+                return super()._new_conn()
+            except Exception:
+                dns_cache.invalidate(hostname.rstrip('.'), self.port)
+                raise
+            finally:
+                self._dns_host = hostname
+
+    return ResolvingConnection
+
+class GatewayHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with optional DNS caching and TLS session resumption"""
+
+    def __init__(self, dns_cache: Optional[DNSCache] = None, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        self.dns_cache = dns_cache
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.ssl_context is not None:
+            pool_kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        if self.dns_cache is not None:
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': type('ResolvingHTTPConnectionPool', (HTTPConnectionPool,), {
+                    'ConnectionCls': _resolving(HTTPConnection, self.dns_cache)
+                }),
+                'https': type('ResolvingHTTPSConnectionPool', (HTTPSConnectionPool,), {
+                    'ConnectionCls': _resolving(HTTPSConnection, self.dns_cache)
+                }),
+            }
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        if self.ssl_context is not None and verify is True and url.lower().startswith('https'):
+            # CA bundle is loaded into the shared context once, not per connection
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+def create_ssl_context(metrics: Optional[MetricsRegistry] = None, prefix: str = 'transport') -> ResumingSSLContext:
+    context = ResumingSSLContext(metrics, prefix)
+    context.load_verify_locations(extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH))
+    return context
+
+def http2_available() -> bool:
+    """True when httpx and the h2 package are installed"""
+    if httpx is None:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+class HTTP2Adapter(BaseAdapter):
+    """requests adapter that multiplexes concurrent requests over HTTP/2 connections.
+
+    Requests from worker threads are handed to one httpx AsyncClient running on
+    a private event loop thread (httpx's sync HTTP/2 client is not thread-safe),
+    so ThirdPartyAPI keeps its blocking, requests-based interface. Hosts that
+    negotiate HTTP/1.1 over ALPN are pinned to the fallback adapter. Responses
+    are read in full, and the stream is reset once the body passes
+    max_response_bytes; TLS settings come from the adapter's context, not from
+    per-request verify/cert arguments.
+    """
+
+    def __init__(self, fallback: HTTPAdapter, ssl_context: Optional[ssl.SSLContext] = None, max_connections: int = 2,
+                 max_streams: int = 100, max_response_bytes: Optional[int] = None,
+                 metrics: Optional[MetricsRegistry] = None, prefix: str = 'transport'):
+        super().__init__()
+        if not http2_available():
+            raise RuntimeError("HTTP/2 transport requires the 'httpx[http2]' package")
+        self.fallback = fallback
+        # Not shared with the fallback adapter: httpx sets h2 in the context's ALPN protocols
+        self.ssl_context = ssl_context or ssl.create_default_context(cafile=extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH))
+        self.max_connections = max_connections
+        self.max_streams = max_streams
+        self.max_response_bytes = max_response_bytes
+        self.metrics = metrics or default_metrics
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client = None
+        self._streams: Dict[str, asyncio.Semaphore] = {}
+        self._http1_hosts: Set[str] = set()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        host = urlsplit(request.url).netloc
+        if host not in self._http1_hosts:
+            future = asyncio.run_coroutine_threadsafe(self._send(request, host, timeout), self._event_loop())
+            response = future.result()
+            if response.http_version == 'HTTP/2':
+                self.metrics.inc(f'{self.prefix}.requests.http2')
+                return self._build_response(request, response)
+            self.metrics.inc(f'{self.prefix}.requests.http1')
+            self._pin_http1(host, 'server did not negotiate h2')
+            return self._build_response(request, response)
+        return self.fallback.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+    def close(self):
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.fallback.close()
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._client = httpx.AsyncClient(
+                        http2=True,
+                        verify=self.ssl_context,
+                        limits=httpx.Limits(max_connections=self.max_connections,
+                                            max_keepalive_connections=self.max_connections)
+                    )
+                    self._thread = threading.Thread(target=loop.run_forever, name='http2-transport', daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    async def _send(self, request, host: str, timeout):
+        attempts = 2 if request.method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            try:
+                # Cap in-flight streams per host; excess requests queue here rather than opening sockets
+                async with self._stream_slots(host):
+                    upstream = self._client.build_request(
+                        request.method, request.url, headers=dict(request.headers), content=request.body, timeout=self._timeout(timeout)
+                    )
+                    response = await self._client.send(upstream, stream=True)
+                    try:
+                        await self._read(response, request.url)
+                    finally:
+                        await response.aclose()
+                    return response
+            except httpx.ConnectTimeout as e:
+                raise requests.exceptions.ConnectTimeout(e, request=request)
+            except httpx.TimeoutException as e:
+                raise requests.exceptions.ReadTimeout(e, request=request)
+            except (httpx.ProtocolError, httpx.ReadError, httpx.WriteError) as e:
+                # The connection died under the request, usually retired by GOAWAY (e.g. a server-side
+                # max requests per connection). Idempotent requests are retried on a fresh connection.
+                self.metrics.inc(f'{self.prefix}.http2.connection_errors')
+                if attempt + 1 == attempts:
+                    raise requests.exceptions.ConnectionError(e, request=request)
+            except httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(e, request=request)
+
+    async def _read(self, response, url: str):
+        """Read the body in chunks, giving up once it exceeds max_response_bytes"""
+        limit = self.max_response_bytes
+        if limit and int(response.headers.get('Content-Length') or 0) > limit:
+            raise ResponseTooLargeException(f"Response from {url} exceeds {limit} bytes")
+        chunks, size = [], 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if limit and size > limit:
+                raise ResponseTooLargeException(f"Response from {url} exceeds {limit} bytes")
+            chunks.append(chunk)
+        response._content = b''.join(chunks)
+
+    def _stream_slots(self, host: str) -> asyncio.Semaphore:
+        # Only touched from the event loop thread
+        semaphore = self._streams.get(host)
+        if semaphore is None:
+            semaphore = self._streams[host] = asyncio.Semaphore(self.max_streams)
+        return semaphore
+
+    def _pin_http1(self, host: str, reason: str):
+        if host not in self._http1_hosts:
+            self._http1_hosts.add(host)
+            self.metrics.inc(f'{self.prefix}.http2.fallbacks')
+            logger.warning(f"Falling back to HTTP/1.1 for {host}: {reason}")
+
+    @staticmethod
+    def _timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def _build_response(self, request, response) -> requests.Response:
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result._content = response.content
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.reason = response.reason_phrase
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        return result
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Type
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, Required, TypedDict
+from app.core.exceptions import ValidationException
+from app.core.profiling import phase
+
+class RequestValidationException(ValidationException):
+    def __init__(self, name: str, errors: List[Dict[str, Any]]):
+        fields = ', '.join('.'.join(str(part) for part in error['loc']) or 'body' for error in errors)
+        super().__init__(f"Invalid {name} request: {fields}", status_code=400)
+        self.errors = [{'loc': list(error['loc']), 'msg': error['msg'], 'type': error['type']} for error in errors]
+
+class CompiledSchema:
+    """Validator for one request schema that returns plain dicts instead of model instances.
+
+    The model's fields are turned into a TypedDict once, so validation
+    coerces and checks the parsed JSON directly. The result matches
+    model.model_dump(exclude_none=True) for payloads that are only forwarded.
+    """
+
+    def __init__(self, name: str, model: Type[BaseModel], extra: str = 'ignore'):
+        self.name = name
+        self.model = model
+        fields = {
+            field_name: Required[field.annotation] if field.is_required() else NotRequired[field.annotation]
+            for field_name, field in model.model_fields.items()
+        }
+        payload = TypedDict(f'{model.__name__}Payload', fields)
+        payload.__pydantic_config__ = ConfigDict(extra=extra, use_enum_values=True)
+        self.adapter = TypeAdapter(payload)
+        self.defaults = {
+            field_name: field.default for field_name, field in model.model_fields.items()
+            if not field.is_required() and field.default is not None
+        }
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        try:
+            with phase('validation'):
+                values = self.adapter.validate_python(data if data is not None else {})
+        except ValidationError as e:
+            raise RequestValidationException(self.name, e.errors(include_url=False, include_input=False))
+        if None in values.values():
+            values = {key: value for key, value in values.items() if value is not None}
+        return {**self.defaults, **values} if self.defaults else values
+
+class SchemaRegistry:
+    """Request schemas compiled once at import time, keyed by route name"""
+
+    def __init__(self):
+        self._schemas: Dict[str, CompiledSchema] = {}
+
+    def register(self, name: str, model: Type[BaseModel], extra: str = 'ignore') -> CompiledSchema:
+        """Compile model for route `name`; extra='allow' forwards fields the schema doesn't list"""
+        if name in self._schemas:
+            raise ValueError(f"Schema '{name}' is already registered")
+        schema = self._schemas[name] = CompiledSchema(name, model, extra)
+        return schema
+
+    def get(self, name: str) -> CompiledSchema:
+        return self._schemas[name]
+
+    def validate(self, name: str, data: Any) -> Dict[str, Any]:
+        return self._schemas[name].validate(data)
+
+    def names(self) -> List[str]:
+        return sorted(self._schemas)
+
+# Create a singleton instance
+request_schemas = SchemaRegistry()
@@ -1,7 +1,14 @@
 from typing import Dict, Any, Optional, Callable
+from flask import request, session
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from functools import wraps
 import logging
+import queue
+from app.core.metrics import metrics
+from app.core.profiling import phase
+from app.core.rooms import ALREADY_JOINED, JOINED, NOT_CONNECTED, RoomRegistry
+from app.core.ws_auth import WebSocketAuth, token_from
+from config import Config
 
 logger = logging.getLogger(__name__)
 
@@ -9,40 +16,144 @@ class WebSocketManager:
     def __init__(self):
         self._socketio: Optional[SocketIO] = None
         self._event_handlers: Dict[str, Dict[str, Callable]] = {}
+        # With a message queue, emits reach clients connected to every instance
+        self.message_queue = Config.SOCKETIO_MESSAGE_QUEUE
+        # Connection/room bookkeeping for every namespace with registered handlers
+        self.rooms = RoomRegistry(
+            max_connections=Config.WS_MAX_CONNECTIONS,
+            max_rooms=Config.WS_MAX_ROOMS_PER_CONNECTION,
+            idle_seconds=Config.WS_ROOM_IDLE_SECONDS,
+            leave=self._leave_collected
+        )
+        # Connect-time token verification and cached per-resource authorization
+        self.auth = WebSocketAuth(
+            Config.WS_AUTH_SECRET,
+            required=Config.WS_AUTH_REQUIRED,
+            max_age=Config.WS_AUTH_TOKEN_MAX_AGE,
+            cache_size=Config.WS_AUTH_CACHE_SIZE,
+            cache_ttl=Config.WS_AUTH_CACHE_TTL
+        )
         
     def init_app(self, app):
         """Initialize SocketIO with the Flask app"""
-        self._socketio = SocketIO(app, cors_allowed_origins="*")
+        if self.auth.required and not self.auth.configured:
+            # Fail closed: never fall back to a default signing key
+            logger.error("WS_AUTH_SECRET is not set; every WebSocket connection will be refused")
+        self._socketio = SocketIO(
+            app, cors_allowed_origins="*", async_mode=Config.SOCKETIO_ASYNC_MODE,
+            message_queue=self.message_queue
+        )
         self._register_handlers()
+        if self.rooms.idle_seconds:
+            self._socketio.start_background_task(self._collect_idle_rooms)
         
     def _register_handlers(self):
         """Register all event handlers with SocketIO"""
         for namespace, handlers in self._event_handlers.items():
+            self._register_lifecycle(namespace)
             for event, handler in handlers.items():
-                self._socketio.on_event(event, handler, namespace=namespace)
+                if event not in ('connect', 'disconnect'):
+                    self._socketio.on_event(event, handler, namespace=namespace)
     
     def register_handler(self, event: str, handler: Callable, namespace: str = '/'):
-        """Register a new event handler"""
+        """Register a new event handler; 'connect'/'disconnect' handlers run after the room registry's"""
         if namespace not in self._event_handlers:
             self._event_handlers[namespace] = {}
+            if self._socketio:
+                self._register_lifecycle(namespace)
         
         self._event_handlers[namespace][event] = handler
         
-        if self._socketio:
+        if self._socketio and event not in ('connect', 'disconnect'):
             self._socketio.on_event(event, handler, namespace=namespace)
+
+    def _register_lifecycle(self, namespace: str):
+        def on_connect(auth=None):
+            if self.auth.required:
+                claims = self.auth.verify(token_from(auth, request.args.get('token')))
+                if claims is None:
+                    raise ConnectionRefusedError('unauthorized')
+                # Verified once per connection; event handlers read the claims from the session
+                session['ws_claims'] = claims
+                session['ws_claims_key'] = self.auth.claims_key(claims)
+            if not self.rooms.connect(request.sid, namespace):
+                raise ConnectionRefusedError('connection limit reached')
+            handler = self._event_handlers[namespace].get('connect')
+            if handler is None:
+                return None
+            try:
+                accepted = handler(auth) if auth is not None else handler()
+            except Exception:
+                self.rooms.disconnect(request.sid, namespace)
+                raise
+            if accepted is False:
+                self.rooms.disconnect(request.sid, namespace)
+            return accepted
+
+        def on_disconnect(*args):
+            self.rooms.disconnect(request.sid, namespace)
+            handler = self._event_handlers[namespace].get('disconnect')
+            if handler is not None:
+                return handler(*args)
+
+        self._socketio.on_event('connect', on_connect, namespace=namespace)
+        self._socketio.on_event('disconnect', on_disconnect, namespace=namespace)
+
+    def join(self, room: str) -> str:
+        """Put the current connection in a room, within its subscription cap; returns the registry outcome"""
+        result = self.rooms.join(request.sid, room, request.namespace)
+        # Connected before this namespace's handlers were registered
+        if result == NOT_CONNECTED and self.rooms.connect(request.sid, request.namespace):
+            result = self.rooms.join(request.sid, room, request.namespace)
+        if result == JOINED:
+            join_room(room)
+        return result
+
+    def leave(self, room: str) -> bool:
+        left = self.rooms.leave(request.sid, room, request.namespace)
+        leave_room(room)
+        return left
+
+    def has_subscribers(self, room: str, namespace: str = '/') -> bool:
+        """Whether any connection of this worker is in the room; checked before emitting, misses count as skipped emits"""
+        # Subscribers on other instances are not in this worker's registry, so never skip through a queue
+        if self.message_queue or self.rooms.has_subscribers(room, namespace):
+            return True
+        metrics.inc('websocket.emits.skipped')
+        return False
+
+    def _leave_collected(self, sid: str, room: str, namespace: str):
+        if self._socketio and self._socketio.server:
+            self._socketio.server.leave_room(sid, room, namespace=namespace)
+
+    def _collect_idle_rooms(self):
+        while True:
+            self._socketio.sleep(Config.WS_ROOM_GC_INTERVAL)
+            try:
+                self.rooms.collect()
+            except Exception as e:
+                logger.error(f"Collecting idle WebSocket rooms failed: {str(e)}")
     
     def emit(self, event: str, data: Dict[str, Any], room: Optional[str] = None, 
             namespace: str = '/', **kwargs):
         """Emit an event to connected clients"""
         try:
-            if room:
-                self._socketio.emit(event, data, room=room, namespace=namespace, **kwargs)
-            else:
-                self._socketio.emit(event, data, namespace=namespace, **kwargs)
+            with phase('websocket'):
+                if room:
+                    self.rooms.touch(room, namespace)
+                    self._socketio.emit(event, data, room=room, namespace=namespace, **kwargs)
+                else:
+                    self._socketio.emit(event, data, namespace=namespace, **kwargs)
         except Exception as e:
             logger.error(f"Error emitting event {event}: {str(e)}")
             raise
     
+    def create_queue(self, maxsize: int = 0):
+        """Create a queue that cooperates with the SocketIO async mode (eventlet or threads)"""
+        if self._socketio and self._socketio.server:
+            return self._socketio.server.eio.create_queue(maxsize)
+        return queue.Queue(maxsize)
+
     def run_app(self, app, **kwargs):
         """Run the Flask app with SocketIO support"""
         if not self._socketio:
@@ -52,26 +163,46 @@ class WebSocketManager:
 # Create a singleton instance
 websocket_manager = WebSocketManager()
 
+def ws_claims() -> Optional[Dict[str, Any]]:
+    """Claims of the current connection's token (None when unauthenticated)"""
+    return session.get('ws_claims')
+
+def stream_claims() -> Optional[Dict[str, Any]]:
+    """Claims of an HTTP stream's token: Authorization: Bearer, or ?token= since EventSource can't set headers"""
+    header = request.headers.get('Authorization', '')
+    token = header[7:] if header.startswith('Bearer ') else request.args.get('token')
+    return websocket_manager.auth.verify(token)
+
 def ws_auth_required(f):
-    """Decorator to check WebSocket authentication"""
+    """Drop events from connections without verified claims (a session lookup; the token was checked on connect)"""
     @wraps(f)
     def wrapped(*args, **kwargs):
-        if not getattr(f, 'auth_checked', False):
-            # Implement your authentication logic here
-            # For example, check session or token
-            pass
+        if websocket_manager.auth.required and ws_claims() is None:
+            emit('error', {'status': 'error', 'message': 'unauthorized'})
+            return None
         return f(*args, **kwargs)
     return wrapped
 
-def join_ws_room(room_id: str):
-    """Join a WebSocket room"""
-    join_room(room_id)
-    logger.info(f"Client joined room: {room_id}")
+def ws_authorize(kind: str, resource_id: str) -> bool:
+    """Whether the current connection may subscribe to a resource; decisions are cached per claim set"""
+    auth = websocket_manager.auth
+    if not auth.required:
+        return True
+    return auth.authorize(ws_claims(), kind, resource_id, session.get('ws_claims_key'))
+
+def join_ws_room(room_id: str) -> bool:
+    """Join a WebSocket room; False when the connection is at its subscription cap"""
+    result = websocket_manager.join(room_id)
+    if result not in (JOINED, ALREADY_JOINED):
+        logger.info(f"Client could not join room {room_id}: {result}")
+        return False
+    logger.debug(f"Client joined room: {room_id}")
+    return True
 
 def leave_ws_room(room_id: str):
     """Leave a WebSocket room"""
-    leave_room(room_id)
-    logger.info(f"Client left room: {room_id}")
+    websocket_manager.leave(room_id)
+    logger.debug(f"Client left room: {room_id}")
 
 def emit_to_room(room_id: str, event: str, data: Dict[str, Any], **kwargs):
     """Emit an event to a specific room"""
@@ -0,0 +1,125 @@
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
+import logging
+from itsdangerous import BadData, URLSafeTimedSerializer
+from app.core.cache import LRUCache
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class WebSocketAuth:
+    """Signed connection tokens and memoized per-resource authorization.
+
+    A backend issues a token carrying the claims a client may use (subject,
+    account, customer, explicit resource IDs). The token is verified once
+    when the client connects; afterwards each subscription only needs an
+    authorization decision, which registered authorizers make and a bounded
+    LRU keeps for cache_ttl seconds (denials included), so bursts of
+    subscriptions don't repeat upstream lookups.
+    """
+
+    def __init__(self, secret_key: Optional[str], required: bool = True, max_age: float = 3600, cache_size: int = 100000,
+                 cache_ttl: float = 60.0, salt: str = 'websocket-auth'):
+        self.required = required
+        self.max_age = max_age
+        # Without a secret no token is issued or accepted
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=salt) if secret_key else None
+        self._decisions = LRUCache(cache_size, ttl=cache_ttl)
+        self._authorizers: Dict[str, Callable[[Dict[str, Any], str], bool]] = {}
+
+    @property
+    def configured(self) -> bool:
+        return self._serializer is not None
+
+    def issue(self, claims: Dict[str, Any]) -> str:
+        if self._serializer is None:
+            raise ValueError("WebSocket tokens need WS_AUTH_SECRET")
+        return self._serializer.dumps(claims)
+
+    def verify(self, token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Claims of a valid, unexpired token, else None"""
+        if not token:
+            metrics.inc('websocket.auth.rejected.missing')
+            return None
+        if self._serializer is None:
+            metrics.inc('websocket.auth.rejected.invalid')
+            return None
+        try:
+            claims = self._serializer.loads(token, max_age=self.max_age)
+        except BadData as e:
+            metrics.inc('websocket.auth.rejected.invalid')
+            logger.info(f"Rejected WebSocket token: {type(e).__name__}")
+            return None
+        if not isinstance(claims, dict):
+            metrics.inc('websocket.auth.rejected.invalid')
+            return None
+        metrics.inc('websocket.auth.accepted')
+        return claims
+
+    @staticmethod
+    def claims_key(claims: Dict[str, Any]) -> str:
+        """Stable digest of a claim set; cached decisions are shared by connections with the same claims"""
+        return hashlib.blake2b(json.dumps(claims, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+    def register_authorizer(self, kind: str, authorizer: Callable[[Dict[str, Any], str], bool]):
+        """authorizer(claims, resource_id) decides whether claims grant access to one resource of this kind"""
+        self._authorizers[kind] = authorizer
+
+    def authorize(self, claims: Optional[Dict[str, Any]], kind: str, resource_id: str,
+                  claims_key: Optional[str] = None) -> bool:
+        if claims is None:
+            return False
+        key = (claims_key or self.claims_key(claims), kind, resource_id)
+        allowed = self._decisions.get(key, _MISSING)
+        if allowed is not _MISSING:
+            metrics.inc('websocket.auth.cache.hits')
+            return allowed
+        metrics.inc('websocket.auth.cache.misses')
+        authorizer = self._authorizers.get(kind)
+        if authorizer is None:
+            logger.warning(f"No WebSocket authorizer registered for '{kind}'")
+            return False
+        try:
+            allowed = bool(authorizer(claims, resource_id))
+        except Exception as e:
+            # Not cached: a failed lookup is retried on the next subscription
+            logger.error(f"WebSocket authorization for {kind} {resource_id} failed: {str(e)}")
+            return False
+        self._decisions.set(key, allowed)
+        if not allowed:
+            metrics.inc('websocket.auth.denied')
+        return allowed
+
+    def invalidate(self):
+        self._decisions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = metrics.counter('websocket.auth.cache.hits')
+        misses = metrics.counter('websocket.auth.cache.misses')
+        return {
+            'required': self.required,
+            'configured': self.configured,
+            'accepted': metrics.counter('websocket.auth.accepted'),
+            'rejected': {
+                'missing': metrics.counter('websocket.auth.rejected.missing'),
+                'invalid': metrics.counter('websocket.auth.rejected.invalid'),
+            },
+            'denied': metrics.counter('websocket.auth.denied'),
+            'cache': {
+                'size': len(self._decisions),
+                'maxsize': self._decisions.maxsize,
+                'ttl': self._decisions.ttl,
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+            },
+        }
+
+def token_from(auth: Any, query_token: Optional[str]) -> Optional[str]:
+    """Token from the Socket.IO auth payload ({"token": ...}), else the 'token' query parameter"""
+    if isinstance(auth, dict) and auth.get('token'):
+        return auth['token']
+    return query_token
@@ -0,0 +1,9 @@
+def create_provider():
+    """Create the fake payment provider configured by FAKEPAY_* settings"""
+    from .provider import FakePaymentProvider
+    from config import Config
+    return FakePaymentProvider(
+        latency_ms=Config.FAKEPAY_LATENCY_MS,
+        jitter_ms=Config.FAKEPAY_JITTER_MS,
+        error_rate=Config.FAKEPAY_ERROR_RATE
+    )
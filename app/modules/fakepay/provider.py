@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import random
+import threading
+import time
+import uuid
+from app.core.exceptions import NotFoundException, ThirdPartyAPIException
+from app.core.interfaces import PaymentProvider
+
+class FakePaymentProvider(PaymentProvider):
+    """In-memory payment provider with tunable latency and failure rate, for demos and tests.
+
+    Payments mirror the shape of Xendit payment requests so either provider can
+    serve the same routes.
+    """
+
+    payment_id_prefix = 'fp-'
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._payments: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _simulate(self):
+        delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if self._random.random() < self.error_rate:
+            raise ThirdPartyAPIException("FakePay API error: simulated upstream failure", status_code=503)
+
+    def create_payment(self, payment_data: Dict[str, Any]) -> Dict[str, Any]:
+        self._simulate()
+        now = datetime.now(timezone.utc).isoformat()
+        payment = {
+            'country': 'ID',
+            'status': 'SUCCEEDED',
+            **payment_data,
+            'id': f'fp-{uuid.uuid4().hex}',
+            'created': now,
+            'updated': now,
+        }
+        with self._lock:
+            self._payments[payment['id']] = payment
+        return dict(payment)
+
+    def get_payment(self, payment_id: str) -> Dict[str, Any]:
+        self._simulate()
+        with self._lock:
+            payment = self._payments.get(payment_id)
+        if payment is None:
+            raise NotFoundException(f"Payment {payment_id} not found")
+        return dict(payment)
+
+    def list_payments(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self._simulate()
+        params = params or {}
+        limit = int(params.get('limit', 10))
+        with self._lock:
+            payments = [dict(p) for p in self._payments.values()
+                        if all(str(p.get(key)) == str(value) for key, value in params.items() if key != 'limit')]
+        return {'data': payments[:limit], 'has_more': len(payments) > limit}
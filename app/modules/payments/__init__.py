@@ -0,0 +1,6 @@
+def create_payments_blueprint():
+    """Create the provider-agnostic payments blueprint"""
+    # Imported here so that importing the package does not pull in the
+    # controller and every configured provider
+    from .controller import bp as payments_bp
+    return payments_bp
@@ -0,0 +1,54 @@
+from flask import Blueprint, request, jsonify
+from .router import payment_router
+from .schemas import request_schemas
+from app.core.admin import admin_required
+from app.core.exceptions import ApplicationException
+
+bp = Blueprint('payments', __name__)
+
+PROVIDER_HEADER = 'X-Payment-Provider'
+
+def _provider_response(provider: str, result, status: int):
+    response = jsonify(result)
+    response.headers[PROVIDER_HEADER] = provider
+    return response, status
+
+@bp.route('', methods=['POST'])
+def create_payment():
+    try:
+        payment_data = request_schemas.validate('payments.create_payment', request.json)
+        provider, result = payment_router.call(
+            'create_payment', payment_data,
+            provider=request.headers.get(PROVIDER_HEADER)
+        )
+        return _provider_response(provider, result, 201)
+    except ApplicationException as e:
+        return jsonify({'error': str(e)}), e.status_code
+
+@bp.route('/<payment_id>', methods=['GET'])
+def get_payment(payment_id: str):
+    try:
+        provider, result = payment_router.call(
+            'get_payment', payment_id,
+            provider=request.headers.get(PROVIDER_HEADER), resource_id=payment_id, idempotent=True
+        )
+        return _provider_response(provider, result, 200)
+    except ApplicationException as e:
+        return jsonify({'error': str(e)}), e.status_code
+
+@bp.route('', methods=['GET'])
+def list_payments():
+    params = request.args.to_dict()
+    try:
+        provider, result = payment_router.call(
+            'list_payments', params,
+            provider=params.pop('provider', None) or request.headers.get(PROVIDER_HEADER), failover=False
+        )
+        return _provider_response(provider, result.get('data', []), 200)
+    except ApplicationException as e:
+        return jsonify({'error': str(e)}), e.status_code
+
+@bp.route('/providers', methods=['GET'])
+@admin_required
+def get_provider_stats():
+    return jsonify(payment_router.stats()), 200
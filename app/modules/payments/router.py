@@ -0,0 +1,15 @@
+from werkzeug.utils import import_string
+from app.core.lifecycle import worker_resources
+from app.core.provider_router import ProviderRouter
+from config import Config
+
+def create_payment_router() -> ProviderRouter:
+    """Build the router over the enabled providers from Config.PAYMENT_PROVIDERS"""
+    enabled = Config.ENABLED_PAYMENT_PROVIDERS or list(Config.PAYMENT_PROVIDERS)
+    providers = {name: import_string(Config.PAYMENT_PROVIDERS[name])() for name in enabled}
+    id_prefixes = {name: provider.payment_id_prefix for name, provider in providers.items()}
+    return ProviderRouter(providers, name='payments', id_prefixes=id_prefixes, **Config.PAYMENT_ROUTER)
+
+# One router (and provider statistics) per worker process, created after fork
+worker_resources.register('payments.router', create_payment_router)
+payment_router = worker_resources.proxy('payments.router')
@@ -0,0 +1,14 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+from app.core.validation import request_schemas
+
+class PaymentRequest(BaseModel):
+    reference_id: str = Field(..., description="Payment reference ID")
+    amount: float = Field(..., description="Payment amount")
+    currency: str = Field(..., description="Payment currency")
+    payment_method_id: str = Field(..., description="Payment method ID")
+    description: Optional[str] = Field(None, description="Payment description")
+    customer_id: Optional[str] = Field(None, description="Customer ID")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+request_schemas.register('payments.create_payment', PaymentRequest)
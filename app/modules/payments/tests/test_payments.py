@@ -0,0 +1,45 @@
+import pytest
+from flask import Flask
+from app.core.provider_router import ProviderRouter
+from app.modules.fakepay.provider import FakePaymentProvider
+from app.modules.payments import create_payments_blueprint
+
+PAYMENT = {'reference_id': 'ref-1', 'amount': 10000, 'currency': 'IDR', 'payment_method_id': 'pm-1'}
+
+@pytest.fixture
+def router(monkeypatch):
+    router = ProviderRouter({
+        'primary': FakePaymentProvider(error_rate=1.0),
+        'fakepay': FakePaymentProvider(seed=1),
+    }, explore_ratio=0, breaker_failure_threshold=1)
+    # Prefer the failing provider until its circuit opens
+    router.stats_by_provider['fakepay'].record(500, ok=True)
+    monkeypatch.setattr('app.modules.payments.controller.payment_router', router)
+    return router
+
+@pytest.fixture
+def client(router):
+    app = Flask(__name__)
+    app.register_blueprint(create_payments_blueprint(), url_prefix='/api/payments')
+    return app.test_client()
+
+def test_create_is_not_retried_on_another_provider(client, router):
+    response = client.post('/api/payments', json=PAYMENT)
+
+    assert response.status_code == 503
+    assert router.breakers['primary'].state == 'open'
+
+def test_fails_over_once_circuit_is_open_and_reads_from_owner(client):
+    client.post('/api/payments', json=PAYMENT)
+
+    created = client.post('/api/payments', json=PAYMENT)
+    fetched = client.get(f"/api/payments/{created.json['id']}")
+
+    assert created.status_code == 201
+    assert created.headers['X-Payment-Provider'] == 'fakepay'
+    assert fetched.json['reference_id'] == 'ref-1'
+    assert fetched.headers['X-Payment-Provider'] == 'fakepay'
+
+def test_validation_and_unknown_provider(client):
+    assert client.post('/api/payments', json={'amount': 1}).status_code == 400
+    assert client.get('/api/payments', headers={'X-Payment-Provider': 'nope'}).status_code == 400
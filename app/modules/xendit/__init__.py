@@ -1,9 +1,10 @@
-from flask import Blueprint
-from .controller import bp as xendit_bp
-from .websocket import init_xendit_websocket
-
 def create_xendit_blueprint():
     """Create and configure the Xendit blueprint"""
+    # Imported here so that importing the package (e.g. for its websocket or
+    # CLI hooks) does not pull in the controller, schemas and use cases
+    from .controller import bp as xendit_bp
+    from .websocket import init_xendit_websocket
+
     # Initialize WebSocket handlers
     init_xendit_websocket()
     return xendit_bp
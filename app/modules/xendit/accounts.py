@@ -0,0 +1,112 @@
+from typing import Any, Dict, Optional
+import json
+import os
+import time
+import logging
+from flask import Blueprint, g, has_request_context, jsonify, request
+from werkzeug.local import LocalProxy
+from app.core.client_pool import ClientPool
+from app.core.exceptions import NotFoundException
+from app.core.lifecycle import worker_resources
+from .api import XenditAPI
+from .settings import client_settings
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _create_client(name: str, settings: Dict[str, Any]) -> XenditAPI:
+    settings = dict(settings)
+    api_key = settings.pop('api_key', None) or os.getenv(settings.pop('api_key_env', '') or 'XENDIT_API_KEY')
+    base_url = settings.pop('base_url', None)
+    settings.pop('weight', None)
+    # Account settings win over the service-wide runtime tunables
+    config = {**client_settings(), **settings, 'metrics_prefix': f'upstream.xendit.{name}'}
+    return XenditAPI(api_key=api_key, base_url=base_url, config=config)
+
+class XenditAccountPool(ClientPool):
+    """Xendit clients per (sub-)account, read from XENDIT_ACCOUNTS_FILE and reloaded when it changes.
+
+    Without an accounts file the pool holds a single "default" account using XENDIT_API_KEY.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: float = 10.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._mtime: Optional[float] = None
+        self._checked = time.monotonic()
+        super().__init__(_create_client, **self._read())
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path:
+            return {'accounts': {'default': {}}, 'default': 'default'}
+        self._mtime = os.stat(self.path).st_mtime
+        with open(self.path) as f:
+            document = json.load(f)
+        return {
+            'accounts': document.get('accounts', {}),
+            'default': document.get('default'),
+            'rules': document.get('rules', []),
+        }
+
+    def refresh(self):
+        """Reload accounts if the file changed; checked at most every reload_interval seconds"""
+        now = time.monotonic()
+        if not self.path or now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+        try:
+            if os.stat(self.path).st_mtime != self._mtime:
+                self.reload(**self._read())
+        except (OSError, ValueError) as e:
+            # Keep serving with the current accounts until the file is fixed
+            logger.error(f"Failed to reload Xendit accounts from {self.path}: {str(e)}")
+
+def create_account_pool() -> XenditAccountPool:
+    return XenditAccountPool(Config.XENDIT_ACCOUNTS_FILE, Config.XENDIT_ACCOUNTS_RELOAD_INTERVAL)
+
+# One account pool (a pooled API client per sub-account) per worker process, created after fork
+worker_resources.register(
+    'xendit.accounts',
+    create_account_pool,
+    warmup=lambda pool: pool.warmup(),
+    close=lambda pool: pool.close()
+)
+xendit_accounts = worker_resources.proxy('xendit.accounts')
+
+def create_payment_provider() -> XenditAPI:
+    """Xendit as a payment router provider, using the default account's client"""
+    return LocalProxy(lambda: xendit_accounts.get())
+
+def current_client(pool: ClientPool) -> XenditAPI:
+    """Client for the account selected for the current request, else the default account"""
+    return pool.get(g.get('xendit_account') if has_request_context() else None)
+
+def init_account_routing(bp: Blueprint, pool: XenditAccountPool):
+    """Select an account per request and remember which account created each resource"""
+
+    @bp.before_request
+    def select_account():
+        pool.refresh()
+        view_args = request.view_args or {}
+        # Generated routes name the resource <id>, hand-written ones <payment_id> etc.
+        resource_id = next((value for key, value in view_args.items() if key == 'id' or key.endswith('_id')), None)
+        try:
+            g.xendit_account = pool.select(
+                account=request.headers.get(Config.XENDIT_ACCOUNT_HEADER),
+                resource_id=resource_id,
+                path=request.path,
+                method=request.method
+            )
+        except NotFoundException as e:
+            return jsonify({'error': str(e)}), 400
+
+    @bp.after_request
+    def remember_owner(response):
+        account = g.get('xendit_account')
+        if account:
+            response.headers[Config.XENDIT_ACCOUNT_HEADER] = account
+            if request.method == 'POST' and response.status_code in (200, 201) and response.is_json:
+                data = response.get_json(silent=True)
+                if isinstance(data, dict) and data.get('id'):
+                    pool.remember(data['id'], account)
+        return response
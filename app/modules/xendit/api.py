@@ -1,33 +1,35 @@
 import requests
 import os
 from typing import Optional, Dict, Any, List
+from app.core.interfaces import PaymentProvider
 from app.core.third_party import ThirdPartyAPI, ThirdPartyAPIException
 from config import Config
+from .endpoints import ENDPOINTS
 
-class XenditAPI(ThirdPartyAPI):
+class XenditAPI(ThirdPartyAPI, PaymentProvider):
     """Xendit API client"""
+
+    service_name = 'xendit'
+    # Payment request IDs
+    payment_id_prefix = 'pr-'
     
-    def __init__(self, api_key: str = None, base_url: str = None):
-        """Initialize Xendit API client"""
-        self.api_key = api_key or os.getenv('XENDIT_API_KEY')
-        self.base_url = base_url or os.getenv('XENDIT_API_BASE_URL')
-        if not self.api_key:
+    def __init__(self, api_key: str = None, base_url: str = None, config: Optional[Dict[str, Any]] = None):
+        """Initialize Xendit API client; config overrides entries of Config.API_CONFIGS['xendit']"""
+        api_key = api_key or os.getenv('XENDIT_API_KEY')
+        base_url = base_url or os.getenv('XENDIT_API_BASE_URL')
+        if not api_key:
             raise ValueError("XENDIT_API_KEY environment variable is required")
-        if not self.base_url:
+        if not base_url:
             raise ValueError("XENDIT_API_BASE_URL environment variable is required")
-        self.headers = {
-            'Authorization': f'Basic {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+        super().__init__(base_url=base_url, api_key=api_key, config={**Config.API_CONFIGS.get('xendit', {}), **(config or {})})
+        self.headers = self.get_headers()
 
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                      hedge: bool = False, raw: bool = False) -> Dict[str, Any]:
         try:
-            response = requests.request(method, url, json=data, params=params, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ThirdPartyAPIException(f"Xendit API error: {str(e)}")
+            return super()._make_request(method, endpoint, hedge=hedge, raw=raw, json=data, params=params)
+        except ThirdPartyAPIException as e:
+            raise ThirdPartyAPIException(f"Xendit API error: {e.message}", status_code=e.status_code, raw_error=e.raw_error)
 
     def get_headers(self):
         """Get headers for API requests"""
@@ -36,6 +38,18 @@ class XenditAPI(ThirdPartyAPI):
             'Content-Type': 'application/json'
         }
 
+    def get_shadow_headers(self):
+        """Shadow calls authenticate with their own key (XENDIT_SHADOW_API_KEY), if any"""
+        api_key = self.config.get('shadow_api_key')
+        return {'Authorization': f'Basic {api_key}'} if api_key else {}
+
+    def call(self, name: str, path_params: Optional[Dict[str, str]] = None, data: Optional[Dict] = None,
+             params: Optional[Dict] = None, raw: bool = False) -> Dict[str, Any]:
+        """Call an endpoint from the generated table, e.g. call('list_payment_requests_captures', {'id': ...})"""
+        endpoint = ENDPOINTS[name]
+        path = endpoint.path.format_map(path_params) if endpoint.params else endpoint.path
+        return self._make_request(endpoint.method, path, data=data, params=params, hedge=endpoint.hedge, raw=raw)
+
     # Customer APIs
     def create_customer(self, customer_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new customer"""
@@ -52,7 +66,7 @@ class XenditAPI(ThirdPartyAPI):
 
     def get_payment_method(self, payment_method_id: str) -> Dict[str, Any]:
         """Get payment method details"""
-        return self._make_request('GET', f'/v2/payment_methods/{payment_method_id}')
+        return self._make_request('GET', f'/v2/payment_methods/{payment_method_id}', hedge=True)
 
     def update_payment_method(self, payment_method_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a payment method"""
@@ -73,7 +87,7 @@ class XenditAPI(ThirdPartyAPI):
 
     def get_payment(self, payment_id: str) -> Dict[str, Any]:
         """Get payment details"""
-        return self._make_request('GET', f'/payment_requests/{payment_id}')
+        return self._make_request('GET', f'/payment_requests/{payment_id}', hedge=True)
 
     def list_payments(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """List payments"""
@@ -103,7 +117,7 @@ class XenditAPI(ThirdPartyAPI):
 
     def get_ewallet_charge_status(self, charge_id: str) -> Dict[str, Any]:
         """Get eWallet charge status"""
-        return self._make_request('GET', f'/ewallets/charges/{charge_id}')
+        return self._make_request('GET', f'/ewallets/charges/{charge_id}', hedge=True)
 
     # QR Code Payment APIs
     def create_qr_code(self, qr_code_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -112,7 +126,7 @@ class XenditAPI(ThirdPartyAPI):
 
     def get_qr_code_status(self, qr_code_id: str) -> Dict[str, Any]:
         """Get QR code payment status"""
-        return self._make_request('GET', f'/qr_codes/{qr_code_id}')
+        return self._make_request('GET', f'/qr_codes/{qr_code_id}', hedge=True)
 
     # Over-the-Counter Payment APIs
     def create_otc_payment(self, otc_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -121,4 +135,4 @@ class XenditAPI(ThirdPartyAPI):
 
     def get_otc_payment_status(self, payment_id: str) -> Dict[str, Any]:
         """Get over-the-counter payment status"""
-        return self._make_request('GET', f'/payment_requests/{payment_id}')
+        return self._make_request('GET', f'/payment_requests/{payment_id}', hedge=True)
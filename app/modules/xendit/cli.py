@@ -0,0 +1,126 @@
+import json
+import os
+import signal
+import threading
+import click
+from flask.cli import AppGroup
+from .api import XenditAPI
+from .export import EXPORT_FORMATS, PaymentExporter
+from .imports import IMPORT_FORMATS, IMPORT_KINDS, BulkImport
+from .jobs import create_job_pool, notify_job_finished
+from .reconciliation import ReconciliationJob
+from app.core.codegen import read_collection, render_endpoints, render_schemas
+from app.core.jobs import JobStore
+from config import Config
+
+cli = AppGroup('xendit', help='Xendit module commands.')
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+COLLECTION = 'documentation/Xendit API Collection.json'
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(MODULE_DIR)))
+
+@cli.command('export-payments')
+@click.option('--output', '-o', required=True, help='Output file path')
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv', show_default=True)
+@click.option('--payment-method-id', default=None, help='Only export payments for this payment method')
+@click.option('--checkpoint', default=None, help='Checkpoint file used to resume an interrupted export')
+@click.option('--page-size', default=100, show_default=True, help='Upstream page size')
+@click.option('--param', '-p', multiple=True, help='Extra list filter as key=value, e.g. -p status=SUCCEEDED')
+def export_payments(output, fmt, payment_method_id, checkpoint, page_size, param):
+    """Stream Xendit payment history to a CSV, JSONL or Parquet file"""
+    params = dict(item.split('=', 1) for item in param)
+    exporter = PaymentExporter(
+        XenditAPI(), fmt, page_size=page_size,
+        progress=lambda state: click.echo(
+            f"{state.rows} rows, {state.pages} pages, cursor={state.cursor}", err=True
+        )
+    )
+    state = exporter.export_to_file(output, params, payment_method_id, checkpoint_path=checkpoint)
+    click.echo(f"Exported {state.rows} payments to {output}", err=True)
+
+@cli.command('reconcile')
+@click.option('--ledger', required=True, type=click.Path(exists=True, dir_okay=False), help='Ledger file (.csv or .jsonl)')
+@click.option('--output', '-o', required=True, help='Mismatch report path (JSONL)')
+@click.option('--start', required=True, type=click.DateTime(), help='Start of the time range (inclusive)')
+@click.option('--end', required=True, type=click.DateTime(), help='End of the time range (exclusive)')
+@click.option('--partitions', default=64, show_default=True, help='Hash partitions for the join')
+@click.option('--workers', default=None, type=int, help='Worker processes (default: CPU count)')
+@click.option('--fetch-windows', default=8, show_default=True, help='Time windows fetched concurrently')
+@click.option('--fetch-concurrency', default=4, show_default=True, help='Concurrent upstream fetches')
+@click.option('--field', '-f', multiple=True, help='Ledger column mapping as field=column, e.g. -f amount=total')
+def reconcile(ledger, output, start, end, partitions, workers, fetch_windows, fetch_concurrency, field):
+    """Reconcile a ledger file against Xendit payments for a time range"""
+    summary = ReconciliationJob(
+        XenditAPI(), ledger, output, start=start, end=end,
+        partitions=partitions, workers=workers, fetch_windows=fetch_windows,
+        fetch_concurrency=fetch_concurrency, ledger_fields=dict(item.split('=', 1) for item in field)
+    ).run()
+    click.echo(json.dumps(summary, indent=2))
+
+@cli.command('import')
+@click.argument('kind', type=click.Choice(sorted(IMPORT_KINDS)))
+@click.option('--input', '-i', 'input_path', required=True, type=click.Path(exists=True, dir_okay=False), help='Rows to import (.csv or .jsonl)')
+@click.option('--report', '-o', required=True, help='Per-row result report path (JSONL)')
+@click.option('--checkpoint', default=None, help='Checkpoint file used to resume an interrupted import')
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), default=None, help='Input format (default: from the extension)')
+@click.option('--concurrency', default=8, show_default=True, help='Concurrent upstream requests')
+@click.option('--rate-limit', default=20.0, show_default=True, help='Upstream requests per second (0 = unlimited)')
+@click.option('--workers', default=None, type=int, help='Validation processes (default: CPU count)')
+@click.option('--chunk-rows', default=1000, show_default=True, help='Rows per validation chunk and checkpoint')
+def import_rows(kind, input_path, report, checkpoint, fmt, concurrency, rate_limit, workers, chunk_rows):
+    """Create customers or payment methods in bulk from a CSV or JSONL file"""
+    summary = BulkImport(
+        XenditAPI(), kind, input_path, report, checkpoint_path=checkpoint, fmt=fmt,
+        concurrency=concurrency, rate_limit=rate_limit, workers=workers, chunk_rows=chunk_rows,
+        progress=lambda state: click.echo(
+            f"{state['rows']} rows: {state['created']} created, {state['invalid']} invalid, {state['failed']} failed",
+            err=True
+        )
+    ).run()
+    click.echo(json.dumps(summary, indent=2))
+
+@cli.command('jobs-worker')
+def jobs_worker():
+    """Run background job workers in this process (use with XENDIT_JOBS_IN_PROCESS=false)"""
+    store = JobStore(Config.XENDIT_JOBS_DB_PATH)
+    # Through a message queue this process emits completions itself; otherwise web workers
+    # poll the store for them and push them to their own websocket clients
+    pool = create_job_pool(store, on_finished=notify_job_finished if Config.SOCKETIO_MESSAGE_QUEUE else None)
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stopping.set())
+    pool.start()
+    click.echo(f"Job workers running against {Config.XENDIT_JOBS_DB_PATH}", err=True)
+    try:
+        stopping.wait()
+    except KeyboardInterrupt:
+        pass
+    click.echo("Stopping job workers", err=True)
+    pool.stop()
+    store.close()
+
+@cli.command('generate-endpoints')
+@click.option('--collection', default=os.path.join(ROOT_DIR, COLLECTION), show_default=True, type=click.Path(exists=True, dir_okay=False),
+              help='Postman collection (v2.1) to read')
+@click.option('--check', is_flag=True, help='Fail if the generated modules are out of date instead of writing them')
+def generate_endpoints(collection, check):
+    """Generate the endpoint table (endpoints.py) and request schema skeletons (endpoint_schemas.py)"""
+    specs = read_collection(collection, hosts=('api.xendit.co', '{{url}}'))
+    command = 'flask xendit generate-endpoints'
+    outputs = {
+        'endpoints.py': render_endpoints(specs, COLLECTION, command, schema_prefix='xendit.'),
+        'endpoint_schemas.py': render_schemas(specs, COLLECTION, command, schema_prefix='xendit.'),
+    }
+    stale = []
+    for filename, source in outputs.items():
+        path = os.path.join(MODULE_DIR, filename)
+        if os.path.exists(path):
+            with open(path) as f:
+                if f.read() == source:
+                    continue
+        stale.append(filename)
+        if not check:
+            with open(path, 'w') as f:
+                f.write(source)
+    if check and stale:
+        raise click.ClickException(f"Out of date: {', '.join(stale)}; run `{command}`")
+    click.echo(f"{len(specs)} endpoints; {'updated ' + ', '.join(stale) if stale else 'up to date'}", err=True)
@@ -0,0 +1,384 @@
+"""Request schema skeletons generated from documentation/Xendit API Collection.json.
+
+Do not edit by hand; regenerate with `flask xendit generate-endpoints`.
+"""
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel
+from app.core.validation import request_schemas
+
+class AuthLinkedAccountTokensRequest(BaseModel):
+    channel_code: Optional[str] = None
+    customer_id: Optional[str] = None
+    properties: Optional[Dict[str, Any]] = None
+
+class AuthPaymentMethodsRequest(BaseModel):
+    auth_code: Optional[str] = None
+
+class AuthPaymentRequestsRequest(BaseModel):
+    auth_code: Optional[str] = None
+
+class AuthReversalCreditCardChargesRequest(BaseModel):
+    external_id: Optional[str] = None
+
+class CaptureCreditCardChargesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+
+class CreateAccountHoldersRequest(BaseModel):
+    address: Optional[Dict[str, Any]] = None
+    business_detail: Optional[Dict[str, Any]] = None
+    email: Optional[str] = None
+    individual_details: Optional[List[Any]] = None
+    kyc_documents: Optional[List[Any]] = None
+    phone_number: Optional[str] = None
+    website_url: Optional[str] = None
+
+class CreateAccountsRequest(BaseModel):
+    email: Optional[str] = None
+    public_profile: Optional[Dict[str, Any]] = None
+    type: Optional[str] = None
+
+class CreateBatchDisbursementsRequest(BaseModel):
+    disbursements: Optional[List[Any]] = None
+    reference: Optional[str] = None
+
+class CreateCallbackUrlsRequest(BaseModel):
+    url: Optional[str] = None
+
+class CreateCallbackVirtualAccountsRequest(BaseModel):
+    bank_code: Optional[str] = None
+    external_id: Optional[str] = None
+    name: Optional[str] = None
+    virtual_account_number: Optional[str] = None
+
+class CreateCreditCardChargesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    capture: Optional[bool] = None
+    card_cvn: Optional[str] = None
+    external_id: Optional[str] = None
+    token_id: Optional[str] = None
+
+class CreateCreditCardChargesRefundsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    external_id: Optional[str] = None
+
+class CreateCustomersRequest(BaseModel):
+    addresses: Optional[List[Any]] = None
+    email: Optional[str] = None
+    given_names: Optional[str] = None
+    individual_detail: Optional[Dict[str, Any]] = None
+    mobile_number: Optional[str] = None
+    reference_id: Optional[str] = None
+    surname: Optional[str] = None
+    type: Optional[str] = None
+
+class CreateDirectDebitsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    callback_url: Optional[str] = None
+    currency: Optional[str] = None
+    enable_otp: Optional[bool] = None
+    payment_method_id: Optional[str] = None
+    reference_id: Optional[str] = None
+
+class CreateDisbursementsRequest(BaseModel):
+    account_holder_name: Optional[str] = None
+    account_number: Optional[str] = None
+    amount: Optional[Union[int, float]] = None
+    bank_code: Optional[str] = None
+    description: Optional[str] = None
+    external_id: Optional[str] = None
+
+class CreateEwalletsChargesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    channel_code: Optional[str] = None
+    channel_properties: Optional[Dict[str, Any]] = None
+    checkout_method: Optional[str] = None
+    currency: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    payment_method_id: Optional[str] = None
+    reference_id: Optional[str] = None
+
+class CreateFeeRulesRequest(BaseModel):
+    description: Optional[str] = None
+    name: Optional[str] = None
+    routes: Optional[List[Any]] = None
+
+class CreateFixedPaymentCodeRequest(BaseModel):
+    expected_amount: Optional[Union[int, float]] = None
+    external_id: Optional[str] = None
+    name: Optional[str] = None
+    retail_outlet_name: Optional[str] = None
+
+class CreateInvoicesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    callback_virtual_account_id: Optional[str] = None
+    description: Optional[str] = None
+    external_id: Optional[str] = None
+    payer_email: Optional[str] = None
+    should_send_email: Optional[bool] = None
+
+class CreatePaylaterChargesRequest(BaseModel):
+    checkout_method: Optional[str] = None
+    failure_redirect_url: Optional[str] = None
+    plan_id: Optional[str] = None
+    reference_id: Optional[str] = None
+    success_redirect_url: Optional[str] = None
+
+class CreatePaylaterPlansRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    channel_code: Optional[str] = None
+    currency: Optional[str] = None
+    customer_id: Optional[str] = None
+    order_items: Optional[List[Any]] = None
+
+class CreatePaymentCodesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    channel_code: Optional[str] = None
+    currency: Optional[str] = None
+    customer_name: Optional[str] = None
+    market: Optional[str] = None
+    reference_id: Optional[str] = None
+
+class CreatePaymentMethodsV1Request(BaseModel):
+    customer_id: Optional[str] = None
+    properties: Optional[Dict[str, Any]] = None
+    type: Optional[str] = None
+
+class CreatePaymentMethodsV2Request(BaseModel):
+    country: Optional[str] = None
+    customer_id: Optional[str] = None
+    direct_debit: Optional[Dict[str, Any]] = None
+    ewallet: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None
+    reusability: Optional[str] = None
+    type: Optional[str] = None
+
+class CreatePaymentRequestsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    capture_method: Optional[str] = None
+    channel_properties: Optional[Dict[str, Any]] = None
+    country: Optional[str] = None
+    currency: Optional[str] = None
+    customer_id: Optional[str] = None
+    description: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    payment_method: Optional[Dict[str, Any]] = None
+    payment_method_id: Optional[str] = None
+
+class CreatePaymentRequestsCapturesRequest(BaseModel):
+    capture_amount: Optional[Union[int, float]] = None
+    reference_id: Optional[str] = None
+
+class CreatePayoutsV1Request(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    email: Optional[str] = None
+    external_id: Optional[str] = None
+
+class CreatePayoutsV2Request(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    channel_code: Optional[str] = None
+    channel_properties: Optional[Dict[str, Any]] = None
+    currency: Optional[str] = None
+    description: Optional[str] = None
+    reference_id: Optional[str] = None
+    type: Optional[str] = None
+
+class CreateQrCodesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    currency: Optional[str] = None
+    expires_at: Optional[str] = None
+    reference_id: Optional[str] = None
+    type: Optional[str] = None
+
+class CreateQrCodesPaymentsRefundsRequest(BaseModel):
+    api_version: Optional[Any] = None
+    business_id: Optional[str] = None
+    created: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    event: Optional[str] = None
+
+class CreateRecurringPaymentsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    description: Optional[str] = None
+    external_id: Optional[str] = None
+    interval: Optional[str] = None
+    interval_count: Optional[Any] = None
+    payer_email: Optional[str] = None
+    payment_method_id: Optional[str] = None
+    should_send_email: Optional[bool] = None
+
+class CreateRecurringPlansRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    currency: Optional[str] = None
+    customer_id: Optional[str] = None
+    description: Optional[str] = None
+    failed_cycle_action: Optional[str] = None
+    failure_return_url: Optional[str] = None
+    immediate_action_type: Optional[str] = None
+    items: Optional[List[Any]] = None
+    metadata: Optional[Any] = None
+    notification_config: Optional[Dict[str, Any]] = None
+    payment_methods: Optional[List[Any]] = None
+    recurring_action: Optional[str] = None
+    reference_id: Optional[str] = None
+    schedule: Optional[Dict[str, Any]] = None
+    success_return_url: Optional[str] = None
+
+class CreateRecurringSchedulesRequest(BaseModel):
+    anchor_date: Optional[str] = None
+    failed_attempt_notifications: Optional[List[Any]] = None
+    interval: Optional[str] = None
+    interval_count: Optional[Union[int, float]] = None
+    reference_id: Optional[str] = None
+    retry_interval: Optional[str] = None
+    retry_interval_count: Optional[Union[int, float]] = None
+    total_recurrence: Optional[Union[int, float]] = None
+    total_retry: Optional[Union[int, float]] = None
+
+class CreateReportsRequest(BaseModel):
+    currency: Optional[str] = None
+    filter: Optional[Dict[str, Any]] = None
+    format: Optional[str] = None
+    type: Optional[str] = None
+
+class CreateSessionsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    cancel_return_url: Optional[str] = None
+    country: Optional[str] = None
+    currency: Optional[str] = None
+    customer: Optional[Dict[str, Any]] = None
+    mode: Optional[str] = None
+    reference_id: Optional[str] = None
+    session_type: Optional[str] = None
+    success_return_url: Optional[str] = None
+
+class CreateSplitRulesRequest(BaseModel):
+    description: Optional[str] = None
+    name: Optional[str] = None
+    routes: Optional[List[Any]] = None
+
+class CreateTransfersRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    destination_user_id: Optional[str] = None
+    reference: Optional[str] = None
+    source_user_id: Optional[str] = None
+
+class SimulatePaymentCallbackVirtualAccountsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+
+class SimulatePaymentFixedPaymentCodeRequest(BaseModel):
+    payment_code: Optional[str] = None
+    retail_outlet_name: Optional[str] = None
+    transfer_amount: Optional[Union[int, float]] = None
+
+class SimulatePaymentMethodsPaymentsRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+
+class SimulatePaymentNonFixedPaymentCodeRequest(BaseModel):
+    payment_code: Optional[str] = None
+    retail_outlet_name: Optional[str] = None
+    transfer_amount: Optional[Union[int, float]] = None
+
+class SimulatePaymentPoolVirtualAccountsRequest(BaseModel):
+    bank_account_number: Optional[str] = None
+    bank_code: Optional[str] = None
+    transfer_amount: Optional[Union[int, float]] = None
+
+class SimulateRecurringPlansCyclesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+
+class UpdateAccountHoldersRequest(BaseModel):
+    business_detail: Optional[Dict[str, Any]] = None
+    kyc_documents: Optional[List[Any]] = None
+    website_url: Optional[str] = None
+
+class UpdateAccountsRequest(BaseModel):
+    account_holder_id: Optional[str] = None
+    email: Optional[str] = None
+    public_profile: Optional[Dict[str, Any]] = None
+
+class UpdateCallbackVirtualAccountsRequest(BaseModel):
+    expected_amount: Optional[str] = None
+
+class UpdateFixedPaymentCodeRequest(BaseModel):
+    expected_amount: Optional[Union[int, float]] = None
+    name: Optional[str] = None
+
+class UpdatePaymentCodesRequest(BaseModel):
+    amount: Optional[Union[int, float]] = None
+    currency: Optional[str] = None
+    customer_name: Optional[str] = None
+
+class UpdatePaymentMethodsRequest(BaseModel):
+    description: Optional[str] = None
+    over_the_counter: Optional[Dict[str, Any]] = None
+    status: Optional[str] = None
+    virtual_account: Optional[Dict[str, Any]] = None
+
+class UpdateRecurringSchedulesRequest(BaseModel):
+    anchor_date: Optional[str] = None
+    failed_attempt_notifications: Optional[List[Any]] = None
+    interval: Optional[str] = None
+    interval_count: Optional[Union[int, float]] = None
+    retry_interval: Optional[str] = None
+    retry_interval_count: Optional[Union[int, float]] = None
+    total_recurrence: Optional[Union[int, float]] = None
+    total_retry: Optional[Union[int, float]] = None
+
+class ValidateOtpDirectDebitsRequest(BaseModel):
+    otp_code: Optional[str] = None
+
+class ValidateOtpLinkedAccountTokensRequest(BaseModel):
+    otp_code: Optional[str] = None
+
+request_schemas.register('xendit.auth_linked_account_tokens', AuthLinkedAccountTokensRequest, extra='allow')
+request_schemas.register('xendit.auth_payment_methods', AuthPaymentMethodsRequest, extra='allow')
+request_schemas.register('xendit.auth_payment_requests', AuthPaymentRequestsRequest, extra='allow')
+request_schemas.register('xendit.auth_reversal_credit_card_charges', AuthReversalCreditCardChargesRequest, extra='allow')
+request_schemas.register('xendit.capture_credit_card_charges', CaptureCreditCardChargesRequest, extra='allow')
+request_schemas.register('xendit.create_account_holders', CreateAccountHoldersRequest, extra='allow')
+request_schemas.register('xendit.create_accounts', CreateAccountsRequest, extra='allow')
+request_schemas.register('xendit.create_batch_disbursements', CreateBatchDisbursementsRequest, extra='allow')
+request_schemas.register('xendit.create_callback_urls', CreateCallbackUrlsRequest, extra='allow')
+request_schemas.register('xendit.create_callback_virtual_accounts', CreateCallbackVirtualAccountsRequest, extra='allow')
+request_schemas.register('xendit.create_credit_card_charges', CreateCreditCardChargesRequest, extra='allow')
+request_schemas.register('xendit.create_credit_card_charges_refunds', CreateCreditCardChargesRefundsRequest, extra='allow')
+request_schemas.register('xendit.create_customers', CreateCustomersRequest, extra='allow')
+request_schemas.register('xendit.create_direct_debits', CreateDirectDebitsRequest, extra='allow')
+request_schemas.register('xendit.create_disbursements', CreateDisbursementsRequest, extra='allow')
+request_schemas.register('xendit.create_ewallets_charges', CreateEwalletsChargesRequest, extra='allow')
+request_schemas.register('xendit.create_fee_rules', CreateFeeRulesRequest, extra='allow')
+request_schemas.register('xendit.create_fixed_payment_code', CreateFixedPaymentCodeRequest, extra='allow')
+request_schemas.register('xendit.create_invoices', CreateInvoicesRequest, extra='allow')
+request_schemas.register('xendit.create_paylater_charges', CreatePaylaterChargesRequest, extra='allow')
+request_schemas.register('xendit.create_paylater_plans', CreatePaylaterPlansRequest, extra='allow')
+request_schemas.register('xendit.create_payment_codes', CreatePaymentCodesRequest, extra='allow')
+request_schemas.register('xendit.create_payment_methods_v1', CreatePaymentMethodsV1Request, extra='allow')
+request_schemas.register('xendit.create_payment_methods_v2', CreatePaymentMethodsV2Request, extra='allow')
+request_schemas.register('xendit.create_payment_requests', CreatePaymentRequestsRequest, extra='allow')
+request_schemas.register('xendit.create_payment_requests_captures', CreatePaymentRequestsCapturesRequest, extra='allow')
+request_schemas.register('xendit.create_payouts_v1', CreatePayoutsV1Request, extra='allow')
+request_schemas.register('xendit.create_payouts_v2', CreatePayoutsV2Request, extra='allow')
+request_schemas.register('xendit.create_qr_codes', CreateQrCodesRequest, extra='allow')
+request_schemas.register('xendit.create_qr_codes_payments_refunds', CreateQrCodesPaymentsRefundsRequest, extra='allow')
+request_schemas.register('xendit.create_recurring_payments', CreateRecurringPaymentsRequest, extra='allow')
+request_schemas.register('xendit.create_recurring_plans', CreateRecurringPlansRequest, extra='allow')
+request_schemas.register('xendit.create_recurring_schedules', CreateRecurringSchedulesRequest, extra='allow')
+request_schemas.register('xendit.create_reports', CreateReportsRequest, extra='allow')
+request_schemas.register('xendit.create_sessions', CreateSessionsRequest, extra='allow')
+request_schemas.register('xendit.create_split_rules', CreateSplitRulesRequest, extra='allow')
+request_schemas.register('xendit.create_transfers', CreateTransfersRequest, extra='allow')
+request_schemas.register('xendit.simulate_payment_callback_virtual_accounts', SimulatePaymentCallbackVirtualAccountsRequest, extra='allow')
+request_schemas.register('xendit.simulate_payment_fixed_payment_code', SimulatePaymentFixedPaymentCodeRequest, extra='allow')
+request_schemas.register('xendit.simulate_payment_methods_payments', SimulatePaymentMethodsPaymentsRequest, extra='allow')
+request_schemas.register('xendit.simulate_payment_non_fixed_payment_code', SimulatePaymentNonFixedPaymentCodeRequest, extra='allow')
+request_schemas.register('xendit.simulate_payment_pool_virtual_accounts', SimulatePaymentPoolVirtualAccountsRequest, extra='allow')
+request_schemas.register('xendit.simulate_recurring_plans_cycles', SimulateRecurringPlansCyclesRequest, extra='allow')
+request_schemas.register('xendit.update_account_holders', UpdateAccountHoldersRequest, extra='allow')
+request_schemas.register('xendit.update_accounts', UpdateAccountsRequest, extra='allow')
+request_schemas.register('xendit.update_callback_virtual_accounts', UpdateCallbackVirtualAccountsRequest, extra='allow')
+request_schemas.register('xendit.update_fixed_payment_code', UpdateFixedPaymentCodeRequest, extra='allow')
+request_schemas.register('xendit.update_payment_codes', UpdatePaymentCodesRequest, extra='allow')
+request_schemas.register('xendit.update_payment_methods', UpdatePaymentMethodsRequest, extra='allow')
+request_schemas.register('xendit.update_recurring_schedules', UpdateRecurringSchedulesRequest, extra='allow')
+request_schemas.register('xendit.validate_otp_direct_debits', ValidateOtpDirectDebitsRequest, extra='allow')
+request_schemas.register('xendit.validate_otp_linked_account_tokens', ValidateOtpLinkedAccountTokensRequest, extra='allow')
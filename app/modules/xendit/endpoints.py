@@ -0,0 +1,224 @@
+"""Endpoint table generated from documentation/Xendit API Collection.json.
+
+Do not edit by hand; regenerate with `flask xendit generate-endpoints`.
+"""
+from app.core.dispatch import Endpoint
+
+ENDPOINTS = {
+    # Binding - Initiate Account Authorization
+    'auth_linked_account_tokens': Endpoint('POST', '/linked_account_tokens/auth', schema='xendit.auth_linked_account_tokens'),
+    # Linking only - Validate OTP
+    'auth_payment_methods': Endpoint('POST', '/v2/payment_methods/{id}/auth', params=('id',), schema='xendit.auth_payment_methods'),
+    # Confirm Payment - Validate OTP
+    'auth_payment_requests': Endpoint('POST', '/payment_requests/{id}/auth', params=('id',), schema='xendit.auth_payment_requests'),
+    # Reverse Auth
+    'auth_reversal_credit_card_charges': Endpoint('POST', '/credit_card_charges/{id}/auth_reversal', params=('id',), schema='xendit.auth_reversal_credit_card_charges'),
+    # Success cancel IDR cash payout (OTC)
+    'cancel_payouts': Endpoint('POST', '/v2/payouts/{id}/cancel', params=('id',)),
+    # Cancel Cycle
+    'cancel_recurring_plans_cycles': Endpoint('POST', '/recurring/plans/{plan_id}/cycles/{id}/cancel', params=('plan_id', 'id')),
+    # Cancel Session
+    'cancel_sessions': Endpoint('POST', '/sessions/{session_id}/cancel', params=('session_id',)),
+    # Capture Auth
+    'capture_credit_card_charges': Endpoint('POST', '/credit_card_charges/{id}/capture', params=('id',), schema='xendit.capture_credit_card_charges'),
+    # Create Account Holder
+    'create_account_holders': Endpoint('POST', '/v2/account_holders', schema='xendit.create_account_holders'),
+    # Create Account V2
+    'create_accounts': Endpoint('POST', '/v2/accounts', schema='xendit.create_accounts'),
+    # Create Batch Disbursement
+    'create_batch_disbursements': Endpoint('POST', '/batch_disbursements', schema='xendit.create_batch_disbursements'),
+    # Set Callback URL
+    'create_callback_urls': Endpoint('POST', '/callback_urls/{type}', params=('type',), schema='xendit.create_callback_urls'),
+    # Create FVA
+    'create_callback_virtual_accounts': Endpoint('POST', '/callback_virtual_accounts', schema='xendit.create_callback_virtual_accounts'),
+    # Authorize (Hold Amount)
+    'create_credit_card_charges': Endpoint('POST', '/credit_card_charges', schema='xendit.create_credit_card_charges'),
+    # Refund Charge
+    'create_credit_card_charges_refunds': Endpoint('POST', '/credit_card_charges/{id}/refunds', params=('id',), schema='xendit.create_credit_card_charges_refunds'),
+    # Step 1 - Create Customer
+    'create_customers': Endpoint('POST', '/customers', schema='xendit.create_customers'),
+    # Payment - One Time Payment w/o OTP
+    'create_direct_debits': Endpoint('POST', '/direct_debits', schema='xendit.create_direct_debits'),
+    # [TEST] Disbursement: Fail (Not enough balance error)
+    'create_disbursements': Endpoint('POST', '/disbursements', schema='xendit.create_disbursements'),
+    # channel_not_activated - 403
+    'create_ewallets_charges': Endpoint('POST', '/ewallets/charges', schema='xendit.create_ewallets_charges'),
+    # Refund charges w magic numbers in docs
+    'create_ewallets_charges_refunds': Endpoint('POST', '/ewallets/charges/{id}/refunds', params=('id',)),
+    # [Deprecated] Create Fee Rule
+    'create_fee_rules': Endpoint('POST', '/fee_rules', schema='xendit.create_fee_rules'),
+    # Create FPC (Alfamart)
+    'create_fixed_payment_code': Endpoint('POST', '/fixed_payment_code', schema='xendit.create_fixed_payment_code'),
+    # [TEST] Invoice: Paid / Virtual Account
+    'create_invoices': Endpoint('POST', '/v2/invoices', schema='xendit.create_invoices'),
+    # Create KREDIVO Charge
+    'create_paylater_charges': Endpoint('POST', '/paylater/charges', schema='xendit.create_paylater_charges'),
+    # Create Paylater Refund
+    'create_paylater_charges_refunds': Endpoint('POST', '/paylater/charges/{id_plc_format}/refunds', params=('id_plc_format',)),
+    # Initiate PayLater plans with FEE and DISCOUNT (even amount)
+    'create_paylater_plans': Endpoint('POST', '/paylater/plans', schema='xendit.create_paylater_plans'),
+    # Create Payment Code (7ELEVEN)
+    'create_payment_codes': Endpoint('POST', '/payment_codes', schema='xendit.create_payment_codes'),
+    # Binding - Create Payment Method
+    'create_payment_methods_v1': Endpoint('POST', '/payment_methods', schema='xendit.create_payment_methods_v1'),
+    # Linking only - Create Payment Method
+    'create_payment_methods_v2': Endpoint('POST', '/v2/payment_methods', schema='xendit.create_payment_methods_v2'),
+    # Pay with Linked Payment Method with 3DS
+    'create_payment_requests': Endpoint('POST', '/payment_requests', schema='xendit.create_payment_requests'),
+    # Capture Payment - Full Amount
+    'create_payment_requests_captures': Endpoint('POST', '/payment_requests/{id}/captures', params=('id',), schema='xendit.create_payment_requests_captures'),
+    # Create Payout
+    'create_payouts_v1': Endpoint('POST', '/payouts', schema='xendit.create_payouts_v1'),
+    # Success create IDR cash payout (OTC)
+    'create_payouts_v2': Endpoint('POST', '/v2/payouts', schema='xendit.create_payouts_v2'),
+    # Create QR Code
+    'create_qr_codes': Endpoint('POST', '/qr_codes', schema='xendit.create_qr_codes'),
+    # Refund QR Payment
+    'create_qr_codes_payments_refunds': Endpoint('POST', '/qr_codes/payments/{qrpy_id}/refunds', params=('qrpy_id',), schema='xendit.create_qr_codes_payments_refunds'),
+    # Payment - Recurring Payments
+    'create_recurring_payments': Endpoint('POST', '/recurring_payments', schema='xendit.create_recurring_payments'),
+    # Create Plan (Xendit Linking UI)
+    'create_recurring_plans': Endpoint('POST', '/recurring/plans', schema='xendit.create_recurring_plans'),
+    # Create Schedule
+    'create_recurring_schedules': Endpoint('POST', '/recurring/schedules', schema='xendit.create_recurring_schedules'),
+    # Generate Report
+    'create_reports': Endpoint('POST', '/reports', schema='xendit.create_reports'),
+    # Create Payment Session
+    'create_sessions': Endpoint('POST', '/sessions', schema='xendit.create_sessions'),
+    # Create Split Rule
+    'create_split_rules': Endpoint('POST', '/split_rules', schema='xendit.create_split_rules'),
+    # Create Transfer
+    'create_transfers': Endpoint('POST', '/transfers', schema='xendit.create_transfers'),
+    # Deactivate Plan
+    'deactivate_recurring_plans': Endpoint('POST', '/recurring/plans/{id}/deactivate', params=('id',)),
+    # Binding - Unlink Linked Account Token Copy
+    'delete_linked_account_tokens': Endpoint('DELETE', '/linked_account_tokens/{linked_account_token_id}', params=('linked_account_token_id',)),
+    # Expire Payment Method
+    'expire_payment_methods': Endpoint('POST', '/v2/payment_methods/{id}/expire', params=('id',)),
+    # Get Account Holder by ID
+    'get_account_holders': Endpoint('GET', '/v2/account_holders/{id}', params=('id',), hedge=True),
+    # Get Account V2
+    'get_accounts': Endpoint('GET', '/v2/accounts/{id}', params=('id',), hedge=True),
+    # Get Balance
+    'get_balance': Endpoint('GET', '/balance'),
+    # Get Virtual Account Payment
+    'get_callback_virtual_account_payments': Endpoint('GET', '/callback_virtual_account_payments/payment_id={payment_id}', params=('payment_id',), hedge=True),
+    # Get Virtual Account
+    'get_callback_virtual_accounts': Endpoint('GET', '/callback_virtual_accounts/{id}', params=('id',), hedge=True),
+    # Get Charge
+    'get_credit_card_charges': Endpoint('GET', '/credit_card_charges/{credit_card_charge_id}', params=('credit_card_charge_id',), hedge=True),
+    # Get Disbursement
+    'get_disbursements': Endpoint('GET', '/disbursements/{id}', params=('id',), hedge=True),
+    # Get Charge Status
+    'get_ewallets_charges': Endpoint('GET', '/ewallets/charges/{charge_id}', params=('charge_id',), hedge=True),
+    # Get refund status
+    'get_ewallets_charges_refunds': Endpoint('GET', '/ewallets/charges/{charge_id}/refunds/{refund_id}', params=('charge_id', 'refund_id'), hedge=True),
+    # Get void status
+    'get_ewallets_charges_void': Endpoint('GET', '/ewallets/charges/{id}/void', params=('id',)),
+    # Get FPC Detail
+    'get_fixed_payment_code': Endpoint('GET', '/fixed_payment_code/{fixed_payment_code_id}', params=('fixed_payment_code_id',), hedge=True),
+    # Get Invoice
+    'get_invoices': Endpoint('GET', '/v2/invoices/{id}', params=('id',), hedge=True),
+    # GET Paylater Charge by ID
+    'get_paylater_charges': Endpoint('GET', '/paylater/charges/{charge_id_plc_format}', params=('charge_id_plc_format',), hedge=True),
+    # Get Payment Code by ID
+    'get_payment_codes': Endpoint('GET', '/payment_codes/{payment_code_id}', params=('payment_code_id',), hedge=True),
+    # Get Payment Method by ID
+    'get_payment_methods': Endpoint('GET', '/v2/payment_methods/{id}', params=('id',), hedge=True),
+    # Get Payment Request by ID
+    'get_payment_requests': Endpoint('GET', '/payment_requests/{id}', params=('id',), hedge=True),
+    # Get Payout
+    'get_payouts_v1': Endpoint('GET', '/payouts/{id}', params=('id',), hedge=True),
+    # Get IDR payout by ID
+    'get_payouts_v2': Endpoint('GET', '/v2/payouts/{payout_id}', params=('payout_id',), hedge=True),
+    # Get QR Code by QR ID
+    'get_qr_codes': Endpoint('GET', '/qr_codes/{id}', params=('id',), hedge=True),
+    # Get QR Refund by Refund ID
+    'get_qr_codes_payments_refunds': Endpoint('GET', '/qr_codes/payments/{qrpy_id}/refunds/{refund_id}', params=('qrpy_id', 'refund_id'), hedge=True),
+    # Get Plan
+    'get_recurring_plans': Endpoint('GET', '/recurring/plans/{id}', params=('id',), hedge=True),
+    # Get Cycle
+    'get_recurring_plans_cycles': Endpoint('GET', '/recurring/plans/{plan_id}/cycles/{id}', params=('plan_id', 'id'), hedge=True),
+    # Get Schedule
+    'get_recurring_schedules': Endpoint('GET', '/recurring/schedules/{id}', params=('id',), hedge=True),
+    # Get Report
+    'get_reports': Endpoint('GET', '/reports/{id}', params=('id',), hedge=True),
+    # GET Session
+    'get_sessions': Endpoint('GET', '/sessions/{session_id}', params=('session_id',), hedge=True),
+    # Get Transaction
+    'get_transactions': Endpoint('GET', '/transactions/{id}', params=('id',), hedge=True),
+    # Get Transfer
+    'get_transfers': Endpoint('GET', '/transfers/reference={reference}', params=('reference',), hedge=True),
+    # List Disbursement Banks
+    'list_available_disbursements_banks': Endpoint('GET', '/available_disbursements_banks'),
+    # List available FVA banks
+    'list_available_virtual_account_banks': Endpoint('GET', '/available_virtual_account_banks'),
+    # Get list of refunds
+    'list_ewallets_charges_refunds': Endpoint('GET', '/ewallets/charges/{id}/refunds', params=('id',)),
+    # Binding - Retreive Accessible Accounts Copy
+    'list_linked_account_tokens_accounts': Endpoint('GET', '/linked_account_tokens/{linked_account_token_id}/accounts', params=('linked_account_token_id',)),
+    # Get Refund status by Refund ID
+    'list_paylater_charges_refunds': Endpoint('GET', '/paylater/charges/{refund_id_plc_format}/refunds', params=('refund_id_plc_format',)),
+    # Get Payments
+    'list_payment_codes_payments': Endpoint('GET', '/payment_codes/{payment_code_id}/payments', params=('payment_code_id',)),
+    # List Payment Methods
+    'list_payment_methods': Endpoint('GET', '/v2/payment_methods'),
+    # List Payments by Payment Method ID
+    'list_payment_methods_payments': Endpoint('GET', '/v2/payment_methods/{id}/payments', params=('id',)),
+    # List Payment Requests
+    'list_payment_requests': Endpoint('GET', '/payment_requests'),
+    # List Captures by Payment Request ID
+    'list_payment_requests_captures': Endpoint('GET', '/payment_requests/{id}/captures', params=('id',)),
+    # Get IDR payouts by reference ID
+    'list_payouts': Endpoint('GET', '/v2/payouts'),
+    # Get Payout Channels
+    'list_payouts_channels': Endpoint('GET', '/payouts_channels'),
+    # Get List of QR Payments by QR ID
+    'list_qr_codes_payments': Endpoint('GET', '/qr_codes/{id}/payments', params=('id',)),
+    # List QR Refunds by QR Payment ID
+    'list_qr_codes_payments_refunds': Endpoint('GET', '/qr_codes/payments/{qrpy_id}/refunds', params=('qrpy_id',)),
+    # Get Plan's list of Cycles
+    'list_recurring_plans_cycles': Endpoint('GET', '/recurring/plans/{id}/cycles', params=('id',)),
+    # List Transactions
+    'list_transactions': Endpoint('GET', '/transactions'),
+    # [TEST] Pay FVA
+    'simulate_payment_callback_virtual_accounts': Endpoint('POST', '/callback_virtual_accounts/external_id={external_id}/simulate_payment', params=('external_id',), schema='xendit.simulate_payment_callback_virtual_accounts'),
+    # [TEST] Pay Alfamart FPC
+    'simulate_payment_fixed_payment_code': Endpoint('POST', '/fixed_payment_code/simulate_payment', schema='xendit.simulate_payment_fixed_payment_code'),
+    # Simulate Payment
+    'simulate_payment_methods_payments': Endpoint('POST', '/v2/payment_methods/{id}/payments/simulate', params=('id',), schema='xendit.simulate_payment_methods_payments'),
+    # [TEST] Alfamart Payment
+    'simulate_payment_non_fixed_payment_code': Endpoint('POST', '/non_fixed_payment_code/simulate_payment', schema='xendit.simulate_payment_non_fixed_payment_code'),
+    # [TEST] Payment: Invoice VA
+    'simulate_payment_pool_virtual_accounts': Endpoint('POST', '/pool_virtual_accounts/simulate_payment', schema='xendit.simulate_payment_pool_virtual_accounts'),
+    # Simulate QR Payments (Test Mode)
+    'simulate_qr_codes_payments': Endpoint('POST', '/qr_codes/{id}/payments/simulate', params=('id',)),
+    # Simulate Cycle Status
+    'simulate_recurring_plans_cycles': Endpoint('POST', '/recurring/plans/{plan_id}/cycles/{id}/simulate', params=('plan_id', 'id'), schema='xendit.simulate_recurring_plans_cycles'),
+    # Update Account Holder
+    'update_account_holders': Endpoint('PATCH', '/v2/account_holders/{id}', params=('id',), schema='xendit.update_account_holders'),
+    # Update Account V2
+    'update_accounts': Endpoint('PATCH', '/v2/accounts/{id}', params=('id',), schema='xendit.update_accounts'),
+    # Update Virtual Account
+    'update_callback_virtual_accounts': Endpoint('PATCH', '/callback_virtual_accounts/{id}', params=('id',), schema='xendit.update_callback_virtual_accounts'),
+    # Update FPC
+    'update_fixed_payment_code': Endpoint('PATCH', '/fixed_payment_code/{fixed_payment_code_id}', params=('fixed_payment_code_id',), schema='xendit.update_fixed_payment_code'),
+    # Update Payment Code
+    'update_payment_codes': Endpoint('PATCH', '/payment_codes/{payment_code_id}', params=('payment_code_id',), schema='xendit.update_payment_codes'),
+    # Update Payment Method
+    'update_payment_methods': Endpoint('PATCH', '/v2/payment_methods/{id}', params=('id',), schema='xendit.update_payment_methods'),
+    # Update Plan
+    'update_recurring_plans': Endpoint('PATCH', '/recurring/plans/{id}', params=('id',)),
+    # Update Cycle
+    'update_recurring_plans_cycles': Endpoint('PATCH', '/recurring/plans/{plan_id}/cycles/{id}', params=('plan_id', 'id')),
+    # Update Schedule
+    'update_recurring_schedules': Endpoint('PATCH', '/recurring/schedules', schema='xendit.update_recurring_schedules'),
+    # Payment - Validate OTP (One Time Payment w OTP)
+    'validate_otp_direct_debits': Endpoint('POST', '/direct_debits/{direct_debit_id}/validate_otp', params=('direct_debit_id',), schema='xendit.validate_otp_direct_debits'),
+    # Binding - Validate OTP for Linked Account Token
+    'validate_otp_linked_account_tokens': Endpoint('POST', '/linked_account_tokens/{linked_account_token_id}/validate_otp', params=('linked_account_token_id',), schema='xendit.validate_otp_linked_account_tokens'),
+    # Void charges w magic numbers in docs
+    'void_ewallets_charges': Endpoint('POST', '/ewallets/charges/{id}/void', params=('id',)),
+    # Void Payout
+    'void_payouts': Endpoint('POST', '/payouts/{id}/void', params=('id',)),
+}
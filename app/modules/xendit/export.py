@@ -0,0 +1,218 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+import os
+import time
+import logging
+from app.core.exceptions import ValidationException
+from .api import XenditAPI
+from .schemas import PaymentMethodResponse, PaymentResponse
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# Fixed column layout so every chunk can be written without looking ahead
+PAYMENT_COLUMNS = [name for name in PaymentResponse.model_fields if name != 'payment_method'] + [
+    f'payment_method.{name}' for name in PaymentMethodResponse.model_fields
+]
+
+def flatten_payment(payment: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a payment into export columns, inlining payment_method fields"""
+    row = {key: value for key, value in payment.items() if key != 'payment_method'}
+    for key, value in (payment.get('payment_method') or {}).items():
+        row[f'payment_method.{key}'] = value
+    return {
+        column: json.dumps(value, separators=(',', ':')) if isinstance(value, (dict, list)) else value
+        for column, value in row.items()
+    }
+
+def iter_payment_pages(api: XenditAPI, params: Optional[Dict[str, Any]] = None,
+                       payment_method_id: Optional[str] = None,
+                       after_id: Optional[str] = None) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """Yield (page, cursor) pairs across all pages of list_payments or list_payments_by_payment_method"""
+    params = dict(params or {})
+    while True:
+        if after_id:
+            params['after_id'] = after_id
+        if payment_method_id:
+            response = api.list_payments_by_payment_method(payment_method_id, params)
+        else:
+            response = api.list_payments(params)
+
+        page = response.get('data', [])
+        if page:
+            after_id = page[-1].get('id')
+        yield page, after_id
+        if not page or not response.get('has_more'):
+            return
+
+class ExportProgress:
+    """Running totals for an export job, passed to progress callbacks"""
+
+    def __init__(self, cursor: Optional[str] = None, rows: int = 0):
+        self.cursor = cursor
+        self.rows = rows
+        self.pages = 0
+        self.started = time.monotonic()
+
+    def advance(self, rows: int, cursor: Optional[str]):
+        self.rows += rows
+        self.pages += 1
+        self.cursor = cursor
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        return {
+            'rows': self.rows,
+            'pages': self.pages,
+            'cursor': self.cursor,
+            'elapsed': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+class PaymentExporter:
+    """Streams Xendit payment history page by page in constant memory"""
+
+    def __init__(self, api: XenditAPI, fmt: str = 'csv', page_size: int = 100,
+                 progress: Optional[Callable[[ExportProgress], None]] = None):
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationException(f"Unsupported export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+        self.api = api
+        self.fmt = fmt
+        self.page_size = page_size
+        self.progress = progress
+
+    def _pages(self, params: Optional[Dict[str, Any]], payment_method_id: Optional[str],
+               cursor: Optional[str], state: ExportProgress) -> Iterator[List[Dict[str, Any]]]:
+        params = {'limit': self.page_size, **(params or {})}
+        for page, next_cursor in iter_payment_pages(self.api, params, payment_method_id, cursor):
+            state.advance(len(page), next_cursor)
+            if page:
+                yield [flatten_payment(payment) for payment in page]
+            if self.progress:
+                self.progress(state)
+
+    def iter_chunks(self, params: Optional[Dict[str, Any]] = None, payment_method_id: Optional[str] = None,
+                    cursor: Optional[str] = None, include_header: bool = True,
+                    state: Optional[ExportProgress] = None) -> Iterator[bytes]:
+        """Yield encoded CSV or JSONL chunks, one per upstream page"""
+        if self.fmt == 'parquet':
+            raise ValidationException("Parquet exports cannot be streamed; use the CLI with an output file")
+        state = state or ExportProgress(cursor)
+        buffer = io.StringIO()
+
+        if self.fmt == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=PAYMENT_COLUMNS, extrasaction='ignore')
+            if include_header:
+                writer.writeheader()
+            for rows in self._pages(params, payment_method_id, cursor, state):
+                writer.writerows(rows)
+                yield self._drain(buffer)
+            if buffer.tell():
+                yield self._drain(buffer)
+        else:
+            for rows in self._pages(params, payment_method_id, cursor, state):
+                for row in rows:
+                    buffer.write(json.dumps(row, separators=(',', ':'), default=str))
+                    buffer.write('\n')
+                yield self._drain(buffer)
+
+    def stream(self, params: Optional[Dict[str, Any]] = None, payment_method_id: Optional[str] = None,
+               cursor: Optional[str] = None) -> Iterator[bytes]:
+        """iter_chunks for an HTTP response: a failure after the first chunk ends the body with an error marker"""
+        state = ExportProgress(cursor)
+        started = False
+        try:
+            for chunk in self.iter_chunks(params, payment_method_id, cursor, state=state):
+                started = True
+                yield chunk
+        except Exception as e:
+            if not started:
+                # Nothing sent yet, so the server can still answer with an error status
+                raise
+            logger.error(f"Payment export failed after {state.rows} rows, resume with after_id={state.cursor}: {str(e)}")
+            yield self._error_marker(str(e), state.cursor)
+
+    def _error_marker(self, message: str, cursor: Optional[str]) -> bytes:
+        # The status line has already gone out as 200; this tells the client the body is incomplete
+        if self.fmt == 'csv':
+            return f"# export incomplete: {message}; resume with after_id={cursor}\n".encode()
+        return (json.dumps({'error': message, 'resume_after_id': cursor}, separators=(',', ':')) + '\n').encode()
+
+    def export_to_file(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       payment_method_id: Optional[str] = None,
+                       checkpoint_path: Optional[str] = None) -> ExportProgress:
+        """Export to a file, checkpointing the cursor after each chunk so the job can resume"""
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        state = ExportProgress(checkpoint.get('cursor'), checkpoint.get('rows', 0))
+        resuming = state.cursor is not None
+
+        if self.fmt == 'parquet':
+            if resuming:
+                root, ext = os.path.splitext(path)
+                path = f"{root}.from-{state.cursor}{ext}"
+            self._write_parquet(path, params, payment_method_id, state, checkpoint_path)
+            return state
+
+        with open(path, 'ab' if resuming else 'wb') as output:
+            for chunk in self.iter_chunks(params, payment_method_id, state.cursor,
+                                          include_header=not resuming, state=state):
+                output.write(chunk)
+                output.flush()
+                self._save_checkpoint(checkpoint_path, state)
+        return state
+
+    def _write_parquet(self, path: str, params: Optional[Dict[str, Any]], payment_method_id: Optional[str],
+                       state: ExportProgress, checkpoint_path: Optional[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValidationException("Parquet export requires the 'pyarrow' package")
+
+        schema = pa.schema([
+            (column, pa.float64() if column == 'amount' else pa.string()) for column in PAYMENT_COLUMNS
+        ])
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in self._pages(params, payment_method_id, state.cursor, state):
+                columns = {
+                    column: [self._parquet_value(column, row.get(column)) for row in rows]
+                    for column in PAYMENT_COLUMNS
+                }
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                self._save_checkpoint(checkpoint_path, state)
+
+    @staticmethod
+    def _parquet_value(column: str, value: Any) -> Any:
+        if value is None:
+            return None
+        return float(value) if column == 'amount' else str(value)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Optional[str]) -> Dict[str, Any]:
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return {}
+        with open(checkpoint_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Optional[str], state: ExportProgress):
+        if not checkpoint_path:
+            return
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state.to_dict(), f)
+        os.replace(tmp_path, checkpoint_path)
@@ -0,0 +1,185 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import csv
+import json
+import os
+import logging
+from app.core.exceptions import ValidationException
+from app.core.resilience import TokenBucket
+from app.core.validation import RequestValidationException
+from .api import XenditAPI
+from .schemas import request_schemas
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+# kind -> (request schema, XenditAPI method)
+IMPORT_KINDS = {
+    'customers': ('xendit.create_customer', 'create_customer'),
+    'payment_methods': ('xendit.create_payment_method', 'create_payment_method'),
+}
+
+def unflatten_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """CSV row to a request body: empty cells dropped, 'a.b' columns nested, JSON object/array cells decoded"""
+    body: Dict[str, Any] = {}
+    for column, value in row.items():
+        if not column or value is None or value == '':
+            continue
+        if value[:1] in '{[':
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        target = body
+        *parents, key = column.split('.')
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+    return body
+
+def validate_rows(schema_name: str, fmt: str, rows: List[Tuple[int, Any]]) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]]]:
+    """Process-pool worker: decode and validate one chunk into (row, payload, errors) triples"""
+    results = []
+    for number, raw in rows:
+        try:
+            body = json.loads(raw) if fmt == 'jsonl' else unflatten_row(raw)
+            results.append((number, request_schemas.validate(schema_name, body), None))
+        except RequestValidationException as e:
+            results.append((number, None, e.errors))
+        except ValueError as e:
+            results.append((number, None, [{'loc': [], 'msg': str(e), 'type': 'json_invalid'}]))
+    return results
+
+def iter_row_chunks(path: str, fmt: str, chunk_rows: int, after_row: int = 0) -> Iterator[List[Tuple[int, Any]]]:
+    """Undecoded rows in chunks, numbered from 1 (CSV records after the header, JSONL lines)"""
+    with open(path, newline='') as f:
+        rows = enumerate(csv.DictReader(f), 1) if fmt == 'csv' else enumerate(f, 1)
+        chunk = []
+        for number, raw in rows:
+            if number <= after_row or (fmt == 'jsonl' and not raw.strip()):
+                continue
+            chunk.append((number, raw))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+class BulkImport:
+    """Creates customers or payment methods from a CSV/JSONL file.
+
+    Rows are decoded and validated in a process pool, a few chunks ahead of
+    submission. Valid rows are sent to Xendit from `concurrency` threads under
+    a `rate_limit` (requests/second). Every row gets a line in the JSONL
+    report (created ID or errors), and the checkpoint records the last
+    finished chunk so an interrupted import resumes after it.
+    """
+
+    def __init__(self, api: XenditAPI, kind: str, input_path: str, report_path: str,
+                 checkpoint_path: Optional[str] = None, fmt: Optional[str] = None, concurrency: int = 8,
+                 rate_limit: float = 20.0, workers: Optional[int] = None, chunk_rows: int = 1000,
+                 progress: Optional[Callable[[Dict[str, int]], None]] = None):
+        if kind not in IMPORT_KINDS:
+            raise ValidationException(f"Unknown import kind '{kind}'")
+        fmt = fmt or os.path.splitext(input_path)[1].lstrip('.')
+        if fmt not in IMPORT_FORMATS:
+            raise ValidationException("Import file must be .csv or .jsonl")
+        self.api = api
+        self.schema_name, self.method = IMPORT_KINDS[kind]
+        self.input_path = input_path
+        self.report_path = report_path
+        self.checkpoint_path = checkpoint_path
+        self.fmt = fmt
+        self.concurrency = concurrency
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self.progress = progress
+
+    def run(self) -> Dict[str, int]:
+        checkpoint = self._load_checkpoint()
+        after_row = checkpoint.get('row', 0)
+        summary = checkpoint.get('summary') or {'rows': 0, 'created': 0, 'invalid': 0, 'failed': 0}
+        if after_row:
+            logger.info(f"Resuming import of {self.input_path} after row {after_row}")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as processes, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as threads, \
+                open(self.report_path, 'a' if after_row else 'w') as report:
+            pending = deque()
+            for chunk in iter_row_chunks(self.input_path, self.fmt, self.chunk_rows, after_row):
+                pending.append((chunk[-1][0], processes.submit(validate_rows, self.schema_name, self.fmt, chunk)))
+                # Bound how far validation runs ahead of submission
+                if len(pending) > self.workers * 2:
+                    self._submit_chunk(*pending.popleft(), threads, report, summary)
+            while pending:
+                self._submit_chunk(*pending.popleft(), threads, report, summary)
+
+        logger.info(f"Import of {self.input_path} finished: {summary}")
+        return summary
+
+    def _submit_chunk(self, last_row: int, validated, threads: ThreadPoolExecutor, report, summary: Dict[str, int]):
+        entries = []
+        for number, payload, errors in validated.result():
+            if errors is None:
+                entries.append(threads.submit(self._send, number, payload))
+            else:
+                entries.append({'row': number, 'status': 'invalid', 'errors': errors})
+        for entry in entries:
+            line = entry if isinstance(entry, dict) else entry.result()
+            summary['rows'] += 1
+            summary[line['status']] += 1
+            report.write(json.dumps(line, default=str) + '\n')
+        report.flush()
+        self._save_checkpoint(last_row, summary)
+        if self.progress:
+            self.progress(summary)
+
+    def _send(self, number: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.rate_limiter:
+            self.rate_limiter.acquire(timeout=float('inf'))
+        try:
+            result = getattr(self.api, self.method)(payload)
+        except Exception as e:
+            # One bad row is reported, not allowed to abort the import
+            return {'row': number, 'status': 'failed', 'reference_id': payload.get('reference_id'),
+                    'error': str(e), 'status_code': getattr(e, 'status_code', None)}
+        result = result.dict() if hasattr(result, 'dict') else result
+        return {'row': number, 'status': 'created', 'reference_id': payload.get('reference_id'), 'id': result.get('id')}
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, row: int, summary: Dict[str, int]):
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'row': row, 'summary': summary}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+def import_paths(import_id: str, fmt: str) -> Dict[str, str]:
+    """Upload, report and checkpoint files for an import submitted over HTTP"""
+    base = os.path.join(Config.XENDIT_IMPORT_DIR, import_id)
+    return {'input': f'{base}.{fmt}', 'report': f'{base}.report.jsonl', 'checkpoint': f'{base}.checkpoint.json'}
+
+def create_import(api: XenditAPI, payload: Dict[str, Any],
+                  progress: Optional[Callable[[Dict[str, int]], None]] = None) -> BulkImport:
+    """BulkImport for a queued import job, with limits from XENDIT_IMPORT_*"""
+    return BulkImport(
+        api, payload['kind'], payload['input'], payload['report'], checkpoint_path=payload['checkpoint'],
+        fmt=payload['format'], concurrency=Config.XENDIT_IMPORT_CONCURRENCY,
+        rate_limit=Config.XENDIT_IMPORT_RATE_LIMIT, workers=Config.XENDIT_IMPORT_WORKERS or None,
+        chunk_rows=Config.XENDIT_IMPORT_CHUNK_ROWS, progress=progress
+    )
+
+def read_progress(checkpoint_path: str) -> Optional[Dict[str, int]]:
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path) as f:
+        return json.load(f).get('summary')
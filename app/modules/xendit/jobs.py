@@ -0,0 +1,127 @@
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import logging
+from app.core.exceptions import CircuitOpenException, RateLimitExceededException, ThirdPartyAPIException
+from app.core.jobs import JobRuntime, JobStore, JobType, JobWorkerPool, renew_lease
+from app.core.lifecycle import worker_resources
+from app.core.websocket import websocket_manager
+from .accounts import xendit_accounts
+from .imports import create_import
+from .schemas import request_schemas
+from .settings import job_rate_limit
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _client(payload: Dict[str, Any]):
+    # Jobs run outside the request, so they carry the account selected when they were submitted
+    return xendit_accounts.get(payload.get('account'))
+
+def refund_card_payment(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _client(payload).refund_card_payment(payload['payment_id'], payload['refund'])
+
+def expire_payment_method(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _client(payload).expire_payment_method(payload['payment_method_id'])
+
+def create_customer(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _client(payload).create_customer(payload['customer'])
+
+def import_file(payload: Dict[str, Any]) -> Dict[str, int]:
+    # A retried attempt resumes from the import's checkpoint; the lease is renewed after every chunk
+    return create_import(_client(payload), payload, progress=lambda summary: renew_lease()).run()
+
+def not_sent(e: Exception) -> bool:
+    """The request never reached Xendit (local rate limit or open breaker), so it can be resent"""
+    return isinstance(e, (RateLimitExceededException, CircuitOpenException))
+
+def not_sent_or_server_error(e: Exception) -> bool:
+    return not_sent(e) or (isinstance(e, ThirdPartyAPIException) and e.status_code >= 500)
+
+def _refund_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    refund = dict(item)
+    payment_id = refund.pop('payment_id', None)
+    if not payment_id:
+        raise ValueError('payment_id is required')
+    return {'payment_id': payment_id, 'refund': request_schemas.validate('xendit.refund_card_payment', refund)}
+
+def _expire_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    if not item.get('payment_method_id'):
+        raise ValueError('payment_method_id is required')
+    return {'payment_method_id': item['payment_method_id']}
+
+def _customer_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {'customer': request_schemas.validate('xendit.create_customer', item)}
+
+# job type -> (handler, request item -> job payload, retry policy, resumable after a worker died mid-attempt)
+JOB_HANDLERS: Dict[str, Any] = {
+    # Refunds are not idempotent upstream: only retried when Xendit never saw the request
+    'refund_card_payment': (refund_card_payment, _refund_item, not_sent, False),
+    'expire_payment_method': (expire_payment_method, _expire_item, not_sent_or_server_error, True),
+    'create_customer': (create_customer, _customer_item, not_sent_or_server_error, True),
+}
+
+# Submitted through /imports/<kind> with the file as the body, not through /jobs/<type>
+IMPORT_JOB = 'import_file'
+
+def build_payloads(job_type: str, items: List[Dict[str, Any]], account: Optional[str]) -> List[Dict[str, Any]]:
+    """Validate submitted items into job payloads; raises ValidationException or ValueError"""
+    to_payload = JOB_HANDLERS[job_type][1]
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError('Each item must be a JSON object')
+    return [{**to_payload(item), 'account': account} for item in items]
+
+def job_ids(idempotency_key: Optional[str], job_type: str, count: int) -> Optional[List[str]]:
+    """Stable job IDs for a retried submission, so the same batch is not enqueued twice"""
+    if not idempotency_key:
+        return None
+    return [
+        hashlib.sha256(f"{idempotency_key}:{job_type}:{index}".encode()).hexdigest()[:32]
+        for index in range(count)
+    ]
+
+def build_job_types(settings: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, JobType]:
+    if settings is None:
+        # Rate limits can be changed at runtime (xendit.jobs.<type>.rate_limit)
+        settings = {
+            job_type: {**job_settings, 'rate_limit': job_rate_limit(job_type)}
+            for job_type, job_settings in Config.XENDIT_JOBS.items()
+        }
+    handlers = {
+        job_type: (handler, retryable, resumable)
+        for job_type, (handler, _, retryable, resumable) in JOB_HANDLERS.items()
+    }
+    handlers[IMPORT_JOB] = (import_file, lambda e: True, True)
+    return {
+        job_type: JobType(handler, retryable=retryable, resumable=resumable, **settings.get(job_type, {}))
+        for job_type, (handler, retryable, resumable) in handlers.items()
+    }
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public representation of a job (payloads are not echoed back)"""
+    return {key: job[key] for key in ('id', 'type', 'status', 'result', 'error', 'attempts', 'max_attempts',
+                                      'created_at', 'updated_at')}
+
+def notify_job_finished(job: Dict[str, Any]):
+    """Push a finished job to clients subscribed to it on the /xendit namespace"""
+    room = f"xendit_job_{job['id']}"
+    if websocket_manager.has_subscribers(room, '/xendit'):
+        websocket_manager.emit('job_finished', job_view(job), room=room, namespace='/xendit')
+
+def create_job_pool(store: JobStore, on_finished: Optional[Callable[[Dict[str, Any]], None]] = notify_job_finished) -> JobWorkerPool:
+    return JobWorkerPool(
+        store, build_job_types(), on_finished=on_finished,
+        poll_interval=Config.XENDIT_JOBS_POLL_INTERVAL, lease_seconds=Config.XENDIT_JOBS_LEASE_SECONDS
+    )
+
+def create_job_runtime() -> JobRuntime:
+    store = JobStore(Config.XENDIT_JOBS_DB_PATH)
+    in_process = Config.XENDIT_JOBS_IN_PROCESS
+    # With a message queue the process running a job emits its completion to every instance;
+    # a completion watcher in each web worker would deliver it once more per worker
+    watch = in_process or not Config.SOCKETIO_MESSAGE_QUEUE
+    pool = create_job_pool(store, on_finished=notify_job_finished if watch else None)
+    return JobRuntime(store, pool, in_process=in_process)
+
+# Job workers (or the completion watcher) run in every web worker process, started after fork
+worker_resources.register('xendit.jobs', create_job_runtime, close=lambda runtime: runtime.close())
+xendit_jobs = worker_resources.proxy('xendit.jobs')
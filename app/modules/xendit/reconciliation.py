@@ -0,0 +1,279 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+import logging
+from app.core.exceptions import ValidationException
+from .api import XenditAPI
+from .export import iter_payment_pages
+
+logger = logging.getLogger(__name__)
+
+# List filters used to split the reconciliation range into concurrently fetched windows
+CREATED_GTE = 'created[gte]'
+CREATED_LT = 'created[lt]'
+
+COMPARED_FIELDS = ('amount', 'currency', 'status')
+DEFAULT_LEDGER_FIELDS = {field: field for field in ('reference_id',) + COMPARED_FIELDS}
+
+def partition_for(reference_id: str, partitions: int) -> int:
+    """Stable partition for a reference_id (same result in every process)"""
+    return zlib.crc32(reference_id.encode()) % partitions
+
+def normalize_record(record: Dict[str, Any], fields: Dict[str, str]) -> Optional[List[Any]]:
+    """Reduce a record to [reference_id, amount, currency, status] using a field mapping"""
+    reference_id = record.get(fields['reference_id'])
+    if not reference_id:
+        return None
+    return [
+        str(reference_id),
+        None if record.get(fields['amount']) in (None, '') else str(record.get(fields['amount'])),
+        (record.get(fields['currency']) or '').upper() or None,
+        (record.get(fields['status']) or '').upper() or None,
+    ]
+
+def split_time_range(start: datetime, end: datetime, windows: int) -> List[Tuple[str, str]]:
+    """Split [start, end) into equal windows of ISO-8601 bounds"""
+    if end <= start:
+        raise ValidationException("Reconciliation end must be after start")
+    step = (end - start) / windows
+    bounds = [start + step * i for i in range(windows)] + [end]
+    return [(bounds[i].isoformat(), bounds[i + 1].isoformat()) for i in range(windows)]
+
+class PartitionWriter:
+    """Spills normalized records into hash-partitioned JSONL files"""
+
+    def __init__(self, workdir: str, prefix: str, partitions: int):
+        self.partitions = partitions
+        self.paths = [os.path.join(workdir, f"{prefix}_{i}.jsonl") for i in range(partitions)]
+        self._files = [open(path, 'a', buffering=1 << 16) for path in self.paths]
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write_many(self, records: List[List[Any]]):
+        with self._lock:
+            for record in records:
+                self._files[partition_for(record[0], self.partitions)].write(
+                    json.dumps(record, separators=(',', ':')) + '\n'
+                )
+            self.count += len(records)
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+def _ledger_chunks(path: str, chunk_size: int) -> Tuple[Optional[List[str]], List[Tuple[int, int]]]:
+    """Return the CSV header (if any) and line-aligned byte ranges of the ledger body"""
+    size = os.path.getsize(path)
+    header = None
+    with open(path, 'rb') as f:
+        start = 0
+        if path.endswith('.csv'):
+            header = next(csv.reader([f.readline().decode()]))
+            start = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+def _partition_ledger_range(path: str, header: Optional[List[str]], start: int, end: int,
+                            workdir: str, partitions: int, part: int, fields: Dict[str, str]) -> int:
+    """Process-pool worker: parse one byte range of the ledger into partition files"""
+    writer = PartitionWriter(workdir, f"ledger_p{part}", partitions)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        lines = _iter_range_lines(f, end)
+        if header is not None:
+            rows = csv.DictReader(lines, fieldnames=header)
+        else:
+            rows = (json.loads(line) for line in lines if line.strip())
+
+        try:
+            batch = []
+            for row in rows:
+                record = normalize_record(row, fields)
+                if record:
+                    batch.append(record)
+                if len(batch) >= 10000:
+                    writer.write_many(batch)
+                    batch = []
+            writer.write_many(batch)
+        finally:
+            writer.close()
+    return writer.count
+
+def _iter_range_lines(f, end: int) -> Iterator[str]:
+    while f.tell() < end:
+        line = f.readline()
+        if not line:
+            return
+        yield line.decode()
+
+def _load_partition(paths: List[str]) -> Dict[str, List[Any]]:
+    records = {}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                record = json.loads(line)
+                records[record[0]] = record
+    return records
+
+def _amounts_differ(left: Optional[str], right: Optional[str]) -> bool:
+    try:
+        return Decimal(left) != Decimal(right)
+    except (InvalidOperation, TypeError):
+        return left != right
+
+def compare_partition(xendit_paths: List[str], ledger_paths: List[str], output_path: str) -> Dict[str, int]:
+    """Process-pool worker: join one partition on reference_id and write mismatches"""
+    xendit = _load_partition(xendit_paths)
+    counts = {'matched': 0, 'missing_in_xendit': 0, 'missing_in_ledger': 0, 'duplicate_in_ledger': 0,
+              'amount': 0, 'currency': 0, 'status': 0}
+    # A reference_id always lands in the same partition, so repeats are caught here
+    seen = set()
+
+    with open(output_path, 'w') as out:
+        def emit(reference_id: str, kind: str, ledger_value: Any = None, xendit_value: Any = None):
+            counts[kind] += 1
+            out.write(json.dumps({'reference_id': reference_id, 'mismatch': kind,
+                                  'ledger': ledger_value, 'xendit': xendit_value}) + '\n')
+
+        for path in ledger_paths:
+            with open(path) as f:
+                for line in f:
+                    ledger = json.loads(line)
+                    reference_id = ledger[0]
+                    if reference_id in seen:
+                        # Compared once; further rows are reported instead of as missing_in_xendit
+                        emit(reference_id, 'duplicate_in_ledger', ledger[1:])
+                        continue
+                    seen.add(reference_id)
+                    remote = xendit.pop(reference_id, None)
+                    if remote is None:
+                        emit(reference_id, 'missing_in_xendit')
+                        continue
+                    clean = True
+                    if _amounts_differ(ledger[1], remote[1]):
+                        emit(reference_id, 'amount', ledger[1], remote[1])
+                        clean = False
+                    for index, kind in ((2, 'currency'), (3, 'status')):
+                        if ledger[index] != remote[index]:
+                            emit(reference_id, kind, ledger[index], remote[index])
+                            clean = False
+                    counts['matched'] += clean
+
+        for reference_id in xendit:
+            emit(reference_id, 'missing_in_ledger')
+    return counts
+
+class ReconciliationJob:
+    """Reconciles an internal ledger file (CSV/JSONL) against Xendit payments for a time range.
+
+    Both sides are spilled into hash partitions keyed on reference_id, so only
+    one partition per worker is ever held in memory. Ledger parsing and the
+    per-partition comparison run in a process pool; Xendit pages are fetched
+    concurrently per time window.
+    """
+
+    def __init__(self, api: XenditAPI, ledger_path: str, output_path: str,
+                 start: datetime, end: datetime, partitions: int = 64, workers: Optional[int] = None,
+                 fetch_windows: int = 8, fetch_concurrency: int = 4, page_size: int = 100,
+                 ledger_fields: Optional[Dict[str, str]] = None, chunk_size: int = 32 << 20,
+                 workdir: Optional[str] = None):
+        if not ledger_path.endswith(('.csv', '.jsonl')):
+            raise ValidationException("Ledger must be a .csv or .jsonl file")
+        self.api = api
+        self.ledger_path = ledger_path
+        self.output_path = output_path
+        self.start = start
+        self.end = end
+        self.partitions = partitions
+        self.workers = workers or os.cpu_count() or 1
+        self.fetch_windows = fetch_windows
+        self.fetch_concurrency = fetch_concurrency
+        self.page_size = page_size
+        self.ledger_fields = {**DEFAULT_LEDGER_FIELDS, **(ledger_fields or {})}
+        self.chunk_size = chunk_size
+        self.workdir = workdir
+
+    def fetch_xendit(self, writer: PartitionWriter):
+        """Fetch every payment in the time range, one paginated stream per window"""
+        xendit_fields = DEFAULT_LEDGER_FIELDS
+
+        def fetch_window(window: Tuple[str, str]) -> int:
+            params = {'limit': self.page_size, CREATED_GTE: window[0], CREATED_LT: window[1]}
+            fetched = 0
+            for page, _ in iter_payment_pages(self.api, params):
+                writer.write_many([r for r in (normalize_record(p, xendit_fields) for p in page) if r])
+                fetched += len(page)
+            return fetched
+
+        windows = split_time_range(self.start, self.end, self.fetch_windows)
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency) as executor:
+            for future in as_completed([executor.submit(fetch_window, w) for w in windows]):
+                future.result()
+
+    def partition_ledger(self, workdir: str, executor: ProcessPoolExecutor) -> List[Future]:
+        """Submit one parsing task per line-aligned chunk of the ledger"""
+        header, ranges = _ledger_chunks(self.ledger_path, self.chunk_size)
+        return [
+            executor.submit(_partition_ledger_range, self.ledger_path, header, start, end,
+                            workdir, self.partitions, part, self.ledger_fields)
+            for part, (start, end) in enumerate(ranges)
+        ]
+
+    def run(self) -> Dict[str, Any]:
+        """Run the reconciliation and write mismatches as JSONL to output_path"""
+        workdir = tempfile.mkdtemp(prefix='xendit-recon-', dir=self.workdir)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                # Ledger parsing runs in worker processes while this process fetches from Xendit
+                ledger_futures = self.partition_ledger(workdir, executor)
+                xendit_writer = PartitionWriter(workdir, 'xendit', self.partitions)
+                try:
+                    self.fetch_xendit(xendit_writer)
+                finally:
+                    xendit_writer.close()
+                ledger_count = sum(future.result() for future in ledger_futures)
+
+                futures = [
+                    executor.submit(
+                        compare_partition,
+                        [xendit_writer.paths[i]],
+                        [os.path.join(workdir, f"ledger_p{part}_{i}.jsonl") for part in range(len(ledger_futures))],
+                        os.path.join(workdir, f"mismatches_{i}.jsonl")
+                    )
+                    for i in range(self.partitions)
+                ]
+                totals: Dict[str, int] = {}
+                for future in futures:
+                    for kind, count in future.result().items():
+                        totals[kind] = totals.get(kind, 0) + count
+
+            with open(self.output_path, 'wb') as out:
+                for i in range(self.partitions):
+                    with open(os.path.join(workdir, f"mismatches_{i}.jsonl"), 'rb') as part:
+                        shutil.copyfileobj(part, out)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        summary = {'ledger_records': ledger_count, 'xendit_records': xendit_writer.count, **totals}
+        logger.info(f"Reconciliation finished: {summary}")
+        return summary
+
+def iter_mismatches(path: str) -> Iterator[Dict[str, Any]]:
+    """Read a mismatch report written by ReconciliationJob"""
+    with open(path) as f:
+        for line in f:
+            yield json.loads(line)
@@ -1,6 +1,7 @@
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from enum import Enum
+from app.core.validation import request_schemas
 
 class PaymentMethodType(str, Enum):
     CARD = "CARD"
@@ -59,6 +60,57 @@ class PaymentRequest(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
     shipping_information: Optional[Dict[str, Any]] = Field(None, description="Shipping information")
 
+class PaymentMethodUpdateRequest(BaseModel):
+    status: Optional[PaymentMethodStatus] = Field(None, description="Payment method status")
+    reusability: Optional[PaymentMethodReusability] = Field(None, description="Payment method reusability")
+    description: Optional[str] = Field(None, description="Payment method description")
+    billing_information: Optional[Dict[str, Any]] = Field(None, description="Billing information")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+class CardPaymentRequest(BaseModel):
+    token_id: str = Field(..., description="Card token ID")
+    external_id: str = Field(..., description="Charge reference ID")
+    amount: float = Field(..., description="Charge amount")
+    authentication_id: Optional[str] = Field(None, description="3DS authentication ID")
+    currency: Optional[str] = Field(None, description="Charge currency")
+    capture: Optional[bool] = Field(None, description="Whether to capture the charge immediately")
+    descriptor: Optional[str] = Field(None, description="Statement descriptor")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+class CardCaptureRequest(BaseModel):
+    amount: float = Field(..., description="Amount to capture")
+
+class CardRefundRequest(BaseModel):
+    amount: float = Field(..., description="Amount to refund")
+    external_id: str = Field(..., description="Refund reference ID")
+
+class EWalletChargeRequest(BaseModel):
+    reference_id: str = Field(..., description="Charge reference ID")
+    currency: str = Field(..., description="Charge currency")
+    amount: float = Field(..., description="Charge amount")
+    checkout_method: str = Field(..., description="Checkout method, e.g. ONE_TIME_PAYMENT")
+    channel_code: Optional[str] = Field(None, description="eWallet channel code")
+    channel_properties: Optional[Dict[str, Any]] = Field(None, description="Channel specific properties")
+    customer_id: Optional[str] = Field(None, description="Customer ID")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+class QRCodeRequest(BaseModel):
+    reference_id: str = Field(..., description="QR code reference ID")
+    type: str = Field(..., description="QR code type, DYNAMIC or STATIC")
+    currency: str = Field(..., description="QR code currency")
+    amount: Optional[float] = Field(None, description="Amount, required for dynamic QR codes")
+    channel_code: Optional[str] = Field(None, description="QR channel code")
+    expires_at: Optional[str] = Field(None, description="Expiry timestamp")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+class OTCPaymentRequest(BaseModel):
+    currency: str = Field(..., description="Payment currency")
+    amount: float = Field(..., description="Payment amount")
+    reference_id: Optional[str] = Field(None, description="Payment reference ID")
+    payment_method: Optional[Dict[str, Any]] = Field(None, description="Over the counter payment method")
+    customer_id: Optional[str] = Field(None, description="Customer ID")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
 class PaymentMethodResponse(BaseModel):
     id: str = Field(..., description="Payment method ID")
     type: PaymentMethodType = Field(..., description="Payment method type")
@@ -91,3 +143,16 @@ class PaymentResponse(BaseModel):
     shipping_information: Optional[Dict[str, Any]] = Field(None, description="Shipping information")
     created: str = Field(..., description="Creation timestamp")
     updated: str = Field(..., description="Last update timestamp")
+
+# Route validators, compiled once at import. Schemas for payloads that used to
+# be forwarded unvalidated allow extra fields so nothing Xendit accepts is dropped.
+request_schemas.register('xendit.create_customer', CustomerRequest)
+request_schemas.register('xendit.create_payment_method', PaymentMethodRequest)
+request_schemas.register('xendit.update_payment_method', PaymentMethodUpdateRequest, extra='allow')
+request_schemas.register('xendit.create_payment', PaymentRequest)
+request_schemas.register('xendit.create_card_payment', CardPaymentRequest, extra='allow')
+request_schemas.register('xendit.capture_card_payment', CardCaptureRequest, extra='allow')
+request_schemas.register('xendit.refund_card_payment', CardRefundRequest, extra='allow')
+request_schemas.register('xendit.create_ewallet_charge', EWalletChargeRequest, extra='allow')
+request_schemas.register('xendit.create_qr_code', QRCodeRequest, extra='allow')
+request_schemas.register('xendit.create_otc_payment', OTCPaymentRequest, extra='allow')
@@ -0,0 +1,66 @@
+from typing import Any, Dict
+import logging
+from app.core.lifecycle import worker_resources
+from app.core.settings import runtime_settings
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Client settings that can change at runtime: name -> (type, minimum, maximum)
+CLIENT_TUNABLES = {
+    'timeout': (float, 0.1, 300),
+    'pool_connections': (int, 1, 1000),
+    'pool_maxsize': (int, 1, 1000),
+    'dns_cache_ttl': (float, 0, 86400),
+    'rate_limit': (float, 0, None),
+    'rate_burst': (float, 0, None),
+    'rate_limit_wait': (float, 0, 60),
+    'breaker_failure_threshold': (int, 0, None),
+    'breaker_reset_timeout': (float, 0, None),
+    'hedge_max_ratio': (float, 0, 1),
+    'hedge_percentile': (float, 1, 100),
+    'hedge_min_delay_ms': (float, 0, None),
+    'max_response_bytes': (int, 0, None),
+    'shadow_sample_rate': (float, 0, 1),
+}
+
+_client_defaults = Config.API_CONFIGS['xendit']
+for _name, (_type, _minimum, _maximum) in CLIENT_TUNABLES.items():
+    runtime_settings.define(f'xendit.{_name}', _client_defaults.get(_name), _type, _minimum, _maximum)
+runtime_settings.define('xendit.local_store_max_age', Config.XENDIT_LOCAL_STORE_MAX_AGE, float, 0,
+                        description='Seconds a locally stored record may be served')
+for _job_type, _job_settings in Config.XENDIT_JOBS.items():
+    runtime_settings.define(f'xendit.jobs.{_job_type}.rate_limit', _job_settings.get('rate_limit', 0), float, 0,
+                            description='Jobs per second (0 = unlimited)')
+
+def client_settings() -> Dict[str, Any]:
+    """Current client tunables, for building new account clients"""
+    return {name: runtime_settings.get(f'xendit.{name}') for name in CLIENT_TUNABLES}
+
+def local_store_max_age() -> float:
+    return runtime_settings.get('xendit.local_store_max_age')
+
+def job_rate_limit(job_type: str) -> float:
+    return runtime_settings.get(f'xendit.jobs.{job_type}.rate_limit')
+
+def apply_settings(changed: Dict[str, Any]):
+    """Push changed tunables into this worker's live clients, store and job workers"""
+    client_updates = {
+        name[len('xendit.'):]: value for name, value in changed.items() if name[len('xendit.'):] in CLIENT_TUNABLES
+    }
+    accounts = worker_resources.peek('xendit.accounts')
+    if client_updates and accounts is not None:
+        accounts.reconfigure(client_updates)
+
+    use_case = worker_resources.peek('xendit.use_case')
+    if 'xendit.local_store_max_age' in changed and use_case is not None and use_case.store is not None:
+        use_case.store.max_age = changed['xendit.local_store_max_age']
+
+    jobs = worker_resources.peek('xendit.jobs')
+    if jobs is not None:
+        for job_type in jobs.pool.job_types:
+            name = f'xendit.jobs.{job_type}.rate_limit'
+            if name in changed:
+                jobs.pool.set_rate_limit(job_type, changed[name])
+
+runtime_settings.subscribe(apply_settings)
@@ -0,0 +1,183 @@
+from typing import Any, Dict, List, Optional
+import json
+import sqlite3
+import threading
+import time
+import logging
+from config import Config
+from .settings import local_store_max_age
+
+logger = logging.getLogger(__name__)
+
+# Indexed columns per table; only filters on these can be answered locally
+TABLES = {
+    'payments': ['reference_id', 'customer_id', 'status', 'payment_method_id', 'created'],
+    'payment_methods': ['reference_id', 'customer_id', 'status', 'type', 'created'],
+    'customers': ['reference_id', 'email', 'created'],
+}
+
+# Query parameters that only shape the result and can be applied locally
+PAGING_PARAMS = {'limit'}
+
+class XenditStore:
+    """Local SQLite materialized view of Xendit payments, payment methods and customers"""
+
+    def __init__(self, path: str = ':memory:', max_age: float = 30.0, max_limit: int = 100):
+        self.path = path
+        self.max_age = max_age
+        self.max_limit = max_limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            for table, columns in TABLES.items():
+                column_sql = ', '.join(f'{column} TEXT' for column in columns)
+                self._conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} '
+                    f'(id TEXT PRIMARY KEY, {column_sql}, body TEXT NOT NULL, synced_at REAL NOT NULL)'
+                )
+                for column in columns:
+                    self._conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})')
+            # Filter sets whose full upstream result was fetched; only these lists are served locally
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS list_syncs '
+                '(table_name TEXT NOT NULL, filters TEXT NOT NULL, synced_at REAL NOT NULL, '
+                'PRIMARY KEY (table_name, filters))'
+            )
+
+    # Writes
+    def upsert(self, table: str, record: Dict[str, Any]):
+        """Insert or refresh a record received from Xendit (API response or webhook)"""
+        self.upsert_many(table, [record])
+
+    def upsert_many(self, table: str, records: List[Dict[str, Any]]):
+        columns = TABLES[table]
+        rows = []
+        now = time.time()
+        for record in records:
+            if not record or not record.get('id'):
+                continue
+            values = [self._column_value(table, column, record) for column in columns]
+            rows.append([record['id'], *values, json.dumps(record, default=str), now])
+        if not rows:
+            return
+
+        placeholders = ', '.join('?' for _ in range(len(columns) + 3))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (id, {', '.join(columns)}, body, synced_at) VALUES ({placeholders})",
+                rows
+            )
+
+    def upsert_payment(self, payment: Dict[str, Any]):
+        self.upsert('payments', payment)
+        if isinstance(payment.get('payment_method'), dict):
+            self.upsert('payment_methods', payment['payment_method'])
+
+    def upsert_payments(self, payments: List[Dict[str, Any]]):
+        self.upsert_many('payments', payments)
+        self.upsert_many('payment_methods', [
+            payment['payment_method'] for payment in payments if isinstance(payment.get('payment_method'), dict)
+        ])
+
+    def merge(self, table: str, record_id: str, fields: Dict[str, Any]) -> bool:
+        """Apply changed fields to a stored record; False when the record isn't stored"""
+        with self._lock:
+            row = self._conn.execute(f'SELECT body FROM {table} WHERE id = ?', (record_id,)).fetchone()
+        if row is None:
+            return False
+        self.upsert(table, {**json.loads(row[0]), **fields})
+        return True
+
+    def record_list(self, table: str, params: Optional[Dict[str, Any]], response: Dict[str, Any]):
+        """Mark a filter set as complete when an upstream list returned every match (has_more is false)"""
+        filters = self._filters(table, params)
+        if filters is None or response.get('has_more') is not False:
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO list_syncs (table_name, filters, synced_at) VALUES (?, ?, ?)',
+                (table, self._filters_key(filters), time.time())
+            )
+
+    # Reads
+    def get(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh record by ID, or None on a miss or a stale entry"""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT body FROM {table} WHERE id = ? AND synced_at >= ?',
+                (record_id, time.time() - self.max_age)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, table: str, params: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Answer a list query from the local store.
+
+        Only filter sets recorded by record_list within max_age are served, since
+        rows from gets, webhooks or other lists may be a partial answer. Returns
+        None otherwise (or on unindexed filters or stale rows) so the caller falls
+        back to upstream.
+        """
+        filters = self._filters(table, params)
+        if filters is None:
+            return None
+        try:
+            limit = min(int((params or {}).get('limit', self.max_limit)), self.max_limit)
+        except (TypeError, ValueError):
+            return None
+
+        oldest_allowed = time.time() - self.max_age
+        where = ' AND '.join(f'{key} = ?' for key in filters)
+        with self._lock:
+            synced = self._conn.execute(
+                'SELECT 1 FROM list_syncs WHERE table_name = ? AND filters = ? AND synced_at >= ?',
+                (table, self._filters_key(filters), oldest_allowed)
+            ).fetchone()
+            if not synced:
+                return None
+            rows = self._conn.execute(
+                f'SELECT body, synced_at FROM {table} WHERE {where} ORDER BY created DESC LIMIT ?',
+                [*filters.values(), limit]
+            ).fetchall()
+
+        if any(synced_at < oldest_allowed for _, synced_at in rows):
+            return None
+        return [json.loads(body) for body, _ in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _filters(table: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """Filters of a list query, or None when they can't be answered from indexed columns"""
+        filters = {key: value for key, value in (params or {}).items() if key not in PAGING_PARAMS}
+        if not filters or any(key not in TABLES[table] for key in filters):
+            return None
+        return {key: str(value) for key, value in filters.items()}
+
+    @staticmethod
+    def _filters_key(filters: Dict[str, str]) -> str:
+        return json.dumps(filters, sort_keys=True)
+
+    @staticmethod
+    def _column_value(table: str, column: str, record: Dict[str, Any]) -> Optional[str]:
+        value = record.get(column)
+        if value is None and table == 'payments' and column == 'payment_method_id':
+            value = (record.get('payment_method') or {}).get('id')
+        return None if value is None else str(value)
+
+def create_store() -> Optional[XenditStore]:
+    """Build the local store from configuration, or None when disabled"""
+    if not Config.XENDIT_LOCAL_STORE_ENABLED:
+        return None
+    logger.info(f"Xendit local store enabled at {Config.XENDIT_LOCAL_STORE_PATH}")
+    return XenditStore(
+        path=Config.XENDIT_LOCAL_STORE_PATH,
+        max_age=local_store_max_age()
+    )
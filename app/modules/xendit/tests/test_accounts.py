@@ -0,0 +1,72 @@
+import json
+from flask import Flask, jsonify
+from app.modules.xendit.accounts import XenditAccountPool, current_client, init_account_routing
+
+def _write(path, accounts, **extra):
+    path.write_text(json.dumps({'accounts': accounts, **extra}))
+
+def test_pool_defaults_to_single_account(monkeypatch):
+    monkeypatch.setenv('XENDIT_API_KEY', 'key-default')
+    pool = XenditAccountPool()
+
+    assert pool.accounts == ['default']
+    assert pool.get().api_key == 'key-default'
+
+def test_accounts_file_is_reloaded_when_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv('XENDIT_SUB_KEY', 'key-sub')
+    path = tmp_path / 'accounts.json'
+    _write(path, {'main': {'api_key': 'key-main'}}, default='main')
+    pool = XenditAccountPool(str(path), reload_interval=0)
+
+    _write(path, {'main': {'api_key': 'key-main'}, 'sub': {'api_key_env': 'XENDIT_SUB_KEY', 'rate_limit': 5}}, default='main')
+    pool._mtime = None
+    pool.refresh()
+
+    assert pool.accounts == ['main', 'sub']
+    assert pool.get('sub').api_key == 'key-sub'
+    assert pool.get('sub').metrics_prefix == 'upstream.xendit.sub'
+    assert pool.get('sub').rate_limiter is not None
+
+def test_requests_use_header_account_and_remember_owner(tmp_path):
+    path = tmp_path / 'accounts.json'
+    _write(path, {'main': {'api_key': 'key-main'}, 'sub': {'api_key': 'key-sub'}}, default='main')
+    pool = XenditAccountPool(str(path))
+    app = Flask(__name__)
+
+    @app.route('/payments', methods=['POST'])
+    def create_payment():
+        return jsonify({'id': 'pr-1', 'key': current_client(pool).api_key}), 201
+
+    @app.route('/payments/<payment_id>', methods=['GET'])
+    def get_payment(payment_id):
+        return jsonify({'key': current_client(pool).api_key}), 200
+
+    init_account_routing(app, pool)
+    client = app.test_client()
+
+    created = client.post('/payments', headers={'X-Xendit-Account': 'sub'})
+    fetched = client.get('/payments/pr-1')
+
+    assert created.json['key'] == 'key-sub'
+    assert fetched.json['key'] == 'key-sub'
+    assert fetched.headers['X-Xendit-Account'] == 'sub'
+    assert client.post('/payments', headers={'X-Xendit-Account': 'nope'}).status_code == 400
+
+def test_generated_routes_keep_resources_on_one_account(tmp_path):
+    from unittest.mock import Mock
+    from flask import Blueprint
+    from app.core.dispatch import register_endpoint_routes
+    from app.modules.xendit.endpoints import ENDPOINTS
+    path = tmp_path / 'accounts.json'
+    _write(path, {'a': {'api_key': 'key-a'}, 'b': {'api_key': 'key-b'}}, default='a')
+    pool = XenditAccountPool(str(path))
+    bp = Blueprint('generated', __name__)
+    init_account_routing(bp, pool)
+    client = Mock(call=lambda *args, **kwargs: json.dumps({'key': current_client(pool).api_key}).encode())
+    register_endpoint_routes(bp, {'get_invoices': ENDPOINTS['get_invoices']}, lambda: client)
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+
+    # Unknown owner: the default account every time, never a round robin
+    keys = {app.test_client().get('/v2/invoices/inv-1').json['key'] for _ in range(4)}
+    assert keys == {'key-a'}
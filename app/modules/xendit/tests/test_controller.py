@@ -132,3 +132,85 @@ async def test_error_handling(client):
         
         assert response.status_code == 400
         assert 'error' in response.json
+
+def test_stream_payment_events_resumes_from_last_event_id(client):
+    from app.core.ws_auth import WebSocketAuth
+    from app.modules.xendit.websocket import authorize_payment, payment_events
+    auth = WebSocketAuth('secret')
+    auth.register_authorizer('xendit.payment', authorize_payment)
+    token = auth.issue({'sub': 'merchant', 'payments': ['pay-sse']})
+    event = payment_events.publish('payment_update', {'payment_id': 'pay-sse', 'status': 'SUCCEEDED'}, channel='pay-sse')
+
+    with patch('app.core.websocket.websocket_manager.auth', auth):
+        assert client.get('/xendit/payments/pay-sse/events').status_code == 401
+        response = client.get('/xendit/payments/pay-sse/events', headers={
+            'Last-Event-ID': str(event.id - 1), 'Authorization': f'Bearer {token}'
+        })
+    frames = iter(response.response)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert next(frames).startswith(b'retry:')
+    assert next(frames) == event.payload
+    response.close()
+
+@pytest.fixture
+def job_runtime(tmp_path):
+    from app.core.jobs import JobRuntime, JobStore
+    from app.modules.xendit.jobs import create_job_pool
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    # No workers or watcher: jobs stay queued so the routes can be inspected
+    runtime = JobRuntime(store, create_job_pool(store, on_finished=None), in_process=False)
+    with patch('app.modules.xendit.controller.xendit_jobs', runtime):
+        yield runtime
+    runtime.close()
+
+def test_web_workers_do_not_watch_completions_through_a_message_queue(tmp_path):
+    from app.modules.xendit.jobs import create_job_runtime
+    with patch.multiple('config.Config', XENDIT_JOBS_DB_PATH=str(tmp_path / 'jobs.db'), XENDIT_JOBS_IN_PROCESS=False,
+                        SOCKETIO_MESSAGE_QUEUE='redis://redis:6379/0'):
+        runtime = create_job_runtime()
+    # The jobs worker emits each completion to every instance itself
+    assert runtime.watcher is None
+    runtime.close()
+
+def test_submit_jobs_queues_validated_items(client, job_runtime):
+    items = [
+        {'payment_id': 'pay-1', 'amount': 5000, 'external_id': 'rf-1'},
+        {'payment_id': 'pay-2', 'amount': 100, 'external_id': 'rf-2'}
+    ]
+    response = client.post('/xendit/jobs/refund_card_payment', json={'items': items}, headers={'Idempotency-Key': 'batch-1'})
+
+    assert response.status_code == 202
+    jobs = response.json['jobs']
+    assert [job['status'] for job in jobs] == ['queued', 'queued']
+    assert job_runtime.store.get(jobs[0]['id'])['payload']['payment_id'] == 'pay-1'
+
+    # Resubmitting with the same key does not queue the refunds twice
+    client.post('/xendit/jobs/refund_card_payment', json={'items': items}, headers={'Idempotency-Key': 'batch-1'})
+    assert job_runtime.store.counts() == {'refund_card_payment': {'queued': 2}}
+
+    status = client.get(f"/xendit/jobs/{jobs[1]['id']}")
+    assert status.status_code == 200 and status.json['type'] == 'refund_card_payment'
+    assert client.get('/xendit/jobs?status=queued').json[0]['status'] == 'queued'
+
+def test_submit_jobs_rejects_unknown_type_and_invalid_items(client, job_runtime):
+    assert client.post('/xendit/jobs/delete_everything', json={}).status_code == 404
+    assert client.post('/xendit/jobs/expire_payment_method', json={'items': [{}]}).status_code == 400
+    assert client.post('/xendit/jobs/create_customer', json={'email': 'a@example.com'}).status_code == 400
+    assert client.get('/xendit/jobs/missing').status_code == 404
+
+def test_submit_import_stores_upload_and_queues_job(client, job_runtime, tmp_path):
+    with patch('app.modules.xendit.imports.Config.XENDIT_IMPORT_DIR', str(tmp_path)):
+        response = client.post('/xendit/imports/customers', data=b'{"reference_id": "c-1"}\n',
+                               content_type='application/x-ndjson')
+
+        assert response.status_code == 202
+        job = job_runtime.store.get(response.json['id'])
+        assert job['type'] == 'import_file' and job['payload']['format'] == 'jsonl'
+        with open(job['payload']['input'], 'rb') as f:
+            assert f.read() == b'{"reference_id": "c-1"}\n'
+
+        status = client.get(f"/xendit/imports/{job['id']}")
+        assert status.status_code == 200 and status.json['progress'] is None
+        assert client.get(f"/xendit/imports/{job['id']}/report").status_code == 404
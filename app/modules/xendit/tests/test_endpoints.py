@@ -0,0 +1,23 @@
+import requests
+from click.testing import CliRunner
+from unittest.mock import Mock
+from app.modules.xendit.api import XenditAPI
+from app.modules.xendit.cli import generate_endpoints
+from app.modules.xendit.endpoints import ENDPOINTS
+
+def test_generated_modules_match_the_collection():
+    result = CliRunner().invoke(generate_endpoints, ['--check'])
+
+    assert result.exit_code == 0, result.output
+
+def test_call_sends_the_table_entry():
+    api = XenditAPI(api_key='test_key', base_url='https://api.xendit.co')
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{"data": []}'
+    api.session.request = Mock(return_value=response)
+
+    assert api.call('list_payment_requests_captures', {'id': 'pr-1'}, params={'limit': 10}) == {'data': []}
+    method, url = api.session.request.call_args.args
+    assert (method, url) == ('GET', 'https://api.xendit.co/payment_requests/pr-1/captures')
+    assert ENDPOINTS['get_payment_requests'].hedge
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from app.modules.xendit.export import PAYMENT_COLUMNS, PaymentExporter, flatten_payment
+
+def make_page(ids, has_more):
+    return {
+        "data": [
+            {
+                "id": payment_id,
+                "reference_id": f"ref-{payment_id}",
+                "amount": 10000,
+                "currency": "IDR",
+                "status": "SUCCEEDED",
+                "metadata": {"order": payment_id},
+                "payment_method": {"id": "pm-123", "type": "CARD"}
+            }
+            for payment_id in ids
+        ],
+        "has_more": has_more
+    }
+
+def test_flatten_payment_inlines_payment_method():
+    row = flatten_payment(make_page(["pay-1"], False)["data"][0])
+
+    assert row["payment_method.id"] == "pm-123"
+    assert row["payment_method.type"] == "CARD"
+    assert row["metadata"] == '{"order":"pay-1"}'
+    assert "payment_method" not in row
+
+def test_csv_export_streams_all_pages(mock_xendit_api):
+    mock_xendit_api.list_payments.side_effect = [make_page(["pay-1", "pay-2"], True), make_page(["pay-3"], False)]
+    progress = []
+    exporter = PaymentExporter(mock_xendit_api, 'csv', page_size=2, progress=lambda state: progress.append(state.rows))
+
+    chunks = list(exporter.iter_chunks({'status': 'SUCCEEDED'}))
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+
+    assert len(chunks) == 2
+    assert [row["id"] for row in rows] == ["pay-1", "pay-2", "pay-3"]
+    assert list(rows[0]) == PAYMENT_COLUMNS
+    assert progress == [2, 3]
+    second_call_params = mock_xendit_api.list_payments.call_args_list[1].args[0]
+    assert second_call_params == {'limit': 2, 'status': 'SUCCEEDED', 'after_id': 'pay-2'}
+
+def test_jsonl_export_by_payment_method(mock_xendit_api):
+    mock_xendit_api.list_payments_by_payment_method.return_value = make_page(["pay-1"], False)
+    exporter = PaymentExporter(mock_xendit_api, 'jsonl')
+
+    lines = b''.join(exporter.iter_chunks(payment_method_id="pm-123")).decode().splitlines()
+
+    assert json.loads(lines[0])["payment_method.id"] == "pm-123"
+    mock_xendit_api.list_payments_by_payment_method.assert_called_once_with("pm-123", {'limit': 100})
+
+def test_streamed_export_ends_with_a_resumable_error_marker(mock_xendit_api):
+    from app.core.exceptions import ThirdPartyAPIException
+    mock_xendit_api.list_payments.side_effect = [make_page(["pay-1", "pay-2"], True), ThirdPartyAPIException("upstream down")]
+
+    lines = b''.join(PaymentExporter(mock_xendit_api, 'jsonl').stream()).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines[:2]] == ["pay-1", "pay-2"]
+    assert json.loads(lines[2]) == {"error": "upstream down", "resume_after_id": "pay-2"}
+
+    mock_xendit_api.list_payments.side_effect = [make_page(["pay-1"], True), ThirdPartyAPIException("upstream down")]
+    body = b''.join(PaymentExporter(mock_xendit_api, 'csv').stream()).decode()
+    assert body.endswith("# export incomplete: upstream down; resume with after_id=pay-1\n")
+
+def test_export_to_file_resumes_from_checkpoint(mock_xendit_api, tmp_path):
+    output = tmp_path / "payments.csv"
+    checkpoint = tmp_path / "payments.checkpoint"
+    checkpoint.write_text(json.dumps({"cursor": "pay-2", "rows": 2}))
+    output.write_text(",".join(PAYMENT_COLUMNS) + "\n")
+    mock_xendit_api.list_payments.return_value = make_page(["pay-3"], False)
+
+    state = PaymentExporter(mock_xendit_api, 'csv').export_to_file(str(output), checkpoint_path=str(checkpoint))
+
+    rows = list(csv.DictReader(io.StringIO(output.read_text())))
+    assert [row["id"] for row in rows] == ["pay-3"]
+    assert state.rows == 3
+    assert json.loads(checkpoint.read_text())["cursor"] == "pay-3"
+    assert mock_xendit_api.list_payments.call_args.args[0]["after_id"] == "pay-2"
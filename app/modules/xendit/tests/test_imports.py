@@ -0,0 +1,58 @@
+import json
+from app.core.exceptions import ThirdPartyAPIException
+from app.modules.xendit.imports import BulkImport, unflatten_row
+
+def read_report(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_unflatten_row_nests_columns_and_decodes_json():
+    row = {'reference_id': 'c-1', 'individual_detail.given_names': 'Ayu', 'addresses': '[{"country": "ID"}]', 'email': ''}
+
+    assert unflatten_row(row) == {
+        'reference_id': 'c-1', 'individual_detail': {'given_names': 'Ayu'}, 'addresses': [{'country': 'ID'}]
+    }
+
+def test_csv_import_reports_every_row(mock_xendit_api, tmp_path):
+    source = tmp_path / 'customers.csv'
+    source.write_text(
+        'reference_id,email,individual_detail.given_names\n'
+        'c-1,a@example.com,Ayu\n'
+        ',missing@example.com,\n'
+        'c-3,c@example.com,Budi\n'
+    )
+
+    def create_customer(payload):
+        if payload['reference_id'] == 'c-3':
+            raise ThirdPartyAPIException('DUPLICATE_CUSTOMER', status_code=409)
+        return {'id': 'cust-1', **payload}
+
+    mock_xendit_api.create_customer.side_effect = create_customer
+    report = tmp_path / 'report.jsonl'
+    summary = BulkImport(mock_xendit_api, 'customers', str(source), str(report), workers=1, rate_limit=0).run()
+
+    assert summary == {'rows': 3, 'created': 1, 'invalid': 1, 'failed': 1}
+    mock_xendit_api.create_customer.assert_any_call(
+        {'reference_id': 'c-1', 'email': 'a@example.com', 'individual_detail': {'given_names': 'Ayu'}}
+    )
+    lines = read_report(report)
+    assert [line['status'] for line in lines] == ['created', 'invalid', 'failed']
+    assert lines[0]['id'] == 'cust-1'
+    assert lines[1]['errors'][0]['loc'] == ['reference_id']
+    assert lines[2]['status_code'] == 409
+
+def test_import_resumes_after_checkpoint(mock_xendit_api, tmp_path):
+    source = tmp_path / 'customers.jsonl'
+    source.write_text(''.join(json.dumps({'reference_id': f'c-{n}'}) + '\n' for n in range(1, 6)) + 'not json\n')
+    checkpoint = tmp_path / 'checkpoint.json'
+    checkpoint.write_text(json.dumps({'row': 3, 'summary': {'rows': 3, 'created': 3, 'invalid': 0, 'failed': 0}}))
+    mock_xendit_api.create_customer.side_effect = lambda payload: {'id': payload['reference_id']}
+    report = tmp_path / 'report.jsonl'
+
+    summary = BulkImport(mock_xendit_api, 'customers', str(source), str(report), checkpoint_path=str(checkpoint),
+                         workers=1, chunk_rows=2, rate_limit=0).run()
+
+    assert [call.args[0]['reference_id'] for call in mock_xendit_api.create_customer.call_args_list] == ['c-4', 'c-5']
+    assert summary == {'rows': 6, 'created': 5, 'invalid': 1, 'failed': 0}
+    assert [line['row'] for line in read_report(report)] == [4, 5, 6]
+    assert json.loads(checkpoint.read_text())['row'] == 6
@@ -0,0 +1,72 @@
+from datetime import datetime
+import json
+from app.modules.xendit.reconciliation import (
+    CREATED_GTE, ReconciliationJob, compare_partition, iter_mismatches, split_time_range
+)
+
+def test_split_time_range():
+    windows = split_time_range(datetime(2024, 1, 1), datetime(2024, 1, 3), 2)
+
+    assert windows == [
+        ('2024-01-01T00:00:00', '2024-01-02T00:00:00'),
+        ('2024-01-02T00:00:00', '2024-01-03T00:00:00'),
+    ]
+
+def test_reconciliation_reports_mismatches(mock_xendit_api, tmp_path):
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_text(
+        "reference_id,amount,currency,status\n"
+        "ref-1,10000,IDR,SUCCEEDED\n"
+        "ref-2,5000,IDR,SUCCEEDED\n"
+        "ref-3,7000,IDR,SUCCEEDED\n"
+        "ref-4,100,IDR,PENDING\n"
+    )
+    xendit_payments = [
+        {"id": "pay-1", "reference_id": "ref-1", "amount": 10000.0, "currency": "IDR", "status": "SUCCEEDED"},
+        {"id": "pay-2", "reference_id": "ref-2", "amount": 5500, "currency": "IDR", "status": "SUCCEEDED"},
+        {"id": "pay-3", "reference_id": "ref-3", "amount": 7000, "currency": "PHP", "status": "FAILED"},
+        {"id": "pay-5", "reference_id": "ref-5", "amount": 1, "currency": "IDR", "status": "SUCCEEDED"},
+    ]
+
+    def list_payments(params):
+        first_window = params[CREATED_GTE].startswith('2024-01-01')
+        return {"data": xendit_payments if first_window else [], "has_more": False}
+
+    mock_xendit_api.list_payments.side_effect = list_payments
+    output = tmp_path / "mismatches.jsonl"
+
+    summary = ReconciliationJob(
+        mock_xendit_api, str(ledger), str(output),
+        start=datetime(2024, 1, 1), end=datetime(2024, 1, 3),
+        partitions=4, workers=2, fetch_windows=2
+    ).run()
+
+    mismatches = {(m['reference_id'], m['mismatch']): m for m in iter_mismatches(str(output))}
+    assert set(mismatches) == {
+        ('ref-2', 'amount'), ('ref-3', 'currency'), ('ref-3', 'status'),
+        ('ref-4', 'missing_in_xendit'), ('ref-5', 'missing_in_ledger'),
+    }
+    assert mismatches[('ref-2', 'amount')]['xendit'] == '5500'
+    assert summary['matched'] == 1
+    assert summary['ledger_records'] == 4
+    assert summary['xendit_records'] == 4
+    assert mock_xendit_api.list_payments.call_count == 2
+
+def test_repeated_ledger_rows_are_reported_as_duplicates(tmp_path):
+    xendit, ledger = tmp_path / "xendit.jsonl", tmp_path / "ledger.jsonl"
+    xendit.write_text(json.dumps(["ref-1", "100", "IDR", "SUCCEEDED"]) + "\n")
+    ledger.write_text("".join(json.dumps(row) + "\n" for row in (
+        ["ref-1", "100", "IDR", "SUCCEEDED"],
+        ["ref-1", "100", "IDR", "SUCCEEDED"],
+        ["ref-2", "5", "IDR", "PENDING"],
+    )))
+    output = tmp_path / "mismatches.jsonl"
+
+    counts = compare_partition([str(xendit)], [str(ledger)], str(output))
+
+    assert [(m['reference_id'], m['mismatch']) for m in iter_mismatches(str(output))] == [
+        ('ref-1', 'duplicate_in_ledger'), ('ref-2', 'missing_in_xendit'),
+    ]
+    assert counts['matched'] == 1
+    assert counts['duplicate_in_ledger'] == 1
+    assert counts['missing_in_xendit'] == 1
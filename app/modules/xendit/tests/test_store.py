@@ -0,0 +1,105 @@
+import time
+from app.modules.xendit.store import XenditStore
+from app.modules.xendit.use_cases import XenditUseCase
+from app.modules.xendit.controller import webhook_authorized
+from config import Config
+
+def make_payment(payment_id: str, customer_id: str = "cust-123", status: str = "SUCCEEDED"):
+    return {
+        "id": payment_id,
+        "reference_id": f"ref-{payment_id}",
+        "customer_id": customer_id,
+        "currency": "IDR",
+        "amount": 10000,
+        "country": "ID",
+        "status": status,
+        "payment_method": {
+            "id": "pm-123",
+            "type": "CARD",
+            "reusability": "MULTIPLE_USE",
+            "status": "ACTIVE",
+            "reference_id": "ref-pm-123",
+            "customer_id": customer_id,
+            "created": "2023-01-01T00:00:00Z",
+            "updated": "2023-01-01T00:00:00Z"
+        },
+        "created": f"2023-01-0{payment_id[-1]}T00:00:00Z",
+        "updated": "2023-01-01T00:00:00Z"
+    }
+
+def test_query_by_indexed_columns():
+    store = XenditStore()
+    store.upsert_payments([make_payment("pay-1"), make_payment("pay-2", status="PENDING"), make_payment("pay-3", customer_id="cust-9")])
+    store.record_list('payments', {'customer_id': 'cust-123'}, {'has_more': False})
+    store.record_list('payments', {'customer_id': 'cust-123', 'status': 'PENDING'}, {'has_more': False})
+    store.record_list('payments', {'payment_method_id': 'pm-123', 'limit': '50'}, {'has_more': False})
+
+    result = store.query('payments', {'customer_id': 'cust-123'})
+
+    assert [payment['id'] for payment in result] == ['pay-2', 'pay-1']
+    assert store.query('payments', {'customer_id': 'cust-123', 'status': 'PENDING'})[0]['id'] == 'pay-2'
+    assert store.query('payments', {'payment_method_id': 'pm-123', 'limit': '1'})[0]['id'] == 'pay-3'
+    assert store.get('payment_methods', 'pm-123')['type'] == 'CARD'
+
+def test_query_falls_back_unless_the_filter_set_was_synced():
+    store = XenditStore()
+    store.upsert_payment(make_payment("pay-1"))
+    store.record_list('payments', {'status': 'SUCCEEDED'}, {'has_more': True})
+
+    # Rows from gets and webhooks may be a partial answer
+    assert store.query('payments', {'customer_id': 'cust-123'}) is None
+    assert store.query('payments', {'status': 'SUCCEEDED'}) is None
+    assert store.query('payments', {'after_id': 'pay-1'}) is None
+    assert store.query('payments', {}) is None
+
+def test_stale_records_are_not_served():
+    store = XenditStore(max_age=0.01)
+    store.upsert_payment(make_payment("pay-1"))
+    store.record_list('payments', {'customer_id': 'cust-123'}, {'has_more': False})
+    time.sleep(0.02)
+
+    assert store.get('payments', 'pay-1') is None
+    assert store.query('payments', {'customer_id': 'cust-123'}) is None
+
+async def test_use_case_serves_list_locally_after_upstream_fill(mock_xendit_api):
+    mock_xendit_api.list_payments.return_value = {"data": [make_payment("pay-1")], "has_more": False}
+    use_case = XenditUseCase(api_client=mock_xendit_api, store=XenditStore())
+
+    first = await use_case.list_payments({'customer_id': 'cust-123'})
+    second = await use_case.list_payments({'customer_id': 'cust-123'})
+
+    assert [payment.id for payment in first] == [payment.id for payment in second] == ['pay-1']
+    mock_xendit_api.list_payments.assert_called_once()
+
+async def test_payment_webhook_updates_its_payment_request(mock_xendit_api):
+    store = XenditStore()
+    use_case = XenditUseCase(api_client=mock_xendit_api, store=store)
+    store.upsert_payment(make_payment("pr-1", status="PENDING"))
+    store.record_list('payments', {'customer_id': 'cust-123'}, {'has_more': False})
+
+    await use_case.handle_webhook({'event': 'payment.succeeded', 'data': {
+        'id': 'py-1', 'payment_request_id': 'pr-1', 'status': 'SUCCEEDED', 'updated': '2023-01-02T00:00:00Z'
+    }})
+
+    assert (await use_case.get_payment("pr-1")).status == "SUCCEEDED"
+    assert store.get('payments', 'py-1') is None
+    assert [payment['id'] for payment in store.query('payments', {'customer_id': 'cust-123'})] == ['pr-1']
+    mock_xendit_api.get_payment.assert_not_called()
+
+async def test_webhook_updates_store(mock_xendit_api):
+    use_case = XenditUseCase(api_client=mock_xendit_api, store=XenditStore())
+
+    await use_case.handle_webhook({'event': 'payment_request.succeeded', 'data': make_payment("pay-1")})
+    result = await use_case.get_payment("pay-1")
+
+    assert result.status == "SUCCEEDED"
+    mock_xendit_api.get_payment.assert_not_called()
+
+def test_webhooks_are_rejected_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(Config, 'XENDIT_WEBHOOK_TOKEN', None)
+    assert not webhook_authorized('')
+    assert not webhook_authorized('anything')
+
+    monkeypatch.setattr(Config, 'XENDIT_WEBHOOK_TOKEN', 'secret')
+    assert webhook_authorized('secret')
+    assert not webhook_authorized('wrong')
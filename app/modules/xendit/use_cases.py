@@ -1,47 +1,94 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Type, Union
+from pydantic import BaseModel
 from .api import XenditAPI
+from .store import XenditStore
 from .schemas import (
     CustomerRequest, PaymentMethodRequest, PaymentRequest,
     PaymentMethodResponse, PaymentResponse
 )
+from app.core.profiling import phase
 from app.core.third_party import ThirdPartyAPIException
 
 class XenditUseCase:
     """Use cases for Xendit API"""
 
-    def __init__(self, api_client: XenditAPI = None):
+    def __init__(self, api_client: XenditAPI = None, store: Optional[XenditStore] = None):
         """Initialize Xendit use cases"""
         self.api = api_client or XenditAPI()
+        self.store = store
+
+    def close(self):
+        """Release the API connection pool and the local store"""
+        self.api.close()
+        if self.store is not None:
+            self.store.close()
+
+    def _remember(self, table: str, record: Dict[str, Any]):
+        """Feed an upstream record into the local store, if enabled"""
+        if self.store is not None:
+            self.store.upsert_payment(record) if table == 'payments' else self.store.upsert(table, record)
+
+    @staticmethod
+    def _payload(data: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        """Request body to forward; routes pass dicts already validated by the schema registry"""
+        return data.model_dump(exclude_none=True) if isinstance(data, BaseModel) else data
+
+    @staticmethod
+    def _build(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+        with phase('validation'):
+            return model(**data)
+
+    @staticmethod
+    def _build_all(model: Type[BaseModel], records: List[Dict[str, Any]]) -> List[BaseModel]:
+        with phase('validation'):
+            return [model(**record) for record in records]
+
+    def _lookup(self, table: str, record_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(table, record_id) if self.store is not None else None
+
+    def _query(self, table: str, params: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        return self.store.query(table, params) if self.store is not None else None
 
     # Customer Operations
-    async def create_customer(self, customer_data: CustomerRequest) -> Dict[str, Any]:
+    async def create_customer(self, customer_data: Union[CustomerRequest, Dict[str, Any]]) -> Dict[str, Any]:
         """Create a new customer"""
         try:
-            return self.api.create_customer(customer_data.dict(exclude_none=True))
+            response = self.api.create_customer(self._payload(customer_data))
+            self._remember('customers', response)
+            return response
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create customer: {str(e)}")
 
     async def get_customer(self, customer_id: str) -> Dict[str, Any]:
         """Get customer details"""
         try:
-            return self.api.get_customer(customer_id)
+            cached = self._lookup('customers', customer_id)
+            if cached is not None:
+                return cached
+            response = self.api.get_customer(customer_id)
+            self._remember('customers', response)
+            return response
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get customer: {str(e)}")
 
     # Payment Method Operations
-    async def create_payment_method(self, payment_method_data: PaymentMethodRequest) -> PaymentMethodResponse:
+    async def create_payment_method(self, payment_method_data: Union[PaymentMethodRequest, Dict[str, Any]]) -> PaymentMethodResponse:
         """Create a new payment method"""
         try:
-            response = self.api.create_payment_method(payment_method_data.dict(exclude_none=True))
-            return PaymentMethodResponse(**response)
+            response = self.api.create_payment_method(self._payload(payment_method_data))
+            self._remember('payment_methods', response)
+            return self._build(PaymentMethodResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create payment method: {str(e)}")
 
     async def get_payment_method(self, payment_method_id: str) -> PaymentMethodResponse:
         """Get payment method details"""
         try:
-            response = self.api.get_payment_method(payment_method_id)
-            return PaymentMethodResponse(**response)
+            response = self._lookup('payment_methods', payment_method_id)
+            if response is None:
+                response = self.api.get_payment_method(payment_method_id)
+                self._remember('payment_methods', response)
+            return self._build(PaymentMethodResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get payment method: {str(e)}")
 
@@ -49,15 +96,22 @@ class XenditUseCase:
         """Update a payment method"""
         try:
             response = self.api.update_payment_method(payment_method_id, update_data)
-            return PaymentMethodResponse(**response)
+            self._remember('payment_methods', response)
+            return self._build(PaymentMethodResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to update payment method: {str(e)}")
 
     async def list_payment_methods(self, params: Optional[Dict[str, Any]] = None) -> List[PaymentMethodResponse]:
         """List payment methods"""
         try:
-            response = self.api.list_payment_methods(params)
-            return [PaymentMethodResponse(**method) for method in response.get('data', [])]
+            methods = self._query('payment_methods', params)
+            if methods is None:
+                response = self.api.list_payment_methods(params)
+                methods = response.get('data', [])
+                if self.store is not None:
+                    self.store.upsert_many('payment_methods', methods)
+                    self.store.record_list('payment_methods', params, response)
+            return self._build_all(PaymentMethodResponse, methods)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to list payment methods: {str(e)}")
 
@@ -65,32 +119,43 @@ class XenditUseCase:
         """Expire a payment method"""
         try:
             response = self.api.expire_payment_method(payment_method_id)
-            return PaymentMethodResponse(**response)
+            self._remember('payment_methods', response)
+            return self._build(PaymentMethodResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to expire payment method: {str(e)}")
 
     # Payment Operations
-    async def create_payment(self, payment_data: PaymentRequest) -> PaymentResponse:
+    async def create_payment(self, payment_data: Union[PaymentRequest, Dict[str, Any]]) -> PaymentResponse:
         """Create a new payment"""
         try:
-            response = self.api.create_payment(payment_data.dict(exclude_none=True))
-            return PaymentResponse(**response)
+            response = self.api.create_payment(self._payload(payment_data))
+            self._remember('payments', response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create payment: {str(e)}")
 
     async def get_payment(self, payment_id: str) -> PaymentResponse:
         """Get payment details"""
         try:
-            response = self.api.get_payment(payment_id)
-            return PaymentResponse(**response)
+            response = self._lookup('payments', payment_id)
+            if response is None:
+                response = self.api.get_payment(payment_id)
+                self._remember('payments', response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get payment: {str(e)}")
 
     async def list_payments(self, params: Optional[Dict[str, Any]] = None) -> List[PaymentResponse]:
         """List payments"""
         try:
-            response = self.api.list_payments(params)
-            return [PaymentResponse(**payment) for payment in response.get('data', [])]
+            payments = self._query('payments', params)
+            if payments is None:
+                response = self.api.list_payments(params)
+                payments = response.get('data', [])
+                if self.store is not None:
+                    self.store.upsert_payments(payments)
+                    self.store.record_list('payments', params, response)
+            return self._build_all(PaymentResponse, payments)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to list payments: {str(e)}")
 
@@ -99,7 +164,7 @@ class XenditUseCase:
         """Create a card payment"""
         try:
             response = self.api.create_card_payment(payment_data)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create card payment: {str(e)}")
 
@@ -107,7 +172,7 @@ class XenditUseCase:
         """Capture a card payment"""
         try:
             response = self.api.capture_card_payment(payment_id, capture_data)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to capture card payment: {str(e)}")
 
@@ -123,7 +188,7 @@ class XenditUseCase:
         """Create an eWallet charge"""
         try:
             response = self.api.create_ewallet_charge(charge_data)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create eWallet charge: {str(e)}")
 
@@ -131,7 +196,7 @@ class XenditUseCase:
         """Get eWallet charge status"""
         try:
             response = self.api.get_ewallet_charge_status(charge_id)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get eWallet charge status: {str(e)}")
 
@@ -140,7 +205,7 @@ class XenditUseCase:
         """Create a QR code payment"""
         try:
             response = self.api.create_qr_code(qr_code_data)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create QR code payment: {str(e)}")
 
@@ -148,7 +213,7 @@ class XenditUseCase:
         """Get QR code payment status"""
         try:
             response = self.api.get_qr_code_status(qr_code_id)
-            return PaymentResponse(**response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get QR code payment status: {str(e)}")
 
@@ -157,7 +222,8 @@ class XenditUseCase:
         """Create an over-the-counter payment"""
         try:
             response = self.api.create_otc_payment(otc_data)
-            return PaymentResponse(**response)
+            self._remember('payments', response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to create OTC payment: {str(e)}")
 
@@ -165,6 +231,22 @@ class XenditUseCase:
         """Get over-the-counter payment status"""
         try:
             response = self.api.get_otc_payment_status(payment_id)
-            return PaymentResponse(**response)
+            self._remember('payments', response)
+            return self._build(PaymentResponse, response)
         except ThirdPartyAPIException as e:
             raise ThirdPartyAPIException(f"Failed to get OTC payment status: {str(e)}")
+
+    # Webhook Operations
+    async def handle_webhook(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a Xendit webhook to the local store and return the updated record"""
+        event = payload.get('event', '')
+        data = payload.get('data') or {}
+        if event.startswith('payment_method.'):
+            self._remember('payment_methods', data)
+        elif event.startswith('payment_request.'):
+            self._remember('payments', data)
+        elif event.startswith('payment.') and self.store is not None and data.get('payment_request_id'):
+            # A payment (py-...) carries the status of the payment request (pr-...) the store holds
+            fields = {key: data[key] for key in ('status', 'updated') if data.get(key)}
+            self.store.merge('payments', data['payment_request_id'], fields)
+        return data
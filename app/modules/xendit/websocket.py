@@ -1,16 +1,75 @@
-from typing import Dict, Any
-from app.core.websocket import websocket_manager, ws_auth_required
+from typing import Any, Dict, List, Optional, Tuple
+from flask_socketio import emit
+from app.core.exceptions import ThirdPartyAPIException
+from app.core.sse import EventStream
+from app.core.websocket import (
+    join_ws_room, leave_ws_room, stream_claims, websocket_manager, ws_auth_required, ws_authorize
+)
+from .accounts import xendit_accounts
+from config import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared event source for the /xendit namespace and the SSE routes
+payment_events = EventStream(
+    replay_size=Config.SSE_REPLAY_BUFFER_SIZE,
+    subscriber_queue_size=Config.SSE_SUBSCRIBER_QUEUE_SIZE,
+    keepalive=Config.SSE_KEEPALIVE_SECONDS,
+    queue_factory=websocket_manager.create_queue
+)
+
+def authorize_payment(claims: Dict[str, Any], payment_id: str) -> bool:
+    """Payments listed in the token, payments belonging to the token's customer_id, or any payment
+    for tokens with the 'payments' scope"""
+    if payment_id in (claims.get('payments') or ()) or 'payments' in (claims.get('scopes') or ()):
+        return True
+    customer_id = claims.get('customer_id')
+    if not customer_id:
+        return False
+    account = xendit_accounts.select(account=claims.get('account'), resource_id=payment_id)
+    try:
+        payment = xendit_accounts.get(account).get_payment(payment_id)
+    except ThirdPartyAPIException as e:
+        if e.status_code == 404:
+            return False
+        raise
+    return payment.get('customer_id') == customer_id
+
+def authorize_job(claims: Dict[str, Any], job_id: str) -> bool:
+    """Jobs listed in the token, or any job for tokens with the 'jobs' scope"""
+    return job_id in (claims.get('jobs') or ()) or 'jobs' in (claims.get('scopes') or ())
+
+def authorize_payment_stream(payment_ids: List[str]) -> Optional[Tuple[Dict[str, Any], int]]:
+    """None when the SSE request may stream these payments (every payment when empty), else an error body and status"""
+    auth = websocket_manager.auth
+    if not auth.required:
+        return None
+    claims = stream_claims()
+    if claims is None:
+        return {'error': 'unauthorized'}, 401
+    if not payment_ids:
+        if 'payments' not in (claims.get('scopes') or ()):
+            return {'error': "Streaming every payment requires the 'payments' scope"}, 403
+        return None
+    claims_key = auth.claims_key(claims)
+    denied = [payment_id for payment_id in payment_ids
+              if not auth.authorize(claims, 'xendit.payment', payment_id, claims_key)]
+    if denied:
+        return {'error': 'forbidden', 'payment_ids': denied}, 403
+    return None
+
 @ws_auth_required
 def handle_payment_subscribe(data):
     """Handle client subscription to payment updates"""
     payment_id = data.get('payment_id')
     if payment_id:
-        room = f"xendit_payment_{payment_id}"
-        join_room(room)
+        if not ws_authorize('xendit.payment', payment_id):
+            emit('payment_subscribed', {'status': 'error', 'message': 'forbidden', 'payment_id': payment_id})
+            return
+        if not join_ws_room(f"xendit_payment_{payment_id}"):
+            emit('payment_subscribed', {'status': 'error', 'message': 'subscription limit reached', 'payment_id': payment_id})
+            return
         emit('payment_subscribed', {'status': 'success', 'payment_id': payment_id})
         logger.info(f"Client subscribed to Xendit payment updates for payment_id: {payment_id}")
     else:
@@ -21,29 +80,45 @@ def handle_payment_unsubscribe(data):
     """Handle client unsubscription from payment updates"""
     payment_id = data.get('payment_id')
     if payment_id:
-        room = f"xendit_payment_{payment_id}"
-        leave_room(room)
+        leave_ws_room(f"xendit_payment_{payment_id}")
         emit('payment_unsubscribed', {'status': 'success', 'payment_id': payment_id})
         logger.info(f"Client unsubscribed from Xendit payment updates for payment_id: {payment_id}")
     else:
         emit('payment_unsubscribed', {'status': 'error', 'message': 'payment_id is required'})
 
+@ws_auth_required
+def handle_job_subscribe(data):
+    """Handle client subscription to a background job's completion"""
+    job_id = data.get('job_id')
+    if job_id:
+        if not ws_authorize('xendit.job', job_id):
+            emit('job_subscribed', {'status': 'error', 'message': 'forbidden', 'job_id': job_id})
+            return
+        if not join_ws_room(f"xendit_job_{job_id}"):
+            emit('job_subscribed', {'status': 'error', 'message': 'subscription limit reached', 'job_id': job_id})
+            return
+        emit('job_subscribed', {'status': 'success', 'job_id': job_id})
+    else:
+        emit('job_subscribed', {'status': 'error', 'message': 'job_id is required'})
+
 def init_xendit_websocket():
     """Initialize Xendit WebSocket handlers"""
+    websocket_manager.auth.register_authorizer('xendit.payment', authorize_payment)
+    websocket_manager.auth.register_authorizer('xendit.job', authorize_job)
     websocket_manager.register_handler('subscribe_xendit_payment', handle_payment_subscribe, namespace='/xendit')
     websocket_manager.register_handler('unsubscribe_xendit_payment', handle_payment_unsubscribe, namespace='/xendit')
+    websocket_manager.register_handler('subscribe_xendit_job', handle_job_subscribe, namespace='/xendit')
 
 async def notify_payment_update(payment_id: str, status: str, details: Dict[str, Any]):
     """Send payment update notification to subscribed clients"""
     room = f"xendit_payment_{payment_id}"
-    websocket_manager.emit(
-        'payment_update',
-        {
-            'payment_id': payment_id,
-            'status': status,
-            'details': details
-        },
-        room=room,
-        namespace='/xendit'
-    )
+    update = {
+        'payment_id': payment_id,
+        'status': status,
+        'details': details
+    }
+    payment_events.publish('payment_update', update, channel=payment_id)
+    # Pollers and webhooks update payments nobody watches; skip the emit for those
+    if websocket_manager.has_subscribers(room, '/xendit'):
+        websocket_manager.emit('payment_update', update, room=room, namespace='/xendit')
     logger.info(f"Xendit payment update notification sent for payment_id: {payment_id}")
@@ -0,0 +1,101 @@
+"""Per-call dispatch overhead: hand-written wrappers vs the generated endpoint table.
+
+The upstream is stubbed at the session (a canned JSON body, no I/O), so the
+numbers are the Python cost of each layer stacked on ThirdPartyAPI._make_request:
+
+    base         ThirdPartyAPI._make_request alone (the floor)
+    method       XenditAPI.get_payment (per-method wrapper + error re-wrap)
+    use_case     XenditUseCase.get_payment on an event loop (try/except, response model)
+    table        XenditAPI.call('get_payment_requests', ...)
+    table_raw    the same with raw=True (body passed through undecoded, as the generated routes do)
+    route_table  GET /api/xendit/payment_requests/<id> through the Flask test client
+    route_method GET /api/xendit/payments/<id> (async view; needs Flask's 'async' extra)
+
+    python benchmarks/bench_dispatch.py --iterations 20000 --body-kb 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('XENDIT_API_KEY', 'bench-key')
+os.environ.setdefault('XENDIT_API_BASE_URL', 'https://api.xendit.co')
+# Access and upstream log lines would swamp the report
+os.environ.setdefault('ACCESS_LOG_ENABLED', 'false')
+
+import requests  # noqa: E402
+from flask import Flask  # noqa: E402
+from app.core.third_party import ThirdPartyAPI  # noqa: E402
+from app.modules.xendit import create_xendit_blueprint  # noqa: E402
+from app.modules.xendit.accounts import xendit_accounts  # noqa: E402
+from app.modules.xendit.use_cases import XenditUseCase  # noqa: E402
+
+def stub_session(api, body: bytes):
+    def request(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        return response
+    api.session.request = request
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5, help='interleaved rounds; the fastest round is reported')
+    parser.add_argument('--body-kb', type=int, default=2, help='size of the canned payment body')
+    args = parser.parse_args()
+
+    body = json.dumps({
+        'id': 'pr-bench', 'reference_id': 'order-1', 'customer_id': 'cust-1', 'amount': 150000, 'currency': 'IDR',
+        'country': 'ID', 'status': 'SUCCEEDED', 'created': '2024-01-01T00:00:00Z', 'updated': '2024-01-01T00:00:05Z',
+        'payment_method': {
+            'id': 'pm-1', 'type': 'EWALLET', 'reusability': 'SINGLE_USE', 'status': 'ACTIVE', 'reference_id': 'pm-ref-1',
+            'customer_id': 'cust-1', 'created': '2024-01-01T00:00:00Z', 'updated': '2024-01-01T00:00:00Z',
+        },
+        'metadata': {'padding': 'x' * (args.body_kb * 1024)},
+    }).encode()
+    api = xendit_accounts.get()
+    stub_session(api, body)
+    use_case = XenditUseCase(api_client=api)
+    loop = asyncio.new_event_loop()
+
+    app = Flask(__name__)
+    app.register_blueprint(create_xendit_blueprint(), url_prefix='/api/xendit')
+    http = app.test_client()
+    assert http.get('/api/xendit/payment_requests/pr-bench').status_code == 200
+
+    calls = {
+        'base': lambda: ThirdPartyAPI._make_request(api, 'GET', '/payment_requests/pr-bench', hedge=True),
+        'method': lambda: api.get_payment('pr-bench'),
+        'use_case': lambda: loop.run_until_complete(use_case.get_payment('pr-bench')),
+        'table': lambda: api.call('get_payment_requests', {'id': 'pr-bench'}),
+        'table_raw': lambda: api.call('get_payment_requests', {'id': 'pr-bench'}, raw=True),
+        'route_table': lambda: http.get('/api/xendit/payment_requests/pr-bench'),
+    }
+    try:
+        import asgiref  # noqa: F401
+        calls['route_method'] = lambda: http.get('/api/xendit/payments/pr-bench')
+    except ImportError:
+        pass
+
+    # Rounds are interleaved so drift (metrics reservoirs filling, CPU frequency) hits every layer alike
+    results = {name: float('inf') for name in calls}
+    for _ in range(args.repeat):
+        for name, call in calls.items():
+            seconds = timeit.timeit(call, number=args.iterations)
+            results[name] = min(results[name], seconds / args.iterations * 1e6)
+    base = results['base']
+    for name, us in results.items():
+        print(json.dumps({
+            'layer': name,
+            'iterations': args.iterations * args.repeat,
+            'us_per_call': round(us, 2),
+            'overhead_over_base_us': round(us - base, 2),
+        }))
+    loop.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Capacity under upstream faults.
+
+Starts a local HTTP stand-in for Xendit and drives concurrent lookups
+through ThirdPartyAPI while the fault injector degrades the upstream. Each
+scenario is a list of fault rules (the same format as the 'faults.rules'
+setting and /admin/faults). Reports throughput, client-side latency
+percentiles and outcomes: successes, upstream errors, timeouts, resets and
+calls rejected by the circuit breaker.
+
+    python benchmarks/bench_faults.py --scenario baseline p99_5s errors_503 --requests 2000 --concurrency 50
+    python benchmarks/bench_faults.py --scenario p99_5s --hedge --timeout 2
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.exceptions import CircuitOpenException, ThirdPartyAPIException  # noqa: E402
+from app.core.faults import fault_injector, parse_rules  # noqa: E402
+from app.core.metrics import metrics  # noqa: E402
+from app.core.third_party import ThirdPartyAPI  # noqa: E402
+
+SCENARIOS = {
+    'baseline': [],
+    # Xendit's tail latency jumps: median 50 ms, p99 5 s
+    'p99_5s': [{'latency': {'distribution': 'lognormal', 'median_ms': 50, 'p99_ms': 5000}}],
+    'errors_503': [{'probability': 0.2, 'status': 503}],
+    'resets': [{'probability': 0.05, 'reset': True}],
+    'slow_body': [{'probability': 0.1, 'body_bytes_per_second': 20000}],
+    # Full outage: the breaker should turn slow failures into fast rejections
+    'outage': [{'status': 503}],
+}
+
+class StandInAPI(ThirdPartyAPI):
+    service_name = 'bench'
+
+    def get_headers(self):
+        return {}
+
+def start_stand_in(body_kb: int) -> ThreadingHTTPServer:
+    body = json.dumps({'id': 'pr-bench', 'status': 'SUCCEEDED', 'padding': 'x' * (body_kb * 1024)}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[max(0, math.ceil(p / 100.0 * len(values)) - 1)] if values else None
+
+def run_scenario(name: str, base_url: str, args) -> dict:
+    metrics.reset_prefix('upstream.bench.')
+    api = StandInAPI(base_url, config={
+        'timeout': args.timeout, 'pool_maxsize': args.concurrency,
+        'breaker_failure_threshold': args.breaker_threshold, 'breaker_reset_timeout': 1.0,
+        'hedge': args.hedge, 'hedge_min_samples': 20, 'hedge_max_ratio': 0.1,
+    })
+    fault_injector.set_rules(parse_rules(SCENARIOS[name]))
+    outcomes, latencies, lock = {}, [], threading.Lock()
+
+    def call(_):
+        started = time.perf_counter()
+        try:
+            api._make_request('GET', '/payment_requests/pr-bench', hedge=args.hedge)
+            outcome = 'ok'
+        except CircuitOpenException:
+            outcome = 'circuit_open'
+        except ThirdPartyAPIException as e:
+            outcome = type(e.raw_error).__name__ if e.raw_error is not None else type(e).__name__
+            if outcome == 'HTTPError':
+                outcome = f'status_{e.status_code}'
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(call, range(args.requests)))
+    seconds = time.perf_counter() - started
+    fault_injector.set_rules([])
+    api.close()
+    return {
+        'scenario': name,
+        'seconds': round(seconds, 2),
+        'requests_per_second': round(args.requests / seconds),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'outcomes': dict(sorted(outcomes.items())),
+        'hedges_fired': metrics.counter('upstream.bench.hedge.fired'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=3.0)
+    parser.add_argument('--breaker-threshold', type=int, default=20)
+    parser.add_argument('--hedge', action='store_true')
+    parser.add_argument('--body-kb', type=int, default=1)
+    args = parser.parse_args()
+
+    # Adapters are wrapped when the session is built, so enable before creating clients
+    fault_injector.enabled = True
+    server = start_stand_in(args.body_kb)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    try:
+        for name in args.scenario:
+            print(json.dumps(run_scenario(name, base_url, args)))
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
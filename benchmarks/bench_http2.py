@@ -0,0 +1,179 @@
+"""Upstream fan-out benchmark: pooled HTTP/1.1 vs multiplexed HTTP/2.
+
+Starts a local HTTPS stand-in (hypercorn, which speaks both HTTP/1.1 and h2
+over ALPN) that answers each request after a fixed delay, then fires
+concurrent calls through ThirdPartyAPI with each transport, sampling the
+peak number of open sockets in the client process (Linux /proc).
+
+Requires hypercorn, httpx[http2] and the openssl CLI.
+
+    python benchmarks/bench_http2.py --requests 2000 --concurrency 50 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def serve(port: int, certfile: str, keyfile: str, latency_ms: float, max_requests: int):
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config as HypercornConfig
+
+    body = json.dumps({'id': 'pr-bench', 'status': 'SUCCEEDED'}).encode()
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        await asyncio.sleep(latency_ms / 1000)
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    config = HypercornConfig()
+    config.bind = [f'127.0.0.1:{port}']
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.loglevel = 'WARNING'
+    # Connections are retired (GOAWAY / close) after this many requests, like nginx's keepalive_requests
+    config.keep_alive_max_requests = max_requests
+    asyncio.run(hypercorn_serve(app, config))
+
+def generate_certificate(directory: str):
+    certfile, keyfile = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run([
+        'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+        '-keyout', keyfile, '-out', certfile, '-subj', '/CN=localhost',
+        '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'
+    ], check=True, capture_output=True)
+    return certfile, keyfile
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    import socket
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError('stand-in server did not start')
+
+class SocketSampler:
+    """Tracks the peak number of socket file descriptors held by this process"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            count = 0
+            for fd in os.listdir('/proc/self/fd'):
+                try:
+                    count += os.readlink(f'/proc/self/fd/{fd}').startswith('socket:')
+                except OSError:
+                    pass
+            self.peak = max(self.peak, count)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def run(transport: str, base_url: str, certfile: str, args) -> dict:
+    from app.core.metrics import metrics
+    from app.core.third_party import ThirdPartyAPI
+
+    class BenchAPI(ThirdPartyAPI):
+        service_name = f'bench_{transport}'
+
+        def get_headers(self):
+            return {'Accept': 'application/json'}
+
+    api = BenchAPI(base_url, config={
+        'http2': transport == 'http2',
+        'pool_connections': 1,
+        'pool_maxsize': args.concurrency,
+        'http2_max_streams': args.concurrency,
+        'timeout': 30,
+    })
+    adapter = api.session.get_adapter(base_url)
+    if transport == 'http2':
+        adapter.ssl_context.load_verify_locations(certfile)
+    else:
+        api.session.trust_env = False
+        api.session.verify = certfile
+
+    latencies = []
+
+    def call(_):
+        started = time.perf_counter()
+        api._make_request('GET', '/v1/payment_requests/pr-bench')
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    call(0)
+    latencies.clear()
+    started = time.perf_counter()
+    with SocketSampler() as sockets, ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(call, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    api.close()
+
+    latencies.sort()
+    counters = metrics.snapshot(api.metrics_prefix)['counters']
+    return {
+        'transport': transport,
+        'requests': args.requests,
+        'elapsed_s': round(elapsed, 2),
+        'rps': round(args.requests / elapsed),
+        'p50_ms': round(latencies[len(latencies) // 2], 1),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1], 1),
+        'peak_sockets': sockets.peak,
+        'http2_requests': counters.get(f'{api.metrics_prefix}.requests.http2', 0),
+        'http2_connection_errors': counters.get(f'{api.metrics_prefix}.http2.connection_errors', 0),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--max-requests-per-connection', type=int, default=1000)
+    parser.add_argument('--serve', nargs=2, metavar=('CERT', 'KEY'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.serve[0], args.serve[1], args.latency_ms, args.max_requests_per_connection)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = generate_certificate(directory)
+        server = subprocess.Popen([sys.executable, __file__, '--serve', certfile, keyfile,
+                                   '--port', str(args.port), '--latency-ms', str(args.latency_ms),
+                                   '--max-requests-per-connection', str(args.max_requests_per_connection)])
+        try:
+            wait_for_port(args.port)
+            base_url = f'https://localhost:{args.port}'
+            for transport in ('http1', 'http2'):
+                print(json.dumps(run(transport, base_url, certfile, args)))
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Bulk import throughput.
+
+Writes a synthetic customers file and imports it through BulkImport against
+an in-process stand-in for the Xendit API (fixed latency per call), once per
+validation worker count. About 1% of rows are invalid so the report path is
+exercised. With low latency the run is bound by validation and shows how it
+scales with processes; with higher latency it is bound by --concurrency.
+
+    python benchmarks/bench_import.py --rows 100000 --workers 1 4 --latency-ms 0
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.modules.xendit.imports import BulkImport  # noqa: E402
+
+class SyntheticXenditAPI:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create_customer(self, payload):
+        if self.latency:
+            time.sleep(self.latency)
+        return {'id': f"cust-{payload['reference_id']}"}
+
+def write_rows(path: str, rows: int):
+    with open(path, 'w') as f:
+        for n in range(rows):
+            row = {
+                'reference_id': f'c-{n}' if n % 100 else None, 'type': 'INDIVIDUAL', 'email': f'buyer{n}@example.com',
+                'mobile_number': '+628123456789', 'individual_detail': {'given_names': 'Ayu', 'surname': 'Lestari'},
+                'addresses': [{'country': 'ID', 'city': 'Jakarta'}], 'metadata': {'source': 'onboarding', 'n': n},
+            }
+            f.write(json.dumps(row) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--chunk-rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'customers.jsonl')
+        write_rows(source, args.rows)
+        for workers in args.workers:
+            started = time.perf_counter()
+            summary = BulkImport(
+                SyntheticXenditAPI(args.latency_ms / 1000), 'customers', source,
+                os.path.join(directory, 'report.jsonl'), concurrency=args.concurrency, rate_limit=0,
+                workers=workers, chunk_rows=args.chunk_rows
+            ).run()
+            seconds = time.perf_counter() - started
+            print(json.dumps({'workers': workers, 'seconds': round(seconds, 2),
+                              'rows_per_second': round(args.rows / seconds), **summary}))
+
+if __name__ == '__main__':
+    main()
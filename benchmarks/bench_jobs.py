@@ -0,0 +1,72 @@
+"""Background job queue throughput.
+
+Enqueues a batch of jobs into a fresh SQLite job store, then drains it with
+a JobWorkerPool whose handler sleeps for a simulated upstream latency.
+Reports enqueue rate (batched inserts) and processing rate per concurrency
+level, which should scale with workers until the store or rate limit caps it.
+
+    python benchmarks/bench_jobs.py --jobs 2000 --latency-ms 20 --concurrency 1 4 16
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.jobs import JobStore, JobType, JobWorkerPool  # noqa: E402
+
+def run(jobs: int, latency: float, concurrency: int, rate_limit: float, batch: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        store = JobStore(os.path.join(directory, 'jobs.db'))
+        done = threading.Event()
+        finished = []
+
+        def on_finished(job):
+            finished.append(job['id'])
+            if len(finished) == jobs:
+                done.set()
+
+        started = time.perf_counter()
+        for offset in range(0, jobs, batch):
+            store.enqueue_many('bench', [{'n': n} for n in range(offset, min(offset + batch, jobs))])
+        enqueue_seconds = time.perf_counter() - started
+
+        pool = JobWorkerPool(
+            store, {'bench': JobType(lambda payload: time.sleep(latency), concurrency, rate_limit or None)},
+            on_finished=on_finished, poll_interval=0.05
+        )
+        started = time.perf_counter()
+        pool.start()
+        done.wait()
+        process_seconds = time.perf_counter() - started
+        pool.stop()
+        store.close()
+
+    return {
+        'jobs': jobs,
+        'concurrency': concurrency,
+        'latency_ms': latency * 1000,
+        'rate_limit': rate_limit or None,
+        'enqueue_per_second': round(jobs / enqueue_seconds),
+        'processed_per_second': round(jobs / process_seconds, 1),
+        'ideal_per_second': round(min(concurrency / latency if latency else float('inf'), rate_limit or float('inf')), 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--rate-limit', type=float, default=0, help='Jobs per second (0 = unlimited)')
+    parser.add_argument('--batch', type=int, default=500, help='Jobs per enqueue transaction')
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        print(json.dumps(run(args.jobs, args.latency_ms / 1000, concurrency, args.rate_limit, args.batch)))
+
+if __name__ == '__main__':
+    main()
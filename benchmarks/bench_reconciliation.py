@@ -0,0 +1,93 @@
+"""Reconciliation benchmark at ledger scale.
+
+Generates a synthetic ledger and a matching in-process stand-in for the
+Xendit list API, then times ReconciliationJob end to end and reports peak
+RSS. About 1% of records are perturbed so every mismatch type is exercised.
+
+    python benchmarks/bench_reconciliation.py --records 1000000 10000000
+"""
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('XENDIT_API_KEY', 'bench')
+
+from app.modules.xendit.reconciliation import CREATED_GTE, CREATED_LT, ReconciliationJob  # noqa: E402
+
+START = datetime(2024, 1, 1)
+SPAN = timedelta(days=1)
+
+class SyntheticXenditAPI:
+    """Serves `records` payments spread evenly over one day, paginated by after_id"""
+
+    def __init__(self, records: int, page_size: int):
+        self.records = records
+        self.page_size = page_size
+
+    def _index_at(self, iso: str) -> int:
+        offset = datetime.fromisoformat(iso) - START
+        return min(self.records, int(self.records * (offset / SPAN)))
+
+    def list_payments(self, params):
+        lower, upper = self._index_at(params[CREATED_GTE]), self._index_at(params[CREATED_LT])
+        first = int(params['after_id'].split('-')[1]) + 1 if params.get('after_id') else lower
+        last = min(first + int(params.get('limit', self.page_size)), upper)
+        data = []
+        for i in range(first, last):
+            perturb = i % 100
+            data.append({
+                'id': f'pay-{i}',
+                'reference_id': f'ref-{i}',
+                'amount': 10000 + (1 if perturb == 1 else 0),
+                'currency': 'PHP' if perturb == 2 else 'IDR',
+                'status': 'FAILED' if perturb == 3 else 'SUCCEEDED',
+            })
+        return {'data': data, 'has_more': last < upper}
+
+def write_ledger(path: str, records: int):
+    with open(path, 'w') as f:
+        f.write('reference_id,amount,currency,status\n')
+        for i in range(records):
+            if i % 100 == 4:
+                continue  # missing in ledger
+            f.write(f'ref-{i},10000,IDR,SUCCEEDED\n')
+        for i in range(records // 100):
+            f.write(f'ref-extra-{i},500,IDR,SUCCEEDED\n')  # missing in Xendit
+
+def run(records: int, workers: int, partitions: int, page_size: int):
+    with tempfile.TemporaryDirectory() as workdir:
+        ledger = os.path.join(workdir, 'ledger.csv')
+        started = time.perf_counter()
+        write_ledger(ledger, records)
+        generated = time.perf_counter() - started
+
+        job = ReconciliationJob(
+            SyntheticXenditAPI(records, page_size), ledger, os.path.join(workdir, 'mismatches.jsonl'),
+            start=START, end=START + SPAN, partitions=partitions, workers=workers,
+            fetch_windows=16, fetch_concurrency=8, page_size=page_size, workdir=workdir
+        )
+        started = time.perf_counter()
+        summary = job.run()
+        elapsed = time.perf_counter() - started
+
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    print(f"records={records:>10,}  ledger_gen={generated:6.1f}s  reconcile={elapsed:7.1f}s  "
+          f"rate={records / elapsed:10,.0f}/s  peak_rss={peak_kb / 1024:7.1f}MiB  "
+          f"mismatches={sum(v for k, v in summary.items() if k not in ('matched', 'ledger_records', 'xendit_records')):,}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--partitions', type=int, default=256)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+    for count in args.records:
+        run(count, args.workers, args.partitions, args.page_size)
@@ -0,0 +1,68 @@
+"""WebSocket room registry at scale.
+
+Registers --connections connections with --rooms-per-connection payment
+subscriptions each (rooms shared by --watchers connections), then reports
+the registry's memory (tracemalloc), join/disconnect throughput and the
+cost of has_subscribers() for watched and unwatched payments.
+
+    python benchmarks/bench_rooms.py --connections 100000 --rooms-per-connection 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.rooms import RoomRegistry  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=100000)
+    parser.add_argument('--rooms-per-connection', type=int, default=3)
+    parser.add_argument('--watchers', type=int, default=2, help='connections per payment room')
+    parser.add_argument('--lookups', type=int, default=1000000)
+    args = parser.parse_args()
+
+    registry = RoomRegistry(max_connections=args.connections, max_rooms=args.rooms_per_connection)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for n in range(args.connections):
+        sid = f'sid-{n:08d}'
+        registry.connect(sid, '/xendit')
+        for r in range(args.rooms_per_connection):
+            registry.join(sid, f'xendit_payment_{(n // args.watchers) * args.rooms_per_connection + r}', '/xendit')
+    join_seconds = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = registry.stats(top=0)
+
+    watched, unwatched = 'xendit_payment_1', 'xendit_payment_missing'
+    timings = {}
+    for name, room in (('watched', watched), ('unwatched', unwatched)):
+        started = time.perf_counter()
+        for _ in range(args.lookups):
+            registry.has_subscribers(room, '/xendit')
+        timings[f'has_subscribers_{name}_ns'] = round((time.perf_counter() - started) / args.lookups * 1e9)
+
+    started = time.perf_counter()
+    for n in range(args.connections):
+        registry.disconnect(f'sid-{n:08d}', '/xendit')
+    disconnect_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        'connections': stats['connections'],
+        'rooms': stats['rooms'],
+        'subscriptions': stats['subscriptions'],
+        'memory_mb': round(memory / 2 ** 20, 1),
+        'bytes_per_subscription': round(memory / max(stats['subscriptions'], 1)),
+        'joins_per_second': round(stats['subscriptions'] / join_seconds),
+        'disconnects_per_second': round(args.connections / disconnect_seconds),
+        **timings,
+        'rooms_after_disconnect': registry.stats(top=0)['rooms'],
+    }))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Startup-time benchmark for create_app as the number of integration modules grows.
+
+Generates N synthetic integration modules (a blueprint plus a schema module of
+Pydantic models, similar in weight to app.modules.xendit) and times
+create_app in a fresh interpreter with eager and lazy module registration.
+
+    python benchmarks/bench_startup.py --modules 1 10 50 100
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMAS = '''from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+''' + ''.join(f'''
+class Model{i}(BaseModel):
+    id: str = Field(..., description="ID")
+    reference_id: str = Field(..., description="Reference ID")
+    amount: float = Field(..., description="Amount")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Metadata")
+    items: Optional[List[Dict[str, Any]]] = Field(None, description="Items")
+''' for i in range(40))
+
+CONTROLLER = '''from flask import Blueprint, jsonify
+from . import schemas
+
+bp = Blueprint({name!r}, __name__)
+
+@bp.route('/ping')
+def ping():
+    return jsonify({{'models': len(vars(schemas))}})
+
+def create_blueprint():
+    return bp
+'''
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+from config import Config
+from app import create_app
+
+class BenchConfig(Config):
+    MODULES = json.loads(sys.argv[1])
+    ENABLED_MODULES = None
+    LAZY_MODULES = sys.argv[2] == 'lazy'
+
+app = create_app(BenchConfig)
+print(time.perf_counter() - started)
+'''
+
+def generate_modules(root: str, count: int) -> dict:
+    package = os.path.join(root, 'bench_modules')
+    os.makedirs(package, exist_ok=True)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    manifest = {}
+    for i in range(count):
+        name = f'integration_{i}'
+        module_dir = os.path.join(package, name)
+        os.makedirs(module_dir, exist_ok=True)
+        open(os.path.join(module_dir, '__init__.py'), 'w').close()
+        with open(os.path.join(module_dir, 'schemas.py'), 'w') as f:
+            f.write(SCHEMAS)
+        with open(os.path.join(module_dir, 'controller.py'), 'w') as f:
+            f.write(CONTROLLER.format(name=name))
+        manifest[name] = {
+            'factory': f'bench_modules.{name}.controller:create_blueprint',
+            'url_prefix': f'/api/{name}'
+        }
+    return manifest
+
+def measure(root: str, manifest: dict, mode: str, repeat: int) -> float:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, root]), XENDIT_API_KEY='bench')
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE, json.dumps(manifest), mode],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'modules':>8}  {'eager (ms)':>11}  {'lazy (ms)':>10}")
+    for count in args.modules:
+        with tempfile.TemporaryDirectory() as root:
+            manifest = generate_modules(root, count)
+            eager = measure(root, manifest, 'eager', args.repeat)
+            lazy = measure(root, manifest, 'lazy', args.repeat)
+        print(f"{count:>8}  {eager * 1000:>11.1f}  {lazy * 1000:>10.1f}")
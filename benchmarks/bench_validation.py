@@ -0,0 +1,58 @@
+"""Request validation micro-benchmark.
+
+Compares the old per-request model round-trip (Model(**body) followed by
+model_dump(exclude_none=True)) with the precompiled validators in the
+schema registry, which validate the parsed JSON straight into a dict.
+
+    python benchmarks/bench_validation.py --iterations 100000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.modules.xendit.schemas import (  # noqa: E402
+    CustomerRequest, PaymentMethodRequest, PaymentRequest, request_schemas
+)
+
+PAYLOADS = {
+    'xendit.create_customer': (CustomerRequest, {
+        'reference_id': 'cust-ref-1', 'type': 'INDIVIDUAL', 'email': 'buyer@example.com',
+        'mobile_number': '+628123456789', 'individual_detail': {'given_names': 'Ayu', 'surname': 'Lestari'},
+        'addresses': [{'country': 'ID', 'city': 'Jakarta', 'postal_code': '10110'}],
+        'metadata': {'source': 'checkout'},
+    }),
+    'xendit.create_payment_method': (PaymentMethodRequest, {
+        'type': 'EWALLET', 'reusability': 'MULTIPLE_USE', 'customer_id': 'cust-1', 'reference_id': 'pm-ref-1',
+        'ewallet': {'channel_code': 'OVO', 'channel_properties': {'mobile_number': '+628123456789'}},
+    }),
+    'xendit.create_payment': (PaymentRequest, {
+        'reference_id': 'order-1', 'amount': 150000, 'currency': 'IDR', 'payment_method_id': 'pm-1',
+        'description': 'Order #1', 'customer_id': 'cust-1', 'metadata': {'cart_id': 'c-1', 'items': 3},
+    }),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, (model, body) in PAYLOADS.items():
+        schema = request_schemas.get(name)
+        assert schema.validate(body) == model(**body).model_dump(exclude_none=True)
+
+        model_seconds = timeit.timeit(lambda: model(**body).model_dump(exclude_none=True), number=args.iterations)
+        registry_seconds = timeit.timeit(lambda: schema.validate(body), number=args.iterations)
+        print(json.dumps({
+            'schema': name,
+            'iterations': args.iterations,
+            'model_round_trip_us': round(model_seconds / args.iterations * 1e6, 2),
+            'registry_us': round(registry_seconds / args.iterations * 1e6, 2),
+            'speedup': round(model_seconds / registry_seconds, 2),
+        }))
+
+if __name__ == '__main__':
+    main()
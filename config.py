@@ -7,12 +7,190 @@ load_dotenv(os.path.join(basedir, '.env'))
 class Config:
     # Flask configuration
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
+
+    # Admin endpoints (/admin/...) are disabled unless a token is configured
+    ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+    # Longest on-demand CPU profile (/admin/profile/cpu), in seconds
+    PROFILE_MAX_SECONDS = float(os.environ.get('PROFILE_MAX_SECONDS', 60))
+
+    # Runtime settings: a JSON file of tunables ({"xendit.timeout": 10} or nested
+    # {"xendit": {"timeout": 10}}) that override the values below while workers
+    # run. Each worker polls it and re-reads it on SIGHUP; POST /admin/settings
+    # validates and writes changes to it. GET /admin/settings lists the tunables.
+    SETTINGS_FILE = os.environ.get('SETTINGS_FILE') or None
+    SETTINGS_RELOAD_INTERVAL = float(os.environ.get('SETTINGS_RELOAD_INTERVAL', 5))
+
+    # Response compression (gzip, or brotli when installed) above a size
+    # threshold, and strong ETags so unchanged polls are answered with 304
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+    BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 4))
+    ETAG_ENABLED = os.environ.get('ETAG_ENABLED', 'true').lower() == 'true'
+
+    # Structured access log (JSON lines) for requests and upstream calls, written
+    # by a background thread. Sample rates are "glob=rate" pairs matched against
+    # the route (e.g. "/api/xendit/payments/<payment_id>") or "upstream:<service>";
+    # slow requests and server errors are always logged. LOG_JSON sends
+    # application logs through the same writer.
+    ACCESS_LOG_ENABLED = os.environ.get('ACCESS_LOG_ENABLED', 'true').lower() == 'true'
+    ACCESS_LOG_FILE = os.environ.get('ACCESS_LOG_FILE') or None
+    ACCESS_LOG_QUEUE_SIZE = int(os.environ.get('ACCESS_LOG_QUEUE_SIZE', 10000))
+    ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', 1.0))
+    ACCESS_LOG_SAMPLE_RATES = {
+        pattern.strip(): float(rate)
+        for pattern, rate in (item.rsplit('=', 1) for item in os.environ.get('ACCESS_LOG_SAMPLE_RATES', '').split(',') if '=' in item)
+    }
+    ACCESS_LOG_SLOW_MS = float(os.environ.get('ACCESS_LOG_SLOW_MS', 1000))
+    ACCESS_LOG_HEADERS = os.environ.get('ACCESS_LOG_HEADERS', 'false').lower() == 'true'
+    LOG_JSON = os.environ.get('LOG_JSON', 'false').lower() == 'true'
+
+    # Size limits. Inbound bodies over MAX_CONTENT_LENGTH bytes get a 413 before
+    # they are read; REQUEST_BODY_LIMITS overrides it with "glob=bytes" pairs
+    # matched against the route. Upstream bodies are read in chunks and cut off
+    # at each service's max_response_bytes. Lists longer than
+    # LIST_STREAM_THRESHOLD items are streamed (0 always buffers).
+    MAX_CONTENT_LENGTH = int(os.environ.get('REQUEST_BODY_LIMIT', 1024 * 1024))
+    BODY_LIMITS = {
+        pattern.strip(): int(limit)
+        for pattern, limit in (item.rsplit('=', 1) for item in os.environ.get(
+            'REQUEST_BODY_LIMITS', '/api/xendit/imports/*=536870912'
+        ).split(',') if '=' in item)
+    }
+    LIST_STREAM_THRESHOLD = int(os.environ.get('LIST_STREAM_THRESHOLD', 500))
+
+    # Fault injection for capacity tests: upstream calls matching a rule get added
+    # latency, error statuses, connection resets or slow bodies. Off unless
+    # enabled; rules (a JSON list) can then be changed at runtime as the
+    # "faults.rules" setting or through /admin/faults.
+    FAULT_INJECTION_ENABLED = os.environ.get('FAULT_INJECTION_ENABLED', 'false').lower() == 'true'
+    FAULT_INJECTION_RULES = os.environ.get('FAULT_INJECTION_RULES', '[]')
     
+    # Integration modules: name -> blueprint factory ("package.module:callable"),
+    # URL prefix and optional websocket/cli hooks. Installed packages can add
+    # modules through the "thirdparty_api_gateway.modules" entry point group.
+    MODULES = {
+        'xendit': {
+            'factory': 'app.modules.xendit:create_xendit_blueprint',
+            'url_prefix': '/api/xendit',
+            'websocket': 'app.modules.xendit.websocket:init_xendit_websocket',
+            'cli': 'app.modules.xendit.cli:cli'
+        },
+        'payments': {
+            'factory': 'app.modules.payments:create_payments_blueprint',
+            'url_prefix': '/api/payments'
+        }
+    }
+    ENABLED_MODULES = [name.strip() for name in os.environ.get('ENABLED_MODULES', '').split(',') if name.strip()] or None
+    LAZY_MODULES = os.environ.get('LAZY_MODULES', 'true').lower() == 'true'
+
+    # Worker lifecycle: warm up clients (DNS, pooled TLS connections) before
+    # reporting ready. Under gunicorn --preload, warmup runs in post_fork
+    # instead (see gunicorn_config.py), so WARMUP_ON_START is disabled there.
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() == 'true'
+    WARMUP_ON_START = WARMUP_ENABLED and os.environ.get('WARMUP_ON_START', 'true').lower() == 'true'
+
+    # Server-Sent Events
+    SSE_REPLAY_BUFFER_SIZE = int(os.environ.get('SSE_REPLAY_BUFFER_SIZE', 1000))
+    SSE_SUBSCRIBER_QUEUE_SIZE = int(os.environ.get('SSE_SUBSCRIBER_QUEUE_SIZE', 100))
+    SSE_KEEPALIVE_SECONDS = float(os.environ.get('SSE_KEEPALIVE_SECONDS', 15))
+
+    # Socket.IO runs on threads in the gthread API pool and on eventlet in the
+    # streams pool (gunicorn_streams_config.py sets it); eventlet is installed, so
+    # it must not be auto-detected. A message queue (e.g. redis://) relays emits
+    # from the API pool to clients of the streams pool.
+    SOCKETIO_ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') or None
+
+    # WebSocket limits per worker: connections, rooms (subscriptions) per
+    # connection, and how long a room may go without a join or event before
+    # its subscriptions are dropped (0 keeps them until disconnect)
+    WS_MAX_CONNECTIONS = int(os.environ.get('WS_MAX_CONNECTIONS', 100000))
+    WS_MAX_ROOMS_PER_CONNECTION = int(os.environ.get('WS_MAX_ROOMS_PER_CONNECTION', 100))
+    WS_ROOM_IDLE_SECONDS = float(os.environ.get('WS_ROOM_IDLE_SECONDS', 86400))
+    WS_ROOM_GC_INTERVAL = float(os.environ.get('WS_ROOM_GC_INTERVAL', 60))
+    # WebSocket clients connect with a token signed with WS_AUTH_SECRET (issued
+    # via /admin/websocket/token); while auth is required and no secret is set,
+    # every connection is refused. Per-resource authorization decisions are cached
+    # for WS_AUTH_CACHE_TTL seconds
+    WS_AUTH_SECRET = os.environ.get('WS_AUTH_SECRET') or None
+    WS_AUTH_REQUIRED = os.environ.get('WS_AUTH_REQUIRED', 'true').lower() == 'true'
+    WS_AUTH_TOKEN_MAX_AGE = float(os.environ.get('WS_AUTH_TOKEN_MAX_AGE', 3600))
+    WS_AUTH_CACHE_SIZE = int(os.environ.get('WS_AUTH_CACHE_SIZE', 100000))
+    WS_AUTH_CACHE_TTL = float(os.environ.get('WS_AUTH_CACHE_TTL', 60))
+
     # Third-party API configurations
     
     # Xendit API
     XENDIT_API_KEY = os.environ.get('XENDIT_API_KEY')
     XENDIT_API_BASE_URL = os.environ.get('XENDIT_API_BASE_URL', 'https://api.xendit.co')
+
+    # Sub-accounts: a JSON file with {"accounts": {name: {api_key | api_key_env,
+    # weight, rate_limit, ...}}, "default": name, "rules": [{"path", "methods",
+    # "account"}]}, reloaded when it changes. Without it XENDIT_API_KEY is used.
+    XENDIT_ACCOUNTS_FILE = os.environ.get('XENDIT_ACCOUNTS_FILE')
+    XENDIT_ACCOUNTS_RELOAD_INTERVAL = float(os.environ.get('XENDIT_ACCOUNTS_RELOAD_INTERVAL', 10))
+    XENDIT_ACCOUNT_HEADER = os.environ.get('XENDIT_ACCOUNT_HEADER', 'X-Xendit-Account')
+
+    # Payment routing across providers (/api/payments): name -> factory
+    # returning an app.core.interfaces.PaymentProvider
+    PAYMENT_PROVIDERS = {
+        'xendit': 'app.modules.xendit.accounts:create_payment_provider',
+        'fakepay': 'app.modules.fakepay:create_provider'
+    }
+    ENABLED_PAYMENT_PROVIDERS = [name.strip() for name in os.environ.get('ENABLED_PAYMENT_PROVIDERS', 'xendit').split(',') if name.strip()]
+    PAYMENT_ROUTER = {
+        'ewma_alpha': float(os.environ.get('PAYMENT_ROUTER_EWMA_ALPHA', 0.2)),
+        'error_penalty': float(os.environ.get('PAYMENT_ROUTER_ERROR_PENALTY', 10)),
+        'explore_ratio': float(os.environ.get('PAYMENT_ROUTER_EXPLORE_RATIO', 0.05)),
+        'breaker_failure_threshold': int(os.environ.get('PAYMENT_ROUTER_BREAKER_FAILURE_THRESHOLD', 5)),
+        'breaker_reset_timeout': float(os.environ.get('PAYMENT_ROUTER_BREAKER_RESET_TIMEOUT', 30))
+    }
+
+    # Fake payment provider for demos and tests (ENABLED_PAYMENT_PROVIDERS=xendit,fakepay)
+    FAKEPAY_LATENCY_MS = float(os.environ.get('FAKEPAY_LATENCY_MS', 50))
+    FAKEPAY_JITTER_MS = float(os.environ.get('FAKEPAY_JITTER_MS', 20))
+    FAKEPAY_ERROR_RATE = float(os.environ.get('FAKEPAY_ERROR_RATE', 0))
+    XENDIT_WEBHOOK_TOKEN = os.environ.get('XENDIT_WEBHOOK_TOKEN')
+
+    # Optional local materialized store for Xendit list/search queries
+    XENDIT_LOCAL_STORE_ENABLED = os.environ.get('XENDIT_LOCAL_STORE_ENABLED', 'false').lower() == 'true'
+    XENDIT_LOCAL_STORE_PATH = os.environ.get('XENDIT_LOCAL_STORE_PATH', ':memory:')
+    XENDIT_LOCAL_STORE_MAX_AGE = float(os.environ.get('XENDIT_LOCAL_STORE_MAX_AGE', 30))
+
+    # Background jobs (/api/xendit/jobs/...) in a local SQLite queue. Workers run
+    # inside each web worker, or with XENDIT_JOBS_IN_PROCESS=false in a separate
+    # `flask xendit jobs-worker` process (web workers then poll for completions).
+    XENDIT_JOBS_DB_PATH = os.environ.get('XENDIT_JOBS_DB_PATH', 'xendit_jobs.db')
+    XENDIT_JOBS_IN_PROCESS = os.environ.get('XENDIT_JOBS_IN_PROCESS', 'true').lower() == 'true'
+    XENDIT_JOBS_POLL_INTERVAL = float(os.environ.get('XENDIT_JOBS_POLL_INTERVAL', 0.5))
+    XENDIT_JOBS_LEASE_SECONDS = float(os.environ.get('XENDIT_JOBS_LEASE_SECONDS', 300))
+    XENDIT_JOBS_MAX_BATCH = int(os.environ.get('XENDIT_JOBS_MAX_BATCH', 1000))
+    # Per job type: worker threads, jobs/second (0 = unlimited), attempts and base retry delay
+    XENDIT_JOBS = {
+        job_type: {
+            'concurrency': int(os.environ.get(f'XENDIT_JOBS_{env}_CONCURRENCY', concurrency)),
+            'rate_limit': float(os.environ.get(f'XENDIT_JOBS_{env}_RATE_LIMIT', rate_limit)),
+            'max_attempts': int(os.environ.get(f'XENDIT_JOBS_{env}_MAX_ATTEMPTS', 3)),
+            'retry_delay': float(os.environ.get(f'XENDIT_JOBS_{env}_RETRY_DELAY', 5))
+        }
+        for job_type, env, concurrency, rate_limit in (
+            ('refund_card_payment', 'REFUND', 2, 5),
+            ('expire_payment_method', 'EXPIRE', 4, 20),
+            ('create_customer', 'CUSTOMER', 4, 20),
+            ('import_file', 'IMPORT', 1, 0)
+        )
+    }
+
+    # Bulk imports (/api/xendit/imports/<kind>, `flask xendit import`): uploads and
+    # reports are kept in XENDIT_IMPORT_DIR. Rows are validated across
+    # XENDIT_IMPORT_WORKERS processes (0 = CPU count) and sent with bounded
+    # concurrency under a requests/second limit.
+    XENDIT_IMPORT_DIR = os.environ.get('XENDIT_IMPORT_DIR', 'imports')
+    XENDIT_IMPORT_CONCURRENCY = int(os.environ.get('XENDIT_IMPORT_CONCURRENCY', 8))
+    XENDIT_IMPORT_RATE_LIMIT = float(os.environ.get('XENDIT_IMPORT_RATE_LIMIT', 20))
+    XENDIT_IMPORT_WORKERS = int(os.environ.get('XENDIT_IMPORT_WORKERS', 0))
+    XENDIT_IMPORT_CHUNK_ROWS = int(os.environ.get('XENDIT_IMPORT_CHUNK_ROWS', 1000))
     
     # Add other third-party API configurations here
     # Example:
@@ -22,7 +200,44 @@ class Config:
     API_CONFIGS = {
         'xendit': {
             'api_key': XENDIT_API_KEY,
-            'base_url': XENDIT_API_BASE_URL
+            'base_url': XENDIT_API_BASE_URL,
+            'timeout': float(os.environ.get('XENDIT_TIMEOUT', 30)),
+            'pool_connections': int(os.environ.get('XENDIT_POOL_CONNECTIONS', 10)),
+            'pool_maxsize': int(os.environ.get('XENDIT_POOL_MAXSIZE', 10)),
+            'warmup_connections': int(os.environ.get('XENDIT_WARMUP_CONNECTIONS', 2)),
+            # Seconds to cache DNS answers in-process (0 disables the cache)
+            'dns_cache_ttl': float(os.environ.get('XENDIT_DNS_CACHE_TTL', 60)),
+            'tls_session_resumption': os.environ.get('XENDIT_TLS_SESSION_RESUMPTION', 'true').lower() == 'true',
+            # Optional HTTP/2 multiplexing (requires httpx[http2]); streams are capped per host
+            'http2': os.environ.get('XENDIT_HTTP2', 'false').lower() == 'true',
+            'http2_max_connections': int(os.environ.get('XENDIT_HTTP2_MAX_CONNECTIONS', 2)),
+            'http2_max_streams': int(os.environ.get('XENDIT_HTTP2_MAX_STREAMS', 100)),
+            # Request budget (requests/second, 0 disables) and circuit breaker, per account
+            'rate_limit': float(os.environ.get('XENDIT_RATE_LIMIT', 0)),
+            'rate_burst': float(os.environ.get('XENDIT_RATE_BURST', 0)) or None,
+            'rate_limit_wait': float(os.environ.get('XENDIT_RATE_LIMIT_WAIT', 0)),
+            'breaker_failure_threshold': int(os.environ.get('XENDIT_BREAKER_FAILURE_THRESHOLD', 5)),
+            'breaker_reset_timeout': float(os.environ.get('XENDIT_BREAKER_RESET_TIMEOUT', 30)),
+            # Hedged lookups: resend a GET still unanswered after the given latency
+            # percentile of recent attempts; hedges are capped at a ratio of lookups
+            'hedge': os.environ.get('XENDIT_HEDGE', 'false').lower() == 'true',
+            'hedge_percentile': float(os.environ.get('XENDIT_HEDGE_PERCENTILE', 95)),
+            'hedge_min_delay_ms': float(os.environ.get('XENDIT_HEDGE_MIN_DELAY_MS', 20)),
+            'hedge_min_samples': int(os.environ.get('XENDIT_HEDGE_MIN_SAMPLES', 50)),
+            'hedge_max_ratio': float(os.environ.get('XENDIT_HEDGE_MAX_RATIO', 0.1)),
+            # Shadow traffic: mirror a sample of read-only calls to a secondary base URL
+            # (a stand-in or new API version) and record response diffs and latency deltas
+            'shadow_base_url': os.environ.get('XENDIT_SHADOW_BASE_URL') or None,
+            # Key sent to the shadow target; the primary API key is never mirrored
+            'shadow_api_key': os.environ.get('XENDIT_SHADOW_API_KEY') or None,
+            'shadow_sample_rate': float(os.environ.get('XENDIT_SHADOW_SAMPLE_RATE', 0.01)),
+            'shadow_max_workers': int(os.environ.get('XENDIT_SHADOW_MAX_WORKERS', 2)),
+            'shadow_max_pending': int(os.environ.get('XENDIT_SHADOW_MAX_PENDING', 100)),
+            'shadow_ignore_fields': [
+                field.strip() for field in os.environ.get('XENDIT_SHADOW_IGNORE_FIELDS', 'created,updated').split(',') if field.strip()
+            ],
+            # Largest response body read from Xendit (0 disables the cap)
+            'max_response_bytes': int(os.environ.get('XENDIT_MAX_RESPONSE_BYTES', 10 * 1024 * 1024))
         }
     }
 
@@ -0,0 +1,29 @@
+import os
+
+# Warm up in each worker after fork rather than in the preloading master
+os.environ.setdefault('WARMUP_ON_START', 'false')
+
+bind = "0.0.0.0:8000"
+# API traffic only; Socket.IO, SSE streams and webhooks are served by the
+# eventlet pool in gunicorn_streams_config.py (see README, Gunicorn Configuration)
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = "gthread"
+timeout = 120
+preload_app = True
+wsgi_app = "app:create_app()"
+
+def post_fork(server, worker):
+    from app.core.lifecycle import worker_resources
+    from config import Config
+    if Config.WARMUP_ENABLED:
+        worker_resources.warmup()
+
+def post_worker_init(worker):
+    # Gunicorn resets worker signal handlers after post_fork; SIGHUP to a worker re-reads SETTINGS_FILE
+    from app.core.settings import runtime_settings
+    runtime_settings.install_signal_handler()
+
+def worker_exit(server, worker):
+    from app.core.lifecycle import worker_resources
+    worker_resources.shutdown()
@@ -0,0 +1,30 @@
+import os
+
+# Long-lived connections (Socket.IO, SSE) on green threads: an idle subscriber
+# costs a greenlet and a socket, not an OS thread
+os.environ.setdefault('SOCKETIO_ASYNC_MODE', 'eventlet')
+# Jobs run in the API workers, which push completions through SOCKETIO_MESSAGE_QUEUE
+os.environ.setdefault('XENDIT_JOBS_IN_PROCESS', 'false')
+
+bind = os.environ.get('STREAMS_BIND', '0.0.0.0:8001')
+# Socket.IO polling sessions and SSE subscribers live in the process, so each
+# instance runs one worker; scale out with instances behind sticky sessions
+workers = 1
+worker_class = "eventlet"
+worker_connections = int(os.environ.get('STREAMS_WORKER_CONNECTIONS', 100000))
+timeout = 120
+# eventlet patches the standard library when the worker starts, before the app
+# may be imported, so the app is loaded (and warmed up) in the worker
+preload_app = False
+wsgi_app = "app:create_app()"
+
+def post_worker_init(worker):
+    from app.core.settings import runtime_settings
+    from config import Config
+    runtime_settings.install_signal_handler()
+    if not Config.SOCKETIO_MESSAGE_QUEUE:
+        worker.log.warning("SOCKETIO_MESSAGE_QUEUE is not set; emits from the API workers won't reach these clients")
+
+def worker_exit(server, worker):
+    from app.core.lifecycle import worker_resources
+    worker_resources.shutdown()